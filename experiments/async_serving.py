@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Serving many queries over one published snapshot with latency: each on
+its own `LazyOntoDAG` in turn, against `AsyncLazyOntoDAG` answering them
+all at once.
+
+The store is `lazy_latency.py`'s 3,221 records behind the same stand-in
+for a network blob store, `LATENCY` per request. The requests are 64
+one- and two-term queries over the mid categories, as a browse pane
+sends them: many overlap, so the shared reader reads a record once for
+every query that wants it.
+
+  serial    a fresh `LazyOntoDAG` per request, one request at a time
+  shared    one `LazyOntoDAG` for every request, one at a time
+  async     one `AsyncLazyOntoDAG`, every request awaited together; the
+            `RecordStore` advertises no concurrency, so its reads take
+            turns on one thread and the loop stays free meanwhile
+  async16   the same, the store allowing 16 reads at once
+
+Printed: records read, store round trips, and wall seconds. The answers
+are checked equal.
+
+Run:  python3 experiments/async_serving.py [LATENCY_MS]   (default 2)
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+from lazy_latency import SlowBytesStore, published  # noqa: E402
+from ontodag.lazy import AsyncLazyOntoDAG, LazyOntoDAG  # noqa: E402
+from recordstore import RecordStore  # noqa: E402
+
+
+class Concurrent:
+    """A record store that lets `workers` reads run at once."""
+
+    def __init__(self, store, workers):
+        self._store, self.max_concurrent_reads = store, workers
+
+    def get(self, name):
+        return self._store.get(name)
+
+    def get_many(self, names):
+        return self._store.get_many(names)
+
+
+def main(latency_ms):
+    root, blobs = published()
+    slow = SlowBytesStore(blobs, latency_ms / 1000)
+    rng = random.Random(11)
+    queries = [rng.sample([f"mid{i}" for i in range(40)], rng.randint(1, 2))
+               for _ in range(64)]
+    print(f"latency {latency_ms} ms per request, {len(queries)} queries")
+    print(f"{'mode':>7} {'fetches':>8} {'trips':>6} {'s':>7}")
+
+    serial = None
+    for mode in ("serial", "shared"):
+        started = time.perf_counter()
+        readers = [LazyOntoDAG(RecordStore.at(root, slow))]
+        answers = []
+        for query in queries:
+            if mode == "serial" and answers:
+                readers.append(LazyOntoDAG(RecordStore.at(root, slow)))
+            answers.append({item.name for item in readers[-1].get(query)})
+        seconds = time.perf_counter() - started
+        fetches = sum(reader.fetches for reader in readers)
+        trips = sum(reader.round_trips for reader in readers)
+        print(f"{mode:>7} {fetches:>8,} {trips:>6,} {seconds:>7.2f}")
+        assert serial in (None, answers)
+        serial = answers
+
+    for mode, workers in (("async", None), ("async16", 16)):
+        store = RecordStore.at(root, slow)
+        reader = AsyncLazyOntoDAG(store if workers is None
+                                  else Concurrent(store, workers))
+
+        async def serve():
+            return await asyncio.gather(*map(reader.get, queries))
+
+        started = time.perf_counter()
+        answers = asyncio.run(serve())
+        seconds = time.perf_counter() - started
+        print(f"{mode:>7} {reader.fetches:>8,} {reader.round_trips:>6,} "
+              f"{seconds:>7.2f}")
+        assert [{item.name for item in answer}
+                for answer in answers] == serial
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if sys.argv[1:] else 2)
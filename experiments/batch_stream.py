@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""A piped stream of puts into a native `.od` file, per line and batched.
+
+Per line is what `generate | odag` did before `--batch`: every mutating
+line ends in a save, and a save of a native file rewrites all of it, so a
+stream of N puts writes O(N^2) lines. Batched (`odag --batch`) saves once
+at the end of the stream; `--batch-every 1000` is the checkpointed middle.
+
+Each stream files N items under a small fixed taxonomy, driven through
+the same `_run_stream` the CLI uses. The per-line mode is skipped above
+PER_LINE_MAX lines — it would run for minutes.
+
+Run:  python3 experiments/batch_stream.py [N ...]   (default 1000 3000 10000)
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stderr
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import ontodag.__main__ as cli  # noqa: E402
+
+PER_LINE_MAX = 3_000
+KINDS = ("Dog", "Cat", "Bird", "Fish")
+
+
+def stream(n):
+    lines = ["put Animal"] + [f"put {kind} Animal" for kind in KINDS]
+    lines += [f"put item{i} {KINDS[i % len(KINDS)]}" for i in range(n)]
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+def run(n, batch, every=None):
+    with tempfile.TemporaryDirectory() as home:
+        session = cli.Session(os.path.join(home, "s.od"))
+        started = time.perf_counter()
+        with redirect_stderr(io.StringIO()):
+            code = cli._run_stream(session, stream(n), interactive=False,
+                                   batch=batch, every=every)
+        elapsed = time.perf_counter() - started
+        assert code == 0
+        loaded = cli.Session(session.spec).dag
+        assert len(loaded.get(["Animal"])) == n + len(KINDS)
+    return elapsed
+
+
+def main(sizes):
+    print(f"{'lines':>7} {'mode':>12} {'seconds':>9} {'lines/s':>9}")
+    for n in sizes:
+        for label, batch, every in (("per line", False, None),
+                                    ("every 1000", True, 1_000),
+                                    ("batch", True, None)):
+            if not batch and n > PER_LINE_MAX:
+                print(f"{n:>7} {label:>12} {'-':>9} {'-':>9}")
+                continue
+            elapsed = run(n, batch, every)
+            print(f"{n:>7} {label:>12} {elapsed:>9.2f} {n / elapsed:>9,.0f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 3_000, 10_000])
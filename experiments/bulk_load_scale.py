@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Loading a projection: edge-by-edge replay vs one `bulk_load` pass.
+
+The projection shape (PROJECTIONS.md §4): a few hundred categories in two
+levels, then N items under 1-3 categories each — about 2N edges, all of
+them sent unreduced (every item is also filed under the root, the way a
+careless projector would emit it) so the reduction has real work to do.
+
+  replay   add_node + add_edge per edge, as _load_native did before
+  bulk     OntoDAG.bulk_load over the same edges
+
+Both leave the same graph (asserted below); the columns are wall seconds.
+The replay is skipped above 200k items, where it stops being interesting.
+
+Run:  python3 experiments/bulk_load_scale.py [N ...]   (default 20k 200k 500k)
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from ontodag.dag import Item, OntoDAG  # noqa: E402
+
+REPLAY_LIMIT = 200_000
+
+
+def projection(n, rng):
+    tops = [f"t{i}" for i in range(30)]
+    cats = [f"c{i}" for i in range(300)]
+    edges = [("*", top) for top in tops]
+    for cat in cats:
+        edges.extend((top, cat) for top in rng.sample(tops, rng.randint(1, 2)))
+    for i in range(n):
+        item = f"item{i}"
+        edges.append(("*", item))
+        edges.extend((cat, item) for cat in rng.sample(cats, rng.randint(1, 3)))
+    rng.shuffle(edges)
+    return edges
+
+
+def replay(edges):
+    dag = OntoDAG()
+    for parent, child in edges:
+        for name in (parent, child):
+            if name not in dag.nodes:
+                dag.add_node(Item(name))
+        dag.add_edge(dag.nodes[parent], dag.nodes[child])
+    return dag
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [20_000, 200_000, 500_000]
+    print(f"{'items':>8} {'edges':>9} {'replay':>8} {'bulk':>7}")
+    for n in sizes:
+        edges = projection(n, random.Random(0))
+        started = time.perf_counter()
+        bulk = OntoDAG()
+        bulk.bulk_load(edges)
+        bulk_time = time.perf_counter() - started
+        replay_time = float("nan")
+        if n <= REPLAY_LIMIT:
+            started = time.perf_counter()
+            plain = replay(edges)
+            replay_time = time.perf_counter() - started
+            assert all(plain.nodes[name].descendant_count == node.descendant_count
+                       and {c.name for c in plain.nodes[name].neighbors}
+                       == {c.name for c in node.neighbors}
+                       for name, node in bulk.nodes.items())
+        print(f"{n:>8} {len(edges):>9} {replay_time:>8.2f} {bulk_time:>7.2f}",
+              flush=True)
+
+
+if __name__ == "__main__":
+    main()
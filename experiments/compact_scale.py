@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Memory per node and query throughput: OntoDAG vs CompactOntoDAG.
+
+Generates a projection-shaped graph (a shallow category layer of a few
+hundred nodes, items filed under 1-3 categories each) and measures, per
+size:
+
+  build         time to file every item (put, one at a time)
+  bytes/node    tracemalloc's traced size of the built graph / node count
+  get/s         two-term conjunctive queries per second over random
+                category pairs (names in, names out for both)
+  below/s       is_below checks per second, item vs random category
+
+OntoDAG is timed on the same stream for the first two sizes only by
+default; at 10^6 items its Item-per-node layout is the thing being
+replaced, and building it dominates the run.
+
+Run:  python3 experiments/compact_scale.py [N ...]   (default 10k 100k)
+      python3 experiments/compact_scale.py 1000000   (compact at 10^6)
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from ontodag.compact import CompactOntoDAG  # noqa: E402
+from ontodag.dag import OntoDAG  # noqa: E402
+
+CATEGORIES = 300
+QUERIES = 2000
+
+
+def stream(n, seed=0):
+    rng = random.Random(seed)
+    cats = [f"c{i}" for i in range(CATEGORIES)]
+    for i, cat in enumerate(cats):
+        # A few levels: each category under up to two earlier ones.
+        yield cat, rng.sample(cats[:i], min(i, rng.randint(0, 2)))
+    for i in range(n):
+        yield f"item{i}", rng.sample(cats, rng.randint(1, 3))
+
+
+def measure(cls, n):
+    tracemalloc.start()
+    started = time.perf_counter()
+    dag = cls()
+    for name, supers in stream(n):
+        dag.put(name, supers)
+    build = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nodes = len(dag.nodes) if isinstance(dag, OntoDAG) else len(dag)
+
+    rng = random.Random(1)
+    pairs = [(f"c{rng.randrange(CATEGORIES)}", f"c{rng.randrange(CATEGORIES)}")
+             for _ in range(QUERIES)]
+    started = time.perf_counter()
+    for pair in pairs:
+        answer = dag.get(pair)
+        if isinstance(dag, OntoDAG):
+            answer = {item.name for item in answer}
+    get_rate = QUERIES / (time.perf_counter() - started)
+
+    checks = [(f"item{rng.randrange(n)}", f"c{rng.randrange(CATEGORIES)}")
+              for _ in range(QUERIES * 10)]
+    started = time.perf_counter()
+    for sub, sup in checks:
+        dag.is_below(sub, sup)
+    below_rate = len(checks) / (time.perf_counter() - started)
+    return build, size / nodes, get_rate, below_rate
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print(f"{'N':>9} {'class':>15} {'build s':>9} {'bytes/node':>11} "
+          f"{'get/s':>9} {'below/s':>10}")
+    for n in sizes:
+        classes = [CompactOntoDAG] + ([OntoDAG] if n <= 100_000 else [])
+        for cls in classes:
+            build, per_node, get_rate, below_rate = measure(cls, n)
+            print(f"{n:>9} {cls.__name__:>15} {build:>9.2f} {per_node:>11.0f} "
+                  f"{get_rate:>9.0f} {below_rate:>10.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
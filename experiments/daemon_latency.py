@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Per-command latency of `odag`, one process per command, with and
+without `odag serve` running.
+
+The store is the one `native_load.py` builds: N nodes, N/100 categories,
+items under two categories each, saved as a native `.od` file. Each
+command is a fresh `python -m ontodag` process — what a shell script
+calling `odag` in a loop pays — running `get` for one category, then
+`count` for two; the first forwarded command loads the store into the
+daemon and is reported on its own.
+
+Run:  python3 experiments/daemon_latency.py [N ...]   (default 10000 100000)
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+import ontodag.__main__ as cli  # noqa: E402
+from ontodag import daemon  # noqa: E402
+from ontodag.dag import OntoDAG  # noqa: E402
+
+COMMANDS = 10
+
+
+def store(n):
+    rng = random.Random(0)
+    categories = max(10, n // 100)
+    edges = [("*", "c0")]
+    edges += [(f"c{rng.randrange(i)}", f"c{i}")
+              for i in range(1, categories)]
+    for i in range(categories, n):
+        for parent in rng.sample(range(categories), 2):
+            edges.append((f"c{parent}", f"i{i}"))
+    dag = OntoDAG()
+    dag.bulk_load(edges)
+    return dag
+
+
+def odag(env, *argv):
+    started = time.perf_counter()
+    done = subprocess.run([sys.executable, "-m", "ontodag", *argv], env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          check=True)
+    return time.perf_counter() - started, done.stdout
+
+
+def mean(env, path):
+    total = 0.0
+    for i in range(COMMANDS):
+        argv = (["get", "c7"] if i % 2 else ["count", "c3", "c5"])
+        total += odag(env, "-f", path, *argv)[0]
+    return total / COMMANDS
+
+
+def main(sizes):
+    print(f"{'nodes':>9} {'local s':>8} {'first s':>8} {'served s':>9}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            env = dict(os.environ, ONTODAG_HOME=home, PYTHONPATH=SRC)
+            path = os.path.join(home, "s.od")
+            cli._save_native(store(n), path)
+            local = mean(env, path)
+            server = subprocess.Popen(
+                [sys.executable, "-m", "ontodag", "serve"], env=env,
+                stderr=subprocess.DEVNULL)
+            try:
+                socket = os.path.join(home, daemon.SOCKET_NAME)
+                while not os.path.exists(socket):
+                    time.sleep(0.05)
+                first, _ = odag(env, "-f", path, "get", "c7")
+                served = mean(env, path)
+            finally:
+                server.terminate()
+                server.wait()
+        print(f"{n:>9,} {local:>8.3f} {first:>8.3f} {served:>9.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
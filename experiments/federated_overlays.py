@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""One cross-layer query in a fresh session: the overlays merged into a
+union, or federated (`overlay_mode federate`, `ontodag.federated`).
+
+The layers are the ones `view_cache.py` builds: the `native_load.py`
+store at N nodes as the primary, and an `rs:` projection of N/2 items
+under N/200 `sys:` categories as the overlay. Each row is a new Session
+answering `get c7 sys:3` — a category of the primary crossed with one of
+the overlay — as `odag get` does:
+
+  merge      the union composed from both layers (the cache's first run)
+  cached     the composed union read back from the view cache
+  federate   the primary loaded, the overlay walked lazily by name
+
+Printed: seconds per mode, and the overlay records the federated query
+fetched. The answers are checked equal.
+
+Run:  python3 experiments/federated_overlays.py [N ...]   (default 10000 100000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import ontodag.__main__ as cli  # noqa: E402
+from view_cache import overlay, primary  # noqa: E402
+
+QUERY = ["c7", "sys:3"]
+
+
+def answer(path, mode):
+    cli._OVERRIDES.clear()
+    cli._OVERRIDES["overlay_mode"] = mode
+    started = time.perf_counter()
+    session = cli.Session(path)
+    names = sorted(item.name for item in session.view().get(QUERY))
+    return time.perf_counter() - started, names, session.view()
+
+
+def main(sizes):
+    print(f"{'nodes':>9} {'merge s':>8} {'cached s':>9} {'federate s':>11} "
+          f"{'fetches':>8}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            path = os.path.join(home, "human.od")
+            machine = "rs:" + os.path.join(home, "machine")
+            cli._save_native(primary(n), path)
+            session = cli.Session(machine)
+            session.dag.bulk_load(overlay(n))
+            session.save()
+            with mock.patch.dict(os.environ, {"ONTODAG_HOME": home,
+                                              "ONTODAG_OVERLAYS": machine}):
+                merge, expected, _ = answer(path, "merge")
+                cached, again, _ = answer(path, "merge")
+                federate, names, view = answer(path, "federate")
+            assert expected == again == names
+            fetches = view.layers[1].fetches
+        print(f"{n:>9,} {merge:>8.3f} {cached:>9.3f} {federate:>11.3f} "
+              f"{fetches:>8,}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
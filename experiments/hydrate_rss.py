@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Hydrating an `rs:` record store whole: wall seconds and peak RSS.
+
+The store is the `projection_scale.py` stream of N items, ingested once.
+Each row hydrates it in a fresh process, which then prints its peak RSS:
+
+  before    the hydrate as it was: every record into one dict, then each
+            node added and each edge wired through `_EdgeSet.add`
+  stream    `EagerOntoDAG` now: nodes as the records stream in, names
+            interned, adjacency wired in bulk, the collector held off
+  snapshot  `EagerOntoDAG` from a warm snapshot (`ontodag.snapshots`)
+
+Both record paths keep every record (the synced baseline commit compares
+against), so the RSS they differ by is the names interning shares and
+the collector's garbage; the snapshot path keeps no record until a
+commit asks for one.
+
+Run:  python3 experiments/hydrate_rss.py [N ...]   (default 100000 300000)
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, "..", "src")
+sys.path.insert(0, HERE)
+sys.path.insert(0, SRC)
+from projection_scale import write_stream  # noqa: E402
+
+MODES = ("before", "stream", "snapshot")
+
+
+def hydrate(mode, path, home):
+    """Hydrate the store at `path` as `mode` does; print seconds and RSS."""
+    import recordstore as rs
+    from ontodag.dag import Item
+    from ontodag.eager import EagerOntoDAG
+    from ontodag.snapshots import SnapshotCache
+
+    class Before(EagerOntoDAG):
+        def _hydrate(self):
+            records = dict(self._all_records())
+            for name in records:
+                if name != self.root.name:
+                    self.add_node(Item(name))
+            for name, record in records.items():
+                node = self.nodes[name]
+                for child_name in record["down"]:
+                    node.neighbors.add(self.nodes[child_name])
+                node.descendant_count = record["count"]
+                if record.get("payload") is not None:
+                    self._payloads[name] = record["payload"]
+                if record.get("meta"):
+                    node.metadata = dict(record["meta"])
+            self._synced = records
+            for index in self._indexes:
+                index.rebuild()
+
+    store = rs.RecordStore(rs.DirBytesStore(os.path.join(path, "blobs")),
+                           pointer=rs.FilePointer(os.path.join(path, "root")))
+    started = time.perf_counter()
+    if mode == "before":
+        dag = Before(store)
+    elif mode == "stream":
+        dag = EagerOntoDAG(store)
+    else:
+        dag = EagerOntoDAG(store, snapshots=SnapshotCache(home, path))
+    seconds = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024                            # KiB on Linux
+    print(len(dag.nodes), seconds, peak)
+
+
+def run(mode, path, home):
+    done = subprocess.run([sys.executable, __file__, "--one", mode, path,
+                           home], capture_output=True, text=True, check=True)
+    nodes, seconds, peak = done.stdout.split()
+    return int(nodes), float(seconds), int(peak)
+
+
+def main(sizes):
+    print(f"{'items':>8} {'mode':>9} {'s':>7} {'RSS MiB':>8}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            stream = os.path.join(home, "stream.jsonl")
+            write_stream(stream, n)
+            path = os.path.join(home, "store")
+            env = dict(os.environ, ONTODAG_HOME=home, PYTHONPATH=SRC)
+            env.pop("ONTODAG_OVERLAYS", None)
+            subprocess.run([sys.executable, "-m", "ontodag", "-f",
+                            "rs:" + path, "ingest", stream], env=env,
+                           check=True, capture_output=True)
+            run("snapshot", path, home)             # leaves the snapshot
+            shapes = set()
+            for mode in MODES:
+                nodes, seconds, peak = run(mode, path, home)
+                shapes.add(nodes)
+                print(f"{n:>8,} {mode:>9} {seconds:>7.2f} "
+                      f"{peak / 2**20:>8,.0f}")
+            assert len(shapes) == 1
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--one"]:
+        hydrate(*sys.argv[2:5])
+    else:
+        main([int(float(arg)) for arg in sys.argv[1:]]
+             or [100_000, 300_000])
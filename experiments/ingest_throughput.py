@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Throughput of `odag ingest` on a datacat-shaped projection stream.
+
+The stream is the one `projection_scale.py` writes (N items, each under
+three or four `sys:` categories). Each row runs `odag -f STORE ingest` in
+a fresh process, as a projector's cron job does, and prints the report
+ingest writes on stderr: wall seconds, lines per second, and the peak RSS
+of that process — the graph plus the chunks in flight.
+
+  jobs      --jobs: the worker processes decoding JSON (1: in process)
+  store     a native `.od` file, or an `rs:` record store (one commit);
+            the `rs:` rows stop at 10^5 lines, where the commit of a fresh
+            store, not ingest, is most of the time and the memory
+
+Run:  python3 experiments/ingest_throughput.py [N ...]   (default 100000 1000000)
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+from projection_scale import write_stream  # noqa: E402
+
+SRC = os.path.join(HERE, "..", "src")
+RS_LIMIT = 100_000
+REPORT = re.compile(r"in ([\d.]+) s \(([\d,]+) lines/s\), peak RSS ([\d,]+) MiB")
+
+
+def ingest(store, stream, jobs, home):
+    env = dict(os.environ, ONTODAG_HOME=home, PYTHONPATH=SRC)
+    env.pop("ONTODAG_OVERLAYS", None)
+    done = subprocess.run(
+        [sys.executable, "-m", "ontodag", "-f", store, "ingest", stream,
+         "--jobs", str(jobs)], env=env, capture_output=True, text=True,
+        check=True)
+    return REPORT.search(done.stderr).groups()
+
+
+def main(sizes):
+    print(f"{'lines':>9} {'store':>5} {'jobs':>4} {'s':>7} {'lines/s':>9} "
+          f"{'RSS MiB':>8}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            stream = os.path.join(home, "stream.jsonl")
+            write_stream(stream, n)
+            for kind in ("od", "rs") if n <= RS_LIMIT else ("od",):
+                for jobs in (1, 2):
+                    store = (os.path.join(home, f"p{jobs}.od") if kind == "od"
+                             else "rs:" + os.path.join(home, f"p{jobs}"))
+                    seconds, rate, rss = ingest(store, stream, jobs, home)
+                    print(f"{n:>9,} {kind:>5} {jobs:>4} {seconds:>7} "
+                          f"{rate:>9} {rss:>8}")
+
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Timestamped items with and without the interval index.
+
+One calendar dimension, `time`, and N events each filed under its own
+second (`time(2026-01-01T00:01:07Z)`). Every put materializes a value and
+runs the combined-order checks, which ask for the value's computed
+neighbours; every range query takes the virtual cone of a one-minute
+window. Without the index each of those compares against every value of
+the star, and a cone walk asks again at every parametric node it passes,
+so both grow much faster than N. With `enable_interval_index()` the star
+is bisected.
+
+Per size: puts/s and the mean time of one range query, per mode. The
+unindexed mode is skipped above UNINDEXED_MAX values — it would run for
+minutes.
+
+Run:  python3 experiments/interval_index.py [N ...]   (default 150 300 3000)
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from ontodag.dag import OntoDAG  # noqa: E402
+
+QUERIES = 20
+UNINDEXED_MAX = 500
+WINDOW = "time(2026-01-01T00:01:00Z..2026-01-01T00:01:59Z)"
+
+
+def stamp(i):
+    return f"time(2026-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:" \
+           f"{i % 60:02d}Z)"
+
+
+def run(n, indexed):
+    dag = OntoDAG()
+    dag.put("dimension", [])
+    dag.put("calendar-dimension", ["dimension"])
+    dag.put("time", ["calendar-dimension"])
+    if indexed:
+        dag.enable_interval_index()
+    started = time.perf_counter()
+    for i in range(n):
+        dag.put(f"event{i}", [stamp(i)])
+    puts = n / (time.perf_counter() - started)
+    started = time.perf_counter()
+    for _ in range(QUERIES):
+        dag.get([WINDOW])
+    return puts, (time.perf_counter() - started) / QUERIES
+
+
+def main(sizes):
+    print(f"{'values':>7} {'index':>6} {'puts/s':>9} {'query ms':>9}")
+    for n in sizes:
+        for indexed in (False, True):
+            if not indexed and n > UNINDEXED_MAX:
+                print(f"{n:>7} {'off':>6} {'-':>9} {'-':>9}")
+                continue
+            puts, query = run(n, indexed)
+            print(f"{n:>7} {'on' if indexed else 'off':>6} {puts:>9,.0f} "
+                  f"{query * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [150, 300, 3_000])
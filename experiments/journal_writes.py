@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Cost of one `put` into a large native store: rewrite vs journal append.
+
+The store is the one `native_load.py` builds: N nodes, N/100 categories,
+items under two categories each. A Session loads it once, then files K new
+items one `put` at a time, each followed by its save:
+
+  rewrite   the whole `.od` file written per save (what every save did
+            before the journal; `FileBackend.compact`)
+  journal   one fsync'd line appended to `STORE.od.journal` per save
+
+Printed per put: mean seconds and bytes written. A fresh load after the
+journal run checks the replay gives the same graph.
+
+Run:  python3 experiments/journal_writes.py [N ...]   (default 100000 1000000)
+"""
+
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import ontodag.__main__ as cli  # noqa: E402
+from ontodag import journal  # noqa: E402
+from ontodag.dag import OntoDAG  # noqa: E402
+
+PUTS = 20
+
+
+def store(n):
+    rng = random.Random(0)
+    categories = max(10, n // 100)
+    edges = [("*", "c0")]
+    edges += [(f"c{rng.randrange(i)}", f"c{i}")
+              for i in range(1, categories)]
+    for i in range(categories, n):
+        for parent in rng.sample(range(categories), 2):
+            edges.append((f"c{parent}", f"i{i}"))
+    dag = OntoDAG()
+    dag.bulk_load(edges)
+    return dag
+
+
+def written(path):
+    return sum(os.path.getsize(p) for p in (path, journal.path_for(path))
+               if os.path.exists(p))
+
+
+def run(path, rewrite):
+    cli._OVERRIDES.clear()
+    session = cli.Session(path)
+    session.dag                                   # the load is not timed
+    if rewrite:
+        session.backend.save = lambda dag, message=None: \
+            session.backend.compact(dag)
+    spent, volume = 0.0, 0
+    with redirect_stdout(io.StringIO()):
+        for i in range(PUTS):
+            before = os.path.getsize(journal.path_for(path)) \
+                if not rewrite and os.path.exists(journal.path_for(path)) \
+                else 0
+            started = time.perf_counter()
+            cli.dispatch(["put", f"new{i}", "c3", "c5"], session)
+            spent += time.perf_counter() - started
+            volume += (os.path.getsize(path) if rewrite
+                       else written(path) - os.path.getsize(path) - before)
+    return spent / PUTS, volume / PUTS, session.dag
+
+
+def main(sizes):
+    print(f"{'nodes':>9} {'MB':>6} {'rewrite s':>10} {'rewrite B':>11} "
+          f"{'journal s':>10} {'journal B':>10}")
+    for n in sizes:
+        dag = store(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            one, two = os.path.join(tmp, "a.od"), os.path.join(tmp, "b.od")
+            cli._save_native(dag, one)
+            cli._save_native(dag, two)
+            del dag
+            size = os.path.getsize(one)
+            slow, slow_bytes, _ = run(one, rewrite=True)
+            fast, fast_bytes, live = run(two, rewrite=False)
+            assert os.path.exists(journal.path_for(two))
+            again = cli._load_native(two)
+            assert again.nodes["c3"].descendant_count \
+                == live.nodes["c3"].descendant_count
+        print(f"{n:>9,} {size / 1e6:>6.1f} {slow:>10.3f} {slow_bytes:>11,.0f} "
+              f"{fast:>10.4f} {fast_bytes:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""`LazyOntoDAG` over a store with latency: one read at a time, against
+the level-batched walks (`_expand_many`).
+
+The store is the one in `lazy.py`'s cost table: 20 top categories, 200
+mid, 3,000 leaves each under two parents, committed to memory. Reads go
+through a stand-in for a network blob store that sleeps `LATENCY` per
+request, a `get_many` being one request. Each row answers one query on a
+fresh reader:
+
+  serial    the store offers `get` alone: one request per record
+  pooled    `get` alone, advertising 16 concurrent reads: a thread pool
+  batched   `RecordStore.get_many`: a request per trie level per batch
+
+Printed: the records read, the reader's `round_trips`, and wall seconds.
+A `RecordStore.get` walks the trie itself, so a record costs a request
+per trie level either way; `round_trips` counts the reader's own.
+
+Run:  python3 experiments/lazy_latency.py [LATENCY_MS]   (default 2)
+"""
+
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+from ontodag.eager import EagerOntoDAG  # noqa: E402
+from ontodag.lazy import LazyOntoDAG  # noqa: E402
+from recordstore import MemoryBytesStore, RecordStore  # noqa: E402
+
+
+class SlowBytesStore:
+    """A blob store that takes `latency` seconds to answer each request."""
+
+    def __init__(self, inner, latency):
+        self._inner, self.latency = inner, latency
+
+    def get(self, ref):
+        time.sleep(self.latency)
+        return self._inner.get(ref)
+
+    def get_many(self, refs):
+        time.sleep(self.latency)
+        return self._inner.get_many(refs)
+
+
+class GetOnly:
+    """A record store that answers only `get`."""
+
+    def __init__(self, store, workers=None):
+        self._store = store
+        if workers is not None:
+            self.max_concurrent_reads = workers
+
+    def get(self, name):
+        return self._store.get(name)
+
+
+def published():
+    rng = random.Random(7)
+    dag = EagerOntoDAG(RecordStore(MemoryBytesStore()))
+    for i in range(20):
+        dag.put(f"top{i}", [])
+    for i in range(200):
+        dag.put(f"mid{i}", [f"top{i % 20}"])
+    with dag.bulk():
+        for i in range(3000):
+            dag.put(f"leaf{i}", rng.sample([f"mid{j}" for j in range(200)],
+                                           2))
+    return dag.commit(), dag.store.blobs
+
+
+def main(latency_ms):
+    root, blobs = published()
+    slow = SlowBytesStore(blobs, latency_ms / 1000)
+    queries = (["mid3"], ["top1", "mid30"], ["top1", "top2"])
+    print(f"latency {latency_ms} ms per request")
+    print(f"{'query':>12} {'mode':>8} {'fetches':>8} {'trips':>6} "
+          f"{'s':>7}")
+    for query in queries:
+        answers = set()
+        for mode in ("serial", "pooled", "batched"):
+            store = RecordStore.at(root, slow)
+            if mode != "batched":
+                store = GetOnly(store, 16 if mode == "pooled" else None)
+            reader = LazyOntoDAG(store)
+            started = time.perf_counter()
+            answers.add(frozenset(item.name for item in reader.get(query)))
+            seconds = time.perf_counter() - started
+            print(f"{' '.join(query):>12} {mode:>8} {reader.fetches:>8,} "
+                  f"{reader.round_trips:>6,} {seconds:>7.2f}")
+        assert len(answers) == 1
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if sys.argv[1:] else 2)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Load time of a native `.od` store: trusted wiring vs add_edge replay.
+
+A store of N nodes — N/100 categories in a random tree-ish hierarchy, the
+rest items filed under two categories each — is saved once with
+`_save_native`, which ends the file in its `#:sha256` line, and loaded
+two ways:
+
+  wired     the file as written: checksum verified, edges wired straight
+            into the adjacency, counts in one reverse-topological pass;
+  replayed  the same bytes without the checksum line, i.e. a hand-edited
+            file: every edge through add_edge in one bulk block.
+
+Run:  python3 experiments/native_load.py [N ...]   (default 10000 100000 1000000)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import ontodag.__main__ as cli  # noqa: E402
+from ontodag.dag import OntoDAG  # noqa: E402
+
+
+def store(n):
+    rng = random.Random(0)
+    categories = max(10, n // 100)
+    edges = [("*", "c0")]
+    edges += [(f"c{rng.randrange(i)}", f"c{i}")
+              for i in range(1, categories)]
+    for i in range(categories, n):
+        for parent in rng.sample(range(categories), 2):
+            edges.append((f"c{parent}", f"i{i}"))
+    dag = OntoDAG()
+    dag.bulk_load(edges)
+    return dag
+
+
+def timed(path):
+    started = time.perf_counter()
+    dag = cli._load_native(path)
+    return time.perf_counter() - started, dag
+
+
+def main(sizes):
+    print(f"{'nodes':>9} {'MB':>6} {'wired s':>8} {'replayed s':>11}")
+    for n in sizes:
+        dag = store(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            wired = os.path.join(tmp, "wired.od")
+            cli._save_native(dag, wired)
+            del dag
+            with open(wired, "rb") as fh:
+                data = fh.read()
+            replayed = os.path.join(tmp, "replayed.od")
+            with open(replayed, "wb") as fh:
+                fh.write(data[:data.rindex(b"#:sha256")])
+            fast, one = timed(wired)
+            slow, two = timed(replayed)
+            assert one.root.descendant_count == two.root.descendant_count
+        print(f"{n:>9,} {len(data) / 1e6:>6.1f} {fast:>8.2f} {slow:>11.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
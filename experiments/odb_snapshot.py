@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""One cold `odag get` against a `.od` file, an `.odb` file loaded in full,
+and an `.odb` file answered from its mapped arrays.
+
+The store is the one `native_load.py` builds: N nodes, N/100 categories,
+items under two categories each. Each mode opens a fresh Session — what a
+separate `odag` process does — and runs `get` for one category, then
+`count` for two. Store sizes on disk are printed alongside.
+
+Run:  python3 experiments/odb_snapshot.py [N ...]   (default 100000 1000000)
+"""
+
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import ontodag.__main__ as cli  # noqa: E402
+from ontodag.dag import OntoDAG  # noqa: E402
+
+
+def store(n):
+    rng = random.Random(0)
+    categories = max(10, n // 100)
+    edges = [("*", "c0")]
+    edges += [(f"c{rng.randrange(i)}", f"c{i}")
+              for i in range(1, categories)]
+    for i in range(categories, n):
+        for parent in rng.sample(range(categories), 2):
+            edges.append((f"c{parent}", f"i{i}"))
+    dag = OntoDAG()
+    dag.bulk_load(edges)
+    return dag
+
+
+def cold(spec, mapped):
+    cli._OVERRIDES.clear()
+    session = cli.Session(spec)
+    if not mapped:
+        session.snapshot = lambda: None
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        cli.dispatch(["get", "c7"], session)
+        cli.dispatch(["count", "c3", "c5"], session)
+    return time.perf_counter() - started
+
+
+def main(sizes):
+    print(f"{'nodes':>9} {'.od MB':>7} {'.odb MB':>8} {'.od s':>7} "
+          f"{'.odb s':>7} {'mapped s':>9}")
+    for n in sizes:
+        dag = store(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            text = os.path.join(tmp, "s.od")
+            binary = os.path.join(tmp, "s.odb")
+            cli._save(dag, text)
+            cli._save(dag, binary)
+            del dag
+            row = [os.path.getsize(text) / 1e6, os.path.getsize(binary) / 1e6,
+                   cold(text, False), cold(binary, False), cold(binary, True)]
+        print(f"{n:>9,} {row[0]:>7.1f} {row[1]:>8.1f} {row[2]:>7.2f} "
+              f"{row[3]:>7.2f} {row[4]:>9.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""put and get throughput on a dimension-heavy store, with and without the
+parse cache.
+
+Three declared dimensions (weight, a calendar `time`, a count `crates`),
+each with a pool of VALUES values; every item is filed under one value of
+each, and every query is a range over one dimension plus a point of
+another. Each put parses its supercategories, both ends of every edge and
+every star value the combined-order checks compare against; each query
+parses its terms and the values of the stars it reads.
+
+"uncached" empties the cache before every parse and compares by re-parsing
+both names — what every parse and comparison cost before the cache existed
+(kind walk, canonicalization, a parse of each side per comparison). The
+resolved units stay cached, as they were before. Both modes run
+with the interval index off, so the star scans are the parse-bound path
+the cache exists for.
+
+Run:  python3 experiments/parse_cache.py [N ...]   (default 100 200)
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from ontodag import dimensions as _dims  # noqa: E402
+from ontodag.dag import OntoDAG  # noqa: E402
+
+VALUES = 20
+QUERIES = 50
+
+
+class Uncached(OntoDAG):
+    """Every parse from scratch, and comparisons re-parsing both sides."""
+
+    def _parsed(self, name):
+        self._parses.names.clear()
+        self._parses.kinds.clear()
+        return super()._parsed(name)
+
+    def _contains(self, outer, inner, kind):
+        return _dims.contains(outer, inner, kind,
+                              units=self._declared_units())
+
+    def _intersect(self, a, b, kind):
+        return _dims.intersect(a, b, kind, units=self._declared_units())
+
+
+def schema(dag):
+    dag.put("dimension", [])
+    dag.put("linear-dimension", ["dimension"])
+    dag.put("calendar-dimension", ["dimension"])
+    dag.put("count-dimension", ["dimension"])
+    dag.put("weight", ["linear-dimension"])
+    dag.put("time", ["calendar-dimension"])
+    dag.put("crates", ["count-dimension"])
+    return dag
+
+
+def supers(rng):
+    return [f"weight({rng.randrange(VALUES)}kg)",
+            f"time(2026-{rng.randrange(12) + 1:02d}-"
+            f"{rng.randrange(28) + 1:02d})",
+            f"crates({rng.randrange(VALUES) + 1})"]
+
+
+def query(rng):
+    lo = rng.randrange(VALUES)
+    return [f"weight({lo}kg..{lo + 5}kg)",
+            f"crates({rng.randrange(VALUES) + 1})"]
+
+
+def run(cls, n):
+    rng = random.Random(0)
+    dag = schema(cls())
+    started = time.perf_counter()
+    for i in range(n):
+        dag.put(f"item{i}", supers(rng))
+    puts = n / (time.perf_counter() - started)
+    started = time.perf_counter()
+    for _ in range(QUERIES):
+        dag.get(query(rng))
+    return puts, QUERIES / (time.perf_counter() - started)
+
+
+def main(sizes):
+    print(f"{'items':>7} {'mode':>9} {'puts/s':>9} {'queries/s':>10}")
+    for n in sizes:
+        for label, cls in (("uncached", Uncached), ("cached", OntoDAG)):
+            puts, queries = run(cls, n)
+            print(f"{n:>7} {label:>9} {puts:>9,.0f} {queries:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 200])
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""The `get` planner with and without ancestor statistics.
+
+Without statistics the probe is priced at a flat `_PROBE_COST_ESTIMATE`
+nodes per candidate; with `enable_ancestor_stats()` at the candidates' real
+ancestor-cone sizes. Two shapes, where the flat guess errs in opposite
+directions:
+
+  deep   chains forty categories long, items filed at the bottom third and
+         also tagged — candidates' ancestor cones are ~30, the guess 16, so
+         without statistics the planner probes when a walk is cheaper
+  wide   two shallow category levels, items under 1-3 categories — cones
+         of 3-5, so the guess is too high and probes that would pay are
+         passed over
+
+Per shape: queries/s for random two- and three-term conjunctions, the node
+visits `explain` reports (summed over a sample), and put/s, since the
+statistics are maintained on every write.
+
+Run:  python3 experiments/planner_costs.py [N ...]   (default 5k 20k)
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from ontodag.dag import OntoDAG  # noqa: E402
+
+QUERIES = 2_000
+
+
+def deep(n, rng):
+    chains, length = 10, 40
+    for c in range(chains):
+        for d in range(length):
+            yield f"k{c}.{d}", [f"k{c}.{d - 1}"] if d else []
+    tags = [f"tag{i}" for i in range(20)]
+    for tag in tags:
+        yield tag, []
+    for i in range(n):
+        chain = rng.randrange(chains)
+        yield f"item{i}", [f"k{chain}.{rng.randrange(26, length)}",
+                           rng.choice(tags)]
+
+
+def wide(n, rng):
+    tops = [f"t{i}" for i in range(30)]
+    for top in tops:
+        yield top, []
+    cats = [f"c{i}" for i in range(300)]
+    for cat in cats:
+        yield cat, rng.sample(tops, rng.randint(1, 2))
+    for i in range(n):
+        yield f"item{i}", rng.sample(cats, rng.randint(1, 3))
+
+
+def measure(shape, n, with_stats):
+    rng = random.Random(0)
+    dag = OntoDAG()
+    if with_stats:
+        dag.enable_ancestor_stats()
+    stream = list(shape(n, rng))
+    started = time.perf_counter()
+    for name, supers in stream:
+        dag.put(name, supers)
+    put_rate = len(stream) / (time.perf_counter() - started)
+
+    categories = sorted(name for name, node in dag.nodes.items()
+                        if node.neighbors and name != "*")
+    queries = [rng.sample(categories, rng.randint(2, 3))
+               for _ in range(QUERIES)]
+    started = time.perf_counter()
+    for terms in queries:
+        dag.get(terms)
+    query_rate = QUERIES / (time.perf_counter() - started)
+    visits = sum(dag.explain(terms)["visits"] for terms in queries[:200])
+    return put_rate, query_rate, visits
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [5_000, 20_000]
+    print(f"{'shape':>6} {'N':>7} {'stats':>6} {'put/s':>8} {'get/s':>8} "
+          f"{'visits':>9}")
+    for shape in (deep, wide):
+        for n in sizes:
+            for with_stats in (False, True):
+                put_rate, query_rate, visits = measure(shape, n, with_stats)
+                print(f"{shape.__name__:>6} {n:>7} "
+                      f"{'on' if with_stats else 'off':>6} {put_rate:>8.0f} "
+                      f"{query_rate:>8.0f} {visits:>9}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""`get` with and without the query result cache, on a skewed workload.
+
+A session that keeps answering the same few conjunctions (the web app's
+`QUERY_LOG` shape): queries are drawn Zipf-like from a pool of 500 random
+two-term conjunctions over a 300-category graph, so a handful of them make
+up most of the traffic. Every `WRITE_EVERY` queries one item is filed,
+which bumps the cache's generation and so invalidates everything — the
+cost a read-mostly session pays for never seeing a stale answer.
+
+Per graph size: queries/s uncached, cached with no writes, cached with
+writes, and the cache's hit rate in each.
+
+Run:  python3 experiments/query_cache.py [N ...]   (default 5k 50k)
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from ontodag.dag import OntoDAG  # noqa: E402
+
+QUERIES = 20_000
+POOL = 500
+WRITE_EVERY = 1_000
+
+
+def build(n, rng):
+    dag = OntoDAG()
+    tops = [f"t{i}" for i in range(30)]
+    cats = [f"c{i}" for i in range(300)]
+    with dag.bulk():
+        for top in tops:
+            dag.put(top, [])
+        for cat in cats:
+            dag.put(cat, rng.sample(tops, rng.randint(1, 2)))
+        for i in range(n):
+            dag.put(f"item{i}", rng.sample(cats, rng.randint(1, 3)))
+    return dag, tops + cats
+
+
+def workload(terms, rng):
+    pool = [rng.sample(terms, 2) for _ in range(POOL)]
+    weights = [1 / (rank + 1) for rank in range(POOL)]
+    return rng.choices(pool, weights, k=QUERIES)
+
+
+def run(dag, queries, cats, writes):
+    started = time.perf_counter()
+    for i, query in enumerate(queries):
+        if writes and i and i % WRITE_EVERY == 0:
+            dag.put(f"new{i}", [cats[i % len(cats)]])
+        dag.get(query)
+    return len(queries) / (time.perf_counter() - started)
+
+
+def main(sizes):
+    print(f"{'items':>7} {'mode':>16} {'q/s':>10} {'hit rate':>9}")
+    for n in sizes:
+        for mode in ("uncached", "cached", "cached + writes"):
+            rng = random.Random(0)
+            dag, terms = build(n, rng)
+            queries = workload(terms, rng)
+            cache = None if mode == "uncached" else dag.enable_query_cache()
+            rate = run(dag, queries, terms[30:], writes=mode.endswith("writes"))
+            hits = "" if cache is None else \
+                f"{cache.hits / (cache.hits + cache.misses):.0%}"
+            print(f"{n:>7} {mode:>16} {rate:>10,.0f} {hits:>9}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [5_000, 50_000])
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""`is_below` and `put` throughput with and without reachability labels.
+
+Two synthetic shapes, because the labels win in different places on each:
+
+  deep   chains of categories with occasional cross-links to an earlier
+         chain, items filed at random depths — long ancestor cones, so an
+         un-indexed negative `is_below` walks far
+  wide   a shallow category layer (two levels) with many items under 1-3
+         categories each — short cones, the projection-store shape
+
+Per shape and size, for the plain OntoDAG and one with
+`enable_reachability_index()` turned on from the start:
+
+  put/s      items filed per second (every put runs add_edge's redundancy
+             and cycle checks, which go through the index)
+  below/s    random is_below pairs per second (mostly negatives, as in a
+             real workload of "does X fit Y?" over unrelated pairs)
+  pos/s      is_below pairs known to be true, per second
+
+Run:  python3 experiments/reachability_scale.py [N ...]   (default 2k 20k)
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from ontodag.dag import OntoDAG  # noqa: E402
+
+PAIRS = 20_000
+
+
+def deep(n, rng):
+    chains, length = 20, 40
+    for c in range(chains):
+        for d in range(length):
+            supers = [f"k{c}.{d - 1}"] if d else []
+            if c and d and rng.random() < 0.1:
+                supers.append(f"k{rng.randrange(c)}.{rng.randrange(d)}")
+            yield f"k{c}.{d}", supers
+    for i in range(n):
+        yield f"item{i}", [f"k{rng.randrange(chains)}.{rng.randrange(length)}"]
+
+
+def wide(n, rng):
+    tops = [f"t{i}" for i in range(30)]
+    for top in tops:
+        yield top, []
+    cats = [f"c{i}" for i in range(300)]
+    for cat in cats:
+        yield cat, rng.sample(tops, rng.randint(1, 2))
+    for i in range(n):
+        yield f"item{i}", rng.sample(cats, rng.randint(1, 3))
+
+
+def measure(shape, n, indexed):
+    rng = random.Random(0)
+    dag = OntoDAG()
+    if indexed:
+        dag.enable_reachability_index()
+    stream = list(shape(n, rng))
+    started = time.perf_counter()
+    for name, supers in stream:
+        dag.put(name, supers)
+    put_rate = len(stream) / (time.perf_counter() - started)
+
+    names = sorted(dag.nodes)
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(PAIRS)]
+    started = time.perf_counter()
+    for sub, sup in pairs:
+        dag.is_below(sub, sup)
+    below_rate = PAIRS / (time.perf_counter() - started)
+
+    positives = []
+    for name in rng.sample(names, min(len(names), PAIRS // 4)):
+        parents = list(dag.nodes[name].parents)
+        if parents:
+            top = rng.choice(parents)
+            while top.parents and rng.random() < 0.7:
+                top = rng.choice(list(top.parents))
+            positives.append((name, top.name))
+    started = time.perf_counter()
+    for sub, sup in positives:
+        assert dag.is_below(sub, sup)
+    pos_rate = len(positives) / (time.perf_counter() - started)
+    return put_rate, below_rate, pos_rate
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2_000, 20_000]
+    print(f"{'shape':>6} {'N':>8} {'index':>6} {'put/s':>9} {'below/s':>10} "
+          f"{'pos/s':>9}")
+    for shape in (deep, wide):
+        for n in sizes:
+            for indexed in (False, True):
+                put_rate, below_rate, pos_rate = measure(shape, n, indexed)
+                print(f"{shape.__name__:>6} {n:>8} {'on' if indexed else 'off':>6} "
+                      f"{put_rate:>9.0f} {below_rate:>10.0f} {pos_rate:>9.0f}",
+                      flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Opening an `rs:` record store: hydrating every record, against the
+hydrated-snapshot cache (`ontodag.snapshots`).
+
+The store is the `projection_scale.py` stream of N items, ingested once.
+Each row is a fresh `odag count sys:type:jpg` process, as a shell runs
+it, after one `put` moved HEAD past the ingest:
+
+  cold      no snapshot: every record read, and the graph snapshotted,
+            as every open did before, plus the write
+  warm      the snapshot at HEAD: mapped, no record read
+  moved     only the version before snapshotted: it plus the diff
+  as-of     `--as-of` the version before, with only HEAD snapshotted
+
+Each run's answer is checked against the cold one.
+
+Run:  python3 experiments/snapshot_open.py [N ...]   (default 10000 100000)
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+from projection_scale import write_stream  # noqa: E402
+
+SRC = os.path.join(HERE, "..", "src")
+
+
+def odag(home, *argv):
+    env = dict(os.environ, ONTODAG_HOME=home, PYTHONPATH=SRC)
+    env.pop("ONTODAG_OVERLAYS", None)
+    started = time.perf_counter()
+    done = subprocess.run([sys.executable, "-m", "ontodag", *argv], env=env,
+                          capture_output=True, text=True, check=True)
+    return time.perf_counter() - started, done.stdout
+
+
+def main(sizes):
+    print(f"{'items':>8} {'open':>6} {'s':>7}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            stream = os.path.join(home, "stream.jsonl")
+            write_stream(stream, n)
+            store = "rs:" + os.path.join(home, "store")
+            snapshots = os.path.join(home, "snapshots")
+            odag(home, "-f", store, "ingest", stream)
+            odag(home, "--eager", "-f", store, "put", "sha256:new",
+                 "sys:type:jpg")
+            _, history = odag(home, "-f", store, "history")
+            previous = ["--as-of", history.splitlines()[1].split()[0]]
+            count = ["-f", store, "count", "sys:type:jpg"]
+            expected = {}
+            for label, flags, warm in (("cold", [], None),
+                                       ("warm", [], []),
+                                       ("moved", [], previous),
+                                       ("as-of", previous, [])):
+                shutil.rmtree(snapshots, ignore_errors=True)
+                if warm is not None:
+                    odag(home, *warm, *count)   # leaves its snapshot
+                seconds, answer = odag(home, *flags, *count)
+                assert expected.setdefault(tuple(flags), answer) == answer
+                print(f"{n:>8,} {label:>6} {seconds:>7.2f}")
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [10_000, 100_000])
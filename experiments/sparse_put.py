@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""A one-shot `odag put` into an `rs:` record store: hydrated whole, against
+the partially resident writer the CLI now uses for put/remove/move.
+
+The store is the `projection_scale.py` stream of N items, ingested once.
+Each row is a fresh `odag` process, as a shell or a script runs it:
+
+  eager     odag --eager --verbose put ...: every record hydrated first
+  sparse    odag --verbose put ...: a `SparseOntoDAG` fetches what it touches
+
+Printed: wall seconds and the records read (the --verbose report). The
+put files a new item under one `sys:type:` category, so it touches the
+item, that category and the root; a `remove --cone` of a whole category
+is printed too, as the case whose cost is the cone it deletes.
+
+The `rs:` store stops at 10^5 items here: the first commit of a fresh
+store, not the put, is what bounds the size on a small machine
+(`ingest_throughput.py`).
+
+Run:  python3 experiments/sparse_put.py [N ...]   (default 10000 100000)
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+from projection_scale import write_stream  # noqa: E402
+
+SRC = os.path.join(HERE, "..", "src")
+READ = re.compile(r"(?:fetched|loaded all) ([\d,]+) records")
+
+
+def odag(home, *argv):
+    env = dict(os.environ, ONTODAG_HOME=home, PYTHONPATH=SRC)
+    env.pop("ONTODAG_OVERLAYS", None)
+    started = time.perf_counter()
+    done = subprocess.run([sys.executable, "-m", "ontodag", *argv], env=env,
+                          capture_output=True, text=True, check=True)
+    seconds = time.perf_counter() - started
+    found = READ.search(done.stderr)
+    return seconds, found.group(1) if found else "?"
+
+
+def main(sizes):
+    print(f"{'items':>8} {'command':>12} {'mode':>6} {'s':>7} {'records':>9}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            stream = os.path.join(home, "stream.jsonl")
+            write_stream(stream, n)
+            store = "rs:" + os.path.join(home, "store")
+            odag(home, "-f", store, "ingest", stream)
+            for label, argv in (
+                    ("put", ["put", "sha256:new", "sys:type:jpg"]),
+                    ("remove cone", ["remove", "--cone", "sys:type:mov"])):
+                for mode, flags in (("eager", ["--eager"]), ("sparse", [])):
+                    seconds, read = odag(home, "-f", store, *flags,
+                                         "--verbose", *argv)
+                    print(f"{n:>8,} {label:>12} {mode:>6} {seconds:>7.2f} "
+                          f"{read:>9}")
+                    if mode == "eager":     # undo it for the sparse row
+                        odag(home, "-f", store, "undo")
+
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [10_000, 100_000])
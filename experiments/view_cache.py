@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Cost of the composed view (`Session.view()`) in a fresh session, with
+and without the on-disk view cache (`ontodag.viewcache`).
+
+The primary is the store `native_load.py` builds at N nodes, saved as a
+native `.od` file; the overlay is an `rs:` projection store with N/2 items
+under N/200 `sys:` categories, some items shared with the primary. Each
+row is a new Session building its view, as every `odag get` with overlays
+configured does:
+
+  compose   no cache: both layers loaded, then merged into a fresh union
+  hit       every layer's stamp unchanged: the cached `.odb` view is read
+  fold      K items ingested into the overlay since: the cached view plus
+            the overlay's diff between the two roots
+
+A final check compares the folded view with a fresh composition.
+
+Run:  python3 experiments/view_cache.py [N ...]   (default 10000 100000)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import ontodag.__main__ as cli  # noqa: E402
+from ontodag.dag import OntoDAG  # noqa: E402
+
+K = 20
+
+
+def primary(n):
+    rng = random.Random(0)
+    categories = max(10, n // 100)
+    edges = [("*", "c0")]
+    edges += [(f"c{rng.randrange(i)}", f"c{i}")
+              for i in range(1, categories)]
+    for i in range(categories, n):
+        for parent in rng.sample(range(categories), 2):
+            edges.append((f"c{parent}", f"i{i}"))
+    dag = OntoDAG()
+    dag.bulk_load(edges)
+    return dag
+
+
+def overlay(n):
+    rng = random.Random(1)
+    categories = max(10, n // 200)
+    edges = [("*", "sys:")]
+    edges += [("sys:", f"sys:{i}") for i in range(categories)]
+    edges += [(f"sys:{rng.randrange(categories)}", f"i{i}")
+              for i in range(n // 100, n // 100 + n // 2)]
+    return edges
+
+
+def timed(spec):
+    started = time.perf_counter()
+    view = cli.Session(spec).view()
+    return time.perf_counter() - started, view
+
+
+def main(sizes):
+    print(f"{'nodes':>9} {'compose s':>10} {'hit s':>8} {'fold s':>8}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            path = os.path.join(home, "human.od")
+            machine = "rs:" + os.path.join(home, "machine")
+            cli._save_native(primary(n), path)
+            session = cli.Session(machine)
+            session.dag.bulk_load(overlay(n))
+            session.save()
+            with mock.patch.dict(os.environ, {"ONTODAG_HOME": home,
+                                              "ONTODAG_OVERLAYS": machine}):
+                cli._OVERRIDES.clear()
+                compose, _ = timed(path)        # composes, then caches
+                hit, _ = timed(path)
+                session = cli.Session(machine)
+                for i in range(K):
+                    session.dag.put(f"new{i}", ["sys:3"])
+                session.save()
+                fold, view = timed(path)
+                union = OntoDAG()
+                union.merge(cli._make_backend(path).load())
+                union.merge(cli._make_backend(machine).load())
+                assert {name: node.descendant_count
+                        for name, node in view.nodes.items()} \
+                    == {name: node.descendant_count
+                        for name, node in union.nodes.items()}
+        print(f"{n:>9,} {compose:>10.3f} {hit:>8.3f} {fold:>8.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
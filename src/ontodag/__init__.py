@@ -51,4 +51,22 @@ def __getattr__(name):
         from ontodag.lazy import SparseOntoDAG
 
         return SparseOntoDAG
+    # The on-demand reader's queries as coroutines, for servers answering
+    # many at once over one snapshot.
+    if name == "AsyncLazyOntoDAG":
+        from ontodag.lazy import AsyncLazyOntoDAG
+
+        return AsyncLazyOntoDAG
+    # Several layers read as one graph, walked in place rather than merged
+    # (the overlays' `federate` mode).
+    if name == "FederatedOntoDAG":
+        from ontodag.federated import FederatedOntoDAG
+
+        return FederatedOntoDAG
+    # The same graph over interned integer ids and CSR adjacency: the
+    # representation for stores too large to hold as one Item per node.
+    if name == "CompactOntoDAG":
+        from ontodag.compact import CompactOntoDAG
+
+        return CompactOntoDAG
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,9 +8,14 @@ Design goals (see the module docstring history in CLAUDE.md):
     work with no file argument;
   * stdin / stdout / pipes: `odag` with no command reads commands from a pipe,
     or drops into an interactive prompt on a tty;
+  * `--batch` makes a piped stream one transaction, saved once at its end
+    (`begin`/`commit`/`rollback` mark transactions inside a stream);
   * `-m MESSAGE` labels the state this run commits (see `history`);
   * `--as-of ROOT` reads a past version instead (any prefix `history` shows;
     read-only, since a past state is history rather than a place to write);
+  * a one-shot `put`/`remove`/`move` on an `rs:`/`swarm:` store fetches only
+    the records it touches (`--eager` loads the whole store; `--verbose`
+    reports the fetches);
   * `-o FILE` redirects query output; `-f STORE` picks the store for one run;
   * `set store PATH` changes the persistent default.
 
@@ -24,16 +29,27 @@ import collections
 import contextvars
 import importlib.util
 import errno
+import gc
+import hashlib
+import io
+import itertools
 import json
 import os
+import re
 import shlex
 import socket
 import sys
+import tempfile
 import time
 
 from ontodag._extras import MissingExtra
 from ontodag.dag import OntoDAG, Item
+from ontodag import _files
+from ontodag import fingerprints as _fingerprints
+from ontodag import journal as _journal
+from ontodag import snapshots as _snapshots
 from ontodag import surface as _surface
+from ontodag import viewcache as _viewcache
 from ontodag.dimensions import REGISTRY_VERSION
 
 try:
@@ -197,6 +213,10 @@ _SETTINGS = {
         "ONTODAG_OVERLAYS", "", "--overlay SPECS",
         "read-only stores merged into every answer (comma-separated store "
         "specs); writes, exports and excerpts never include them"),
+    "overlay_mode": _Setting(
+        "ONTODAG_OVERLAY_MODE", "merge", "--overlay-mode MODE",
+        "how answers read the overlays: merge (compose one union, cached) "
+        "or federate (walk each layer in place)"),
     "render": _Setting(
         "ONTODAG_SURFACE", "auto", "--render / --raw",
         "readable output (auto = on at a terminal, off in a pipe)"),
@@ -247,6 +267,16 @@ def _overlay_specs():
             for spec in value.split(",") if spec.strip()]
 
 
+def _federated(flag=None):
+    """Whether answers walk the overlays in place (`ontodag.federated`)
+    rather than read one composed union."""
+    value = _configured("overlay_mode", flag).strip().lower()
+    if value not in ("merge", "federate"):
+        raise ValueError(f"overlay_mode must be merge or federate, "
+                         f"not {value!r}")
+    return value == "federate"
+
+
 # --------------------------------------------------------------------------- #
 # Serialization: native line format by default, OWL/Manchester by extension
 # --------------------------------------------------------------------------- #
@@ -257,6 +287,8 @@ def _detect_format(path):
         return "manchester"
     if ext == ".owl":
         return "owl"
+    if ext == ".odb":
+        return "odb"
     return "native"
 
 
@@ -270,6 +302,31 @@ def _detect_format(path):
 # edge grammar is unchanged, and metadata is optional enrichment.
 _META_LINE = "#:meta"
 
+# The last line `_save_native` writes: a SHA-256 of every byte before it.
+# A file that still matches is exactly what the writer produced — sorted,
+# reduced, one canonical spelling per token — so the loader can trust it
+# and wire it directly. Anything else (an edit by hand, a tool that writes
+# its own `.od`, a file from before the line existed) is replayed through
+# add_edge as always. A comment, so older readers skip it.
+_CHECKSUM_LINE = "#:sha256"
+
+# Every token `_save_native` writes is shlex.quote output: a bare run of
+# shell-safe ASCII, or one '...' run for anything else. A name with a `'` in
+# it comes out as '"'"' splices, so a line with `"` or a backslash still goes
+# to shlex — as does any line of an untrusted file that quotes at all.
+_CANONICAL_TOKEN = re.compile(r"'([^']*)'|([^ \t\r\n']+)")
+
+
+def _split_line(line, canonical):
+    """shlex.split, without shlex for the lines that cannot need it."""
+    if line.isascii() and line.isprintable() \
+            and "'" not in line and '"' not in line and "\\" not in line:
+        return line.split()
+    if canonical and '"' not in line and "\\" not in line:
+        return [quoted or bare
+                for quoted, bare in _CANONICAL_TOKEN.findall(line)]
+    return shlex.split(line)
+
 
 def _load_native(path):
     """Read the native store: one line per node, `name parent1 parent2 ...`,
@@ -277,16 +334,34 @@ def _load_native(path):
 
     A missing file is an empty DAG (the default store need not exist yet).
     The format is canonical (nodes, parents and metadata keys sorted on save)
-    and the graph is rebuilt via add_edge, so even a hand-edited, non-reduced
-    file loads as its unique transitive reduction.
+    and a file whose `#:sha256` line still matches is wired as written:
+    every edge straight into the adjacency, then every count in one pass.
+    Any other file is rebuilt via add_edge inside one bulk block, so even a
+    hand-edited, non-reduced file loads as its unique transitive reduction,
+    reduced and counted in a single pass. A journal beside the file
+    (`ontodag.journal`) is replayed over it.
     """
+    return _read_native(path)[0]
+
+
+def _read_native(path):
+    """`_load_native`, also returning what a journal appends to: the file's
+    verified `#:sha256` line (None: it has none, or it does not match) and
+    the bytes of journal already replayed."""
     dag = OntoDAG()
     if not os.path.exists(path):
-        return dag
-    edges = []
-    metadata = {}
-    with open(path, encoding="utf-8") as fh:
-        for number, line in enumerate(fh, 1):
+        return dag, None, 0
+    with open(path, "rb") as fh:
+        data = fh.read()
+    base = _checksum(data)
+    canonical = base is not None
+    rows, metadata = [], {}
+    lines = io.StringIO(data.decode("utf-8"), newline=None)
+    # Paused as bulk() pauses it: a load allocates many objects, frees none.
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        for number, line in enumerate(lines, 1):
             line = line.strip()
             if not line:
                 continue
@@ -303,7 +378,57 @@ def _load_native(path):
                 continue
             if line.startswith("#"):
                 continue
-            tokens = shlex.split(line)
+            rows.append(_split_line(line, canonical))
+        if canonical:
+            _wire_native(dag, rows)
+        else:
+            _replay_native(dag, rows)
+    finally:
+        if collecting:
+            gc.enable()
+    for name, values in metadata.items():
+        node = dag.nodes.get(name)
+        if node is not None:          # an annotation for a node with no edges
+            node.metadata.update(values)
+    size = _journal.replay(dag, _journal.path_for(path), base)
+    return dag, base, size
+
+
+def _claimed_checksum(data):
+    """The digest of the `#:sha256` line `data` ends in, unverified, and
+    where that line starts; (None, cut) without one."""
+    cut = data.rfind(b"\n", 0, len(data) - 1) + 1
+    last = data[cut:].strip().decode("ascii", "replace")
+    if not last.startswith(_CHECKSUM_LINE + " "):
+        return None, cut
+    return last[len(_CHECKSUM_LINE) + 1:], cut
+
+
+def _checksum(data):
+    """The digest of the `#:sha256` line `data` ends in, if it matches what
+    precedes it; else None."""
+    digest, cut = _claimed_checksum(data)
+    if digest is None or hashlib.sha256(data[:cut]).hexdigest() != digest:
+        return None
+    return digest
+
+
+def _native_checksum(path):
+    """The `#:sha256` line a native file ends in, read from its tail and not
+    verified: which version of the file is there. None without one."""
+    try:
+        with open(path, "rb") as fh:
+            fh.seek(0, os.SEEK_END)
+            fh.seek(max(0, fh.tell() - 128))
+            return _claimed_checksum(fh.read())[0]
+    except FileNotFoundError:
+        return None
+
+
+def _replay_native(dag, rows):
+    edges = []
+    with dag.bulk():
+        for tokens in rows:
             name = tokens[0]
             if name not in dag.nodes:
                 dag.add_node(Item(name))
@@ -311,13 +436,29 @@ def _load_native(path):
                 if parent not in dag.nodes:
                     dag.add_node(Item(parent))
                 edges.append((parent, name))
-    for parent, child in edges:
-        dag.add_edge(dag.nodes[parent], dag.nodes[child])
-    for name, values in metadata.items():
-        node = dag.nodes.get(name)
-        if node is not None:          # an annotation for a node with no edges
-            node.metadata.update(values)
-    return dag
+        for parent, child in edges:
+            dag.add_edge(dag.nodes[parent], dag.nodes[child])
+
+
+def _wire_native(dag, rows):
+    # The file is its own reduction, so no edge needs checking (DAG._wire).
+    nodes = dag.nodes
+
+    def item(name):
+        node = nodes.get(name)
+        if node is None:
+            node = nodes[name] = Item(name)
+        return node
+
+    def adjacency():
+        for tokens in rows:
+            node = item(tokens[0])
+            parents = [item(parent) for parent in tokens[1:]]
+            yield node, (), parents
+            for above in parents:
+                yield above, (node,), ()
+
+    dag._wire(adjacency(), recount=True)
 
 
 def _save_native(dag, path):
@@ -336,14 +477,33 @@ def _save_native(dag, path):
             p.name for p in node.parents if dag.nodes.get(p.name) is p
         )
         lines.append(" ".join(shlex.quote(t) for t in [name] + parents))
-    with open(path, "w", encoding="utf-8") as fh:
-        fh.write("\n".join(lines) + "\n")
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    checksum = hashlib.sha256(data).hexdigest()
+    data += f"{_CHECKSUM_LINE} {checksum}\n".encode("ascii")
+    # The whole graph, so any journal beside the file is folded in. It is
+    # marked so before the file is replaced: a journal an interruption
+    # leaves behind is then known to be in the new file already.
+    journal = _journal.path_for(path)
+    folding = os.path.exists(journal)
+    with _files.replacing(path) as temporary:
+        with open(temporary, "wb") as fh:
+            fh.write(data)
+            if folding:
+                fh.flush()
+                os.fsync(fh.fileno())
+        if folding:
+            _journal.mark_compacted(journal, checksum)
+    if folding:
+        os.remove(journal)
 
 
 def _load(path):
     fmt = _detect_format(path)
     if fmt == "native":
         return _load_native(path)
+    if fmt == "odb":
+        from ontodag import odb
+        return odb.read(path) if os.path.exists(path) else OntoDAG()
     from ontodag.owl import OWLOntology
     if fmt == "manchester":
         return OWLOntology.import_dag_manchester(file_name=path)
@@ -358,6 +518,10 @@ def _save(dag, path):
     if fmt == "native":
         _save_native(dag, path)
         return
+    if fmt == "odb":
+        from ontodag import odb
+        odb.write(dag, path)
+        return
     from ontodag.owl import OWLOntology
     if fmt == "manchester":
         OWLOntology.export_dag_manchester(dag, path)
@@ -410,12 +574,36 @@ _SYNC_TIMEOUT = 60
 _LOCK_RETRY = 5.0
 
 
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+def _pointer_stamp(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return fh.read().strip()
+    except FileNotFoundError:
+        return None
+
+
 class FileBackend:
+    # The loaded graph's journal (`ontodag.journal`), for a native file.
+    _journal = None
+
     def __init__(self, path):
         self.path = path
 
     def load(self):
-        return _load(self.path)
+        if _detect_format(self.path) != "native":
+            return _load(self.path)
+        dag, base, size = _read_native(self.path)
+        self._journal = _journal.Journal(
+            dag, _journal.path_for(self.path), base, size)
+        return dag
 
     def load_at(self, root):
         raise ValueError(
@@ -437,7 +625,40 @@ class FileBackend:
 
     def save(self, dag, message=None):
         # A message labels a state in a store's timeline; a file has neither.
+        # A native file takes the save as a journal append — O(change), not
+        # a rewrite — until the journal is due for compaction.
+        journal = self._journal
+        if journal is not None and journal.dag is dag \
+                and journal.append(_native_checksum(self.path)) \
+                and not journal.due(os.path.getsize(self.path)):
+            return
+        self.compact(dag)
+
+    def compact(self, dag):
+        """Write `dag` in full, folding the journal into the file."""
         _save(dag, self.path)
+        journal = self._journal
+        if journal is not None and journal.dag is dag:
+            journal.compacted(_native_checksum(self.path))
+
+    def journaled(self):
+        """The bytes of journal beside the file, not yet compacted."""
+        path = _journal.path_for(self.path)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def stamp(self):
+        """Which stored state is there, without reading it: the file's and
+        its journal's identity, size and mtime (for `ontodag.daemon`)."""
+        return [_file_stamp(self.path),
+                _file_stamp(_journal.path_for(self.path))]
+
+    def snapshot(self):
+        """The store mapped read-only (`ontodag.odb.Snapshot`), or None.
+        Only an `.odb` file can answer without being loaded."""
+        if _detect_format(self.path) != "odb" or not os.path.exists(self.path):
+            return None
+        from ontodag.odb import Snapshot
+        return Snapshot(self.path)
 
     def describe(self):
         return self.path
@@ -666,7 +887,7 @@ class SwarmBackend:
         try:
             # Hydration reads every record, so a node that dies between
             # opening the store and reading it lands here, not above.
-            return EagerOntoDAG(store)
+            return EagerOntoDAG(store, snapshots=_snapshot_cache(self))
         except OSError as exc:
             raise _swarm_open_error(self.name, _configured("bee_api"),
                                     exc) from exc
@@ -677,6 +898,14 @@ class SwarmBackend:
             if close is not None:
                 close()
 
+    def load_sparse(self):
+        """The store as a `SparseOntoDAG`, for one write that fetches only
+        the records it touches. Unlike `load`'s, this window stays open:
+        the records are read as the write walks them, and `save` commits
+        through it. Whoever asked for it closes it (`Session.close`)."""
+        from ontodag.lazy import SparseOntoDAG
+        return SparseOntoDAG(self._record_store())
+
     def open_store(self):
         """A store handle for history operations (a transient window, as ever)."""
         return self._record_store()
@@ -698,6 +927,14 @@ class SwarmBackend:
         return publish(pointer)
 
     def save(self, dag, message=None):
+        from ontodag.lazy import SparseOntoDAG
+        if isinstance(dag, SparseOntoDAG):
+            # Its window (load_sparse) has held the writer lock since the
+            # load, so no other window can have moved the head: a plain
+            # commit onto its own lineage, and the same barrier.
+            dag.commit(message=message)
+            self._confirm(dag.store)
+            return
         store = self._record_store()  # transient writer window
         try:
             # Multi-writer convergence is MERGE, not locking: if another
@@ -717,27 +954,35 @@ class SwarmBackend:
                 dag.sync(head, bytes_store=store.blobs)
             else:
                 dag.commit(message=message)  # local, instant, offline-safe
-            # Best-effort barrier: a CLI run is short-lived, so give the
-            # background syncer a chance to land the commit on Swarm before
-            # the window closes. Offline (or slow) is not an error — the
-            # commit is durable locally and the next window's syncer
-            # resumes it.
-            sync = getattr(store, "sync", None)
-            if sync is not None:
-                try:
-                    sync(timeout=_SYNC_TIMEOUT)
-                except Exception as exc:  # TimeoutError, node down, ...
-                    print(
-                        f"note: committed locally; not yet confirmed on "
-                        f"Swarm ({exc}). It will sync on the next use of "
-                        f"this store.",
-                        file=_err(),
-                    )
+            self._confirm(store)
         finally:
             close = getattr(store, "close", None)
             if close is not None:
                 close()
 
+    @staticmethod
+    def _confirm(store):
+        """Best-effort barrier: a CLI run is short-lived, so give the
+        background syncer a chance to land the commit on Swarm before the
+        window closes. Offline (or slow) is not an error — the commit is
+        durable locally and the next window's syncer resumes it."""
+        sync = getattr(store, "sync", None)
+        if sync is not None:
+            try:
+                sync(timeout=_SYNC_TIMEOUT)
+            except Exception as exc:  # TimeoutError, node down, ...
+                print(
+                    f"note: committed locally; not yet confirmed on "
+                    f"Swarm ({exc}). It will sync on the next use of "
+                    f"this store.",
+                    file=_err(),
+                )
+
+    def stamp(self):
+        """Which stored state is there: the local store directory's HEAD
+        (for `ontodag.daemon`)."""
+        return _pointer_stamp(os.path.join(self.store_dir(), "HEAD"))
+
     def describe(self):
         return f"swarm:{self.name}"
 
@@ -833,17 +1078,37 @@ class LocalRecordBackend:
 
     def load(self):
         from ontodag.eager import EagerOntoDAG
-        return EagerOntoDAG(self._record_store())
+        return EagerOntoDAG(self._record_store(),
+                            snapshots=_snapshot_cache(self))
 
     def open_store(self):
         return self._record_store()
 
+    def load_sparse(self):
+        """The store as a `SparseOntoDAG` at its current root: a write
+        fetches the records it touches, and `save` commits its diff."""
+        from ontodag.lazy import SparseOntoDAG
+        return SparseOntoDAG(self._record_store())
+
+    def load_lazy(self):
+        """The store as a `LazyOntoDAG` at its current root: records are
+        fetched as a query walks them (a federated overlay)."""
+        from ontodag.lazy import LazyOntoDAG
+        from recordstore import RecordStore
+        store = self._record_store()
+        return LazyOntoDAG(RecordStore.at(store.root, store.blobs))
+
     def load_at(self, root):
         return _load_at_root(self, root)
 
     def save(self, dag, message=None):
         dag.commit(message=message)
 
+    def stamp(self):
+        """Which stored state is there: the `root` pointer (for
+        `ontodag.daemon`)."""
+        return _pointer_stamp(os.path.join(self.path, "root"))
+
     def describe(self):
         return f"rs:{self.path}"
 
@@ -864,12 +1129,21 @@ def _load_at_root(backend, root):
     close = getattr(store, "close", None)
     try:
         resolved = _resolve_root(store, root)
-        return EagerOntoDAG(RecordStore.at(resolved, store.blobs))
+        return EagerOntoDAG(RecordStore.at(resolved, store.blobs),
+                            snapshots=_snapshot_cache(backend))
     finally:
         if close is not None:
             close()
 
 
+def _snapshot_cache(backend):
+    """The hydrated-snapshot cache of `backend`'s store
+    (`ontodag.snapshots`), or None when a store key is configured."""
+    if _configured("store_key"):
+        return None
+    return _snapshots.SnapshotCache(_home_dir(), backend.describe())
+
+
 def _resolve_root(store, root):
     """A full root from a prefix, or a teaching error naming the ambiguity."""
     known = [version.root for version in store.history()]
@@ -886,6 +1160,13 @@ def _resolve_root(store, root):
         f"{root}: ambiguous — matches {', '.join(name[:16] for name in matches)}")
 
 
+def _backend_stamp(backend):
+    """Which stored state `backend` is at (its `stamp()`), or None when it
+    cannot tell."""
+    stamp = getattr(backend, "stamp", None)
+    return stamp() if stamp is not None else None
+
+
 def _make_backend(spec):
     if _is_swarm(spec):
         return SwarmBackend(spec[len("swarm:"):])
@@ -908,6 +1189,20 @@ class Session:
     down: a user whose node is unreachable and who types `odag help` to
     find the way out has to get help, not the error they came to fix."""
 
+    # An open transaction (`begin`, or a whole `--batch` stream): saves are
+    # deferred to `commit`, and `rollback` returns to the last save.
+    in_transaction = False
+    _dirty = False
+    failed = False          # the last dispatched command failed
+    # The primary's stamp when it was loaded or last saved: which stored
+    # state the in-memory graph is (for the composed-view cache).
+    _stamp = None
+    # Open an `rs:`/`swarm:` store as a partially resident writer
+    # (`SparseOntoDAG`) instead of hydrating it: set by `main` for a
+    # one-shot command whose cost is what it names (`_PARTIAL_WRITES`).
+    partial = False
+    _window = None          # the store such a graph still reads through
+
     def __init__(self, spec):
         self.spec = spec
         self._backend = None
@@ -918,8 +1213,17 @@ class Session:
     def _load(self):
         backend = _make_backend(self.spec)
         as_of = _OVERRIDES.get("as_of")
-        dag = backend.load_at(as_of) if as_of else backend.load()
-        self._backend, self._dag = backend, dag
+        # Taken before the read: a store moving in between makes the stamp
+        # older than the graph, which only costs a cache miss.
+        stamp = None if as_of else _backend_stamp(backend)
+        sparse = None if as_of or not self.partial \
+            else getattr(backend, "load_sparse", None)
+        if sparse is not None:
+            dag = sparse()
+            self._window = dag.store
+        else:
+            dag = backend.load_at(as_of) if as_of else backend.load()
+        self._backend, self._dag, self._stamp = backend, dag, stamp
         self._view = None
 
     @property
@@ -940,19 +1244,21 @@ class Session:
         # leave the session on the one it already had, not half-switched to
         # a backend whose load failed — and `set store` validating at set
         # time is the feature.
+        self.settled("switch stores")
         backend = _make_backend(spec)
+        stamp = _backend_stamp(backend)
         dag = backend.load()
         # A local-first store holds a writer lock and a sync thread; release
         # them when the session moves on (switching back to the same store
         # in one session would otherwise hit its own lock).
         old = getattr(self._dag, "store", None)
         self.spec, self._backend, self._dag = spec, backend, dag
-        self._view = None
+        self._stamp, self._view = stamp, None
         close = getattr(old, "close", None)
         if close is not None:
             close()
 
-    def view(self):
+    def view(self, whole=False):
         """The composed READ view: this store with every configured overlay
         merged in — the join of `docs/plans/PROJECTIONS.md` §5.
 
@@ -972,18 +1278,104 @@ class Session:
         because cones are reduction-invariant. Cached per session; every
         rebinding of the primary (`_load`, `switch`) and every mutation
         (`save`) invalidates it, and a changed `overlays` setting is caught
-        by comparing specs."""
+        by comparing specs. Across sessions it is cached on disk, keyed by
+        every layer's stamp (`ontodag.viewcache`).
+
+        With `overlay_mode` set to `federate` nothing is composed: the view
+        is a `FederatedOntoDAG` walking the primary and each overlay in
+        place (`rs:` overlays lazily), so a query costs the cones it
+        touches. `whole=True` is for the commands that read the whole graph
+        (`show`, pictures), which always get the composed union. A partial
+        primary (`partial`) is always federated: composing it would merge
+        only the records it fetched."""
         specs = _overlay_specs()
         if not specs:
             return self.dag
-        if self._view is None or self._view_specs != specs:
-            composed = OntoDAG()
-            composed.merge(self.dag)
-            for spec in specs:
-                composed.merge(_make_backend(spec).load())
-            self._view, self._view_specs = composed, specs
+        federate = (_federated() or self._window is not None) and not whole
+        if self._view is None or self._view_specs != (specs, federate):
+            view = self._federate(specs) if federate \
+                else self._compose(specs)
+            self._view, self._view_specs = view, (specs, federate)
         return self._view
 
+    def _federate(self, specs):
+        from ontodag.federated import FederatedOntoDAG
+        layers = [self.dag]
+        for spec in specs:
+            backend = _make_backend(spec)
+            load = getattr(backend, "load_lazy", backend.load)
+            layers.append(load())
+        return FederatedOntoDAG(layers)
+
+    def stored_stamp(self):
+        """The stamp of the stored state the graph is — or, not loaded yet,
+        will be — or None when it is not one (unsaved changes, a past
+        version)."""
+        if _OVERRIDES.get("as_of") or self._dirty:
+            return None
+        if self._dag is None:
+            return _backend_stamp(_make_backend(self.spec))
+        return self._stamp
+
+    def fingerprints(self, source):
+        """Where `ingest` records its runs from `source` into this store
+        (`ontodag.fingerprints`), or None when nothing may be recorded: in
+        a transaction (nothing is written until commit), for a past
+        version, or with a store key (the digests name every item)."""
+        if self.in_transaction or _OVERRIDES.get("as_of") \
+                or _configured("store_key"):
+            return None
+        return _fingerprints.Fingerprints(_home_dir(), self.spec, source)
+
+    def _compose(self, specs):
+        layers = [self.spec] + specs
+        backends = [_make_backend(spec) for spec in layers]
+        primary = self.stored_stamp()
+        stamps = [primary] + [_backend_stamp(backend)
+                              for backend in backends[1:]]
+        cache = None
+        if None not in stamps and not _OVERRIDES.get("as_of") \
+                and not _configured("store_key"):
+            cache = _viewcache.ViewCache(_home_dir(), layers)
+            try:
+                view = cache.load(stamps)
+                if view is None:
+                    view = cache.refold(stamps, backends)
+            except (OSError, ValueError):
+                view = None     # unreadable: compose it afresh
+            if view is not None:
+                return view
+        dags = [self.dag] + [backend.load() for backend in backends[1:]]
+        composed = OntoDAG()
+        for dag in dags:
+            composed.merge(dag)
+        if cache is not None:
+            try:
+                cache.store(composed, stamps,
+                            [getattr(dag, "base_root", None) for dag in dags])
+            except OSError:
+                pass            # a cache that cannot be written is no cache
+        return composed
+
+    def snapshot(self):
+        """A mapped, read-only view that can answer a plain query without
+        loading the store, or None.
+
+        Only for an `.odb` file (`ontodag.odb`), and only when the mapped
+        arrays are the whole answer: nothing loaded or pending in memory
+        (it would be newer than the file), no overlays to compose, and no
+        declared dimension, whose computed order the arrays do not hold.
+        The caller closes it."""
+        if _detect_format(self.spec) != "odb" or self._dag is not None \
+                or self._dirty or _overlay_specs() or _OVERRIDES.get("as_of"):
+            return None
+        opener = getattr(_make_backend(self.spec), "snapshot", None)
+        snapshot = opener() if opener is not None else None
+        if snapshot is not None and not snapshot.plain:
+            snapshot.close()
+            return None
+        return snapshot
+
     def save(self):
         # A past state is a state, not a place to write from: the pointer is
         # elsewhere, so a commit here would either be ignored or silently
@@ -993,9 +1385,84 @@ class Session:
                 "--as-of opens a past version read-only; nothing can be "
                 "written to it.\n"
                 "  to make the store go back there:  odag undo  (or `redo`)")
-        self.backend.save(self.dag, message=_OVERRIDES.get("message"))
+        if self.in_transaction:
+            self._dirty = True
+        else:
+            self.backend.save(self.dag, message=_OVERRIDES.get("message"))
+            self._stamp = _backend_stamp(self.backend)
         self._view = None
 
+    # ------------------------------------------------------ transactions
+    # A piped stream used to save after every mutating line: a whole `.od`
+    # rewrite, or a new root in an `rs:`/`swarm:` store's history, per line —
+    # quadratic in the stream, and a history nobody can read. Inside a
+    # transaction `save()` only notes that there is something to write, and
+    # `commit()` writes it once, under the one `-m` label.
+
+    def begin(self):
+        if self.in_transaction:
+            raise ValueError("a transaction is already open "
+                             "(commit or rollback first)")
+        self.in_transaction, self._dirty = True, False
+
+    def checkpoint(self):
+        """Write what the open transaction has so far, and keep it open."""
+        if self._dirty:
+            self.backend.save(self.dag, message=_OVERRIDES.get("message"))
+            self._stamp = _backend_stamp(self.backend)
+            self._dirty = False
+
+    def commit(self):
+        if not self.in_transaction:
+            raise ValueError("no transaction is open (begin starts one)")
+        self.checkpoint()
+        self.in_transaction = False
+
+    def rollback(self):
+        """Drop the in-memory graph back to the last save.
+
+        Unconditional: a command that failed half-way may have changed the
+        graph without ever reaching `save()`. The store is reopened lazily,
+        like the first time; a local-first store's lock is released first,
+        since reopening it would otherwise hit its own lock."""
+        if not self.in_transaction:
+            raise ValueError("no transaction is open (begin starts one)")
+        old = getattr(self._dag, "store", None)
+        self._backend = self._dag = self._view = None
+        self.in_transaction, self._dirty = False, False
+        close = getattr(old, "close", None)
+        if close is not None:
+            close()
+
+    def close(self):
+        """Release the window a partially resident graph reads through (a
+        `swarm:` one holds the writer lock until then)."""
+        close = getattr(self._window, "close", None)
+        self._window = None
+        if close is not None:
+            close()
+
+    def residency(self):
+        """How much of a record store this session read, for `--verbose`:
+        the records a partial write fetched, or the whole store hydrated;
+        None for a text store or one never opened."""
+        if self._dag is None or not hasattr(self._backend, "load_sparse"):
+            return None
+        fetches = getattr(self._dag, "fetches", None)
+        if fetches is not None:
+            return (f"fetched {fetches:,} records from {self.describe()} "
+                    f"(a partial write; --eager loads them all)")
+        return (f"loaded all {len(self._dag.nodes) - 1:,} records of "
+                f"{self.describe()}")
+
+    def settled(self, action):
+        """Refuse `action` while the transaction holds unsaved changes —
+        anything that reloads the graph would silently drop them."""
+        if self._dirty:
+            raise ValueError(f"cannot {action} with uncommitted changes "
+                             f"in this transaction (commit or rollback "
+                             f"first)")
+
     def describe(self):
         # Describing must not open the store (`odag set` runs with the node
         # down). An unloaded session describes the spec it would open —
@@ -1113,20 +1580,22 @@ def _namer(args, session, out):
     return lambda name: name
 
 
-def _print_names(names, args, session, out):
+def _print_names(names, args, session, out, total=None, fmt=None):
     """Print result names one per line under the display cap.
 
     Sorting is on canonical names — the identity — so the prefix a cap keeps
     is the same whether or not output is being rendered. The withheld count
     goes to stderr: it is a message to the person, never part of the answer,
-    so it cannot contaminate a pipe even when `-n` was asked for explicitly."""
-    fmt = _namer(args, session, out)
+    so it cannot contaminate a pipe even when `-n` was asked for explicitly.
+    `total` is the answer's size when `names` is already only the prefix
+    (an `iter_get` stream). `fmt` overrides the session's name formatter."""
+    fmt = fmt or _namer(args, session, out)
     names = sorted(names)
     limit = _want_limit(args, out)
     shown = names[:limit] if limit else names
     for name in shown:
         print(fmt(name), file=out)
-    withheld = len(names) - len(shown)
+    withheld = (len(names) if total is None else total) - len(shown)
     if withheld:
         print(f"odag: {withheld} more not shown "
               f"(-n 0 for all, or `odag count` for the total)",
@@ -1211,9 +1680,36 @@ def _query(categories, dag):
     return dag.get_any(queries)
 
 
+def _mapped_names(queries, session):
+    """The answer's names straight from a mapped `.odb` snapshot, or None
+    when the session has none that can answer (see `Session.snapshot`)."""
+    snapshot = session.snapshot()
+    if snapshot is None:
+        return None
+    with snapshot:
+        names = set()
+        for query in queries:
+            names |= snapshot.get(query)
+        return names
+
+
 def cmd_get(args, session, out):
-    result = _query(args.categories, session.view())
-    _print_names((item.name for item in result), args, session, out)
+    queries = _disjuncts(args.categories)
+    names = _mapped_names(queries, session)
+    if names is not None:
+        # A plain graph renders every name as itself; no need to load it.
+        _print_names(names, args, session, out, fmt=str)
+        return
+    if len(queries) > 1:
+        result = session.view().get_any(queries)
+        _print_names((item.name for item in result), args, session, out)
+        return
+    # A conjunction streams: only the names the cap shows are ever sorted
+    # and held, and the count of the rest is exact all the same.
+    stream = session.view().iter_get(queries[0],
+                                     limit=_want_limit(args, out) or None)
+    names = [item.name for item in stream]
+    _print_names(names, args, session, out, total=stream.total)
 
 
 def cmd_overlapping(args, session, out):
@@ -1236,7 +1732,23 @@ def cmd_count(args, session, out):
     # flag on `get`: it is the complete answer to "how big is this" — never
     # capped, never rendered — for exactly the cases where printing the answer
     # is what you are trying to avoid.
-    print(len(_query(args.categories, session.view())), file=out)
+    queries = _disjuncts(args.categories)
+    snapshot = session.snapshot()
+    if snapshot is not None:
+        with snapshot:
+            if len(queries) == 1:
+                print(snapshot.count_of(queries[0]), file=out)
+            else:
+                print(len(set().union(*(snapshot.get_ids(query)
+                                        for query in queries))), file=out)
+        return
+    dag = session.view()
+    if len(queries) == 1:
+        # `count` rather than len(get): a popcount when the view keeps cone
+        # bitmaps, no answer set built at all.
+        print(dag.count(queries[0]), file=out)
+    else:
+        print(len(dag.get_any(queries)), file=out)
 
 
 def cmd_below(args, session, out):
@@ -1249,6 +1761,73 @@ def cmd_below(args, session, out):
     return 0 if result else 1
 
 
+def cmd_explain(args, session, out):
+    # EXPLAIN ANALYZE: the query really runs (the counters are measured, not
+    # predicted), but only its plan and costs are printed — the answer is
+    # one `get` away. `--json` is the whole trace, for a slow-query log.
+    dag = session.view()
+    if args.below:
+        if len(args.categories) != 2:
+            raise ValueError("explain --below takes exactly SUB SUP")
+        trace = dag.explain_below(*args.categories)
+    else:
+        queries = _disjuncts(args.categories)
+        trace = (dag.explain(queries[0]) if len(queries) == 1
+                 else dag.explain_any(queries))
+    if args.json:
+        print(json.dumps(trace, indent=2, sort_keys=True), file=out)
+        return 0
+    if args.below:
+        labels = " (reachability labels)" if trace["labels"] else ""
+        print(f"below {' '.join(trace['terms'])}: {trace['operator']}"
+              f"{labels}", file=out)
+    elif "branches" in trace:
+        for skipped in trace["skipped"]:
+            print(f"skipped {' '.join(skipped)} (a superset of another "
+                  f"alternative)", file=out)
+        for number, branch in enumerate(trace["branches"], start=1):
+            print(f"alternative {number}:", file=out)
+            _print_plan(branch, out, indent="  ")
+    else:
+        _print_plan(trace, out)
+    print(f"result {str(trace['result']).lower()}, "
+          f"{_trace_costs(trace)}, {trace['seconds'] * 1000:.2f} ms", file=out)
+    return 0
+
+
+def _print_plan(trace, out, indent=""):
+    """One `explain` trace as text: how the terms were cut down, then the
+    operator and, for the planner, one line per step."""
+    terms = trace["terms"] or trace["query"]    # unresolved: as asked
+    print(f"{indent}terms {' '.join(terms) or '(none)'}", file=out)
+    for entry in trace["dropped"]:
+        print(f"{indent}dropped {entry['term']} (subsumed by "
+              f"{entry['subsumed_by']})", file=out)
+    note = f" ({trace['note']})" if "note" in trace else ""
+    print(f"{indent}operator {trace['operator']}{note}", file=out)
+    if trace["operator"] != "planner":
+        return
+    print(f"{indent}order " + ", ".join(f"{entry['term']} ({entry['count']})"
+                                        for entry in trace["order"]),
+          file=out)
+    print(f"{indent}planning: visits {trace['plan_visits']}", file=out)
+    for number, step in enumerate(trace["steps"], start=1):
+        versus = ("" if step["alternative"] is None
+                  else f" vs {step['alternative']}")
+        source = "" if step["input"] is None else f"{step['input']} -> "
+        print(f"{indent}{number}. {step['op']} {' '.join(step['terms'])}: "
+              f"estimate {step['estimate']}{versus}, {_trace_costs(step)}; "
+              f"result {source}{step['result']}", file=out)
+
+
+def _trace_costs(entry):
+    costs = [f"visits {entry['visits']}"]
+    for counter in ("fetches", "round_trips", "cone_hits"):
+        if counter in entry:           # lazy readers only
+            costs.append(f"{counter.replace('_', ' ')} {entry[counter]}")
+    return ", ".join(costs)
+
+
 # --------------------------------------------------------------------------- #
 # `odag swarm` — the on-ramp, because the wall is the node, not the pip install
 # --------------------------------------------------------------------------- #
@@ -1595,12 +2174,16 @@ def _cone_note(deleted, survivors, args, session, verb, out=None):
 
 
 def cmd_show(args, session, out):
-    _print_dag(session.view(), out, fmt=_namer(args, session, out))
+    _print_dag(session.view(whole=True), out, fmt=_namer(args, session, out))
 
 
 def cmd_list(args, session, out):
     # `list` is the empty query under a discoverable name — one code path, so
     # `odag list`, `odag get` and `odag get '*'` cannot drift apart.
+    names = _mapped_names([[]], session)
+    if names is not None:
+        _print_names(names, args, session, out, fmt=str)
+        return
     _print_names((item.name for item in session.view().get([])),
                  args, session, out)
 
@@ -1787,37 +2370,272 @@ def cmd_ingest(args, session, out):
     One commit at the end, not one per line: a projection rebuild is one
     state change, and per-line commits would flood an rs:/swarm: store's
     history with meaningless intermediates.
+
+    The stream is read in chunks of `_INGEST_CHUNK` lines, so what ingest
+    holds besides the graph is bounded by the chunk size, not the stream.
+    `--jobs N` decodes the chunks in N worker processes, a few chunks
+    ahead of the graph; the entries go to `put_many`, which files plain
+    names straight into the bulk buffer, so the graph changes are one
+    reduction pass at the end. The throughput (lines/s, peak RSS) is
+    reported on stderr.
+
+    Each ingest leaves a fingerprint of its stream and of the store it
+    left (`ontodag.fingerprints`). Re-ingesting the same source into a
+    store nobody wrote to since is then nothing at all when the stream is
+    unchanged, and a delta of the changed items when little changed — the
+    graph the full path builds, which `--full` forces. With `--drop` that
+    needs the graph left to be one the rebuild reproduces; when it is not,
+    no fingerprint is left.
     """
-    for name in args.drop or []:
-        if name in session.dag.nodes:
-            session.dag.remove_cone([name])
-    stream = (sys.stdin if args.file in (None, "-")
-              else open(args.file, encoding="utf-8"))
+    if args.jobs < 1:
+        raise ValueError("--jobs must be at least 1")
+    started = time.perf_counter()
+    drop = args.drop or []
+    source = ("-" if args.file in (None, "-")
+              else os.path.abspath(args.file))
+    ledger = session.fingerprints(source)
+    recorded = None
+    if ledger is not None and not args.full:
+        recorded = ledger.recorded(drop, session.stored_stamp())
+    run = _IngestRun(sys.stdin if source == "-"
+                     else open(args.file, encoding="utf-8"), args.jobs)
     try:
-        for lineno, line in enumerate(stream, 1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-                item = entry["item"]
-                supers = list(entry.get("supercategories", []))
-                if not isinstance(item, str) or \
-                        not all(isinstance(s, str) for s in supers):
-                    raise TypeError("names must be strings")
-                for sup in supers:
-                    if sup not in session.dag.nodes:
-                        session.dag.put(sup, [])
-                session.dag.put(item, supers)
-            except (ValueError, KeyError, TypeError) as exc:
-                raise ValueError(
-                    f"line {lineno}: not a projection entry "
-                    f'(need {{"item": NAME, "supercategories": [NAME, ...]}}'
-                    f"): {exc}") from exc
+        outcome = None
+        if recorded is None and ledger is not None and drop \
+                and not run.stream.seekable():
+            run.hash_ahead()    # spooled, for `settled` to read again
+        if recorded is not None:
+            run.hash_ahead()
+            if run.sha.hexdigest() == recorded["stream"]:
+                print("odag: ingest: the stream is unchanged since the last "
+                      "ingest into this store; nothing to do", file=_err())
+                return
+            outcome = run.delta(session, drop, ledger, recorded)
+        if outcome is None:
+            run.full(session, drop)
+        if ledger is not None and drop and not run.settled(session.dag, drop):
+            # A rebuild would not leave this graph as it is, so the next
+            # ingest has to be one: no fingerprint to skip it with.
+            ledger = None
     finally:
-        if stream is not sys.stdin:
-            stream.close()
+        if run.stream is not sys.stdin:
+            run.stream.close()
     session.save()
+    if ledger is not None:
+        try:
+            ledger.store(drop, session.stored_stamp(), run.sha.hexdigest(),
+                         run.categories, run.digests)
+        except OSError:
+            pass            # no fingerprint: the next ingest runs in full
+    elapsed = time.perf_counter() - started
+    report = (f"odag: ingested {run.lines:,} lines in {elapsed:.1f} s "
+              f"({run.lines / max(elapsed, 1e-9):,.0f} lines/s)")
+    peak = _peak_rss()
+    if peak is not None:
+        report += f", peak RSS {peak / 2**20:,.0f} MiB"
+    if outcome is not None:
+        report += f"; {outcome:,} changed items applied as a delta"
+    print(report, file=_err())
+
+
+class _IngestRun:
+    """One `odag ingest` stream: its entries, decoded in order, with the
+    stream hashed and each item's digest taken on the way."""
+
+    def __init__(self, stream, jobs):
+        self.stream, self.jobs = stream, jobs
+        self.sha, self.hashed = hashlib.sha256(), False
+        self.digests, self.categories = {}, set()
+        self.lines = 0
+        self.start = stream.tell() if stream.seekable() else None
+        self.at = None      # the line of the entry being applied
+        self.decoded = None     # the entries, when read ahead for a delta
+
+    def hash_ahead(self):
+        """Hash the whole stream before any of it is applied, so that an
+        unchanged one costs no more; stdin is spooled to disk for it."""
+        stream = self.stream
+        spool = None
+        if not stream.seekable():
+            spool = tempfile.TemporaryFile("w+", encoding="utf-8")
+        start = 0 if spool is not None else stream.tell()
+        while True:
+            block = stream.read(1 << 20)
+            if not block:
+                break
+            self.sha.update(block.encode("utf-8"))
+            if spool is not None:
+                spool.write(block)
+        if spool is not None:
+            self.stream = stream = spool
+        stream.seek(start)
+        self.start, self.hashed = start, True
+
+    def _read(self):
+        for line in self.stream:
+            if not self.hashed:
+                self.sha.update(line.encode("utf-8"))
+            yield line
+
+    def entries(self):
+        """`(line number, item, supercategories)` per entry, in order."""
+        for decoded, count in _decoded_chunks(self._read(), self.jobs):
+            for entry in decoded:
+                _fingerprints.add_line(self.digests, entry[1], entry[2])
+                self.categories.update(entry[2])
+                yield entry
+            # A decode error names its own line.
+            self.lines, self.at = self.lines + count, None
+
+    def _put(self, dag, entries):
+        def pairs():
+            for lineno, item, supers in entries:
+                self.at = lineno
+                yield item, supers
+            # A failure after the last entry (a cycle, at the final
+            # reduction) belongs to no line.
+            self.at = None
+
+        try:
+            dag.put_many(pairs(), scaffold=True)
+        except ValueError as exc:
+            if self.at is None:
+                raise
+            raise ValueError(f"line {self.at}: {exc}") from exc
+
+    def full(self, session, drop):
+        for name in drop:
+            if name in session.dag.nodes:
+                session.dag.remove_cone([name])
+        self._put(session.dag, self.entries() if self.decoded is None
+                  else iter(self.decoded))
+
+    def settled(self, dag, drop):
+        """Whether ingesting the stream again in full, `--drop` and all,
+        would leave `dag` as it is (`fingerprints.rebuilds_to_itself`).
+        The stream is read again for the items the cone-delete cuts,
+        unless a delta kept it decoded."""
+        lost, deleted = _fingerprints.cut(dag, drop)
+        if not lost and not deleted:
+            return True
+        if self.decoded is not None:
+            entries = self.decoded
+        elif self.start is None:
+            return False
+        else:
+            self.stream.seek(self.start)
+            entries = (entry for decoded, _ in
+                       _decoded_chunks(self.stream, self.jobs)
+                       for entry in decoded)
+        supers_of = {}
+        for _, item, supers in entries:
+            if item in lost:
+                supers_of.setdefault(item, set()).update(supers)
+        return _fingerprints.rebuilds_to_itself(dag, lost, deleted, supers_of,
+                                                self.categories)
+
+    def delta(self, session, drop, ledger, recorded):
+        """Apply only what changed since `recorded`, the fingerprint of the
+        ingest that left the store as it is; the number of changed items,
+        or None, with nothing applied, when it cannot be done as a delta."""
+        previous = ledger.digests(recorded)
+        if previous is None:
+            return None
+        entries = self.decoded = list(self.entries())
+        moved = _fingerprints.changed(previous, self.digests)
+        dag = session.dag
+        if not drop:
+            # Idempotence: the unchanged lines are asserted already.
+            self._put(dag, (entry for entry in entries if entry[1] in moved))
+            return len(moved)
+        supers_of = {}
+        for _, item, supers in entries:
+            if item in moved:
+                supers_of.setdefault(item, {}).update(dict.fromkeys(supers))
+        if _fingerprints.refile(
+                dag, moved, {item: list(supers)
+                             for item, supers in supers_of.items()},
+                drop, self.categories, set(recorded["supers"])):
+            return len(moved)
+        return None
+
+
+# Lines per chunk of an ingested stream: the unit read, decoded (in a
+# worker, with --jobs) and handed to the graph.
+_INGEST_CHUNK = 20_000
+
+
+def _decode_projection(lines, first):
+    """One chunk of a projection stream, decoded: `(line number, item,
+    supercategories)` per entry, or a ValueError naming the first bad line
+    (`first` is the chunk's first line number). Top-level so that worker
+    processes can run it."""
+    entries = []
+    for lineno, line in enumerate(lines, first):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+            item = entry["item"]
+            supers = list(entry.get("supercategories", []))
+            if not isinstance(item, str) or \
+                    not all(isinstance(s, str) for s in supers):
+                raise TypeError("names must be strings")
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(
+                f"line {lineno}: not a projection entry "
+                f'(need {{"item": NAME, "supercategories": [NAME, ...]}}'
+                f"): {exc}") from exc
+        entries.append((lineno, item, supers))
+    return entries
+
+
+def _decoded_chunks(stream, jobs):
+    """Yield `(entries, line count)` per chunk of `stream`, in order. With
+    `jobs` > 1 the chunks are decoded in that many worker processes, at
+    most one chunk per worker plus one ahead of the consumer, so memory
+    stays bounded however long the stream is."""
+    def chunks():
+        first = 1
+        while True:
+            lines = list(itertools.islice(stream, _INGEST_CHUNK))
+            if not lines:
+                return
+            yield lines, first
+            first += len(lines)
+
+    if jobs == 1:
+        for lines, first in chunks():
+            yield _decode_projection(lines, first), len(lines)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    pending = collections.deque()
+    with ProcessPoolExecutor(jobs) as pool:
+        try:
+            for lines, first in chunks():
+                pending.append((pool.submit(_decode_projection, lines, first),
+                                len(lines)))
+                if len(pending) > jobs:
+                    future, count = pending.popleft()
+                    yield future.result(), count
+            while pending:
+                future, count = pending.popleft()
+                yield future.result(), count
+        finally:
+            for future, _ in pending:
+                future.cancel()
+
+
+def _peak_rss():
+    """This process's peak resident set size in bytes, or None where the
+    platform does not say (no `resource` module)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
 
 
 def cmd_excerpt(args, session, out):
@@ -1961,8 +2779,9 @@ def _describe_move(session, store, before, after):
         return ""
     try:
         from recordstore import RecordStore
-        old = EagerOntoDAG(RecordStore.at(before, blobs))
-        new = EagerOntoDAG(RecordStore.at(after, blobs))
+        snapshots = _snapshot_cache(session.backend)
+        old = EagerOntoDAG(RecordStore.at(before, blobs), snapshots=snapshots)
+        new = EagerOntoDAG(RecordStore.at(after, blobs), snapshots=snapshots)
     except Exception:                       # unreadable state: say nothing
         return ""
     diff = _compare.compare(old, new)
@@ -1989,6 +2808,7 @@ def _step_history(args, session, out, direction):
     Local time travel, not a retraction others honour.
     """
     word = "undo" if direction < 0 else "redo"
+    session.settled(word)
     store, close = _open_history(session)
     try:
         before = store.root
@@ -2083,6 +2903,10 @@ def cmd_status(args, session, out):
         # A file store: no history, but the rest is still worth saying.
         print(f"items = {len(session.dag.get([]))}", file=out)
         print("history = none (a plain file keeps one state)", file=out)
+        pending = getattr(session.backend, "journaled", lambda: 0)()
+        if pending:
+            print(f"journal = {pending} bytes not yet compacted "
+                  f"(odag compact)", file=out)
         return 0
     try:
         status = store.status()
@@ -2096,6 +2920,25 @@ def cmd_status(args, session, out):
     return 0
 
 
+def cmd_compact(args, session, out):
+    """Fold a native store's journal into its file (ontodag.journal)."""
+    session.settled("compact")
+    backend = session.backend
+    if not hasattr(backend, "journaled") \
+            or _detect_format(backend.path) != "native":
+        raise ValueError(
+            f"{session.describe()} keeps no journal: only a native .od file "
+            f"does, so there is nothing to compact")
+    pending = backend.journaled()
+    if not pending:
+        print(f"nothing to compact: {backend.path} has no journal", file=out)
+        return 0
+    backend.compact(session.dag)
+    print(f"compacted {pending} bytes of journal into {backend.path}",
+          file=out)
+    return 0
+
+
 def _image_base(spec):
     """Default output name for `visualize`: named after the store.
 
@@ -2130,7 +2973,7 @@ def cmd_visualize(args, session, out):
     """
     from ontodag.viz import OntoDAGVisualizer, query_picture
     base = args.out or _image_base(session.describe())
-    dag = session.view()          # a picture is discarded: draw the join
+    dag = session.view(whole=True)   # a picture is discarded: draw the join
     queries = _disjuncts(args.categories)
     if any(queries):
         dag = query_picture(dag, queries)
@@ -2166,6 +3009,33 @@ def cmd_web(args, session, out):
         print(file=_err())
 
 
+def cmd_serve(args, session, out):
+    """Keep stores loaded for later `odag` commands (ontodag.daemon).
+
+    Blocks until interrupted, like `web`. The daemon serves every store
+    the forwarded commands name, not only this session's."""
+    from ontodag import daemon
+    path = daemon.socket_path()
+    server = daemon.listen(path)
+    print(f"odag: serving odag commands at {path}", file=_err())
+    resident = daemon.Daemon()
+    try:
+        # A `kill` stops it as Ctrl-C does, socket file removed.
+        import signal
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+    except ValueError:
+        pass                    # not the main thread: Ctrl-C only
+    try:
+        daemon.serve_forever(server, resident)
+    except KeyboardInterrupt:
+        print(file=_err())
+    finally:
+        server.close()
+        resident.close()
+        if os.path.exists(path):
+            os.remove(path)
+
+
 def _effective_setting(session, key):
     """The value currently in effect, by the settings table's one rule.
 
@@ -2266,6 +3136,7 @@ def cmd_set(args, session, out):
         return
     if args.key == "store":
         spec = _normalize_spec(args.value)
+        session.settled("switch stores")
         cfg = _read_config()
         cfg["store"] = spec
         _write_config(cfg)
@@ -2284,6 +3155,8 @@ def cmd_set(args, session, out):
         # only fails later is a setting you debug in the wrong place.
         if args.key == "limit":
             _want_limit(argparse.Namespace(limit=args.value), out)
+        if args.key == "overlay_mode":
+            _federated(args.value)
         if args.key == "overlays":
             # Each spec must at least parse as a backend (no I/O here —
             # backends construct lazily). A typo'd overlay would otherwise
@@ -2321,6 +3194,11 @@ Commands:
                         works; `?` is a synonym at the interactive prompt.
                         Works on typed values from the names alone:
                         below 'weight(3kg)' 'weight(..5kg)' -> true
+  explain [CAT...]      run that query and show how: terms dropped as
+                        subsumed, cone order, each walk/probe step with its
+                        estimate and the nodes (and, lazily, fetches) it
+                        cost. --below SUB SUP explains `below`; --json
+                        prints the whole trace
   move ITEM... --to CAT [--from CAT]
                         reclassify: file the items under --to and retract
                         their old categories. --from picks which one to
@@ -2349,8 +3227,12 @@ Commands:
                         {"item": N, "supercategories": [...]}) from FILE or
                         stdin — the machine-layer wire format; idempotent,
                         one commit. --drop NODE cone-deletes NODE first
-                        (full-rebuild semantics). Usually into a dedicated
-                        projection store read via the `overlays` setting
+                        (full-rebuild semantics); --jobs N decodes in N
+                        worker processes; reports lines/s and peak RSS.
+                        An unchanged stream is skipped, a changed one
+                        applied as a delta; --full applies all of it.
+                        Usually into a dedicated projection store read
+                        via the `overlays` setting
   excerpt FILE [CAT...] write just that query's answer to FILE, with the
                         edges among the answers kept — an importable cut of
                         the store (`export` is the whole thing).
@@ -2394,6 +3276,12 @@ Commands:
                         keeps history: rs:PATH or swarm:NAME
   status                where the store is: root, item count, and how much
                         can be undone or redone
+  serve                 keep stores loaded between commands: while it runs,
+                        every odag command (not a piped stream) is handed
+                        to it and skips loading the store (Ctrl-C stops it)
+  compact               fold a native store's journal into its .od file
+                        (saves append to STORE.journal; this happens by
+                        itself once the journal is big or old enough)
   undo / redo           step back to the previous state, or forward again.
                         Nothing is destroyed — the state you left is still
                         in `history`. --dry-run says what it would do.
@@ -2434,6 +3322,12 @@ round-trips and `odag get ... | wc -l` counts right. Override with
 --render / --raw and -n N (-n 0 for all). `canon TERM` shows the exact
 stored form of any spelling. See docs/plans/SURFACE_LAYER.md.
 
+A piped stream saves after every mutating line unless told otherwise.
+`begin` ... `commit` in the stream defers the saves to the commit, and
+`rollback` drops what the transaction did; a failing line inside one rolls
+it back and skips the rest up to its commit. `odag --batch < cmds` makes
+the whole stream one transaction.
+
 Settings: store, bee_api, bee_batch, bee_signer, render, limit. Each can be
 given four ways, and the first that is present wins:
 
@@ -2470,6 +3364,14 @@ Options (before the command; they apply to every command in a batch):
   -f, --store PATH      use PATH (or swarm:NAME) as the store for this run
   -n, --limit N         show at most N results (0 for all)
   --render, --raw       force friendly or canonical names
+  --batch               save a piped stream once, at its end; a failing
+                        line rolls the whole stream back (exit 1)
+  --batch-every N       as --batch, but also save every N lines
+  --eager               load an rs:/swarm: store whole even for a one-shot
+                        put/remove/move, which otherwise fetches only the
+                        records it touches
+  --verbose             report how many records a command read from an
+                        rs:/swarm: store
   --bee-api URL         Bee node endpoint, for swarm: stores
   --bee-batch ID        postage batch to pay for Swarm writes
   --bee-signer KEY      publish the latest root to a signed Swarm feed
@@ -2568,6 +3470,16 @@ def build_parser():
     p.add_argument("sup")
     p.set_defaults(func=cmd_below, stream_output=True)
 
+    p = sub.add_parser("explain", add_help=True,
+                       help="run a query and show its plan and costs")
+    p.add_argument("categories", nargs="*")
+    p.add_argument("--below", action="store_true",
+                   help="explain `below SUB SUP` instead")
+    p.add_argument("--json", action="store_true",
+                   help="print the whole trace as JSON")
+    p.add_argument("-o", "--output")
+    p.set_defaults(func=cmd_explain, stream_output=True)
+
     p = sub.add_parser("swarm", add_help=True,
                        help="check whether this machine can talk to Swarm, "
                             "and say what to fix")
@@ -2593,6 +3505,15 @@ def build_parser():
     p.add_argument("-o", "--output")
     p.set_defaults(func=cmd_status, stream_output=True)
 
+    p = sub.add_parser("serve", add_help=True,
+                       help="keep stores loaded; later odag commands run "
+                            "in this process")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("compact", add_help=True,
+                       help="fold a native store's journal into its file")
+    p.set_defaults(func=cmd_compact, stream_output=True)
+
     p = sub.add_parser("undo", add_help=True,
                        help="step back to the previous state")
     p.add_argument("--dry-run", action="store_true",
@@ -2692,6 +3613,12 @@ def build_parser():
     p.add_argument("--drop", action="append", metavar="NODE",
                    help="cone-delete NODE before ingesting (full-rebuild "
                         "semantics); repeatable")
+    p.add_argument("--jobs", type=int, default=1, metavar="N",
+                   help="decode the stream in N worker processes "
+                        "(default 1: in this process)")
+    p.add_argument("--full", action="store_true",
+                   help="ignore the fingerprint of the last ingest and "
+                        "apply the whole stream")
     p.set_defaults(func=cmd_ingest)
 
     p = sub.add_parser("export", add_help=True, help="write the store to a file")
@@ -2781,9 +3708,13 @@ def dispatch(argv, session, out=None, err=None):
 
 
 def _dispatch(argv, session):
+    # `failed` is not the exit code: `below` answers "no" with 1, and a
+    # transaction must not roll back over an answer.
+    session.failed = False
     try:
         args = PARSER.parse_args(argv)
     except SystemExit as exc:  # argparse handled --help or a usage error
+        session.failed = bool(exc.code)
         return exc.code or 0
 
     out = _out()
@@ -2803,6 +3734,7 @@ def _dispatch(argv, session):
         # viz extra" is an instruction, and `odag visualize` on a base
         # install used to bury it under twenty lines of stack.
         print(f"odag: {exc}", file=_err())
+        session.failed = True
         return 1
     finally:
         if handle is not None:
@@ -2812,9 +3744,38 @@ def _dispatch(argv, session):
 # Interactive and batch (stdin) modes
 # --------------------------------------------------------------------------- #
 
-def _run_stream(session, stream, interactive):
+def _settle(session, write):
+    """Run a transaction's deferred write; on failure say so, and roll back
+    so the session is not left holding what the store refused."""
+    try:
+        write()
+        return True
+    except (ValueError, OSError) as exc:
+        print(f"odag: {exc}", file=_err())
+        if session.in_transaction:
+            session.rollback()
+        return False
+
+
+def _run_stream(session, stream, interactive, batch=False, every=None):
+    """Dispatch a stream of command lines; return the exit code.
+
+    `begin`/`commit`/`rollback` are words of the stream language rather than
+    commands: a transaction only means something across lines. A line that
+    fails inside one rolls it back, and the rest up to its `commit` or
+    `rollback` is skipped — the lines after a failure were written assuming
+    it succeeded. `batch` wraps the whole stream in one transaction,
+    committed at the end; there a failing line rolls back and stops the
+    stream (exit 1). `every` checkpoints an open transaction each N lines,
+    so a long stream that fails loses at most N lines of work.
+    """
     if interactive:
         print(f"Ontodag {__version__} - type help for help")
+    if batch:
+        session.begin()
+    failed_at = None            # line number of the failure being skipped
+    run = 0                     # lines dispatched since the last checkpoint
+    number = 0
     while True:
         if interactive:
             try:
@@ -2826,6 +3787,7 @@ def _run_stream(session, stream, interactive):
             line = stream.readline()
             if not line:
                 break
+        number += 1
         line = line.strip()
         if not line or line.startswith("#"):
             continue
@@ -2833,16 +3795,76 @@ def _run_stream(session, stream, interactive):
             tokens = shlex.split(line)
         except ValueError as exc:
             print(f"odag: {exc}", file=_err())
+            if batch:
+                session.rollback()
+                print(f"odag: line {number} failed; the batch was rolled "
+                      f"back to its last save", file=_err())
+                return 1
             continue
         if tokens[0] in ("quit", "exit"):
             break
+        if tokens[0] in ("begin", "commit", "rollback") and len(tokens) == 1:
+            word, run = tokens[0], 0
+            if batch:
+                print(f"odag: `{word}` has no effect under --batch (the "
+                      f"whole stream is one transaction)", file=_err())
+            elif failed_at is not None and word != "begin":
+                print(f"odag: the transaction failed at line {failed_at} "
+                      f"and was rolled back; nothing was committed",
+                      file=_err())
+                failed_at = None
+            else:
+                try:
+                    getattr(session, word)()
+                except (ValueError, OSError) as exc:
+                    print(f"odag: {exc}", file=_err())
+            continue
+        if failed_at is not None:
+            print(f"odag: skipped (the transaction failed at line "
+                  f"{failed_at}): {line}", file=_err())
+            continue
         dispatch(tokens, session)
+        if session.failed and session.in_transaction:
+            session.rollback()
+            if batch:
+                print(f"odag: line {number} failed; the batch was rolled "
+                      f"back to its last save", file=_err())
+                return 1
+            failed_at = number
+            continue
+        run += 1
+        if every and session.in_transaction and run >= every:
+            if not _settle(session, session.checkpoint):
+                return 1
+            run = 0
+    if session.in_transaction:
+        if batch:
+            return 0 if _settle(session, session.commit) else 1
+        session.rollback()
+        print("odag: the stream ended inside a transaction; it was rolled "
+              "back (end it with commit)", file=_err())
+        return 1
+    return 0
 
 
 # --------------------------------------------------------------------------- #
 # Entry point
 # --------------------------------------------------------------------------- #
 
+# One-shot commands whose cost on an `rs:`/`swarm:` store is what they name:
+# each reads and changes the records around the names it is given, so a
+# `SparseOntoDAG` runs it on those instead of hydrating every record first.
+# Not `move --dry-run`, which rehearses the move on a copy of the graph.
+_PARTIAL_WRITES = ("put", "remove", "move")
+
+
+def _writes_partially(argv):
+    if _OVERRIDES.get("eager") or argv[0] not in _PARTIAL_WRITES:
+        return False
+    # argparse takes any unambiguous prefix of --dry-run.
+    return not (argv[0] == "move"
+                and any(arg.startswith("--d") for arg in argv[1:]))
+
 def main(argv=None):
     _force_utf8_streams()
     argv = list(sys.argv[1:] if argv is None else argv)
@@ -2853,6 +3875,7 @@ def main(argv=None):
     _OVERRIDES.clear()
     valued = {"-f": "store", "--store": "store", "--file": "store",
               "--overlay": "overlays", "--overlays": "overlays",
+              "--overlay-mode": "overlay_mode",
               "--store-key": "store_key",
               "--bee-api": "bee_api", "--bee-batch": "bee_batch",
               "--bee-signer": "bee_signer", "-n": "limit", "--limit": "limit",
@@ -2861,8 +3884,16 @@ def main(argv=None):
               # other pre-command flags are, since both apply to every command
               # in a batch.
               "-m": "message", "--message": "message",
-              "--as-of": "as_of"}
-    while argv and (argv[0] in valued or argv[0] in ("--raw", "--render")):
+              "--as-of": "as_of",
+              # Stdin-only: how a piped stream saves (one commit per stream,
+              # or per N lines), not a setting of any store.
+              "--batch-every": "batch_every"}
+    flags = ("--raw", "--render", "--batch", "--eager", "--verbose")
+    while argv and (argv[0] in valued or argv[0] in flags):
+        if argv[0] in ("--batch", "--eager", "--verbose"):
+            _OVERRIDES[argv[0][2:]] = "on"
+            argv = argv[1:]
+            continue
         if argv[0] in ("--raw", "--render"):
             _OVERRIDES["render"] = "on" if argv[0] == "--render" else "off"
             argv = argv[1:]
@@ -2873,6 +3904,14 @@ def main(argv=None):
         _OVERRIDES[valued[argv[0]]] = argv[1]
         argv = argv[2:]
 
+    every = _OVERRIDES.get("batch_every")
+    if every is not None:
+        if not every.isdigit() or int(every) < 1:
+            print(f"odag: --batch-every wants a positive number of lines, "
+                  f"not {every!r}", file=_err())
+            sys.exit(2)
+        every = int(every)
+
     if argv and argv[0] in ("-V", "--version"):
         print(__version__)
         sys.exit(0)
@@ -2880,16 +3919,35 @@ def main(argv=None):
         sys.stdout.write(HELP_TEXT)
         sys.exit(0)
 
+    # A running `odag serve` already holds the store loaded: hand the
+    # command to it (ontodag.daemon). Without one, run it here.
+    if argv:
+        from ontodag import daemon
+        code = daemon.forward(argv, _OVERRIDES)
+        if code is not None:
+            sys.exit(code)
+
     # Constructing a Session does no I/O: the store opens lazily, on the
     # first command that touches it, inside dispatch()'s error contract —
     # so `odag help` works even when the configured store's node is down.
     session = Session(_resolve_store())
 
     if not argv:
-        _run_stream(session, sys.stdin, interactive=sys.stdin.isatty())
-        sys.exit(0)
+        sys.exit(_run_stream(session, sys.stdin,
+                             interactive=sys.stdin.isatty(),
+                             batch=bool(_OVERRIDES.get("batch") or every),
+                             every=every))
 
-    sys.exit(dispatch(argv, session))
+    session.partial = _writes_partially(argv)
+    try:
+        code = dispatch(argv, session)
+        if _OVERRIDES.get("verbose"):
+            residency = session.residency()
+            if residency is not None:
+                print(f"odag: {residency}", file=_err())
+    finally:
+        session.close()
+    sys.exit(code)
 
 
 if __name__ == "__main__":
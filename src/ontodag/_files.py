@@ -0,0 +1,31 @@
+"""Rewriting a store file whole — atomically, and as the file it was.
+
+A store is saved by writing a temporary file beside it and renaming it
+over the old one, so a reader or a crash sees the old file or the new,
+never half of one. The rename swaps in a new inode, which loses two
+things unless they are carried over: a path that is a symlink would
+become a regular file (its target left stale), and the file's mode
+would become the umask's (a 0600 store turning world-readable). One
+helper for every format that saves this way, so neither is forgotten.
+"""
+
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def replacing(path):
+    """Yield a temporary path to write the new file to; on a clean exit it
+    replaces the file `path` names (through any symlink), with that
+    file's permissions, and on an exception it is removed."""
+    target = os.path.realpath(path)
+    temporary = f"{target}.tmp{os.getpid()}"
+    try:
+        yield temporary
+        if os.path.exists(target):
+            os.chmod(temporary, os.stat(target).st_mode & 0o7777)
+        os.replace(temporary, target)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
@@ -0,0 +1,178 @@
+"""Cone bitmaps — every node's descendant cone as a bitset, kept current.
+
+The in-memory half of SEMANTIC_CODES.md §3, parked in ROADMAP.md until a hot
+query workload showed up. `OntoDAG.get` answers a conjunction by walking
+term cones into sets of Items and intersecting them; with this index each
+cone is one Python `int` over interned node ids, so a conjunction is a few
+word-parallel ANDs running in C, and `count` is a popcount that never
+touches an Item at all. No dependency: an `int` of 100k bits is 12.5 KB and
+`&` is linear in words (`pyroaring` would be an upgrade, not a requirement).
+
+Opt-in and resident-only: `OntoDAG.enable_cone_bitmaps()` builds it from the
+current graph and registers it on the DAG's index hooks, after which every
+structural change routed through `add_node`/`add_edge`/`remove_edge`/
+`_forget` keeps it exact. Code that wires `neighbors` directly (the copy
+routines, `EagerOntoDAG._hydrate`) does so only on graphs that have no index
+yet; anything else must call `rebuild()`.
+
+Maintenance mirrors the count rules in dag.py:
+
+- **add** ORs `{child} ∪ cone(child)` into the parent and up its ancestors,
+  pruning at the first ancestor that already holds all of it (everything
+  above that one holds it too — the `_plan_add` argument).
+- **remove** cannot subtract (a bit may still be reachable another way), so
+  it marks the parent *stale*; the next read recomputes the stale nodes and
+  their ancestors once, children before parents. Contraction and cone
+  removal drop many edges in a row, so deferring keeps them one recompute.
+
+Cones here are ASSERTED. The combined order adds computed hops between
+parametric values (DIMENSIONS.md §5), which no bitset of present nodes can
+follow without re-deriving them; `covers()` therefore refuses any term whose
+cone holds a term-shaped name, and the planner falls back to its walk/probe
+operators for those queries. Ordinary categories are what this is for.
+"""
+
+from ontodag import dimensions as _dims
+
+
+class ConeBitmaps:
+    def __init__(self, dag):
+        self._dag = dag
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute every cone from the graph as it stands."""
+        dag = self._dag
+        self._ids = {}
+        self._names = []
+        self._free = []          # ids ready for reuse
+        self._released = []      # ids of forgotten nodes, reusable after a flush
+        self._cones = {}
+        self._stale = set()
+        self._shaped = 0         # ids of term-shaped names (see covers)
+        for name in sorted(dag.nodes):
+            self.node_added(dag.nodes[name])
+        for node in reversed(dag.topological_sort()):     # children first
+            self._cones[node.name] = self._union_below(node)
+
+    # ------------------------------------------------------------ DAG hooks
+
+    def node_added(self, node):
+        name = node.name
+        if name in self._ids:
+            return
+        index = self._free.pop() if self._free else len(self._names)
+        if index == len(self._names):
+            self._names.append(name)
+        else:
+            self._names[index] = name
+        self._ids[name] = index
+        self._cones[name] = 0
+        if _dims.split_term(name) is not None:
+            self._shaped |= 1 << index
+
+    def node_forgotten(self, node):
+        index = self._ids.pop(node.name)
+        del self._cones[node.name]
+        self._names[index] = None
+        self._shaped &= ~(1 << index)
+        self._stale.discard(node.name)
+        # Not reusable yet: its bit may still sit in stale ancestors' cones
+        # until the next flush recomputes them.
+        self._released.append(index)
+
+    def edge_added(self, parent, child):
+        cones = self._cones
+        gained = (1 << self._ids[child.name]) | cones[child.name]
+        live_parents = self._dag._live_parents
+        frontier = [parent]
+        while frontier:
+            node = frontier.pop()
+            cone = cones[node.name]
+            if cone & gained == gained:
+                continue          # holds it already, and so does all above
+            cones[node.name] = cone | gained
+            frontier.extend(live_parents(node))
+
+    def edge_removed(self, parent, child):
+        self._stale.add(parent.name)
+
+    # -------------------------------------------------------------- reading
+
+    def _union_below(self, node):
+        ids, cones = self._ids, self._cones
+        cone = 0
+        for child in node.neighbors:
+            cone |= (1 << ids[child.name]) | cones[child.name]
+        return cone
+
+    def _flush(self):
+        if self._stale:
+            dag = self._dag
+            live_parents = dag._live_parents
+            # The stale nodes and everything above them, recomputed children
+            # first (Kahn over the affected subgraph).
+            affected = set()
+            stack = [dag.nodes[name] for name in self._stale]
+            while stack:
+                node = stack.pop()
+                if node.name not in affected:
+                    affected.add(node.name)
+                    stack.extend(live_parents(node))
+            pending = {name: sum(1 for child in dag.nodes[name].neighbors
+                                 if child.name in affected)
+                       for name in affected}
+            ready = [name for name, waiting in pending.items() if not waiting]
+            while ready:
+                node = dag.nodes[ready.pop()]
+                self._cones[node.name] = self._union_below(node)
+                for parent in live_parents(node):
+                    if parent.name in pending:
+                        pending[parent.name] -= 1
+                        if not pending[parent.name]:
+                            ready.append(parent.name)
+            self._stale.clear()
+        if self._released:
+            self._free.extend(self._released)
+            self._released.clear()
+
+    def cone(self, name):
+        """The (strict, asserted) descendant cone of `name` as a bitset."""
+        self._flush()
+        return self._cones[name]
+
+    def covers(self, names):
+        """True when every cone involved is free of term-shaped names, so the
+        asserted cone IS the combined-order cone and the bitset answer is
+        exact."""
+        self._flush()
+        shaped = self._shaped
+        if not shaped:
+            return True
+        ids, cones = self._ids, self._cones
+        return not any(((1 << ids[name]) | cones[name]) & shaped
+                       for name in names)
+
+    def intersect(self, names):
+        """AND of the named cones."""
+        self._flush()
+        cones = self._cones
+        names = iter(names)
+        result = cones[next(names)]
+        for name in names:
+            if not result:
+                break
+            result &= cones[name]
+        return result
+
+    def names(self, bits):
+        """The node names whose ids are set in `bits`."""
+        names = self._names
+        # bin() scans in C; only the set positions cost a Python step.
+        digits = bin(bits)[:1:-1]
+        position = digits.find("1")
+        found = []
+        while position != -1:
+            found.append(names[position])
+            position = digits.find("1", position + 1)
+        return found
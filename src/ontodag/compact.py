@@ -0,0 +1,556 @@
+"""CompactOntoDAG — the same graph, stored as integers instead of objects.
+
+`OntoDAG` keeps every node as an `Item`: a name, a `parents` set, an
+`_EdgeSet` of children, a metadata dict and a count, all hashed by name
+string. That is the right shape for a graph you edit interactively and for
+the dimension machinery, which walks names; it is the wrong shape for a
+projection store with 10^6 memberships, where the per-node overhead of two
+sets and a dict runs to gigabytes and every traversal step hashes a string.
+
+This module is the other end of that trade. Names are interned once to
+dense integer ids; adjacency is kept in both directions in compressed-
+sparse-row form — one `array` of offsets and one of targets per direction,
+each row sorted — so a node costs a few machine words plus its name.
+Writes do not rebuild the arrays: they land in an *overflow delta* (per-row
+sets of added and dropped targets) that every read consults, and the delta
+is folded back into fresh arrays once it grows past a fraction of the base
+(`compact()`), which keeps writes amortized O(1) on top of the same
+reduction and count work `OntoDAG` does.
+
+**Same semantics, same answers.** `put`, `remove`, `merge`, `get`,
+`get_any`, `is_below` and `excerpt` are ports of the `OntoDAG` methods of
+the same names — acyclicity, the complete redundancy rectangle of
+`_remove_unneeded_edges`, descendant counts maintained by delta, and the
+walk/probe query planner — run over ids. tests/test_compact.py holds them to
+`OntoDAG` as the oracle, edge set and counts included.
+
+Two deliberate differences:
+
+- **Answers are names.** `get` and `get_any` return sets of name strings,
+  not `Item`s: materializing an object per answer is exactly the cost this
+  class exists to avoid, and names are the identity at every boundary
+  anyway. `excerpt` still returns an `OntoDAG` — it is an artifact meant to
+  be merged or imported, and those take one.
+- **Dimension-free.** Parametric terms (`weight(3kg)`) are opaque names
+  here: no computed order, no virtual terms, no canonicalization. A store
+  that declares dimensions needs `OntoDAG`, whose traversals interleave the
+  computed hops; converting one with `from_dag` keeps its asserted edges
+  but not that interpretation.
+
+`experiments/compact_scale.py` measures memory per node and query
+throughput against `OntoDAG` at 10^4-10^6 items.
+"""
+
+from array import array
+from bisect import bisect_left
+
+from ontodag.dag import Item, OntoDAG, _name_of
+
+ROOT = "*"
+
+
+class CompactOntoDAG:
+    # Same role and value as OntoDAG._PROBE_COST_ESTIMATE: a stand-in for the
+    # typical ancestor-cone size, used only to choose between two exact
+    # operators in get().
+    _PROBE_COST_ESTIMATE = 16
+
+    # The delta is folded into the base arrays once it holds this many edge
+    # changes, or half the base edge count, whichever is larger — rebuilding
+    # costs O(nodes + edges), so tying the trigger to the base size keeps the
+    # amortized cost per write constant.
+    _COMPACT_MIN = 4096
+
+    def __init__(self):
+        self._ids = {ROOT: 0}          # name -> id
+        self._names = [ROOT]           # id -> name (None once forgotten)
+        self._counts = array("q", [0])
+        self._metadata = {}            # id -> dict, only for nodes that have any
+        # The CSR base covers ids below _base_n; row i of a direction is
+        # targets[offsets[i]:offsets[i + 1]], sorted so membership bisects.
+        self._base_n = 0
+        self._down_off = array("q", [0])
+        self._down_tgt = array("i")
+        self._up_off = array("q", [0])
+        self._up_tgt = array("i")
+        # The overflow delta: row -> set of targets added / dropped since the
+        # last compaction. A dropped target is always a base target and an
+        # added one never is, so a row reads as (base - dropped) + added.
+        self._down_add, self._down_del = {}, {}
+        self._up_add, self._up_del = {}, {}
+        self._delta = 0
+
+    # ------------------------------------------------------------ adjacency
+
+    def _row(self, i, offsets, targets, added, dropped):
+        row = ()
+        if i < self._base_n:
+            lo, hi = offsets[i], offsets[i + 1]
+            if lo != hi:
+                row = targets[lo:hi]
+                gone = dropped.get(i)
+                if gone:
+                    row = [t for t in row if t not in gone]
+        extra = added.get(i)
+        if extra:
+            return [*row, *extra]
+        return row
+
+    def _children(self, i):
+        return self._row(i, self._down_off, self._down_tgt,
+                         self._down_add, self._down_del)
+
+    def _parents(self, i):
+        return self._row(i, self._up_off, self._up_tgt,
+                         self._up_add, self._up_del)
+
+    def _has_edge(self, i, j):
+        extra = self._down_add.get(i)
+        if extra and j in extra:
+            return True
+        if i >= self._base_n:
+            return False
+        gone = self._down_del.get(i)
+        if gone and j in gone:
+            return False
+        lo, hi = self._down_off[i], self._down_off[i + 1]
+        k = bisect_left(self._down_tgt, j, lo, hi)
+        return k < hi and self._down_tgt[k] == j
+
+    def _toggle(self, row, target, into, out_of):
+        pending = out_of.get(row)
+        if pending is not None and target in pending:
+            pending.discard(target)
+            if not pending:
+                del out_of[row]
+        else:
+            into.setdefault(row, set()).add(target)
+
+    def _link(self, i, j):
+        self._toggle(i, j, self._down_add, self._down_del)
+        self._toggle(j, i, self._up_add, self._up_del)
+        self._note_delta()
+
+    def _unlink(self, i, j):
+        self._toggle(i, j, self._down_del, self._down_add)
+        self._toggle(j, i, self._up_del, self._up_add)
+        self._note_delta()
+
+    def _note_delta(self):
+        self._delta += 1
+        if self._delta > max(self._COMPACT_MIN, len(self._down_tgt) // 2):
+            self.compact()
+
+    def compact(self):
+        """Fold the overflow delta into fresh CSR arrays. Purely a layout
+        change — no answer, count or edge moves — so it is safe at any point
+        between operations, and runs on its own as the delta grows."""
+        n = len(self._names)
+        down_off, down_tgt = array("q", [0]), array("i")
+        up_off, up_tgt = array("q", [0]), array("i")
+        for i in range(n):
+            if self._names[i] is not None:
+                down_tgt.extend(sorted(self._children(i)))
+                up_tgt.extend(sorted(self._parents(i)))
+            down_off.append(len(down_tgt))
+            up_off.append(len(up_tgt))
+        self._down_off, self._down_tgt = down_off, down_tgt
+        self._up_off, self._up_tgt = up_off, up_tgt
+        self._down_add, self._down_del = {}, {}
+        self._up_add, self._up_del = {}, {}
+        self._base_n = n
+        self._delta = 0
+
+    # ---------------------------------------------------------------- nodes
+
+    def _intern(self, name):
+        i = self._ids.get(name)
+        if i is None:
+            i = len(self._names)
+            self._ids[name] = i
+            self._names.append(name)
+            self._counts.append(0)
+        return i
+
+    def _forget(self, i):
+        """Drop a node's identity. Its id is not reused: the rows it owned are
+        empty by now, and compaction simply carries them as empty rows."""
+        del self._ids[self._names[i]]
+        self._names[i] = None
+        self._counts[i] = 0
+        self._metadata.pop(i, None)
+
+    def __contains__(self, name):
+        return _name_of(name) in self._ids
+
+    def __len__(self):
+        """Nodes in the graph, the root included (like `len(dag.nodes)`)."""
+        return len(self._ids)
+
+    def names(self):
+        return self._ids.keys()
+
+    def descendant_count(self, name):
+        return self._counts[self._ids[_name_of(name)]]
+
+    def metadata(self, name):
+        return dict(self._metadata.get(self._ids[_name_of(name)], {}))
+
+    def parents_of(self, name):
+        return {self._names[p] for p in self._parents(self._ids[name])}
+
+    def children_of(self, name):
+        return {self._names[c] for c in self._children(self._ids[name])}
+
+    # ----------------------------------------------------------- traversals
+
+    def _descendants(self, i):
+        seen = set()
+        stack = [i]
+        while stack:
+            for child in self._children(stack.pop()):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return seen
+
+    def _ancestors(self, i):
+        seen = set()
+        stack = [i]
+        while stack:
+            for parent in self._parents(stack.pop()):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return seen
+
+    def _has_ancestors(self, i, targets):
+        """`OntoDAG._has_ancestors` over ids: one upward walk, early exit."""
+        missing = set(targets)
+        seen = set()
+        stack = [i]
+        while stack and missing:
+            for parent in self._parents(stack.pop()):
+                missing.discard(parent)
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return not missing
+
+    def _count_reachable(self, start, targets):
+        remaining = set(targets)
+        found = 0
+        seen = set()
+        frontier = [start]
+        while frontier and remaining:
+            for child in self._children(frontier.pop()):
+                if child in remaining:
+                    remaining.discard(child)
+                    found += 1
+                    if not remaining:
+                        return found
+                if child not in seen:
+                    seen.add(child)
+                    frontier.append(child)
+        return found
+
+    def _topological(self):
+        """Live ids, every parent before its children (root first)."""
+        order, done = [], set()
+        for start in range(len(self._names)):
+            if self._names[start] is None or start in done:
+                continue
+            done.add(start)
+            path = [(start, iter(self._children(start)))]
+            while path:
+                node, children = path[-1]
+                for child in children:
+                    if child not in done:
+                        done.add(child)
+                        path.append((child, iter(self._children(child))))
+                        break
+                else:
+                    order.append(node)
+                    path.pop()
+        order.reverse()
+        return order
+
+    # -------------------------------------------------- counts (see dag.py)
+
+    def _plan_add(self, parent, child):
+        below = self._descendants(child)
+        reaches_child = self._ancestors(child) if self._parents(child) \
+            else frozenset()
+        deltas = {}
+        frontier = [parent]
+        seen = set()
+        while frontier:
+            node = frontier.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if node in reaches_child:
+                continue
+            gained = 1 if not below else (
+                1 + len(below) - self._count_reachable(node, below))
+            deltas[node] = deltas.get(node, 0) + gained
+            frontier.extend(self._parents(node))
+        return deltas
+
+    def _apply(self, deltas):
+        counts = self._counts
+        for node, delta in deltas.items():
+            counts[node] += delta
+
+    # --------------------------------------------------------------- writes
+
+    def _add_edge(self, i, j, counts=True):
+        """`OntoDAG.add_edge` over ids. With `counts=False` the caller
+        maintains counts itself (`remove`'s contraction)."""
+        if i == j or self._has_edge(i, j):
+            return
+        if self._has_ancestors(j, (i,)):
+            return                     # already implied: keep the reduction
+        if self._has_ancestors(i, (j,)):
+            raise ValueError(
+                f"Edge {self._names[i]} -> {self._names[j]} would create "
+                "a cycle.")
+        deltas = self._plan_add(i, j) if counts else None
+        self._link(i, j)
+        if deltas:
+            self._apply(deltas)
+        self._remove_unneeded_edges(i, j)
+
+    def _remove_unneeded_edges(self, i, j):
+        # The redundancy rectangle of OntoDAG._remove_unneeded_edges. With no
+        # computed order every pruned edge is redundant via asserted paths, so
+        # pruning changes no reachability and no count: plain unlinks.
+        ancestors = self._ancestors(i)
+        for ancestor in ancestors:
+            if self._has_edge(ancestor, j):
+                self._unlink(ancestor, j)
+        if not self._children(j):
+            return
+        uppers = ancestors | {i}
+        for descendant in self._descendants(j):
+            for parent in list(self._parents(descendant)):
+                if parent in uppers:
+                    self._unlink(parent, descendant)
+
+    def put(self, subcategory, super_categories):
+        """File `subcategory` under each of `super_categories` (under the root
+        when there are none). Names or Items; an Item's metadata is asserted
+        like a re-put in OntoDAG (incoming keys win)."""
+        name = _name_of(subcategory)
+        metadata = getattr(subcategory, "metadata", None)
+        supers = [_name_of(sc) for sc in super_categories]
+        if any(sup not in self._ids for sup in supers):
+            raise ValueError("One or more super-categories do not exist.")
+        if name == ROOT:
+            raise ValueError("Already exists as root.")
+        i = self._intern(name)
+        if metadata:
+            self._metadata.setdefault(i, {}).update(metadata)
+        for sup in supers or [ROOT]:
+            self._add_edge(self._ids[sup], i)
+
+    def remove(self, node_to_remove):
+        """Contract a node away: its children reattach to its parents and
+        every ancestor loses exactly one descendant (see OntoDAG.remove)."""
+        name = _name_of(node_to_remove)
+        if name not in self._ids:
+            raise ValueError(f"Item {name} does not exist.")
+        if name == ROOT:
+            raise ValueError("Cannot remove the root.")
+        i = self._ids[name]
+        parents = list(self._parents(i))
+        children = list(self._children(i))
+        ancestors = self._ancestors(i)
+        for child in children:
+            self._unlink(i, child)
+        for parent in parents:
+            self._unlink(parent, i)
+        self._forget(i)
+        keep_root = not any(parent != 0 for parent in parents)
+        for parent in parents:
+            if parent == 0 and not keep_root:
+                continue
+            for child in children:
+                self._add_edge(parent, child, counts=False)
+        counts = self._counts
+        for ancestor in ancestors:
+            counts[ancestor] -= 1
+
+    def merge(self, other_dag):
+        """Merge an `OntoDAG` or another `CompactOntoDAG` into this one.
+        Metadata merges per key, ours winning, as in `OntoDAG.merge`."""
+        if isinstance(other_dag, CompactOntoDAG):
+            order = [other_dag._names[i] for i in other_dag._topological()]
+            children = other_dag.children_of
+            metadata = {other_dag._names[i]: meta
+                        for i, meta in other_dag._metadata.items()}
+        elif isinstance(other_dag, OntoDAG):
+            order = [node.name for node in other_dag.topological_sort()]
+
+            def children(name):
+                return [child.name
+                        for child in other_dag.nodes[name].neighbors]
+            metadata = {name: node.metadata
+                        for name, node in other_dag.nodes.items()
+                        if node.metadata}
+        else:
+            raise ValueError(
+                "Can only merge with an OntoDAG or CompactOntoDAG instance.")
+        for name in order:
+            i = self._intern(name)
+            if metadata.get(name):
+                mine = self._metadata.setdefault(i, {})
+                for key, value in metadata[name].items():
+                    mine.setdefault(key, value)
+        for name in order:
+            i = self._ids[name]
+            for child in children(name):
+                self._add_edge(i, self._ids[child])
+
+    # -------------------------------------------------------------- queries
+
+    def get(self, super_categories):
+        """Names of everything below all of `super_categories` — the
+        `OntoDAG.get` planner (subsumed terms dropped, smallest cone first,
+        walk or probe chosen per step) over ids. The empty query is every
+        item, as there."""
+        ids = self._ids
+        terms = set()
+        for term in super_categories:
+            i = ids.get(_name_of(term))
+            if i is None:
+                return set()
+            terms.add(i)
+        names = self._names
+        if not terms:
+            return {names[i] for i in self._descendants(0)}
+
+        counts = self._counts
+        nodes = list(terms)
+        minimal = [
+            node for node in nodes
+            if not any(
+                other != node
+                and counts[node] > counts[other]
+                and self._has_ancestors(other, (node,))
+                for other in nodes
+            )
+        ]
+        minimal.sort(key=lambda node: (counts[node], names[node]))
+
+        common = self._descendants(minimal[0])
+        for index in range(1, len(minimal)):
+            if not common:
+                break
+            remaining = minimal[index:]
+            probe_cost = len(common) * self._PROBE_COST_ESTIMATE
+            if probe_cost < sum(counts[term] for term in remaining):
+                common = {candidate for candidate in common
+                          if self._has_ancestors(candidate, remaining)}
+                break
+            common &= self._descendants(minimal[index])
+        return {names[i] for i in common}
+
+    def get_any(self, queries):
+        """Union of conjunctive queries, with `OntoDAG.get_any`'s pruning of
+        disjuncts that are strict supersets of another."""
+        normalized = []
+        for query in queries:
+            terms = frozenset(_name_of(term) for term in query)
+            if terms not in normalized:
+                normalized.append(terms)
+        result = set()
+        for terms in normalized:
+            if not any(other < terms for other in normalized):
+                result |= self.get(terms)
+        return result
+
+    def is_below(self, node, super_category):
+        """True iff `node` equals `super_category` or lies below it; unknown
+        names fail closed to False. Answered upward, with early exit."""
+        sub = self._ids.get(_name_of(node))
+        sup = self._ids.get(_name_of(super_category))
+        if sub is None or sup is None:
+            return False
+        return sub == sup or self._has_ancestors(sub, (sup,))
+
+    # ---------------------------------------------------------- conversions
+
+    @classmethod
+    def from_dag(cls, dag):
+        """A compact copy of an `OntoDAG`. The source is already reduced and
+        its counts are exact, so nothing is replayed: names are interned and
+        the CSR arrays are written directly."""
+        compact = cls()
+        for name in sorted(dag.nodes):
+            compact._intern(name)
+        ids = compact._ids
+        n = len(compact._names)
+        down = [()] * n
+        up = [()] * n
+        for name, node in dag.nodes.items():
+            i = ids[name]
+            down[i] = sorted(ids[child.name] for child in node.neighbors)
+            up[i] = sorted(ids[parent.name] for parent in node.parents
+                           if dag.nodes.get(parent.name) is parent)
+            compact._counts[i] = node.descendant_count
+            if node.metadata:
+                compact._metadata[i] = dict(node.metadata)
+        for rows, offsets, targets in ((down, compact._down_off,
+                                        compact._down_tgt),
+                                       (up, compact._up_off,
+                                        compact._up_tgt)):
+            for row in rows:
+                targets.extend(row)
+                offsets.append(len(targets))
+        compact._base_n = n
+        return compact
+
+    def induced_subdag(self, names):
+        """`OntoDAG.induced_subdag`: an `OntoDAG` of exactly `names` (the
+        root implied) with the real edges among them. Unknown names are
+        ignored."""
+        new_dag = OntoDAG()
+        kept = {name for name in names if name in self._ids}
+        kept.discard(ROOT)
+        for name in sorted(kept):
+            i = self._ids[name]
+            new_dag.add_node(Item(name, metadata=self._metadata.get(i)))
+        for name in kept:
+            item = new_dag.nodes[name]
+            for parent in self._parents(self._ids[name]):
+                parent_name = self._names[parent]
+                if parent_name == ROOT or parent_name in kept:
+                    new_dag.nodes[parent_name].neighbors.add(item)
+        for node in new_dag.nodes.values():
+            node.descendant_count = len(
+                new_dag.get_descendants(node, computed=False))
+        return new_dag
+
+    def to_dag(self):
+        """The whole graph as an `OntoDAG` (edges, counts and metadata)."""
+        return self.induced_subdag(self._ids)
+
+    def excerpt(self, queries, context=False):
+        """`OntoDAG.excerpt`: a query's answer as a standalone `OntoDAG`,
+        answers with no parent inside the cut hung under the root. `queries`
+        is DNF, as there; `context` adds the answers' ancestors."""
+        answer = (self.get(queries[0]) if len(queries) == 1
+                  else self.get_any(queries))
+        names = set(answer)
+        if context:
+            for name in answer:
+                names |= {self._names[ancestor] for ancestor
+                          in self._ancestors(self._ids[name])}
+        names.discard(ROOT)
+        cut = self.induced_subdag(names)
+        for name in sorted(cut.nodes):
+            node = cut.nodes[name]
+            if node is not cut.root and not node.parents:
+                cut.add_edge(cut.root, node)
+        return cut
@@ -0,0 +1,308 @@
+"""odag serve — a resident process that keeps stores loaded between commands.
+
+Every `odag` run starts from nothing: the first command reads the whole
+native file, or hydrates an EagerOntoDAG from its record store (for
+`swarm:`, inside a transient window with lock retries), and the process
+exits with the graph still warm. At 10^5 items that load is most of what
+a one-shot `odag get` costs. `odag serve` holds the loaded Sessions
+instead, one per store spec, and listens on a Unix socket in the ontodag
+home directory (`~/.ontodag/odag.sock`).
+
+While it runs, `odag CMD ...` is forwarded to it: the client sends the
+command line with what decides how it runs — its global flags, the
+settings' environment variables, its working directory, and whether its
+stdout and stderr are terminals — and writes back what the command
+printed, exiting with its code. `dispatch` binds output through the
+`_OUT`/`_ERR` context vars, so capturing it is the same thing the web
+console does. With no daemon (or one that will not answer) the client
+runs the command itself, as always; only a daemon that dropped a request
+half-way is an error, since the command may have written.
+
+Coherence. A resident graph is only reusable while it is the stored
+state, so each store's backend gives a cheap `stamp()` — the file's (and
+its journal's) inode, size and mtime; the `root` pointer of an `rs:`
+store; the HEAD of a `swarm:` store's local directory. A request whose
+store has a different stamp than the one recorded drops the session and
+loads afresh; an overlay whose stamp moved drops the composed view. The
+daemon's own saves record the stamp after them. A command that fails
+drops its session too: it may have changed the graph without reaching
+its save, which a one-shot process would have thrown away on exit.
+
+Requests are served one at a time, in the daemon's one thread: a request
+sets the process's working directory, environment and flag layer while it
+runs, and a store's Session is never touched by two commands at once.
+Streams (`odag < script`, the prompt), and the commands that would be
+odd away from the caller's terminal or stdin (LOCAL), always run locally.
+
+The wire format is one JSON object per connection each way, newline-
+terminated; stdlib only, like the MCP server.
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+
+import ontodag.__main__ as cli
+
+SOCKET_NAME = "odag.sock"
+
+# Never forwarded: a daemon running the daemon or the web server, help and
+# settings (no store to keep warm), the Swarm doctor (talks to a node, not
+# a store), and ingest (reads the caller's stdin by default).
+LOCAL = {"serve", "web", "help", "set", "swarm", "ingest"}
+
+# The environment a request carries: every setting's variable, and the
+# Bee endpoint's legacy spelling.
+FORWARDED_ENV = sorted({setting.env for setting in cli._SETTINGS.values()}
+                       | {"BEE_API_URL"})
+
+
+def socket_path():
+    return os.path.join(cli._home_dir(), SOCKET_NAME)
+
+
+def _send(sock, message):
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _receive(sock):
+    chunks = []
+    while True:
+        chunk = sock.recv(1 << 16)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    data = b"".join(chunks)
+    return json.loads(data) if data.endswith(b"\n") else None
+
+
+# --------------------------------------------------------------------------- #
+# The client side: what `odag CMD ...` does while a daemon runs
+# --------------------------------------------------------------------------- #
+
+def forward(argv, overrides):
+    """Run `argv` in the daemon, printing what it printed. Returns the exit
+    code, or None when there is no daemon to run it (run it locally)."""
+    if argv[0] in LOCAL or not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path()
+    if not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(path)
+            _send(sock, {
+                "version": cli.__version__,
+                "argv": list(argv),
+                "overrides": dict(overrides),
+                "env": {key: os.environ.get(key) for key in FORWARDED_ENV},
+                "cwd": os.getcwd(),
+                "tty": [cli._isatty(sys.stdout), cli._isatty(sys.stderr)],
+            })
+        except OSError:
+            return None          # a stale socket: nobody is listening
+        try:
+            answer = _receive(sock)
+        except (OSError, ValueError):
+            answer = None
+    finally:
+        sock.close()
+    if answer is None:
+        print(f"odag: the daemon at {path} dropped the command; it may or "
+              f"may not have run (check, then retry)", file=sys.stderr)
+        return 1
+    if answer.get("refused"):
+        print(f"odag: note: {answer['refused']} — running this locally",
+              file=sys.stderr)
+        return None
+    sys.stdout.write(answer["out"])
+    sys.stdout.flush()
+    sys.stderr.write(answer["err"])
+    return answer["code"]
+
+
+# --------------------------------------------------------------------------- #
+# The daemon side
+# --------------------------------------------------------------------------- #
+
+class _Capture(io.StringIO):
+    """A capture buffer that is a terminal exactly when the caller's is, so
+    `auto` render and limit decide as they would have in the caller."""
+
+    def __init__(self, tty):
+        super().__init__()
+        self._tty = tty
+
+    def isatty(self):
+        return self._tty
+
+
+class _ResidentSession(cli.Session):
+    """A Session that notes whether a command saved through it."""
+
+    wrote = False
+
+    def save(self):
+        super().save()
+        self.wrote = True
+
+
+def _stamp(spec):
+    """The stored state's stamp (see the module docstring); None when the
+    backend cannot tell, and a session on it is never reused."""
+    return cli._backend_stamp(cli._make_backend(spec))
+
+
+def _close(session):
+    store = getattr(session._dag, "store", None)
+    close = getattr(store, "close", None)
+    if close is not None:
+        close()
+
+
+@contextlib.contextmanager
+def _as_requested(request):
+    """The caller's working directory, environment and flag layer, for the
+    length of one request."""
+    cwd = os.getcwd()
+    environment = {key: os.environ.get(key) for key in request["env"]}
+    overrides = dict(cli._OVERRIDES)
+    try:
+        os.chdir(request["cwd"])
+        for key, value in request["env"].items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        cli._OVERRIDES.clear()
+        cli._OVERRIDES.update(request["overrides"])
+        yield
+    finally:
+        os.chdir(cwd)
+        for key, value in environment.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        cli._OVERRIDES.clear()
+        cli._OVERRIDES.update(overrides)
+
+
+class Daemon:
+    """Resident Sessions, one per store and the settings that open it."""
+
+    def __init__(self):
+        # key -> [session, primary stamp, overlay stamps]
+        self.sessions = {}
+        self.loads = 0          # sessions created; reuse is requests - loads
+        self.requests = 0
+
+    def _key(self, spec):
+        return (spec, cli._OVERRIDES.get("as_of")) + tuple(
+            cli._configured(key)
+            for key in ("store_key", "bee_api", "bee_batch", "bee_signer"))
+
+    def _session(self, key, spec, stamp, overlays):
+        entry = self.sessions.get(key)
+        if entry is not None and (stamp is None or entry[1] != stamp):
+            _close(entry[0])
+            entry = None
+        if entry is None:
+            entry = [_ResidentSession(spec), stamp, overlays]
+            self.sessions[key] = entry
+            self.loads += 1
+        elif entry[2] != overlays or None in overlays:
+            entry[0]._view = None
+            entry[2] = overlays
+        return entry
+
+    def handle(self, request):
+        """Run one forwarded command; the answer to send back."""
+        if request.get("version") != cli.__version__:
+            return {"refused": f"the daemon runs ontodag "
+                               f"{cli.__version__}, this is "
+                               f"{request.get('version')} (restart it)"}
+        self.requests += 1
+        tty_out, tty_err = request["tty"]
+        out, err = _Capture(tty_out), _Capture(tty_err)
+        key = None
+        try:
+            with _as_requested(request):
+                spec = cli._resolve_store()
+                key = self._key(spec)
+                stamp = _stamp(spec)
+                overlays = [_stamp(layer) for layer in cli._overlay_specs()]
+                entry = self._session(key, spec, stamp, overlays)
+                session = entry[0]
+                session.wrote = False
+                code = cli.dispatch(request["argv"], session, out=out, err=err)
+                if session.failed or stamp is None:
+                    _close(session)
+                    del self.sessions[key]
+                elif session.wrote:
+                    entry[1] = _stamp(spec)
+        except Exception as exc:
+            # One command's failure is its answer, never the daemon's end.
+            # Its session may be half-changed, so it goes too.
+            entry = self.sessions.pop(key, None) if key is not None else None
+            if entry is not None:
+                _close(entry[0])
+            message = str(exc) if isinstance(exc, (ValueError, OSError)) \
+                else f"{type(exc).__name__}: {exc}"
+            print(f"odag: {message}", file=err)
+            code = 1
+        return {"code": code, "out": out.getvalue(), "err": err.getvalue()}
+
+    def close(self):
+        for session, _stamp_, _overlays in self.sessions.values():
+            _close(session)
+        self.sessions.clear()
+
+
+def listen(path):
+    """A listening socket at `path`, readable by this user alone. A socket
+    file nobody answers on is left over from a daemon that died, and is
+    replaced; one that answers is a daemon already running."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError("odag serve needs Unix domain sockets, which this "
+                         "platform does not have")
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.remove(path)
+        else:
+            raise ValueError(f"a daemon is already serving at {path}")
+        finally:
+            probe.close()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    mask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(mask)
+    server.listen(16)
+    return server
+
+
+def serve_forever(server, daemon):
+    while True:
+        connection, _ = server.accept()
+        with connection:
+            try:
+                request = _receive(connection)
+                if request is None:
+                    continue
+                _send(connection, daemon.handle(request))
+            except Exception as exc:
+                # A malformed request or a client gone mid-answer: serve
+                # the next one.
+                print(f"odag serve: {exc}", file=sys.stderr)
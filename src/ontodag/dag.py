@@ -1,7 +1,17 @@
+import gc
+import heapq
+import time
+from collections import defaultdict
 from contextlib import contextmanager
 from itertools import combinations
 
 from ontodag import dimensions as _dims
+from ontodag.bitmaps import ConeBitmaps
+from ontodag.intervals import IntervalIndex
+from ontodag.parses import ParseCache
+from ontodag.querycache import QueryCache
+from ontodag.reach import ReachabilityLabels
+from ontodag.stats import AncestorStats
 
 
 class _EdgeSet(set):
@@ -76,6 +86,70 @@ class Item:
         return out
 
 
+class _Bulk:
+    """State of one open `OntoDAG.bulk()` block."""
+
+    def __init__(self, passthrough):
+        self.edges = []          # buffered (parent, child) names, in order
+        self.created = []        # names of nodes the block added
+        self.passthrough = passthrough
+
+
+class ResultStream:
+    """What `OntoDAG.iter_get` returns: iterate it for the answer's Items.
+
+    `total` is how many matching items have been confirmed so far and
+    `exact` whether that is all of them. In name order the whole answer is
+    confirmed before the first item comes out (the smallest `limit` names
+    need every candidate seen), so the total is always exact; in planner
+    order the walk stops at `limit` and `total` is a lower bound until
+    `count()` finishes the walk — counting, not collecting."""
+
+    def __init__(self, confirmed, limit, order):
+        self._confirmed = confirmed
+        self.total = 0
+        self.exact = False
+        self._items = (self._by_name(limit) if order == "name"
+                       else self._as_confirmed(limit))
+
+    def __iter__(self):
+        return self._items
+
+    def _counted(self):
+        for item in self._confirmed:
+            self.total += 1
+            yield item
+
+    def _by_name(self, limit):
+        key = _name_of
+        if limit is None:
+            chosen = sorted(self._counted(), key=key)
+        elif limit == 0:
+            chosen = ()
+            self.count()            # nsmallest(0) would not look at all
+        else:
+            chosen = heapq.nsmallest(limit, self._counted(), key=key)
+        self.exact = True
+        yield from chosen
+
+    def _as_confirmed(self, limit):
+        if limit == 0:
+            return
+        for item in self._counted():
+            yield item
+            if self.total == limit:
+                return
+        self.exact = True
+
+    def count(self):
+        """The exact total: confirms (without yielding) whatever the
+        iteration has not reached."""
+        for _ in self._counted():
+            pass
+        self.exact = True
+        return self.total
+
+
 def _name_of(node_or_name):
     """Identity at the public boundary is the name: accept a plain string or
     anything with a `.name` (an Item), and return the name string."""
@@ -83,16 +157,33 @@ def _name_of(node_or_name):
 
 
 class DAG:
+    # The reachability-label index (ontodag.reach), when enabled.
+    _reach = None
+    # The trace `OntoDAG.explain` is filling, if any: walks add the nodes
+    # they visited to its "visits".
+    _trace = None
+    # The open OntoDAG.bulk() block, if any.
+    _bulk = None
+
     def __init__(self, nodes=None):
         self.nodes = {}
         self._counts_frozen = False  # True while an operation maintains counts itself
+        # Optional in-memory indexes, told about every structural change made
+        # through add_node/add_edge/remove_edge/_forget (see ontodag.bitmaps
+        # for the hook protocol). Direct `neighbors` wiring bypasses them, so
+        # loaders wire through `_wire`, which rebuilds them after.
+        self._indexes = []
         if nodes:
             for node in nodes:
                 self.add_node(node)
 
     def add_node(self, node):
         """Add a node (Item) to the graph."""
+        if self._bulk is not None and node.name not in self.nodes:
+            self._bulk.created.append(node.name)
         self.nodes[node.name] = node
+        for index in self._indexes:
+            index.node_added(node)
 
     # ---- computed order (parametric dimensions) ----------------------------
     #
@@ -128,11 +219,17 @@ class DAG:
 
         deltas = None if self._counts_frozen else self._plan_add(from_node, to_node)
         from_node.neighbors.add(to_node)
+        for index in self._indexes:
+            index.edge_added(from_node, to_node)
         self._apply_count_deltas(deltas)
 
     def _is_reachable(self, start, target, computed=False):
         """True if `target` is strictly reachable from `start` (iterative,
         early exit); `computed=True` also follows computed dimension hops."""
+        reach = self._reach
+        if reach is not None and reach.covers(computed) \
+                and not reach.may_reach(start.name, target.name):
+            return False
         seen = set()
         stack = [start]
         while stack:
@@ -157,6 +254,8 @@ class DAG:
         if to_node not in from_node.neighbors:
             raise ValueError("Edge does not exist.")
         from_node.neighbors.remove(to_node)
+        for index in self._indexes:
+            index.edge_removed(from_node, to_node)
         # "can X still reach c?" is a post-state question, so plan after
         self._apply_count_deltas(
             None if self._counts_frozen else self._plan_remove(from_node, to_node))
@@ -321,6 +420,8 @@ class DAG:
                 if neighbor not in visited:
                     visited.add(neighbor)
                     frontier.append(neighbor)
+        if self._trace is not None:
+            self._trace["visits"] += len(visited)
         return descendants
 
     def _has_ancestors(self, node, targets, computed=True):
@@ -335,6 +436,9 @@ class DAG:
         near the root, while checking it upward from X cannot.
         """
         missing = set(targets)
+        reach = self._reach
+        if reach is not None and reach.covers(computed):
+            return self._has_ancestors_labelled(node, missing, reach)
         seen = set()
         stack = [node]
         while stack and missing:
@@ -349,6 +453,43 @@ class DAG:
                 if parent not in seen:
                     seen.add(parent)
                     stack.append(parent)
+        if self._trace is not None:
+            self._trace["visits"] += len(seen) + 1
+        return not missing
+
+    def _has_ancestors_labelled(self, node, missing, reach):
+        """`_has_ancestors` with the reachability labels: a target the labels
+        rule out settles the answer with no walk at all, and the walk climbs
+        only through parents that may still lie below some missing target —
+        the labels say nothing else can be on a path to one."""
+        may_reach = reach.may_reach
+        if not all(may_reach(target.name, node.name) for target in missing):
+            return False
+        if len(missing) == 1:
+            # The is_below / add_edge shape: one target, so the pruning test
+            # is a single label check per parent.
+            target = next(iter(missing))
+            may_lead = reach.below_test(target.name)
+        else:
+            def may_lead(name):
+                return any(may_reach(target.name, name)
+                           for target in missing)
+        seen = set()
+        stack = [node]
+        while stack and missing:
+            current = stack.pop()
+            for parent in current.parents:
+                if self.nodes.get(parent.name) is not parent:
+                    continue          # not ours (see get_ancestors)
+                if parent in missing:
+                    missing.discard(parent)
+                    if not missing:
+                        break
+                if parent not in seen and may_lead(parent.name):
+                    seen.add(parent)
+                    stack.append(parent)
+        if self._trace is not None:
+            self._trace["visits"] += len(seen) + 1
         return not missing
 
     def _walk_ancestors(self, node, computed=True):
@@ -372,6 +513,23 @@ class DAG:
                     frontier.append(parent)
                     yield parent
 
+    def _walk_descendants(self, node, computed=True):
+        """Yield `node`'s descendants as the downward walk reaches them —
+        `get_descendants` for a caller that may stop early (`iter_get`
+        under a limit)."""
+        seen = {node}
+        frontier = [node]
+        while frontier:
+            current = frontier.pop()
+            successors = list(current.neighbors)
+            if computed:
+                successors.extend(self._computed_children(current))
+            for child in successors:
+                if child not in seen:
+                    seen.add(child)
+                    frontier.append(child)
+                    yield child
+
     def get_ancestors(self, node, ignore=(), computed=True):
         name = self._canonical_name(_name_of(node))  # strings accepted too
         if name not in self.nodes:
@@ -463,6 +621,9 @@ class OntoDAG(DAG):
         super().__init__()
         self.root = Item("*")
         self.nodes[self.root.name] = self.root
+        # Parsed parametric names, kept by the index hooks (ontodag.parses).
+        self._parses = ParseCache(self)
+        self._indexes.append(self._parses)
 
     # ---- parametric dimensions (docs/DIMENSIONS.md) -------------------------
     #
@@ -472,17 +633,18 @@ class OntoDAG(DAG):
     # The order *within* a dimension is computed from the names and never
     # materialized as edges (dense orders have no transitive reduction).
 
-    def _dimension_kind(self, head_name):
+    def _dimension_kind(self, head_name, seen=None):
         """The registry kind a declared dimension head inherits (ancestor
         walk from the head to a kind node), or None. Inheriting two
         different kinds is an error, not an MRO puzzle (DIMENSIONS.md §3).
         The walk stops at kind nodes, so kind nodes themselves and plain
-        categories resolve to None."""
+        categories resolve to None. `seen`, when given, collects the nodes
+        the walk passed through — what the parse cache watches."""
         node = self.nodes.get(head_name)
         if node is None or head_name in _dims.KINDS:
             return None
         kinds = set()
-        seen = set()
+        seen = set() if seen is None else seen
         stack = [node]
         while stack:
             for parent in stack.pop().parents:
@@ -502,32 +664,62 @@ class OntoDAG(DAG):
     def _declared_units(self):
         """Graph-declared unit vocabulary (UNITS.md §7): the resolved map
         from `unit(...)`/`unit-family(...)` nodes under the registry node
-        `unit-declaration`. Cached; the cache self-checks against the
-        declaration-name set, so puts, removes and merges are picked up
-        without invalidation hooks. Loud on conflicts and unresolvable
-        definitions — the conflicting-kind-declaration precedent."""
-        node = self.nodes.get(_dims.UNIT_DECLARATION)
-        names = frozenset(child.name for child in node.neighbors)             if node is not None else frozenset()
-        cached = getattr(self, "_unit_cache", None)
-        if cached is not None and cached[0] == names:
-            return cached[1]
-        units = _dims.resolve_declarations(names)
-        self._unit_cache = (names, units)
-        return units
+        `unit-declaration`. Cached in the parse cache, which every change
+        under `unit-declaration` clears, so puts, removes and merges are
+        picked up. Loud on conflicts and unresolvable definitions — the
+        conflicting-kind-declaration precedent."""
+        cache = self._parses
+        if cache.units is None:
+            node = self.nodes.get(_dims.UNIT_DECLARATION)
+            names = frozenset(child.name for child in node.neighbors) \
+                if node is not None else frozenset()
+            cache.units = _dims.resolve_declarations(names)
+        return cache.units
 
     def _parse_parametric(self, name):
         """(head, kind, canonical name) when `name` is a parametric term of a
         *declared* dimension; None otherwise. This is the parse trigger:
         term-shaped names with undeclared heads stay opaque atoms, so
         existing graphs are untouched (DIMENSIONS.md §7)."""
+        entry = self._parsed(name)
+        return entry[0] if entry is not None else None
+
+    def _parsed(self, name):
+        """((head, kind, canonical), denotation of canonical) or None —
+        `_parse_parametric` plus the parsed value, memoized per name in the
+        parse cache (ontodag.parses) until the schema changes."""
+        cache = self._parses
+        try:
+            return cache.names[name]
+        except KeyError:
+            pass
         split = _dims.split_term(name)
         if split is None:
             return None
-        kind = self._dimension_kind(split[0])
+        kind = cache.kind(split[0])
         if kind is None:
-            return None
-        return split[0], kind, _dims.canonicalize(
-            name, kind, units=self._declared_units())
+            return cache.store(name, None)
+        units = self._declared_units()
+        canonical = _dims.canonicalize(name, kind, units=units)
+        return cache.store(name, ((split[0], kind, canonical),
+                                  _dims.denotation(canonical, kind, units)))
+
+    def _contains(self, outer, inner, kind):
+        """`dimensions.contains` on the cached denotations of two parsed
+        same-head names."""
+        a, b = self._parsed(outer), self._parsed(inner)
+        if a is None or b is None or a[0][0] != b[0][0]:
+            return _dims.contains(outer, inner, kind,
+                                  units=self._declared_units())
+        return _dims.contains_denoted(outer, a[1], inner, b[1], kind)
+
+    def _intersect(self, a_name, b_name, kind):
+        """`dimensions.intersect` on the cached denotations."""
+        a, b = self._parsed(a_name), self._parsed(b_name)
+        if a is None or b is None or a[0][0] != b[0][0]:
+            return _dims.intersect(a_name, b_name, kind,
+                                   units=self._declared_units())
+        return _dims.intersect_denoted(a_name, a[1], b_name, b[1], kind)
 
     def _canonical_name(self, name):
         parsed = self._parse_parametric(name)
@@ -550,6 +742,32 @@ class OntoDAG(DAG):
             if parsed is not None and parsed[0] == head_name:
                 yield child, parsed[1]
 
+    def _indexed_star(self, head, kind, canonical):
+        """(star, lo, hi): the head's interval-index entry and the bounds of
+        `canonical`, or None when the index is off or does not cover this
+        dimension — the caller then scans `_star`."""
+        if self._intervals is None:
+            return None
+        units = self._declared_units()
+        star = self._intervals.lookup(head, kind, units)
+        if star is None:
+            return None
+        family, lo, hi = self._parsed(canonical)[1]
+        if not star.matches(family):
+            return None
+        return star, lo, hi
+
+    def _star_where(self, head, kind, canonical, relation):
+        """Present values of `head` standing in `relation` ("inside",
+        "around" or "overlapping") to `canonical`, from the interval index;
+        None when it cannot answer."""
+        indexed = self._indexed_star(head, kind, canonical)
+        if indexed is None:
+            return None
+        star, lo, hi = indexed
+        nodes = self.nodes
+        return [nodes[name] for name in getattr(star, relation)(lo, hi)]
+
     def _computed_children(self, node):
         """Present same-head terms contained in `node`'s denotation — the
         computed hops of the combined order. Distinct canonical names are
@@ -559,10 +777,13 @@ class OntoDAG(DAG):
         if parsed is None:
             return
         head, kind, canonical = parsed
+        indexed = self._star_where(head, kind, canonical, "inside")
+        if indexed is not None:
+            yield from (value for value in indexed if value is not node)
+            return
         for sibling, _ in self._star(head):
-            if sibling is not node and _dims.contains(
-                    canonical, sibling.name, kind,
-                    units=self._declared_units()):
+            if sibling is not node \
+                    and self._contains(canonical, sibling.name, kind):
                 yield sibling
 
     def _computed_parents(self, node):
@@ -570,10 +791,13 @@ class OntoDAG(DAG):
         if parsed is None:
             return
         head, kind, canonical = parsed
+        indexed = self._star_where(head, kind, canonical, "around")
+        if indexed is not None:
+            yield from (value for value in indexed if value is not node)
+            return
         for sibling, _ in self._star(head):
-            if sibling is not node and _dims.contains(
-                    sibling.name, canonical, kind,
-                    units=self._declared_units()):
+            if sibling is not node \
+                    and self._contains(sibling.name, canonical, kind):
                 yield sibling
 
     def get_overlapping(self, term):
@@ -599,11 +823,14 @@ class OntoDAG(DAG):
                 " — get_overlapping needs a computed denotation")
         head, kind, canonical = parsed
         result = set()
-        for value, _ in self._star(head):
-            if _dims.intersect(canonical, value.name, kind,
-                               units=self._declared_units()) is not None:
-                result.add(value)
-                result |= self.get_descendants(value)
+        values = self._star_where(head, kind, canonical, "overlapping")
+        if values is None:
+            values = [value for value, _ in self._star(head)
+                      if self._intersect(canonical, value.name,
+                                         kind) is not None]
+        for value in values:
+            result.add(value)
+            result |= self.get_descendants(value)
         return result
 
     def _virtual_cone(self, head, kind, canonical):
@@ -614,11 +841,13 @@ class OntoDAG(DAG):
         read-only client can ask any threshold without writing
         (DIMENSIONS.md §8)."""
         cone = set()
-        for value, _ in self._star(head):
-            if _dims.contains(canonical, value.name, kind,
-                              units=self._declared_units()):
-                cone.add(value)
-                cone |= self.get_descendants(value)
+        values = self._star_where(head, kind, canonical, "inside")
+        if values is None:
+            values = [value for value, _ in self._star(head)
+                      if self._contains(canonical, value.name, kind)]
+        for value in values:
+            cone.add(value)
+            cone |= self.get_descendants(value)
         return cone
 
     def _ensure_parametric_node(self, canonical, head, kind):
@@ -648,6 +877,16 @@ class OntoDAG(DAG):
         """Add a directed edge between two nodes and remove unneeded edges from ancestors."""
         if from_node == to_node or to_node in from_node.neighbors:
             return
+        batch = self._bulk
+        if batch is not None and not batch.passthrough:
+            if from_node.name not in _dims.KINDS:
+                batch.edges.append((from_node.name, to_node.name))
+                return
+            # Declaring a dimension changes what every later name means, so
+            # the block stops buffering here: what came before is applied,
+            # and the rest goes through one edge at a time (see bulk()).
+            batch.passthrough = True
+            self._bulk_flush(batch)
         parsed_from = self._parse_parametric(from_node.name)
         parsed_to = self._parse_parametric(to_node.name)
         if parsed_from is not None and parsed_to is not None \
@@ -684,13 +923,112 @@ class OntoDAG(DAG):
         self._apply_count_deltas(deltas)
         self._remove_unneeded_edges(from_node, to_node)
 
-    # Stand-in for the typical ancestor-cone size, which is not maintained
-    # per node. Used only to choose between two *exact* operators in get(),
-    # so a bad estimate costs time, never correctness. Deliberately biased
-    # high (ancestor cones in category graphs are usually far smaller than
-    # this) so the probe only fires when it is clearly the cheaper plan.
+    # Stand-in for the typical ancestor-cone size, when it is not maintained
+    # per node (see enable_ancestor_stats). Used only to choose between two
+    # *exact* operators in get(), so a bad estimate costs time, never
+    # correctness. Deliberately biased high (ancestor cones in category
+    # graphs are usually far smaller than this) so the probe only fires
+    # when it is clearly the cheaper plan.
     _PROBE_COST_ESTIMATE = 16
 
+    # The cone-bitmap index (ontodag.bitmaps), when enabled.
+    _bitmaps = None
+
+    def enable_cone_bitmaps(self):
+        """Keep every node's cone as a bitset from now on, so `get` and
+        `count` answer conjunctions of ordinary categories by AND/popcount
+        instead of cone walks. Built from the current graph in one pass and
+        maintained by every later write; worth it for a graph that stays
+        resident and answers many queries (the interactive prompt, the web
+        app), not for a one-shot command. Returns the index."""
+        if self._bitmaps is None:
+            self._bitmaps = ConeBitmaps(self)
+            self._indexes.append(self._bitmaps)
+        return self._bitmaps
+
+    def disable_cone_bitmaps(self):
+        if self._bitmaps is not None:
+            self._indexes.remove(self._bitmaps)
+            self._bitmaps = None
+
+    def enable_reachability_index(self):
+        """Maintain reachability labels from now on (ontodag.reach), so that
+        `is_below`, the planner's probe and every write's redundancy and
+        cycle checks decide most negative answers with no walk, and climb
+        only along possible paths otherwise. Opt-in like the cone bitmaps;
+        answers are identical either way. Returns the index."""
+        if self._reach is None:
+            self._reach = ReachabilityLabels(self)
+            self._indexes.append(self._reach)
+        return self._reach
+
+    def disable_reachability_index(self):
+        if self._reach is not None:
+            self._indexes.remove(self._reach)
+            self._reach = None
+
+    # The ancestor-statistics index (ontodag.stats), when enabled.
+    _stats = None
+
+    def enable_ancestor_stats(self):
+        """Maintain each node's ancestor-cone size and depth from now on
+        (ontodag.stats), so the `get` planner prices a probe by the
+        candidates' real ancestor cones instead of a flat estimate, and
+        rules out most subsumption between query terms by depth alone.
+        Opt-in like the other indexes; answers are identical either way.
+        Returns the index."""
+        if self._stats is None:
+            self._stats = AncestorStats(self)
+            self._indexes.append(self._stats)
+        return self._stats
+
+    def disable_ancestor_stats(self):
+        if self._stats is not None:
+            self._indexes.remove(self._stats)
+            self._stats = None
+
+    # The interval index over dimension values (ontodag.intervals), when
+    # enabled.
+    _intervals = None
+
+    def enable_interval_index(self):
+        """Keep each interval dimension's present values sorted from now on
+        (ontodag.intervals), so a parametric term's virtual cone, its
+        computed neighbours and `get_overlapping` bisect the star instead
+        of comparing against every value: a `time(...)` range over 10^5
+        timestamps costs O(log n + k). Opt-in like the other indexes;
+        answers are identical either way. Returns the index."""
+        if self._intervals is None:
+            self._intervals = IntervalIndex(self)
+            self._indexes.append(self._intervals)
+        return self._intervals
+
+    def disable_interval_index(self):
+        if self._intervals is not None:
+            self._indexes.remove(self._intervals)
+            self._intervals = None
+
+    # The query result cache (ontodag.querycache), when enabled.
+    _results = None
+
+    def enable_query_cache(self, size=256):
+        """Keep the `size` most recently used `get` answers from now on
+        (ontodag.querycache), keyed by canonical term set and stamped with
+        a generation every write bumps, so a repeated query is a lookup
+        and a stale answer is impossible. `get_any` and `count` reuse it
+        per disjunct. For long-lived readers (the MCP server, an
+        interactive session); returns the cache, whose `hits`, `misses`
+        and `evictions` say whether it is paying off."""
+        if self._results is None:
+            self._results = QueryCache(self, size)
+            self._indexes.append(self._results)
+        return self._results
+
+    def disable_query_cache(self):
+        if self._results is not None:
+            self._indexes.remove(self._results)
+            self._results = None
+
     def get(self, super_categories):
         """Return all items that are subcategories of all specified super-categories.
 
@@ -726,9 +1064,15 @@ class OntoDAG(DAG):
         - walk: traverse the term's whole cone and intersect
           (cost ~ its `descendant_count`);
         - probe: walk upward from each surviving candidate and keep those
-          with every remaining term among their ancestors (cost ~
-          len(result) x ancestor-cone size, independent of the remaining
-          cones' sizes — and one pass settles *all* remaining terms).
+          with every remaining term among their ancestors (cost ~ the
+          candidates' ancestor-cone sizes, independent of the remaining
+          cones' sizes — and one pass settles *all* remaining terms). The
+          sizes are exact with `enable_ancestor_stats()`; without it each
+          candidate is assumed to cost `_PROBE_COST_ESTIMATE`.
+
+        `explain` runs the same plan and reports it, step by step. With
+        `enable_query_cache()` a repeated query is answered from the cache
+        until the next write.
 
         The loop also stops as soon as the running result is empty, so the
         largest cones are often never walked at all.
@@ -740,6 +1084,72 @@ class OntoDAG(DAG):
         results. See docs/plans/SEMANTIC_CODES.md §10 before adding such a rewrite;
         it is sound only with a canonical-placement invariant on put().
         """
+        results = self._results
+        if results is None:
+            return self._get(super_categories, None)
+        key = frozenset(self._canonical_name(_name_of(term))
+                        for term in super_categories)
+        answer = results.lookup(key)
+        if answer is None:
+            answer = self._get(super_categories, None)
+            results.store(key, answer)
+        return answer
+
+    def _get(self, super_categories, trace):
+        """`get`, recording its plan and execution into `trace` (see
+        `explain`) when one is given."""
+        settled, minimal = self._plan(super_categories, trace)
+        if settled is not None:
+            return settled
+
+        # With cone bitmaps every remaining step is one AND per term — unless
+        # a cone holds parametric values, whose computed hops the bitsets do
+        # not follow (ontodag.bitmaps).
+        bitmaps = self._bitmaps
+        names = [node.name for node in minimal]
+        if bitmaps is not None and bitmaps.covers(names):
+            if trace is not None:
+                trace["operator"] = "bitmaps"
+            return {self.nodes[name]
+                    for name in bitmaps.names(bitmaps.intersect(names))}
+
+        # Adaptive execution: walk or probe, decided per step from the now-
+        # known size of the running result.
+        step = trace is not None and self._trace_step(
+            trace, "walk", minimal[:1], minimal[0].descendant_count)
+        common_subcategories = self.get_descendants(minimal[0])
+        if step:
+            self._trace_done(trace, step, common_subcategories)
+        for index, node in enumerate(minimal[1:], start=1):
+            if not common_subcategories:
+                break
+            remaining = minimal[index:]
+            walk_cost = sum(term.descendant_count for term in remaining)
+            probe_cost = self._probe_cost(common_subcategories, walk_cost)
+            if probe_cost < walk_cost:
+                # One upward walk per candidate settles every remaining term.
+                # (Candidates can never equal query terms: a surviving term
+                # is an ancestor of no other term, so no term lies inside the
+                # first term's cone — strict ancestry is the right test.)
+                step = trace is not None and self._trace_step(
+                    trace, "probe", remaining, probe_cost, walk_cost)
+                common_subcategories = {
+                    candidate for candidate in common_subcategories
+                    if self._has_ancestors(candidate, remaining)}
+                if step:
+                    self._trace_done(trace, step, common_subcategories)
+                return common_subcategories
+            step = trace is not None and self._trace_step(
+                trace, "walk", [node], node.descendant_count, probe_cost)
+            common_subcategories &= self.get_descendants(node)
+            if step:
+                self._trace_done(trace, step, common_subcategories)
+        return common_subcategories
+
+    def _plan(self, super_categories, trace):
+        """Steps 1-3 of `get`: `(answer, None)` when the query settles
+        before any cone walk, else `(None, terms)` — the surviving terms,
+        smallest cone first. The empty query plans as the root's cone."""
         # 1. Resolve and deduplicate; terms may be name strings or Items
         # (names are the identity at the public boundary, and parametric
         # sugar canonicalizes first). An unknown ordinary term has an empty
@@ -756,8 +1166,13 @@ class OntoDAG(DAG):
                 continue
             node = self.nodes.get(raw)
             if node is None:
-                return set()
+                if trace is not None:
+                    trace["operator"] = "empty"
+                    trace["note"] = f"unknown term {raw!r}"
+                return set(), None
             terms[node.name] = node
+        if trace is not None:
+            trace["terms"] = sorted(terms) + sorted(parametric)
         if not terms and not parametric:
             # The EMPTY query is the universe, not an error: an intersection
             # of no cones is unconstrained, so everything qualifies. That is
@@ -766,7 +1181,9 @@ class OntoDAG(DAG):
             # it to the top — and it makes `get` total. Equivalently it is the
             # root's cone, so `get([])`, `get(["*"])` and the CLI's `list` are
             # one question with one answer.
-            return self.get_descendants(self.root)
+            if trace is not None:
+                trace["operator"] = "universe"
+            return None, [self.root]
 
         # 1a. Same-head parametric terms pre-intersect EXACTLY — within a
         # dimension, meets are computable (interval intersection), so this
@@ -777,10 +1194,12 @@ class OntoDAG(DAG):
             by_head = {}
             for name, (head, kind) in parametric.items():
                 if head in by_head:
-                    met = _dims.intersect(by_head[head][0], name, kind,
-                                          units=self._declared_units())
+                    met = self._intersect(by_head[head][0], name, kind)
                     if met is None:
-                        return set()
+                        if trace is not None:
+                            trace["operator"] = "empty"
+                            trace["note"] = f"disjoint {head!r} terms"
+                        return set(), None
                     by_head[head] = (met, kind)
                 else:
                     by_head[head] = (name, kind)
@@ -795,52 +1214,186 @@ class OntoDAG(DAG):
             # anyway), then the surviving present terms settle by one upward
             # probe per candidate — every step result-preserving.
             if virtual:
+                if trace is not None:
+                    trace["operator"] = "virtual"
                 cones = sorted((self._virtual_cone(head, kind, name)
                                 for name, (head, kind) in virtual.items()),
                                key=len)
                 common = cones[0]
                 for cone in cones[1:]:
                     if not common:
-                        return set()
+                        return set(), None
                     common &= cone
                 if terms and common:
                     remaining = list(terms.values())
                     common = {candidate for candidate in common
                               if self._has_ancestors(candidate, remaining)}
-                return common
+                return common, None
 
-        # 2. Drop terms subsumed by another term.
+        # 2. Drop terms subsumed by another term. With ancestor statistics
+        # a strict ancestor must also be strictly shallower, which settles
+        # most pairs without the upward walk.
+        stats = self._stats
+        by_depth = stats is not None and stats.covers(computed=True)
         nodes = list(terms.values())
-        minimal = [
-            node for node in nodes
-            if not any(
-                other is not node
-                and node.descendant_count > other.descendant_count
-                and self._has_ancestors(other, (node,))
-                for other in nodes
-            )
-        ]
+        minimal = []
+        for node in nodes:
+            for other in nodes:
+                if other is not node \
+                        and node.descendant_count > other.descendant_count \
+                        and (not by_depth or stats.depth(node.name)
+                             < stats.depth(other.name)) \
+                        and self._has_ancestors(other, (node,)):
+                    if trace is not None:
+                        trace["dropped"].append(
+                            {"term": node.name, "subsumed_by": other.name})
+                    break
+            else:
+                minimal.append(node)
 
         # 3. Smallest cone first.
         minimal.sort(key=lambda node: (node.descendant_count, node.name))
+        if trace is not None:
+            trace["order"] = [{"term": node.name,
+                               "count": node.descendant_count}
+                              for node in minimal]
+            trace["plan_visits"] = trace["visits"]
+        return None, minimal
+
+    def iter_get(self, super_categories, limit=None, order="name"):
+        """`get(super_categories)` one Item at a time, stopping early when
+        it can. Returns a `ResultStream`: iterate it for the items, then
+        read `total` (and `exact`), or call `count()` for the exact total.
+
+        `order="name"` yields the answer sorted by name — with a `limit`,
+        the first `limit` names, kept in a heap of that size rather than
+        by sorting the whole answer. `order=None` yields items as the
+        planner confirms them, and with a `limit` stops walking once it
+        has that many: the planner's smallest cone is walked lazily and
+        each item in it is probed upward against the other terms, so a
+        limited query over a huge cone costs about `limit` probes.
+        Without that early exit (name order, or no limit) the walk/probe
+        choice is the planner's, by the same estimates. Queries that
+        settle without a cone walk (unknown or virtual terms, cone
+        bitmaps) stream their computed answer."""
+        if order not in ("name", None):
+            raise ValueError(f"unknown order {order!r} (use 'name' or None)")
+        if limit is not None and (not isinstance(limit, int)
+                                  or isinstance(limit, bool) or limit < 0):
+            raise ValueError("limit must be a non-negative integer or None")
+        early = limit is not None and order is None
+        return ResultStream(self._confirmed(super_categories, early),
+                            limit, order)
+
+    def _confirmed(self, super_categories, early):
+        """Yield `get`'s answer in no particular order, each item proven a
+        member before it is yielded. `early`: the caller will stop after a
+        few, so walk lazily and probe rather than intersect whole cones."""
+        results = self._results
+        if results is not None and not early:
+            yield from self.get(super_categories)   # a cached answer, or one
+            return
+        settled, minimal = self._plan(super_categories, None)
+        bitmaps = self._bitmaps
+        if settled is None and bitmaps is not None \
+                and bitmaps.covers([node.name for node in minimal]):
+            settled = self._get(super_categories, None)
+        if settled is not None:
+            yield from settled
+            return
+        first, remaining = minimal[0], minimal[1:]
+        if remaining and not early:
+            # Priced flat: the candidates are not known until the walk.
+            walk_cost = sum(term.descendant_count for term in remaining)
+            if first.descendant_count * self._PROBE_COST_ESTIMATE \
+                    >= walk_cost:
+                # Walking the other cones is cheaper than probing every
+                # candidate: the ordinary plan, then stream its answer.
+                yield from self._get(super_categories, None)
+                return
+        for candidate in self._walk_descendants(first):
+            if not remaining or self._has_ancestors(candidate, remaining):
+                yield candidate
+
+    def _probe_cost(self, candidates, bound):
+        """Estimated visits for probing upward from every candidate: exact
+        ancestor-cone sizes with ancestor statistics, the flat estimate
+        without. Only compared with `bound`, so it may stop there."""
+        if self._stats is None:
+            return len(candidates) * self._PROBE_COST_ESTIMATE
+        return self._stats.probe_cost(
+            (candidate.name for candidate in candidates), bound)
+
+    def _trace_counts(self, trace):
+        """The counters a traced step reports its share of: nodes visited
+        here; `LazyOntoDAG` adds store fetches and cone-index hits."""
+        return {"visits": trace["visits"]}
+
+    def _trace_step(self, trace, operator, terms, estimate, alternative=None):
+        step = {"op": operator, "terms": [term.name for term in terms],
+                "estimate": estimate, "alternative": alternative,
+                "input": None, "result": None}
+        step.update(self._trace_counts(trace))
+        if trace["steps"]:
+            step["input"] = trace["steps"][-1]["result"]
+        trace["steps"].append(step)
+        return step
+
+    def _trace_done(self, trace, step, result):
+        for counter, value in self._trace_counts(trace).items():
+            step[counter] = value - step[counter]
+        step["result"] = len(result)
+
+    def _traced(self, trace, run):
+        """Run `run()` with `trace` collecting, then total its counters and
+        wall time into it; returns what `run` returned."""
+        before = self._trace_counts(trace)
+        outer, self._trace = self._trace, trace
+        started = time.perf_counter()
+        try:
+            result = run()
+        finally:
+            self._trace = outer
+        trace["seconds"] = time.perf_counter() - started
+        for counter, value in self._trace_counts(trace).items():
+            trace[counter] = value - before[counter]
+        return result
 
-        # Adaptive execution: walk or probe, decided per step from the now-
-        # known size of the running result.
-        common_subcategories = self.get_descendants(minimal[0])
-        for index, node in enumerate(minimal[1:], start=1):
-            if not common_subcategories:
-                break
-            remaining = minimal[index:]
-            probe_cost = len(common_subcategories) * self._PROBE_COST_ESTIMATE
-            if probe_cost < sum(term.descendant_count for term in remaining):
-                # One upward walk per candidate settles every remaining term.
-                # (Candidates can never equal query terms: a surviving term
-                # is an ancestor of no other term, so no term lies inside the
-                # first term's cone — strict ancestry is the right test.)
-                return {candidate for candidate in common_subcategories
-                        if self._has_ancestors(candidate, remaining)}
-            common_subcategories &= self.get_descendants(node)
-        return common_subcategories
+    def explain(self, super_categories):
+        """Answer `get(super_categories)` and report how — EXPLAIN ANALYZE
+        for the planner. Returns a dict:
+
+        - `terms`: the resolved query terms; `dropped`: terms subsumed by
+          another term (`{term, subsumed_by}`); `order`: the surviving
+          terms smallest cone first (`{term, count}`);
+        - `operator`: `planner` (walk/probe steps below), `bitmaps`,
+          `virtual` (computed parametric cones), `universe` (the empty
+          query) or `empty` (settled before any walk; `note` says why);
+        - `steps`: per planner step, `op` (`walk`/`probe`), its `terms`,
+          the `estimate` of nodes it would visit and the `alternative`
+          operator's estimate it won against, the running result's size
+          before (`input`) and after (`result`), and the nodes it actually
+          `visits`;
+        - `plan_visits` / `visits`: nodes visited by planning alone and in
+          total; `result`: the answer's size; `seconds`: wall time.
+
+        Estimates come from `descendant_count` for walks and from the
+        ancestor statistics for probes (`enable_ancestor_stats()`; a flat
+        `_PROBE_COST_ESTIMATE` per candidate otherwise). On a `LazyOntoDAG`
+        every step and the totals also report `fetches` (store reads),
+        `round_trips` (store requests waited on in turn) and `cone_hits`
+        (cones served from the cache or published summaries)."""
+        return self._explain(super_categories)[0]
+
+    def _explain(self, super_categories):
+        trace = {"query": sorted({_name_of(term) for term in super_categories}),
+                 "terms": [], "dropped": [], "order": [],
+                 "operator": "planner", "steps": [],
+                 "plan_visits": 0, "visits": 0}
+        result = self._traced(trace,
+                              lambda: self._get(super_categories, trace))
+        trace["result"] = len(result)
+        return trace, result
 
     def get_any(self, queries):
         """Union of conjunctive queries — `get` in disjunctive normal form.
@@ -863,6 +1416,11 @@ class OntoDAG(DAG):
         unknown term empties only its own disjunct — the other branches
         still answer.
         """
+        return self._get_any(queries, None)
+
+    def _get_any(self, queries, trace):
+        """`get_any`, recording each disjunct's `explain` trace into `trace`
+        when one is given."""
         normalized = []
         for query in queries:
             terms = frozenset(self._canonical_name(_name_of(term))
@@ -879,11 +1437,51 @@ class OntoDAG(DAG):
             return set()
         minimal = [terms for terms in normalized
                    if not any(other < terms for other in normalized)]
+        if trace is not None:
+            trace["disjuncts"] = [sorted(terms) for terms in normalized]
+            trace["skipped"] = [sorted(terms) for terms in normalized
+                                if terms not in minimal]
         result = set()
         for terms in minimal:
-            result |= self.get(terms)
+            if trace is None:
+                result |= self.get(terms)
+                continue
+            branch, answer = self._explain(terms)
+            trace["branches"].append(branch)
+            # The branch collected its own counts; they are this trace's too.
+            for counter in self._trace_counts(branch):
+                trace[counter] = trace.get(counter, 0) + branch[counter]
+            result |= answer
         return result
 
+    def explain_any(self, queries):
+        """Answer `get_any(queries)` and report how: the canonical
+        `disjuncts`, those `skipped` as supersets of another, and one
+        `explain` trace per disjunct run (`branches`), with the counters
+        totalled and `result` the union's size."""
+        return self._explain_any(queries)[0]
+
+    def _explain_any(self, queries):
+        trace = {"query": [sorted(_name_of(term) for term in query)
+                           for query in queries],
+                 "disjuncts": [], "skipped": [], "branches": [],
+                 "visits": 0}
+        result = self._traced(trace, lambda: self._get_any(queries, trace))
+        trace["result"] = len(result)
+        return trace, result
+
+    def count(self, super_categories):
+        """`len(self.get(super_categories))`, without building the answer
+        when cone bitmaps are enabled and the terms are ordinary categories:
+        then it is the popcount of the ANDed cones."""
+        bitmaps = self._bitmaps
+        if bitmaps is not None:
+            names = {_name_of(term) for term in super_categories}
+            if names and all(name in self.nodes for name in names) \
+                    and bitmaps.covers(names):
+                return bitmaps.intersect(names).bit_count()
+        return len(self.get(super_categories))
+
     def is_below(self, node, super_category):
         """True iff `node` fits within `super_category` — equal to it, or
         below it in the combined (asserted + computed) order. The Boolean
@@ -907,32 +1505,48 @@ class OntoDAG(DAG):
         rule with dimensions (a point value with a large asserted cone
         sits below an interval whose asserted cone is empty).
         """
+        return self._is_below(node, super_category, None)
+
+    def _is_below(self, node, super_category, trace):
+        """`is_below`, recording which rule decided it into `trace` (see
+        `explain_below`) when one is given."""
         sub = self._canonical_name(_name_of(node))
         sup = self._canonical_name(_name_of(super_category))
+        if trace is not None:
+            trace["terms"] = [sub, sup]
         sub_parsed = self._parse_parametric(sub)
         sup_parsed = self._parse_parametric(sup)
         sub_node = self.nodes.get(sub)
         sup_node = self.nodes.get(sup)
         if (sub_node is None and sub_parsed is None) or \
                 (sup_node is None and sup_parsed is None):
+            if trace is not None:
+                trace["operator"] = "unknown"
             return False                 # unknown vocabulary fails closed
         if sub == sup:
+            if trace is not None:
+                trace["operator"] = "reflexive"
             return True                  # fits-within is reflexive
         # Same-dimension arithmetic is sound unconditionally (the computed
         # order is real whether or not the nodes exist) — and for a pair
         # with a virtual side it is also complete, short of cross edges.
         if sub_parsed is not None and sup_parsed is not None \
                 and sub_parsed[0] == sup_parsed[0] \
-                and _dims.contains(sup, sub, sup_parsed[1],
-                                   units=self._declared_units()):
+                and self._contains(sup, sub, sup_parsed[1]):
+            if trace is not None:
+                trace["operator"] = "arithmetic"
             return True
         if sub_node is None:
             # A virtual subject relates upward only through the present
             # values that contain it.
+            if trace is not None:
+                trace["operator"] = "virtual-subject"
             head, kind, _ = sub_parsed
+            around = self._star_where(head, kind, sub, "around")
+            if around is not None:
+                return any(self.is_below(value, sup) for value in around)
             return any(
-                _dims.contains(value.name, sub, kind,
-                               units=self._declared_units())
+                self._contains(value.name, sub, kind)
                 and self.is_below(value, sup)
                 for value, _kind in self._star(head))
         if sup_node is None:
@@ -944,16 +1558,38 @@ class OntoDAG(DAG):
             # materializing the whole up-cone (which, on a lazy reader,
             # is the difference between a couple of fetches and all of
             # them).
+            if trace is not None:
+                trace["operator"] = "virtual-bound"
             head, kind, _ = sup_parsed
             for ancestor in self._walk_ancestors(sub_node):
+                if trace is not None:
+                    trace["visits"] += 1
                 parsed = self._parse_parametric(ancestor.name)
                 if parsed is not None and parsed[0] == head \
-                        and _dims.contains(sup, ancestor.name, kind,
-                                           units=self._declared_units()):
+                        and self._contains(sup, ancestor.name, kind):
                     return True
             return False
+        if trace is not None:
+            reach = self._reach
+            trace["operator"] = "upward"
+            trace["labels"] = reach is not None and reach.covers(True)
         return self._has_ancestors(sub_node, (sup_node,))
 
+    def explain_below(self, node, super_category):
+        """Answer `is_below(node, super_category)` and report how: the
+        canonical `terms`, the deciding `operator` — `unknown` (fails
+        closed), `reflexive`, `arithmetic` (same-dimension containment),
+        `virtual-subject`, `virtual-bound` (a climb testing each ancestor)
+        or `upward` (one ancestor walk; `labels` says whether the
+        reachability labels pruned it) — the nodes it `visits`, the boolean
+        `result` and `seconds`. Lazy readers add `fetches`."""
+        trace = {"query": [_name_of(node), _name_of(super_category)],
+                 "terms": [], "operator": None, "labels": False,
+                 "visits": 0}
+        trace["result"] = self._traced(
+            trace, lambda: self._is_below(node, super_category, trace))
+        return trace
+
     def get_by_dag(self, query_dag):
         """
         Returns a new DAG with a new root, with the nodes that are intersected with the query nodes,
@@ -1036,7 +1672,9 @@ class OntoDAG(DAG):
         a store delete from it (`SparseOntoDAG`). `remove_cone` deleting nodes
         directly is exactly how a sparse cone removal came to commit a root
         that still contained the deleted records."""
-        del self.nodes[name]
+        node = self.nodes.pop(name)
+        for index in self._indexes:
+            index.node_forgotten(node)
 
     def _live_parent_names(self, name):
         """Names of a node's own parents (empty for a name not in the graph)."""
@@ -1083,8 +1721,7 @@ class OntoDAG(DAG):
                 parametric_supers[parsed[0]].append((name, parsed[1]))
         for head, entries in parametric_supers.items():
             for (name_a, kind), (name_b, _) in combinations(entries, 2):
-                if _dims.intersect(name_a, name_b, kind,
-                                   units=self._declared_units()) is None:
+                if self._intersect(name_a, name_b, kind) is None:
                     raise ValueError(
                         f"{sub_name} cannot sit under both {name_a} "
                         f"and {name_b}: provably disjoint {head!r} terms — "
@@ -1473,6 +2110,443 @@ class OntoDAG(DAG):
 
         return deleted
 
+    # ---- bulk loading -------------------------------------------------------
+    #
+    # Every add_edge pays for its own redundancy check, cycle check, count
+    # plan and pruning — local work, but a loader that replays a million
+    # edges pays it a million times and prunes edges that the next line
+    # would have made redundant anyway. A bulk block buffers the edges and
+    # derives the same graph in one pass: the transitive reduction of
+    # (present ∪ buffered) edges is unique (I3), so the result is exactly
+    # what the sequential replay would have left, counts included.
+
+    # Below this many buffered edges per resident node the block replays
+    # edge by edge instead: the one pass costs the whole graph, a replay
+    # only what the edges touch.
+    _BULK_REPLAY_RATIO = 8
+    # Whether the one pass may run at all (it needs every node resident).
+    _bulk_one_pass = True
+
+    def _declares_dimensions(self):
+        """True once some registry kind node has a child — from then on
+        names may be parametric and edges imply computed order."""
+        nodes = self.nodes
+        return any(kind in nodes and nodes[kind].neighbors
+                   for kind in _dims.KINDS)
+
+    @contextmanager
+    def bulk(self, freeze=False):
+        """Buffer the edges added inside the block and apply them on exit.
+
+        Nodes are created immediately; edges (from `add_edge`, `put`,
+        `merge`, ...) are collected and, on a clean exit, reduced and
+        counted in one pass (`bulk_load`). Inside the block the graph shows
+        the nodes but not yet the buffered edges, so it is for building,
+        not for reading or removing. A block on a graph with declared
+        dimensions does not buffer, and one that declares a dimension stops
+        buffering at that edge: parametric names have to be resolved
+        against the graph as it stands, edge by edge.
+
+        On an exception nothing buffered is applied and the nodes the block
+        created are removed again; edges that were already applied (an edge
+        replay, or the unbuffered dimension case) stay, as they would in
+        `merge`. The garbage collector is paused for the block, which
+        allocates many objects and frees none; `freeze=True` then moves
+        everything into the permanent generation (`gc.freeze`) so later
+        collections never rescan the loaded graph — for a process that
+        keeps it resident, since frozen objects are never collected.
+        Nested blocks join the outer one."""
+        if self._bulk is not None:
+            yield self
+            return
+        batch = _Bulk(passthrough=self._declares_dimensions())
+        collecting = gc.isenabled()
+        gc.disable()
+        self._bulk = batch
+        try:
+            yield self
+            self._bulk = None
+            self._bulk_flush(batch)
+        except BaseException:
+            self._bulk = None
+            for name in reversed(batch.created):
+                if name in self.nodes:
+                    self.remove(name)
+            raise
+        finally:
+            self._bulk = None
+            if collecting:
+                gc.enable()
+        if freeze:
+            gc.freeze()
+
+    def bulk_load(self, edges, metadata=None, freeze=False):
+        """Add many `(parent, child)` edges in one pass.
+
+        Names (or Items) that are not in the graph yet become nodes. The
+        edges need not be reduced and may come in any order: the result is
+        the transitive reduction of the present and the given edges with
+        every count exact — the graph a replay through `add_edge` would
+        build. A cycle is refused as a whole, before anything changes.
+        `metadata` maps names to dicts merged into those nodes (incoming
+        keys win, as for a re-put). Parentless nodes are left parentless;
+        pass `("*", name)` to file one under the root. See `bulk()` for
+        `freeze`."""
+        with self.bulk(freeze=freeze):
+            nodes = self.nodes
+            batch = self._bulk
+            for parent, child in edges:
+                parent, child = _name_of(parent), _name_of(child)
+                if parent not in nodes:
+                    self.add_node(Item(parent))
+                if child not in nodes:
+                    self.add_node(Item(child))
+                if batch.passthrough or parent in _dims.KINDS:
+                    self.add_edge(nodes[parent], nodes[child])
+                elif parent != child:
+                    batch.edges.append((parent, child))   # add_edge's buffer
+            for name, values in (metadata or {}).items():
+                if name not in nodes:
+                    raise ValueError(f"Metadata for unknown node {name!r}.")
+                nodes[name].metadata.update(values)
+
+    def put_many(self, pairs, scaffold=False):
+        """`put` every `(item, supercategories)` pair, in one bulk block.
+
+        The result is the graph the puts in order would build. While no
+        dimension is declared every name is opaque, so a pair skips `put`'s
+        per-call parsing and placement checks and goes straight to the bulk
+        buffer as edges; a pair that declares a dimension, or any pair
+        after one, takes `put` itself. `scaffold=True` files a
+        supercategory that is not in the graph yet at top level first (a
+        later pair may refine it) instead of refusing the pair — the
+        projection-stream rule of `odag ingest`. `pairs` is consumed
+        lazily, so a stream need not be held in memory."""
+        with self.bulk():
+            batch = self._bulk
+            nodes = self.nodes
+            root = self.root
+            for item, supers in pairs:
+                item = _name_of(item)
+                supers = [_name_of(sup) for sup in supers]
+                if batch.passthrough or item == root.name \
+                        or not _dims.KINDS.isdisjoint(supers):
+                    if scaffold:
+                        for sup in supers:
+                            if sup not in nodes:
+                                self.put(sup, [])
+                    self.put(item, supers)
+                    continue
+                parents = []
+                for sup in supers:
+                    node = nodes.get(sup)
+                    if node is None:
+                        if not scaffold:
+                            raise ValueError(
+                                "One or more super-categories do not exist.")
+                        node = Item(sup)
+                        self.add_node(node)
+                        batch.edges.append((root.name, sup))
+                    parents.append(node)
+                child = nodes.get(item)
+                if child is None:
+                    child = Item(item)
+                    self.add_node(child)
+                for parent in parents or (root,):
+                    # add_edge's buffer, with its already-there check.
+                    if parent is not child and child not in parent.neighbors:
+                        batch.edges.append((parent.name, item))
+
+    def _bulk_flush(self, batch):
+        edges, batch.edges = batch.edges, []
+        if not edges:
+            return
+        nodes = self.nodes
+        if not self._bulk_one_pass \
+                or len(edges) * self._BULK_REPLAY_RATIO < len(nodes):
+            # A cycle is refused before the first edge goes in, as the one
+            # pass refuses it (`_inner_order`), not halfway through.
+            self._inner_order(self._children_below(edges))
+            for parent, child in edges:
+                self.add_edge(nodes[parent], nodes[child])
+            return
+        self._reduce_in_one_pass(edges)
+
+    def _children_below(self, edges):
+        """Each node's children with the buffered `edges` added, for the
+        nodes at or below the edges' children alone: a cycle through a
+        buffered edge runs from its child down to its parent, and the
+        graph had none without them."""
+        nodes = self.nodes
+        buffered = defaultdict(set)
+        for parent, child in edges:
+            buffered[parent].add(child)
+        children = {}
+        stack = [child for _, child in edges]
+        while stack:
+            name = stack.pop()
+            if name in children:
+                continue
+            kids = {child.name for child in nodes[name].neighbors}
+            kids |= buffered.get(name, set())
+            children[name] = kids
+            stack.extend(kid for kid in kids if kid not in children)
+        return {name: kids for name, kids in children.items() if kids}
+
+    def _reduce_in_one_pass(self, edges):
+        """Rewire the whole graph to the reduction of (present ∪ `edges`)
+        and recount every node, asserted order only (no dimension is
+        declared, or the block would not have buffered).
+
+        Nodes with children ("inner" nodes — categories) get bit positions
+        in topological order, and each gets two bitsets over them: the
+        inner nodes below it and the inner nodes above it. Leaves (items,
+        the bulk of any real store) get no bit at all — a million of them
+        would make every set a megabit wide. Instead:
+
+        - an inner edge u -> c is redundant iff c lies below another child
+          of u;
+        - a leaf's edge from parent p is redundant iff p lies above another
+          of the leaf's parents;
+        - a count is the inner nodes below plus the leaves whose parents
+          lie at or below, found from the leaves' side through the
+          "above" sets.
+
+        Leaves with the same parent set share all of that work, and items
+        filed under the same categories are the common case."""
+        nodes = self.nodes
+        children = {}
+        for name, node in nodes.items():
+            if node.neighbors:
+                children[name] = {child.name for child in node.neighbors}
+        for parent, child in edges:
+            kids = children.get(parent)
+            if kids is None:
+                kids = children[parent] = set()
+            kids.add(child)
+
+        order = self._inner_order(children)
+        position = {name: i for i, name in enumerate(order)}
+        # Split every child set once, with set operations running in C.
+        inner_kids = []
+        leaf_parents = defaultdict(list)
+        for i, name in enumerate(order):
+            kids = children[name]
+            inner = kids & position.keys()
+            inner_kids.append([position[child] for child in inner])
+            for leaf in kids - inner:
+                leaf_parents[leaf].append(i)
+        below, above = self._inner_cones(inner_kids)
+
+        new_children = []
+        for inner in inner_kids:
+            covered = 0
+            for j in inner:
+                covered |= below[j]
+            new_children.append([order[j] for j in inner
+                                 if not covered >> j & 1])
+        groups = {}
+        for leaf, parents in leaf_parents.items():
+            key = tuple(parents)          # ascending: appended in order
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [leaf]
+            else:
+                group.append(leaf)
+        def reached():
+            for parents, leaves in groups.items():
+                reaching = 0
+                for i in parents:
+                    reaching |= above[i]
+                for i in parents:
+                    if not reaching >> i & 1:
+                        new_children[i].extend(leaves)
+                    reaching |= 1 << i
+                yield reaching, len(leaves)
+
+        leaves_below = self._bit_tallies(reached(), len(order))
+
+        for node in nodes.values():
+            node.descendant_count = 0
+        for i, name in enumerate(order):
+            node = nodes[name]
+            node.descendant_count = below[i].bit_count() + leaves_below[i]
+            wanted = new_children[i]
+            neighbors = node.neighbors
+            if not neighbors:                 # the common case: a new node
+                for child in wanted:
+                    neighbors.add(nodes[child])
+                continue
+            if len(neighbors) == len(wanted) \
+                    and all(nodes[child] in neighbors for child in wanted):
+                continue
+            wanted = {nodes[child] for child in wanted}
+            for child in [child for child in neighbors if child not in wanted]:
+                neighbors.remove(child)
+            for child in wanted:
+                if child not in neighbors:
+                    neighbors.add(child)
+        # The rewiring above bypassed the index hooks.
+        for index in self._indexes:
+            index.rebuild()
+
+    def _wire(self, adjacency=(), recount=False):
+        """Wire a graph straight from a source that is already its own
+        reduction — a native file, its journal, an `.odb` snapshot, a
+        record store — with none of the checks `add_edge` makes.
+
+        `adjacency` yields `(node, children, parents)`, Items already in
+        `self.nodes`. Each direction is one C-level `set.update`, past
+        `_EdgeSet.add` and its per-edge bookkeeping of `parents`, which is
+        why the caller gives both. With `recount` the descendant counts are
+        derived from the result (`_recount`); without, the caller has set
+        them. Nothing here told the index hooks (`DAG.__init__`) about
+        the wiring, or about any the caller did directly before calling,
+        so every index is rebuilt from the graph as it now stands."""
+        update = set.update
+        for node, children, parents in adjacency:
+            update(node.neighbors, children)
+            update(node.parents, parents)
+        if recount:
+            self._recount()
+        for index in self._indexes:
+            index.rebuild()
+
+    def _recount(self):
+        """Set every descendant count from the edges as they stand, in one
+        reverse-topological pass.
+
+        For a graph wired directly from a source that is already its own
+        reduction (a checksummed native file), where nothing maintained
+        the counts and nothing needs reducing. The same scheme as
+        `_reduce_in_one_pass`: inner nodes get bits, and leaves with the
+        same parents are counted once, through their parents' "above"
+        sets."""
+        nodes = self.nodes
+        children = {name: [child.name for child in node.neighbors]
+                    for name, node in nodes.items() if node.neighbors}
+        order = self._inner_order(children)
+        position = {name: i for i, name in enumerate(order)}
+        inner_kids = []
+        leaf_parents = defaultdict(list)
+        for i, name in enumerate(order):
+            inner = []
+            for child in children[name]:
+                j = position.get(child)
+                if j is None:
+                    leaf_parents[child].append(i)
+                else:
+                    inner.append(j)
+            inner_kids.append(inner)
+        below, above = self._inner_cones(inner_kids)
+        groups = defaultdict(int)
+        for parents in leaf_parents.values():
+            groups[tuple(parents)] += 1
+        def reached():
+            for parents, leaves in groups.items():
+                reaching = 0
+                for i in parents:
+                    reaching |= above[i] | (1 << i)
+                yield reaching, leaves
+
+        leaves_below = self._bit_tallies(reached(), len(order))
+        for node in nodes.values():
+            node.descendant_count = 0
+        for i, name in enumerate(order):
+            nodes[name].descendant_count = \
+                below[i].bit_count() + leaves_below[i]
+
+    def _inner_order(self, children):
+        """The nodes with children, in topological order (Kahn). Leaves
+        cannot sit on a cycle, so this is the whole cycle check."""
+        waiting = dict.fromkeys(children, 0)
+        for kids in children.values():
+            for child in kids:
+                if child in waiting:
+                    waiting[child] += 1
+        order = [name for name, count in waiting.items() if not count]
+        for name in order:                    # grows as nodes become ready
+            for child in children[name]:
+                if child in waiting:
+                    waiting[child] -= 1
+                    if not waiting[child]:
+                        order.append(child)
+        if len(order) < len(children):
+            raise ValueError(
+                "Bulk load would create a cycle through "
+                f"{', '.join(self._cycle_members(children, waiting))}.")
+        return order
+
+    @staticmethod
+    def _inner_cones(inner_kids):
+        """Per inner node (by topological position), the bitsets of the
+        inner nodes strictly below and strictly above it."""
+        size = len(inner_kids)
+        below = [0] * size
+        for i in range(size - 1, -1, -1):
+            cone = 0
+            for j in inner_kids[i]:
+                cone |= below[j] | (1 << j)
+            below[i] = cone
+        above = [0] * size
+        for i in range(size):
+            up = above[i] | (1 << i)
+            for j in inner_kids[i]:
+                above[j] |= up
+        return below, above
+
+    @staticmethod
+    def _bit_tallies(weighted, size):
+        """For each bit position below `size`, the total weight of the
+        `(mask, weight)` pairs whose mask has it set. `weighted` is
+        consumed lazily: a million leaf groups' masks never exist at once.
+
+        Bit-sliced: `counters[k]` holds bit k of every position's running
+        total, so adding a mask is a binary-counter carry across all
+        positions at once — a few big-int operations per mask instead of
+        one Python step per set bit, which is what dominated the count
+        pass when leaves sit under many categories."""
+        counters = []
+        for mask, weight in weighted:
+            level = 0
+            while weight:
+                if weight & 1:
+                    while len(counters) < level:
+                        counters.append(0)
+                    carry, k = mask, level
+                    while carry:
+                        if k == len(counters):
+                            counters.append(carry)
+                            break
+                        held = counters[k]
+                        counters[k], carry = held ^ carry, held & carry
+                        k += 1
+                weight >>= 1
+                level += 1
+        tallies = [0] * size
+        for k, bits in enumerate(counters):
+            step = 1 << k
+            while bits:
+                low = bits & -bits
+                tallies[low.bit_length() - 1] += step
+                bits ^= low
+        return tallies
+
+    @staticmethod
+    def _cycle_members(children, waiting):
+        """A few names on (or between) the cycles Kahn could not resolve:
+        the unresolved nodes, minus those with no unresolved child."""
+        stuck = {name for name, count in waiting.items() if count}
+        trimmed = True
+        while trimmed:
+            trimmed = False
+            for name in list(stuck):
+                if not any(child in stuck for child in children[name]):
+                    stuck.discard(name)
+                    trimmed = True
+        names = sorted(stuck)
+        return names[:5] + (["..."] if len(names) > 5 else [])
+
     def merge(self, other_dag):
         """Merge another OntoDAG into this one.
 
@@ -1482,23 +2556,28 @@ class OntoDAG(DAG):
         if not isinstance(other_dag, OntoDAG):
             raise ValueError("Can only merge with another OntoDAG instance.")
 
-        # Pass 1: add all missing nodes (no edges yet). Metadata merges
-        # per key with ours winning on conflict (same policy as the
-        # payload/meta carry-over in EagerOntoDAG.merge).
-        for node_name, other_node in other_dag.nodes.items():
-            if node_name not in self.nodes:
-                self.add_node(Item(node_name, metadata=other_node.metadata))
-            else:
-                for key, value in other_node.metadata.items():
-                    self.nodes[node_name].metadata.setdefault(key, value)
-
-        # Pass 2: add edges in topological order (general → specific) using
-        # add_edge so _remove_unneeded_edges prunes redundant edges correctly.
-        for other_node in other_dag.topological_sort():
-            self_node = self.nodes[other_node.name]
-            for neighbor in other_node.neighbors:
-                if neighbor.name in self.nodes:
-                    self.add_edge(self_node, self.nodes[neighbor.name])
+        # One bulk block: a merge of a comparable graph is reduced and
+        # counted in one pass, a small one replays edge by edge.
+        with self.bulk():
+            # Pass 1: add all missing nodes (no edges yet). Metadata merges
+            # per key with ours winning on conflict (same policy as the
+            # payload/meta carry-over in EagerOntoDAG.merge).
+            for node_name, other_node in other_dag.nodes.items():
+                if node_name not in self.nodes:
+                    self.add_node(
+                        Item(node_name, metadata=other_node.metadata))
+                else:
+                    for key, value in other_node.metadata.items():
+                        self.nodes[node_name].metadata.setdefault(key, value)
+
+            # Pass 2: add edges in topological order (general → specific)
+            # using add_edge so _remove_unneeded_edges prunes redundant
+            # edges correctly.
+            for other_node in other_dag.topological_sort():
+                self_node = self.nodes[other_node.name]
+                for neighbor in other_node.neighbors:
+                    if neighbor.name in self.nodes:
+                        self.add_edge(self_node, self.nodes[neighbor.name])
 
         self._remove_duplicate_root_edges()
 
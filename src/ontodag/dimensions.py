@@ -671,6 +671,23 @@ def space_of(name, kind, units=None):
     return "prefix"
 
 
+def denotation(name, kind, units=None):
+    """The parsed value of a parametric term — what `contains` and
+    `intersect` compare. A caller asking about the same names over and over
+    (the DAG's parse cache) keeps these and uses the `_denoted` forms."""
+    return _denotation(split_term(name)[1], kind, units)
+
+
+def bounds(name, kind, units=None):
+    """(family, lo, hi) of an interval-valued term — the closed interval
+    `contains` and `intersect` compare, None for an unbounded end — or None
+    for the kinds whose order is not an interval order (dominance, prefix).
+    This is what an index sorts values by (ontodag.intervals)."""
+    if kind not in _INTERVALISH:
+        return None
+    return _denotation(split_term(name)[1], kind, units)
+
+
 def _same_head(a, b):
     head_a, param_a = split_term(a)
     head_b, param_b = split_term(b)
@@ -704,24 +721,33 @@ def contains(outer, inner, kind, units=None):
     incomparable, never mutually contained (that is what keeps the combined
     relation a partial order — DIMENSIONS.md §11, I1)."""
     _, param_outer, param_inner = _same_head(outer, inner)
+    if kind not in KINDS:
+        raise ValueError(f"unknown dimension kind {kind!r}")
+    return contains_denoted(outer, _denotation(param_outer, kind, units),
+                            inner, _denotation(param_inner, kind, units),
+                            kind)
+
+
+def contains_denoted(outer, outer_value, inner, inner_value, kind):
+    """`contains` on already parsed denotations (see `denotation`); the
+    names are for the error messages only, and must share a head."""
     if kind in _INTERVALISH:
-        fam_o, lo_o, hi_o = _denotation(param_outer, kind, units)
-        fam_i, lo_i, hi_i = _denotation(param_inner, kind, units)
+        fam_o, lo_o, hi_o = outer_value
+        fam_i, lo_i, hi_i = inner_value
         if fam_o != fam_i:
             raise ValueError(_family_mismatch(outer, fam_o, inner, fam_i))
         lo_ok = lo_o is None or (lo_i is not None and lo_i >= lo_o)
         hi_ok = hi_o is None or (hi_i is not None and hi_i <= hi_o)
         return lo_ok and hi_ok
     if kind == KIND_DOMINANCE:
-        fam_o, values_o = _parse_dominance(param_outer, units)
-        fam_i, values_i = _parse_dominance(param_inner, units)
+        fam_o, values_o = outer_value
+        fam_i, values_i = inner_value
         if fam_o != fam_i or len(values_o) != len(values_i):
             raise ValueError(
                 f"incompatible dominance spaces: {outer!r} vs {inner!r}")
         return all(o >= i for o, i in zip(values_o, values_i))
     if kind == KIND_PREFIX:
-        return _parse_prefix(param_inner).startswith(
-            _parse_prefix(param_outer))
+        return inner_value.startswith(outer_value)
     raise ValueError(f"unknown dimension kind {kind!r}")
 
 
@@ -730,10 +756,20 @@ def intersect(a, b, kind, units=None):
     intersection is provably empty. Within a dimension meets are exact —
     the planner pre-intersects same-head query terms with this, and the
     disjoint-parents guard raises on None (DIMENSIONS.md §8, §9)."""
-    head, param_a, param_b = _same_head(a, b)
+    _, param_a, param_b = _same_head(a, b)
+    if kind not in KINDS:
+        raise ValueError(f"unknown dimension kind {kind!r}")
+    return intersect_denoted(a, _denotation(param_a, kind, units),
+                             b, _denotation(param_b, kind, units), kind)
+
+
+def intersect_denoted(a, a_value, b, b_value, kind):
+    """`intersect` on already parsed denotations (see `denotation`); the
+    names must share a head."""
+    head = split_term(a)[0]
     if kind in _INTERVALISH:
-        fam_a, lo_a, hi_a = _denotation(param_a, kind, units)
-        fam_b, lo_b, hi_b = _denotation(param_b, kind, units)
+        fam_a, lo_a, hi_a = a_value
+        fam_b, lo_b, hi_b = b_value
         if fam_a != fam_b:
             raise ValueError(_family_mismatch(a, fam_a, b, fam_b))
         lo = lo_a if lo_b is None else lo_b if lo_a is None else max(lo_a, lo_b)
@@ -742,16 +778,15 @@ def intersect(a, b, kind, units=None):
             return None
         return f"{head}({_render((fam_a, lo, hi), kind)})"
     if kind == KIND_DOMINANCE:
-        fam_a, values_a = _parse_dominance(param_a, units)
-        fam_b, values_b = _parse_dominance(param_b, units)
+        fam_a, values_a = a_value
+        fam_b, values_b = b_value
         if fam_a != fam_b or len(values_a) != len(values_b):
             raise ValueError(
                 f"incompatible dominance spaces: {a!r} vs {b!r}")
         meet = tuple(min(x, y) for x, y in zip(values_a, values_b))
         return f"{head}({_render((fam_a, meet), kind)})"
     if kind == KIND_PREFIX:
-        value_a = _parse_prefix(param_a)
-        value_b = _parse_prefix(param_b)
+        value_a, value_b = a_value, b_value
         if value_a.startswith(value_b):
             return f"{head}({value_a})"
         if value_b.startswith(value_a):
@@ -16,9 +16,13 @@ Implements the design in docs/SWARM_DESIGN.md:
   changes back through staged puts + ``commit()`` (§6). Mutation semantics
   (acyclicity, transitive reduction, counts) are entirely inherited from
   `OntoDAG` — this class only adds persistence.
-- ``commit()`` diffs the current graph against the last-synced records and
-  stages only what changed, so the store's structural sharing keeps small
-  changes small.
+- ``commit()`` stages only the records that changed since the last sync,
+  so the store's structural sharing keeps small changes small — and it
+  finds them without diffing the whole graph: the DAG's index hooks name
+  the nodes a change touched (`_DirtyNames`), and only those records are
+  rebuilt and compared.
+- Given a snapshot cache (`ontodag.snapshots`), hydration maps the graph
+  at the nearest cached root and reads only the records that differ.
 
 The store is duck-typed (``get``/``put``/``delete``/``keys``/``commit``,
 plus an optional ``items()`` used for batched hydration when present),
@@ -27,13 +31,78 @@ nothing from `recordstore`, keeping the core↔recordstore dependency
 one-directional even here (see tests/test_boundaries.py).
 """
 
+import gc
+import sys
+from operator import attrgetter
+
+from ontodag import odb
 from ontodag.dag import Item, OntoDAG, _name_of
 
+_annotated = attrgetter("metadata")
+
+
+class _DirtyNames:
+    """The nodes whose records may have changed since the last commit.
+
+    Registered as one of the DAG's indexes (the hook protocol of
+    `ontodag.bitmaps`), so every structural change names what it touched:
+    an added or forgotten node, both ends of an added or removed edge.
+    Counts move without hooks, but only above a changed edge — a count
+    changes only if some path below the node gained or lost an edge, and
+    the prefix of that path survives — so `names()` adds the ancestors of
+    every changed edge's parent, as the graph now stands. A wholesale
+    rewiring (`bulk()`, hence `merge`) has no per-edge story and makes the
+    next commit diff everything (`lost`)."""
+
+    def __init__(self):
+        self.touched = set()
+        self.parents = set()
+        self.lost = False
+
+    def rebuild(self):
+        self.lost = True
+
+    def node_added(self, node):
+        self.touched.add(node.name)
+
+    def node_forgotten(self, node):
+        self.touched.add(node.name)
+
+    def edge_added(self, parent, child):
+        self.touched.add(child.name)
+        self.parents.add(parent.name)
+
+    edge_removed = edge_added
+
+    def names(self, dag):
+        """Every name whose record may differ from its last-synced one,
+        or None when only a full diff can tell."""
+        if self.lost:
+            return None
+        above = {name for name in self.parents if name in dag.nodes}
+        frontier = [dag.nodes[name] for name in above]
+        while frontier:
+            for parent in dag._live_parents(frontier.pop()):
+                if parent.name not in above:
+                    above.add(parent.name)
+                    frontier.append(parent)
+        return above | self.touched
+
+    def clear(self):
+        self.touched, self.parents, self.lost = set(), set(), False
+
 
 class EagerOntoDAG(OntoDAG):
-    def __init__(self, record_store):
+    # Cross-check every commit's dirty set against a full diff of the
+    # graph, raising RuntimeError on a record the hooks missed: O(store)
+    # per commit again, so for tests and debugging (set it on the class or
+    # on one instance).
+    verify_commits = False
+
+    def __init__(self, record_store, snapshots=None):
         super().__init__()
         self.store = record_store
+        self._snapshots = snapshots     # a snapshots.SnapshotCache, or None
         # The root of this dag's own hydrate/commit lineage — what its
         # in-memory state is a mutation of. `store.root` is not a substitute:
         # a transient-window deployment rebinds `store` to a fresh handle
@@ -41,34 +110,103 @@ class EagerOntoDAG(OntoDAG):
         # move under a live handle, so only the dag itself can say which
         # root it last synced with.
         self.base_root = getattr(record_store, "root", None)
-        self._synced = {}          # key -> record as of the last commit/hydrate
+        # key -> record as of the last commit/hydrate (a snapshots.Records
+        # when hydrated from a snapshot)
+        self._synced = {}
         self._payloads = {}        # name -> swarm ref
         # node meta lives on Item.metadata (records' "meta" field)
         self._hydrate()
+        # Metadata has no hooks (it is a plain dict, edited in place by
+        # callers), so commit compares the annotated nodes: these, whose
+        # synced records carry meta (the graph is as synced here), and any
+        # that carry it now.
+        self._annotated = {node.name for node in
+                           filter(_annotated, self.nodes.values())}
+        self._dirty = _DirtyNames()
+        if self.root.name not in self._synced:
+            self._dirty.touched.add(self.root.name)     # a new store
+        self._indexes.append(self._dirty)
 
     # ------------------------------------------------------------------ sync
 
     def commit(self, message=None):
         """Stage every changed node record, commit, return the new root.
 
-        `message` labels the resulting state in the store's timeline (it is
-        never part of the content — see `RecordStore.commit`). Passed through
-        only when given, so a duck-typed store with a plain `commit()` keeps
-        working."""
-        current = {name: self._record_for(node)
-                   for name, node in self.nodes.items()}
-        for name, record in current.items():
-            if self._synced.get(name) != record:
-                self.store.put(name, record)
-        for name in self._synced:
-            if name not in current:
+        Only the records of dirty names are rebuilt and compared (see
+        `_DirtyNames`), so a one-item put into a large store costs its
+        ancestors at commit, not the store. `message` labels the resulting
+        state in the store's timeline (it is never part of the content —
+        see `RecordStore.commit`). Passed through only when given, so a
+        duck-typed store with a plain `commit()` keeps working."""
+        names = self._dirty_names()
+        changed = self._changed(names)
+        if self.verify_commits and names is not None:
+            expected = self._changed(None)
+            if changed != expected:
+                missed = sorted(set(expected) ^ set(changed))
+                raise RuntimeError(
+                    f"dirty tracking disagrees with the full diff on "
+                    f"{len(missed)} record(s): {', '.join(missed[:5])}")
+        for name, record in changed.items():
+            if record is None:
                 self.store.delete(name)
+            else:
+                self.store.put(name, record)
         root = (self.store.commit(message=message) if message is not None
                 else self.store.commit())
-        self._synced = current
+        for name, record in changed.items():
+            if record is None:
+                del self._synced[name]
+            else:
+                self._synced[name] = record
+            if record is not None and record["meta"]:
+                self._annotated.add(name)
+            else:
+                self._annotated.discard(name)
+        self._dirty.clear()
         self.base_root = root
         return root
 
+    def _dirty_names(self):
+        """The names whose records may have changed since the last sync,
+        or None when only a full diff can tell."""
+        names = self._dirty.names(self)
+        if names is not None:
+            # An annotated node is dirty when its metadata moved: a dict
+            # comparison against the synced record, not a record rebuilt.
+            nodes, synced = self.nodes, self._synced
+            annotated = self._annotated
+            for name in annotated:
+                node, record = nodes.get(name), synced.get(name)
+                if node is None or record is None \
+                        or node.metadata != record["meta"]:
+                    names.add(name)
+            # One annotated since the last sync has metadata where its
+            # synced record had none.
+            names.update(node.name for node in
+                         filter(_annotated, nodes.values())
+                         if node.name not in annotated)
+        return names
+
+    def _changed(self, names):
+        """`{name: record}` for each of `names` (None: every node, and every
+        synced name) whose record differs from the synced one; None as the
+        record of a name that no longer exists."""
+        nodes, synced = self.nodes, self._synced
+        if names is None:
+            names = set(nodes) | set(synced)
+        changed = {}
+        for name in names:
+            node = nodes.get(name)
+            if node is None:
+                if name in synced:
+                    changed[name] = None
+                continue
+            record = self._record_for(node)
+            if synced.get(name) != record:
+                changed[name] = record
+        return changed
+
     def _record_for(self, node):
         return {
             "up": sorted(parent.name for parent in node.parents
@@ -82,24 +220,109 @@ class EagerOntoDAG(OntoDAG):
         }
 
     def _hydrate(self):
-        records = dict(self._all_records())
-        if not records:
+        cached = self._snapshots is not None and self.base_root is not None
+        if cached and self._hydrate_cached():
             return
         # Records are the canonical, already-reduced state, so the graph is
-        # reconstructed directly instead of replayed through put().
-        for name in records:
-            if name != self.root.name:
-                self.add_node(Item(name))
-        for name, record in records.items():
-            node = self.nodes[name]
-            for child_name in record["down"]:
-                node.neighbors.add(self.nodes[child_name])
+        # reconstructed directly instead of replayed through put(): nodes as
+        # the records stream in (a window at a time, `_all_records`), then
+        # each node's adjacency in two C-level updates (`DAG._wire`), off
+        # the synced records' own lists. Names are interned, so a name is
+        # one string however many of those lists repeat it; the collector
+        # is held off while the graph is built, as `odb.read` does.
+        nodes, records, intern = self.nodes, {}, sys.intern
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for name, record in self._all_records():
+                name = intern(name)
+                record["up"] = list(map(intern, record["up"]))
+                record["down"] = list(map(intern, record["down"]))
+                records[name] = record
+                node = nodes.get(name)
+                if node is None:
+                    node = nodes[name] = Item(name)
+                node.descendant_count = record["count"]
+                if record.get("payload") is not None:
+                    self._payloads[name] = record["payload"]
+                if record.get("meta"):
+                    node.metadata = dict(record["meta"])
+            if not records:
+                return
+            node_named = nodes.__getitem__
+            self._wire((nodes[name], map(node_named, record["down"]),
+                        map(node_named, record["up"]))
+                       for name, record in records.items())
+        finally:
+            if collecting:
+                gc.enable()
+        self._synced = records
+        if cached:
+            self._snapshots.store(self, self.base_root, self._payloads)
+
+    def _hydrate_cached(self):
+        """Hydrate from the snapshot cache: the graph at the nearest cached
+        root, brought to `base_root` by the records that differ between
+        the two. False, with nothing loaded, when nothing usable is
+        cached."""
+        from ontodag.snapshots import REFRESH, Records
+        found = self._snapshots.nearest(self.base_root)
+        if found is None:
+            return False
+        cached, path, payloads = found
+        changes = []
+        if cached != self.base_root:
+            from ontodag._extras import require
+            rs = require("recordstore", "store", "the snapshot cache")
+            blobs = getattr(self.store, "blobs", None)
+            if blobs is None:
+                return False
+            try:
+                changes = [
+                    (key, None if theirs is rs.ABSENT else theirs)
+                    for key, _, theirs in rs.RecordStore.at(
+                        cached, blobs).diff(self.base_root)]
+            except KeyError:            # the cached root is not in this store
+                return False
+        odb.read(path, into=self)
+        self._payloads = dict(payloads)
+        self._synced = Records(path, payloads)
+        if changes:
+            self._rewire(changes)
+            if len(changes) * REFRESH > len(self.nodes):
+                self._snapshots.store(self, self.base_root, self._payloads)
+        return True
+
+    def _rewire(self, changes):
+        """Bring the graph to the `(name, record)` pairs of `changes` (None
+        for a record gone), wired directly as `_hydrate` wires: an edge
+        that moved changed the records at both its ends, so every node
+        whose adjacency moved is among them."""
+        nodes = self.nodes
+        for name, record in changes:
+            if record is None:
+                node = nodes.pop(name, None)
+                if node is not None:
+                    node.neighbors.clear()
+            elif name not in nodes:
+                nodes[name] = Item(name)
+        for name, record in changes:
+            if record is None:
+                self._synced.pop(name, None)
+                self._payloads.pop(name, None)
+                continue
+            node = nodes[name]
+            node.neighbors.clear()
+            node.neighbors.update(nodes[child] for child in record["down"])
             node.descendant_count = record["count"]
+            node.metadata = dict(record["meta"]) if record.get("meta") else {}
             if record.get("payload") is not None:
                 self._payloads[name] = record["payload"]
-            if record.get("meta"):
-                node.metadata = dict(record["meta"])
-        self._synced = records
+            else:
+                self._payloads.pop(name, None)
+            self._synced[name] = record
+        for index in self._indexes:
+            index.rebuild()
 
     def _all_records(self):
         """Every ``(key, record)`` in the store, batched where the store allows.
@@ -124,6 +347,7 @@ class EagerOntoDAG(OntoDAG):
         name = self._canonical_name(_name_of(subcategory))
         if payload is not None:
             self._payloads[name] = payload
+            self._dirty.touched.add(name)
         if meta is not None:
             self.nodes[name].metadata = dict(meta)
 
@@ -137,7 +361,9 @@ class EagerOntoDAG(OntoDAG):
         # Carry payloads from the other side; ours win on conflict.
         if isinstance(other_dag, EagerOntoDAG):
             for name, payload in other_dag._payloads.items():
-                self._payloads.setdefault(name, payload)
+                if name not in self._payloads:
+                    self._payloads[name] = payload
+                    self._dirty.touched.add(name)
 
     def sync(self, other_root, bytes_store=None) -> str:
         """Fold a peer's published state into this graph, commit the union,
@@ -252,12 +478,10 @@ class EagerOntoDAG(OntoDAG):
         for key, _mine, theirs in diff:
             if theirs is not rs.ABSENT:
                 touched[key] = theirs
-        for key, record in self._synced.items():
-            if key in diff_keys:
-                continue
-            node = self.nodes.get(key)
-            if node is None or self._record_for(node) != record:
-                touched[key] = record    # peer's copy equals our baseline
+        # Locally dirty keys: the peer's copy equals our baseline.
+        for key in self._changed(self._dirty_names()):
+            if key not in diff_keys and key in self._synced:
+                touched[key] = self._synced[key]
 
         # Pass 1: nodes, ours-win metadata and payloads (merge()'s policy).
         for key in sorted(touched):
@@ -272,6 +496,7 @@ class EagerOntoDAG(OntoDAG):
                     node.metadata.setdefault(meta_key, value)
             if record.get("payload") is not None:
                 self._payloads.setdefault(key, record["payload"])
+            self._dirty.touched.add(key)
         # Pass 2: replay the peer's asserted edges. Every parent a peer
         # record names exists by now: an unchanged-in-both parent is
         # already ours, a changed or peer-new one is in the diff, and a
@@ -291,4 +516,8 @@ class EagerOntoDAG(OntoDAG):
                     self._synced.pop(key, None)
                 else:
                     self._synced[key] = theirs
+                # The baseline moved under the graph: compare it again.
+                self._dirty.touched.add(key)
+                if theirs is not rs.ABSENT and theirs.get("meta"):
+                    self._annotated.add(key)
         return bool(touched)
@@ -0,0 +1,92 @@
+"""FederatedOntoDAG — query several layers as one graph, without building it.
+
+`Session.view()` answers over the primary store and its overlays by
+composing them: a fresh OntoDAG, every layer merged in, the union
+re-reduced. That costs the size of every layer before the first answer,
+however small the question. A federated view answers the same questions
+by walking the layers where they stand: a node is its name, and its edges
+are the union of that name's edges in every layer that has it, so a walk
+crosses from one layer to another wherever a name appears in both.
+
+It is a `LazyOntoDAG` whose "record store" is the layers: fetching a name
+looks it up in each layer and joins what they hold — children and
+parents (live edges only), metadata with the earlier layer winning, as
+merge does. Everything the lazy reader does on top of records then holds
+unchanged: nodes are expanded as the query walks them, cones are cached,
+writes are refused, and `explain` counts the lookups as `fetches`. A
+layer that is itself a `LazyOntoDAG` stays lazy: only the names a query
+touches are fetched from it.
+
+Why the answers agree with the composed view: a query is cones and
+upward walks, and cones are reduction-invariant — the union of the
+layers' edges reaches exactly what its reduction reaches, so leaving
+edges one layer makes redundant in place changes no answer. Two things
+differ. `descendant_count` is the largest of the layers' counts, not the
+union's: the planner reads it only to order cones and price steps, so
+plans may differ while answers do not. And whole-graph operations
+(`topological_sort`, pictures, `show`) would see the unreduced union of
+what was touched; those are for the composed view (`load_all()` makes
+every name resident, still unreduced).
+"""
+
+from ontodag.lazy import LazyOntoDAG
+
+
+class _Layers:
+    """The layers as one duck-typed record store: a name's record is the
+    union of what every layer holding it says about it."""
+
+    def __init__(self, layers):
+        self.layers = list(layers)
+
+    def get(self, name):
+        up, down, meta, count, found = set(), set(), {}, 0, False
+        for layer in self.layers:
+            node = layer.nodes.get(name)
+            if node is None:
+                continue
+            found = True
+            # dict.get: the identity check must not fetch on a lazy layer.
+            nodes = layer.nodes
+            down.update(child.name for child in node.neighbors
+                        if dict.get(nodes, child.name) is child)
+            up.update(parent.name for parent in node.parents
+                      if dict.get(nodes, parent.name) is parent)
+            for key, value in node.metadata.items():
+                meta.setdefault(key, value)
+            count = max(count, node.descendant_count)
+        if not found:
+            raise KeyError(name)
+        return {"up": list(up), "down": list(down), "count": count,
+                "meta": meta}
+
+    def keys(self):
+        names = set()
+        for layer in self.layers:
+            load_all = getattr(layer, "load_all", None)
+            if load_all is not None:
+                load_all()
+            names.update(layer.nodes)
+        return sorted(names)
+
+
+class FederatedOntoDAG(LazyOntoDAG):
+    """Read-only view of `layers` (OntoDAGs of any residency, in order of
+    precedence) as one graph, walked in place rather than merged."""
+
+    def __init__(self, layers, cache_cones=True, max_cached_cones=64):
+        super().__init__(_Layers(layers), cache_cones=cache_cones,
+                         max_cached_cones=max_cached_cones)
+
+    @property
+    def layers(self):
+        return self.store.layers
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            "FederatedOntoDAG is a read-only view of its layers: write to "
+            "one of them (the primary store), then build the view again.")
+
+    put = put_many = remove = merge = bulk_load = _read_only
+    add_edge = remove_edge = add_node = _read_only
+    commit = _read_only
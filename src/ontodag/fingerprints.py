@@ -0,0 +1,246 @@
+"""Ingest fingerprints — what the last `odag ingest` of a stream left behind.
+
+The projection contract makes a full re-ingest after every rescan the
+normal operation (`docs/plans/PROJECTIONS.md` §4): idempotent puts, and
+with `--drop` a cone-delete and rebuild. On an unchanged stream all of
+that work changes nothing. So each ingest leaves a fingerprint of the
+stream and of the store it produced, one per (target store, source):
+
+    ~/.ontodag/ingests/<key>.json      the stream's sha256, the `--drop`
+                                       names, the target's stamp after the
+                                       save, the supercategory names used
+    ~/.ontodag/ingests/<key>.digests   a digest per item of its memberships
+
+The next ingest of the same source into the same store compares. While
+the store is still at the recorded stamp — nobody wrote to it since, so
+it is exactly what that ingest left — an unchanged stream (same sha256,
+same `--drop`) is done without reading a line into the graph, and a
+changed one is applied as a delta: only the items whose digest moved.
+
+Without `--drop` the delta is exact by idempotence: every unchanged line
+is already asserted, and the puts of the changed ones are what a re-run
+adds. With `--drop` the rebuild also takes memberships away, which the
+delta (`refile`) reproduces by re-filing each changed item as the rebuild
+would leave it: the parents it keeps through the cone-delete (those not
+deleted with the cone, as `cone_removal_plan` decides), plus the ones the
+new stream gives it. That is only local when the changed items are
+leaves of the graph and the stream's categories are the same set; a
+change to the category structure is refused, and ingest rebuilds in full.
+
+Both shortcuts take the recorded store for what a rebuild from the same
+stream leaves, so a `--drop` ingest records its fingerprint only when
+that holds of the graph it left (`cut` and `rebuilds_to_itself`): a
+cone-delete of the `--drop` names followed by the stream's puts would
+change nothing. It need not — a node the store files under a dropped
+category that the stream does not, say, survives the first rebuild
+(nothing held it under the category before) and goes with the second.
+Such an ingest leaves no fingerprint, and the next one runs in full.
+
+A digest is the sum of a 64-bit hash of each of the item's lines, so an
+item filed over several lines needs no buffering, and a line repeated is
+a change (re-filed, never missed). Nothing is recorded inside a
+transaction, for a past version, or with a store key configured: the
+digests name every item in the clear.
+"""
+
+import hashlib
+import json
+import os
+
+DIRECTORY = "ingests"
+VERSION = 1
+_MASK = (1 << 64) - 1
+
+
+def line_digest(supers):
+    """The 64-bit hash of one line's supercategories (in any order)."""
+    joined = "\0".join(sorted(supers)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(joined, digest_size=8).digest(),
+                          "big")
+
+
+def add_line(digests, item, supers):
+    """Fold one line into `digests` (item -> digest)."""
+    digests[item] = (digests.get(item, 0) + line_digest(supers)) & _MASK
+
+
+class Fingerprints:
+    """The fingerprint of the last ingest of `source` (a path, or "-" for
+    stdin) into the store `target` (a store spec)."""
+
+    def __init__(self, home, target, source):
+        key = hashlib.sha256(json.dumps([target, source]).encode(
+            "utf-8")).hexdigest()
+        base = os.path.join(home, DIRECTORY, key[:32])
+        self.target, self.source = target, source
+        self.manifest = base + ".json"
+        self.path = base + ".digests"
+
+    def recorded(self, drop, stamp):
+        """The manifest, if the last ingest used the same `drop` names and
+        left the store at `stamp`; else None."""
+        try:
+            with open(self.manifest, encoding="utf-8") as fh:
+                recorded = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(recorded, dict) \
+                or recorded.get("version") != VERSION \
+                or recorded.get("target") != self.target \
+                or recorded.get("drop") != sorted(drop) \
+                or recorded.get("stamp") != stamp:
+            return None
+        return recorded
+
+    def digests(self, recorded):
+        """The item digests written with `recorded`, or None."""
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                stored = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(stored, dict) \
+                or stored.get("stream") != recorded["stream"]:
+            return None
+        return stored.get("items")
+
+    def store(self, drop, stamp, stream, supers, digests):
+        """Record an ingest of the stream with sha256 `stream` that left the
+        store at `stamp`."""
+        os.makedirs(os.path.dirname(self.manifest), exist_ok=True)
+        for path, content in (
+                (self.path, {"stream": stream, "items": digests}),
+                (self.manifest, {"version": VERSION, "target": self.target,
+                                 "source": self.source, "drop": sorted(drop),
+                                 "stamp": stamp, "stream": stream,
+                                 "supers": sorted(supers)})):
+            temporary = f"{path}.tmp{os.getpid()}"
+            with open(temporary, "w", encoding="utf-8") as fh:
+                json.dump(content, fh)
+            os.replace(temporary, path)
+
+
+def changed(old, new):
+    """The items whose memberships moved between two digest tables,
+    dropped items included."""
+    moved = {item for item, digest in new.items() if old.get(item) != digest}
+    moved.update(item for item in old if item not in new)
+    return moved
+
+
+def cut(dag, drop):
+    """What the cone-delete of `drop` would cut from `dag`: `(lost,
+    deleted)`, `lost` mapping each member of the cone that loses a parent
+    to the names of the parents it loses, `deleted` the names deleted."""
+    nodes = dag.nodes
+    targets = [name for name in drop if name in nodes]
+    if not targets:
+        return {}, set()
+    cone, deleted = dag.cone_removal_plan(targets)
+    lost = {}
+    for name in cone:
+        parents = {parent.name for parent in nodes[name].parents
+                   if nodes.get(parent.name) is parent
+                   and (name in deleted or parent.name in deleted)}
+        if parents:
+            lost[name] = parents
+    return lost, deleted
+
+
+def rebuilds_to_itself(dag, lost, deleted, supers_of, categories):
+    """Whether the stream gives back everything the cone-delete cuts
+    (`cut`), so that a rebuild would leave `dag` as it is: each deleted
+    node named by the stream and carrying no metadata, each lost parent
+    one the stream files the node under. `supers_of` maps the stream's
+    items (those in `lost`, at least) to their supercategories; a name
+    only `categories` holds is created at top level, under the root."""
+    root = dag.root.name
+    if root in deleted:
+        return False
+    for name in deleted:
+        if dag.nodes[name].metadata \
+                or name not in supers_of and name not in categories:
+            return False
+    for name, parents in lost.items():
+        given = supers_of.get(name)
+        if given is None and name not in categories:
+            return False
+        if not parents <= (set(given or ()) or {root}):
+            return False
+    return True
+
+
+def refile(dag, items, supers_of, drop, categories, previous):
+    """Bring `dag` — what an ingest with `--drop drop` left — to what a
+    rebuild from the new stream leaves, re-filing only `items`.
+
+    `supers_of` maps each changed item still in the stream to its
+    supercategories (an item missing from it left the stream);
+    `categories` and `previous` are the supercategory names the new and
+    the last stream use. Returns False, with `dag` untouched, when the
+    change is not local: a changed item that is a category, a category
+    set that moved, or a declared dimension (computed order)."""
+    nodes = dag.nodes
+    if categories != previous or not categories <= nodes.keys() \
+            or dag._declares_dimensions():
+        return False
+    targets = {name for name in drop if name in nodes}
+    if dag.root.name in targets:
+        return False
+    for item in items:
+        node = nodes.get(item)
+        if item in categories or node is not None and any(
+                nodes.get(child.name) is child for child in node.neighbors):
+            return False
+
+    deleted = {}
+
+    def goes(name):
+        """Whether the cone-delete of `targets` deletes category `name`:
+        a target, or every parent deleted. Settled parents first, on an
+        explicit stack (I6: no recursion)."""
+        stack = [name]
+        while stack:
+            current = stack[-1]
+            if current in deleted:
+                stack.pop()
+                continue
+            parents = [parent.name for parent in nodes[current].parents
+                       if nodes.get(parent.name) is parent]
+            unsettled = [parent for parent in parents
+                         if parent not in deleted]
+            if current in targets or not parents or any(
+                    deleted.get(parent) is False for parent in parents):
+                deleted[current] = current in targets
+            elif unsettled:
+                stack.extend(unsettled)
+                continue
+            else:
+                deleted[current] = all(deleted[p] for p in parents)
+            stack.pop()
+        return deleted[name]
+
+    plans = []
+    for item in sorted(items):
+        node = nodes.get(item)
+        kept = set() if node is None else {
+            parent.name for parent in node.parents
+            if nodes.get(parent.name) is parent and not goes(parent.name)}
+        plans.append((item, node, kept, item in targets or not kept))
+
+    for item, node, kept, gone in plans:
+        supers = supers_of.get(item)
+        if gone:
+            if node is not None:
+                dag.remove(item)
+            if supers is not None:
+                dag.put(item, supers)
+            continue
+        wanted = kept | set(supers or ())
+        for parent in [parent for parent in node.parents
+                       if nodes.get(parent.name) is parent
+                       and parent.name not in wanted]:
+            dag.remove_edge(parent, node)
+        for name in sorted(wanted):
+            dag.add_edge(nodes[name], node)
+    return True
@@ -0,0 +1,229 @@
+"""Interval index — a dimension's present values, sorted by where they sit.
+
+A parametric query term is answered from its head's star (DIMENSIONS.md
+§8): `_virtual_cone` keeps the values its denotation contains,
+`_computed_children`/`_parents` the siblings on either side of a value,
+`get_overlapping` the values it meets. Without an index each of those parses
+every value of the dimension and compares Fractions, so a `time(...)` range
+over 10^5 timestamps is a linear scan — and every traversal step through a
+parametric node repeats it.
+
+For the interval kinds (linear, calendar, count) this keeps, per head:
+
+- the **points** (values with lo == hi: `weight(3kg)`, a timestamp), as a
+  sorted array of their value. A point lies inside `[lo, hi]` exactly when
+  it sorts between the ends, so containment and overlap are two bisections
+  and the matches between them: O(log n + k).
+- the **ranges** (`weight(1kg..2kg)`, `time(2026)`), as a plain list of
+  parsed `(lo, hi)` checked one by one. Stores file items under points; the
+  ranges are the few bands someone chose to name, so a scan is the honest
+  structure for them.
+
+Built per head on first use and then kept by the DAG's index hooks (an
+anchor edge added or removed, a node forgotten); `rebuild()` drops every
+head. An entry remembers the kind and unit vocabulary it parsed under and
+is rebuilt when either changes, so re-declaring a head is never missed.
+Dominance and prefix dimensions are not interval-ordered and are not
+indexed, nor is a star whose values do not share one unit family (the
+scan raises the family error there, as it always has): `lookup` returns
+None and the caller scans.
+
+Opt-in like the other indexes (`OntoDAG.enable_interval_index()`), never
+persisted, and allowed on a lazy reader: an entry is built from the head's
+star, which the scan would have fetched anyway.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from ontodag import dimensions as _dims
+
+
+class IntervalIndex:
+    def __init__(self, dag):
+        self._dag = dag
+        self._heads = {}          # head name -> _Star
+
+    def rebuild(self):
+        """Forget every head; each is re-derived on its next lookup."""
+        self._heads.clear()
+
+    # ------------------------------------------------------------ DAG hooks
+
+    def node_added(self, node):
+        pass                       # a value joins its star by its anchor edge
+
+    def node_forgotten(self, node):
+        self._heads.pop(node.name, None)
+        split = _dims.split_term(node.name)
+        if split is not None and split[0] in self._heads:
+            self._heads[split[0]].discard(node.name)
+
+    def edge_added(self, parent, child):
+        star = self._heads.get(parent.name)
+        if star is not None and _anchored(parent, child):
+            if not star.add(child.name):
+                star.indexed = False
+
+    def edge_removed(self, parent, child):
+        star = self._heads.get(parent.name)
+        if star is not None and _anchored(parent, child):
+            star.discard(child.name)
+
+    # -------------------------------------------------------------- reading
+
+    def lookup(self, head, kind, units):
+        """The head's `_Star`, current for `kind` and `units`, or None when
+        this dimension is not indexed (the caller scans)."""
+        star = self._heads.get(head)
+        if star is None or star.kind != kind or star.units is not units:
+            star = self._heads[head] = _Star.build(self._dag, head, kind, units)
+        return star if star.indexed else None
+
+
+def _anchored(parent, child):
+    split = _dims.split_term(child.name)
+    return split is not None and split[0] == parent.name
+
+
+class _Star:
+    """One head's values: sorted points plus a list of ranges."""
+
+    def __init__(self, kind, units):
+        self.kind = kind
+        self.units = units
+        self.indexed = True
+        self.family = None        # the unit family every value shares
+        self._keys = []           # point values, sorted
+        self._names = []          # the point names, parallel to _keys
+        self._ranges = {}         # name -> (lo, hi)
+
+    @classmethod
+    def build(cls, dag, head, kind, units):
+        star = cls(kind, units)
+        head_node = dag.nodes.get(head)
+        if head_node is None:
+            return star
+        points = []
+        for child in head_node.neighbors:
+            if not _anchored(head_node, child):
+                continue
+            parsed = star._parse(child.name)
+            if parsed is None:
+                star.indexed = False
+                return star
+            lo, hi = parsed
+            if lo is not None and lo == hi:
+                points.append((lo, child.name))
+            else:
+                star._ranges[child.name] = (lo, hi)
+        points.sort()
+        star._keys = [value for value, _ in points]
+        star._names = [name for _, name in points]
+        return star
+
+    def _parse(self, name):
+        """(lo, hi) of a value, fixing the family on the first one; None
+        when it cannot be indexed here."""
+        try:
+            parsed = _dims.bounds(name, self.kind, self.units)
+        except ValueError:
+            return None
+        if parsed is None:
+            return None           # not an interval kind
+        family, lo, hi = parsed
+        if self.family is None:
+            self.family = family
+        elif family != self.family:
+            return None
+        return lo, hi
+
+    def add(self, name):
+        """Index a new value; False when it cannot be (the head then goes
+        unindexed until the next `rebuild()`)."""
+        if name in self._ranges or self._position(name) is not None:
+            return True
+        parsed = self._parse(name)
+        if parsed is None:
+            return False
+        lo, hi = parsed
+        if lo is not None and lo == hi:
+            at = bisect_left(self._keys, lo)
+            self._keys.insert(at, lo)
+            self._names.insert(at, name)
+        else:
+            self._ranges[name] = (lo, hi)
+        return True
+
+    def discard(self, name):
+        if self._ranges.pop(name, None) is not None:
+            return
+        at = self._position(name)
+        if at is not None:
+            del self._keys[at]
+            del self._names[at]
+
+    def _position(self, name):
+        try:
+            parsed = _dims.bounds(name, self.kind, self.units)
+        except ValueError:
+            return None
+        if parsed is None or parsed[0] != self.family \
+                or parsed[1] is None or parsed[1] != parsed[2]:
+            return None
+        at = bisect_left(self._keys, parsed[1])
+        while at < len(self._keys) and self._keys[at] == parsed[1]:
+            if self._names[at] == name:
+                return at
+            at += 1
+        return None
+
+    def _span(self, lo, hi):
+        """Indexes of the points within [lo, hi] (None = unbounded)."""
+        start = 0 if lo is None else bisect_left(self._keys, lo)
+        stop = len(self._keys) if hi is None else bisect_right(self._keys, hi)
+        return start, stop
+
+    def matches(self, family):
+        """False when a query term's family differs from the star's: the
+        caller scans, and the arithmetic raises its usual error."""
+        return self.family is None or family == self.family
+
+    # ------------------------------------------------------------- queries
+    #
+    # Each takes the query's (lo, hi) and returns value names. `inside` and
+    # `overlapping` read the points from one bisected span; `around` can
+    # only hit the single point equal to a point query.
+
+    def inside(self, lo, hi):
+        """Values whose denotation lies within [lo, hi]."""
+        start, stop = self._span(lo, hi)
+        found = self._names[start:stop]
+        found.extend(name for name, (r_lo, r_hi) in self._ranges.items()
+                     if _within(r_lo, r_hi, lo, hi))
+        return found
+
+    def around(self, lo, hi):
+        """Values whose denotation contains [lo, hi]."""
+        found = []
+        if lo is not None and lo == hi:
+            at = bisect_left(self._keys, lo)
+            if at < len(self._keys) and self._keys[at] == lo:
+                found.append(self._names[at])
+        found.extend(name for name, (r_lo, r_hi) in self._ranges.items()
+                     if _within(lo, hi, r_lo, r_hi))
+        return found
+
+    def overlapping(self, lo, hi):
+        """Values whose denotation meets [lo, hi]."""
+        start, stop = self._span(lo, hi)
+        found = self._names[start:stop]
+        found.extend(name for name, (r_lo, r_hi) in self._ranges.items()
+                     if (hi is None or r_lo is None or r_lo <= hi)
+                     and (lo is None or r_hi is None or r_hi >= lo))
+        return found
+
+
+def _within(lo, hi, outer_lo, outer_hi):
+    """[lo, hi] ⊆ [outer_lo, outer_hi] — `dimensions.contains` on bounds."""
+    return (outer_lo is None or (lo is not None and lo >= outer_lo)) \
+        and (outer_hi is None or (hi is not None and hi <= outer_hi))
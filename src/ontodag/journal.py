@@ -0,0 +1,271 @@
+"""The `.od` journal — a native store's saves as appended changes.
+
+A native store (`.od`) is one canonical text file, and rewriting it is the
+only way to change it: a one-item `put` into a 200 MB store wrote 200 MB.
+The journal, a file beside it (`store.od.journal`), takes the changes
+instead. Each save appends one line — the save's structural changes and
+metadata updates as a JSON list — and fsyncs it, so a write costs I/O in
+proportion to what changed. Loading reads the `.od` file as before, then
+replays the journal over it. Compaction folds the journal back in: a full
+rewrite of the `.od` file, then the journal is deleted. It happens when the
+journal outgrows a quarter of the file or a day of age, or on `odag
+compact`; other tools reading `.od` files see every change from then on.
+
+What is recorded is the graph-level effect of a save, not the command
+that caused it: the nodes and edges `put`, `remove` or `move` added and
+removed, through the DAG's index hooks (`ontodag.bitmaps`), in order. A
+replay is then plain wiring — no planning, reduction or cycle check can
+answer differently the second time — and the counts are recomputed once
+at the end. Metadata has no hooks, so a save compares each node's
+metadata with what was last written, and records the ones that differ.
+
+    # ontodag journal v1 <sha256> <unix time>
+    [["node","Flight"],["edge","*","Flight"]]
+    [["edge","Travel","Flight"],["unedge","*","Flight"]]
+    [["meta","Flight",{"label":"Flights"}]]
+
+The header names the `.od` file the journal extends, by that file's
+`#:sha256` line. A compaction appends `# compacted <sha256>` before it
+replaces the file, so a journal left behind by an interrupted compaction
+is recognised as already folded in. A journal whose base is neither is
+refused: the file was rewritten by something else, and replaying onto it
+would apply the changes to the wrong graph. A last line cut short by a
+crash is the save that never finished, and is skipped.
+
+Operations that rewire the graph wholesale — `bulk()` blocks, hence
+`merge` and `import` — bypass the hooks (they `rebuild()` instead), so
+the save after one compacts rather than appends.
+"""
+
+import json
+import os
+import time
+from operator import attrgetter
+
+from ontodag.dag import Item
+
+SUFFIX = ".journal"
+HEADER = "# ontodag journal v1"
+COMPACTED = "# compacted"
+
+# Compaction thresholds: a journal past 1/RATIO of its file's size costs a
+# load about as much as the file does, and one older than MAX_AGE seconds
+# leaves other readers of the `.od` file that far behind.
+RATIO = 4
+MAX_AGE = 24 * 60 * 60
+
+
+def path_for(path):
+    """The journal beside the store at `path`."""
+    return path + SUFFIX
+
+
+def replay(dag, path, base):
+    """Apply the journal at `path` to `dag`, which was loaded from the file
+    whose `#:sha256` line is `base` (None: the file had no valid one).
+
+    Returns the journal's usable length in bytes; 0 when there is no
+    journal, or one an interrupted compaction already folded in."""
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as fh:
+        data = fh.read()
+    end = data.rfind(b"\n") + 1         # a torn last line never finished
+    lines = data[:end].decode("utf-8").splitlines()
+    if not lines or not lines[0].startswith(HEADER + " "):
+        raise ValueError(f"{path}: not an ontodag journal")
+    started = lines[0].split()
+    if len(started) < 6 or started[4] != base:
+        if base is not None and f"{COMPACTED} {base}" in lines:
+            return 0
+        raise ValueError(
+            f"{path} extends a different version of its store, which was "
+            f"rewritten since; its changes cannot be applied to it.\n"
+            f"  to load the store as it is, move the journal aside")
+    ops = []
+    for number, line in enumerate(lines[1:], 2):
+        if line.startswith("#"):
+            continue
+        try:
+            ops.extend(json.loads(line))
+        except ValueError as exc:
+            raise ValueError(f"{path}:{number}: malformed journal line "
+                             f"({exc})") from exc
+    if ops:
+        _apply(dag, ops)
+    return end
+
+
+def mark_compacted(path, base):
+    """Record that the journal at `path` is folded into the file whose
+    `#:sha256` line is `base`. A torn last line goes first: it is a save
+    that never finished, and the marker must be a line of its own."""
+    with open(path, "r+b") as fh:
+        data = fh.read()
+        fh.seek(data.rfind(b"\n") + 1)
+        fh.truncate()
+        fh.write(f"{COMPACTED} {base}\n".encode("ascii"))
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _apply(dag, ops):
+    nodes = dag.nodes
+
+    def node(name):
+        item = nodes.get(name)
+        if item is None:
+            item = nodes[name] = Item(name)
+        return item
+
+    for op in ops:
+        kind = op[0]
+        if kind == "edge":
+            node(op[1]).neighbors.add(node(op[2]))
+        elif kind == "unedge":
+            if op[1] in nodes and op[2] in nodes:
+                nodes[op[1]].neighbors.discard(nodes[op[2]])
+        elif kind == "node":
+            node(op[1])
+        elif kind == "forget":
+            # A forgotten node's edges are not part of the store (the file
+            # writer skips them), so they go with it.
+            item = nodes.pop(op[1], None)
+            if item is not None:
+                for parent in list(item.parents):
+                    parent.neighbors.discard(item)
+                item.neighbors.clear()
+        elif kind == "meta":
+            if op[1] in nodes:
+                metadata = nodes[op[1]].metadata
+                metadata.clear()
+                metadata.update(op[2])
+        else:
+            raise ValueError(f"unknown journal operation {kind!r}")
+    dag._wire(recount=True)         # counts and indexes, after the above
+
+
+_annotated = attrgetter("metadata")
+
+
+def _copy(metadata):
+    return json.loads(json.dumps(metadata))
+
+
+class Journal:
+    """The changes to one loaded graph since its last save, and the file
+    they are appended to.
+
+    Registered as one of the DAG's indexes, so every structural change is
+    recorded as it happens. `base` is the `#:sha256` line of the `.od`
+    file the graph was loaded from (None: it had no valid one, so there is
+    nothing to append to) and `size` the bytes of journal already applied.
+    """
+
+    def __init__(self, dag, path, base, size):
+        self.dag = dag
+        self.path = path
+        self.base = base
+        self.size = size
+        self.started = self._started() if size else None
+        self._ops = []
+        self.lost = False
+        self._metadata = {name: _copy(node.metadata)
+                          for name, node in dag.nodes.items() if node.metadata}
+        dag._indexes.append(self)
+
+    def _started(self):
+        with open(self.path, "rb") as fh:
+            header = fh.readline().decode("utf-8").split()
+        return float(header[5])
+
+    # ------------------------------------------------------------ DAG hooks
+
+    def rebuild(self):
+        """The graph was rewired wholesale: only a full write captures it."""
+        self.lost = True
+        self._ops = []
+
+    def node_added(self, node):
+        self._ops.append(["node", node.name])
+
+    def node_forgotten(self, node):
+        self._ops.append(["forget", node.name])
+        self._metadata.pop(node.name, None)
+
+    def edge_added(self, parent, child):
+        self._ops.append(["edge", parent.name, child.name])
+
+    def edge_removed(self, parent, child):
+        self._ops.append(["unedge", parent.name, child.name])
+
+    # -------------------------------------------------------------- writing
+
+    def changes(self):
+        """This save's operations: the recorded structure, then every node
+        whose metadata differs from what was last written."""
+        ops = list(self._ops)
+        seen = self._metadata
+        nodes = self.dag.nodes
+        # A scan of every node (metadata has no hooks), kept to one pass
+        # in C: about 0.1 s at 10^6 nodes, against seconds for a rewrite.
+        for node in filter(_annotated, nodes.values()):
+            if seen.get(node.name) != node.metadata:
+                ops.append(["meta", node.name, node.metadata])
+        for name in seen:
+            node = nodes.get(name)
+            if node is not None and not node.metadata:
+                ops.append(["meta", name, {}])
+        return ops
+
+    def append(self, base):
+        """Append this save to the journal and fsync it. False when that
+        cannot capture it — a wholesale rewiring, a file with no `#:sha256`
+        line, or a file or journal some other writer changed since the
+        load (`base` is the file's `#:sha256` line now) — and the caller
+        writes the whole file instead."""
+        if self.lost or self.base is None or base != self.base:
+            return False
+        current = os.path.getsize(self.path) \
+            if os.path.exists(self.path) else 0
+        if current != self.size:
+            return False
+        ops = self.changes()
+        if not ops:
+            return True
+        line = json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+        data = (line + "\n").encode("utf-8")
+        if not self.size:
+            self.started = time.time()
+            data = f"{HEADER} {self.base} {self.started:.0f}\n".encode(
+                "ascii") + data
+        with open(self.path, "ab") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self.size += len(data)
+        self._ops = []
+        for op in ops:
+            if op[0] == "meta":
+                if op[2]:
+                    self._metadata[op[1]] = _copy(op[2])
+                else:
+                    del self._metadata[op[1]]
+        return True
+
+    def due(self, file_size):
+        """True when the journal should be folded into its file."""
+        if not self.size:
+            return False
+        return self.size * RATIO > file_size \
+            or time.time() - self.started > MAX_AGE
+
+    def compacted(self, base):
+        """The graph was written in full, as the file whose `#:sha256` line
+        is `base` (the writer removed the journal)."""
+        self.base, self.size, self.started = base, 0, None
+        self.lost = False
+        self._ops = []
+        self._metadata = {name: _copy(node.metadata)
+                          for name, node in self.dag.nodes.items()
+                          if node.metadata}
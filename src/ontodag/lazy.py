@@ -51,7 +51,8 @@ Consequences worth knowing:
   visualization) would silently see a fragment. Call ``load_all()`` first if
   you want those.
 - Fetches are counted in ``self.fetches`` — tests assert on it, and it is the
-  honest measure of whether laziness is paying off.
+  honest measure of whether laziness is paying off. ``explain`` reports them
+  per planner step, beside the cones served without a walk (``cone_hits``).
 - Cones are memoized by name (the snapshot is immutable, so a cached cone can
   never go stale) and this is what makes repeated queries over a hot category
   free. ``max_cached_cones`` bounds the memory that costs.
@@ -79,17 +80,48 @@ deterministically-derived bitmap blob per hot category, fetched instead of
 walked. This class deliberately stops short of that — it is the on-demand
 *reader*; the summaries are a derived index with its own design note.
 
-Batching note: a walk expands one node at a time because the duck-typed store
-interface offers only single-key ``get``. A store-level multi-key get would let
-each BFS level fetch concurrently (recordstore already batches at the blob
-layer for ``items()``); the traversals below are written so that change is
-local to ``_expand_many``.
+Batching: `get_descendants`, `get_ancestors` and `_has_ancestors` walk level
+by level and expand each level as one batch (``_expand_many``): through the
+store's ``get_many`` when it has one (`RecordStore.get_many` walks the trie
+for every key at once, a round trip per trie level rather than per record),
+else on a thread pool of the store's ``max_concurrent_reads`` when it
+advertises one, else one ``get`` at a time. ``self.round_trips`` counts the
+store requests a query waited on in turn, beside ``fetches``; over a store
+with latency it is the number that sets the wall time
+(`experiments/lazy_latency.py`). The early-exit walks (`_walk_ancestors`,
+`_walk_descendants`) still expand one node at a time, so that a caller that
+stops early fetches no more than it read — and so does `_has_ancestors`
+over a store that can only read one record at a time, where a level read
+together is no fewer round trips and the records past the last target
+are fetched for nothing.
 """
 
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+from ontodag import browse as _browse
 from ontodag import dimensions as _dims
 from ontodag.dag import DAG, Item, OntoDAG, _name_of
 
 
+class _Walk:
+    """A level-by-level walk: what it has `found` and `seen`, the level it
+    is expanding (`frontier`) and the next one as far as it got (`level`).
+
+    The walks only ever add to these, and a node met twice is neither
+    found nor queued twice, so a walk stopped anywhere in a level can run
+    that level again and lose nothing."""
+
+    __slots__ = ("found", "seen", "frontier", "level")
+
+    def __init__(self, start, found=(), seen=()):
+        self.found = set(found)
+        self.seen = set(seen)
+        self.frontier = [start] if start is not None else []
+        self.level = []
+
+
 class _LazyNodes(dict):
     """`DAG.nodes` that materializes a stub on first mention of a real key.
 
@@ -145,7 +177,8 @@ class LazyOntoDAG(OntoDAG):
                  cone_index=None):
         super().__init__()
         self.store = record_store
-        self.fetches = 0            # store.get calls; the point of all this
+        self.fetches = 0            # records read; the point of all this
+        self.round_trips = 0        # store requests waited on in turn
         self._records = {}          # name -> record (or None: known absent)
         self._expanded = set()      # names whose edges are filled in
         self._cone_cache = {} if cache_cones else None
@@ -171,9 +204,40 @@ class LazyOntoDAG(OntoDAG):
         except KeyError:
             record = None
         self.fetches += 1
+        self.round_trips += 1
         self._records[name] = record
         return record
 
+    def _load_many(self, names):
+        """Read the records of `names` not read yet, as one batch."""
+        wanted = [name for name in dict.fromkeys(names)
+                  if name not in self._records]
+        if len(wanted) < 2:
+            for name in wanted:
+                self._load(name)
+            return
+        get_many = getattr(self.store, "get_many", None)
+        workers = getattr(self.store, "max_concurrent_reads", 1)
+        if get_many is not None:
+            found = get_many(wanted)
+            self.round_trips += 1
+        elif workers > 1:
+            with ThreadPoolExecutor(min(workers, len(wanted))) as pool:
+                found = dict(zip(wanted, pool.map(self._get_or_none, wanted)))
+            self.round_trips += -(-len(wanted) // workers)
+        else:
+            found = {name: self._get_or_none(name) for name in wanted}
+            self.round_trips += len(wanted)
+        self.fetches += len(wanted)
+        for name in wanted:
+            self._records[name] = found.get(name)
+
+    def _get_or_none(self, name):
+        try:
+            return self.store.get(name)
+        except KeyError:
+            return None
+
     def _stub(self, name):
         """The `Item` for `name`, created (edgeless) and registered if new."""
         node = dict.get(self.nodes, name)
@@ -202,8 +266,22 @@ class LazyOntoDAG(OntoDAG):
             node.parents.add(self._stub(parent_name))
         return node
 
+    def _walk(self, key, start, found=(), seen=()):
+        """A new level-by-level walk from `start` (`_Replay` resumes the
+        one under `key` instead)."""
+        return _Walk(start, found, seen)
+
+    def _batches(self):
+        """Whether reading a level as one batch saves round trips: the
+        store has `get_many`, or advertises concurrent reads."""
+        return getattr(self.store, "get_many", None) is not None \
+            or getattr(self.store, "max_concurrent_reads", 1) > 1
+
     def _expand_many(self, nodes):
-        """Expand a whole frontier — the seam for a future batched store get."""
+        """Expand a whole frontier, its records read as one batch."""
+        nodes = list(nodes)
+        self._load_many(node.name for node in nodes
+                        if node.name not in self._expanded)
         return [self._expand(node) for node in nodes]
 
     def load_all(self):
@@ -229,12 +307,12 @@ class LazyOntoDAG(OntoDAG):
     # costs the climbed path, never the graph; names without "(" short-
     # circuit before any fetch, keeping dimension-free budgets unchanged.
 
-    def _dimension_kind(self, head_name):
+    def _dimension_kind(self, head_name, seen=None):
         node = self.nodes.get(head_name)   # loads + expands (or None)
         if node is None or head_name in _dims.KINDS:
             return None
         kinds = set()
-        seen = set()
+        seen = set() if seen is None else seen
         stack = [node]
         while stack:
             for parent in self._expand(stack.pop()).parents:
@@ -263,6 +341,7 @@ class LazyOntoDAG(OntoDAG):
         # must not be served a combined cone, or vice versa.
         if computed and self._cone_cache is not None \
                 and name in self._cone_cache:
+            self._count_cone_hit()
             return set(self._cone_cache[name])
         # Published summary: one fetch instead of the enumeration. Combined-
         # order requests only — summaries state the query-path cone, and an
@@ -270,27 +349,41 @@ class LazyOntoDAG(OntoDAG):
         if computed and self._cone_index is not None:
             members = self._cone_index.cone(name)
             if members is not None:
+                self._count_cone_hit()
                 descendants = {self._stub(member) for member in members}
                 self._cache_cone(name, descendants)
                 return descendants
 
-        descendants = set()
-        seen = {start}
-        frontier = [start]
-        while frontier:
-            current = self._expand(frontier.pop())
-            successors = list(current.neighbors)
-            if computed:
-                successors.extend(self._computed_children(current))
-            for child in successors:
-                descendants.add(child)
-                if child not in seen:
-                    seen.add(child)
-                    frontier.append(child)
+        walk = self._walk(("down", name, computed), start, seen=(start,))
+        while walk.frontier:
+            for current in self._expand_many(walk.frontier):
+                successors = list(current.neighbors)
+                if computed:
+                    successors.extend(self._computed_children(current))
+                for child in successors:
+                    walk.found.add(child)
+                    if child not in walk.seen:
+                        walk.seen.add(child)
+                        walk.level.append(child)
+            walk.frontier, walk.level = walk.level, []
+        descendants = walk.found
+        if self._trace is not None:
+            self._trace["visits"] += len(walk.seen)
         if computed:
             self._cache_cone(name, descendants)
         return descendants
 
+    def _count_cone_hit(self):
+        if self._trace is not None:
+            self._trace["cone_hits"] = self._trace.get("cone_hits", 0) + 1
+
+    def _trace_counts(self, trace):
+        counts = super()._trace_counts(trace)
+        counts["fetches"] = self.fetches
+        counts["round_trips"] = self.round_trips
+        counts["cone_hits"] = trace.get("cone_hits", 0)
+        return counts
+
     def _cache_cone(self, name, descendants):
         if self._cone_cache is None:
             return
@@ -300,6 +393,32 @@ class LazyOntoDAG(OntoDAG):
         self._cone_cache[name] = set(descendants)
 
     def _has_ancestors(self, node, targets, computed=True):
+        if not self._batches():
+            return self._has_ancestors_serially(node, targets, computed)
+        # `found` holds the targets not met yet.
+        walk = self._walk(("above", node.name,
+                           frozenset(target.name for target in targets),
+                           computed), node, found=targets)
+        while walk.frontier and walk.found:
+            for current in self._expand_many(walk.frontier):
+                predecessors = [p for p in current.parents
+                                if dict.get(self.nodes, p.name) is p]
+                if computed:
+                    predecessors.extend(self._computed_parents(current))
+                for parent in predecessors:
+                    walk.found.discard(parent)
+                    if parent not in walk.seen:
+                        walk.seen.add(parent)
+                        walk.level.append(parent)
+            walk.frontier, walk.level = walk.level, []
+        if self._trace is not None:
+            self._trace["visits"] += len(walk.seen) + 1
+        return not walk.found
+
+    def _has_ancestors_serially(self, node, targets, computed):
+        # A record at a time, stopping at the one that meets the last
+        # target: where each read is a round trip anyway, the rest of its
+        # level would be fetched for nothing.
         missing = set(targets)
         seen = set()
         stack = [node]
@@ -314,6 +433,8 @@ class LazyOntoDAG(OntoDAG):
                 if parent not in seen:
                     seen.add(parent)
                     stack.append(parent)
+        if self._trace is not None:
+            self._trace["visits"] += len(seen) + 1
         return not missing
 
     def _walk_ancestors(self, node, computed=True):
@@ -335,26 +456,49 @@ class LazyOntoDAG(OntoDAG):
                     frontier.append(parent)
                     yield parent
 
+    def _walk_descendants(self, node, computed=True):
+        # Expansion-aware, like _walk_ancestors: a cached cone streams as
+        # it is; otherwise each node is expanded as the walk reaches it, so
+        # a caller that stops early never fetches the rest of the cone.
+        if computed and self._cone_cache is not None \
+                and node.name in self._cone_cache:
+            self._count_cone_hit()
+            yield from self._cone_cache[node.name]
+            return
+        seen = {node}
+        frontier = [node]
+        while frontier:
+            current = self._expand(frontier.pop())
+            successors = list(current.neighbors)
+            if computed:
+                successors.extend(self._computed_children(current))
+            for child in successors:
+                if child not in seen:
+                    seen.add(child)
+                    frontier.append(child)
+                    yield child
+
     def get_ancestors(self, node, ignore=(), computed=True):
         name = self._canonical_name(_name_of(node))
         start = self.nodes.get(name)
         if start is None:
             raise ValueError(f"Node {name} does not exist in the graph.")
 
-        ancestors = set()
-        frontier = [start]
-        while frontier:
-            current = self._expand(frontier.pop())
-            predecessors = [p for p in current.parents
-                            if dict.get(self.nodes, p.name) is p]
-            if computed:
-                predecessors.extend(self._computed_parents(current))
-            for parent in predecessors:
-                if parent in ancestors or parent in ignore:
-                    continue
-                ancestors.add(parent)
-                frontier.append(parent)
-        return ancestors
+        walk = self._walk(("up", name, frozenset(map(_name_of, ignore)),
+                           computed), start)
+        while walk.frontier:
+            for current in self._expand_many(walk.frontier):
+                predecessors = [p for p in current.parents
+                                if dict.get(self.nodes, p.name) is p]
+                if computed:
+                    predecessors.extend(self._computed_parents(current))
+                for parent in predecessors:
+                    if parent in walk.found or parent in ignore:
+                        continue
+                    walk.found.add(parent)
+                    walk.level.append(parent)
+            walk.frontier, walk.level = walk.level, []
+        return walk.found
 
     # --------------------------------------------------------------- no writes
 
@@ -365,9 +509,30 @@ class LazyOntoDAG(OntoDAG):
             "EagerOntoDAG and re-publish."
         )
 
-    put = remove = merge = _read_only
+    put = put_many = remove = merge = bulk_load = _read_only
     add_edge = remove_edge = add_node = _read_only
     commit = _read_only
+    # bulk()'s one pass rewires the whole graph; a partially-resident
+    # writer replays the buffered edges instead.
+    _bulk_one_pass = False
+
+    def enable_cone_bitmaps(self):
+        # An index of every cone is the whole graph by another name: building
+        # one would fetch every record, which is what this class exists not
+        # to do (SparseOntoDAG inherits the refusal for the same reason).
+        raise TypeError(
+            "cone bitmaps index the whole graph; load it with EagerOntoDAG "
+            "to use them")
+
+    def enable_reachability_index(self):
+        raise TypeError(
+            "reachability labels index the whole graph; load it with "
+            "EagerOntoDAG to use them")
+
+    def enable_ancestor_stats(self):
+        raise TypeError(
+            "ancestor statistics index the whole graph; load it with "
+            "EagerOntoDAG to use them")
 
 
 class SparseOntoDAG(LazyOntoDAG):
@@ -378,9 +543,10 @@ class SparseOntoDAG(LazyOntoDAG):
     The two problems that kept the lazy reader read-only, and how they are
     solved here:
 
-    - **Change detection.** `EagerOntoDAG.commit()` diffs a complete record
-      set; a partially-resident writer cannot enumerate what it never
-      loaded. But it doesn't need to: every mutation runs on *expanded*
+    - **Change detection.** `EagerOntoDAG.commit()` compares against a
+      complete set of synced records (its dirty tracking only narrows
+      which ones); a partially-resident writer cannot enumerate what it
+      never loaded. But it doesn't need to: every mutation runs on *expanded*
       nodes (the overrides below expand before touching anything), so a
       mutated node is always resident — and `self._records` already holds
       each resident node's as-loaded record. `commit()` therefore diffs the
@@ -497,6 +663,12 @@ class SparseOntoDAG(LazyOntoDAG):
     def remove(self, node_to_remove):
         OntoDAG.remove(self, node_to_remove)        # bookkeeping in _forget
 
+    def bulk_load(self, edges, metadata=None, freeze=False):
+        OntoDAG.bulk_load(self, edges, metadata=metadata, freeze=freeze)
+
+    def put_many(self, pairs, scaffold=False):
+        OntoDAG.put_many(self, pairs, scaffold=scaffold)
+
     def _forget(self, name):
         """A node stops existing: stage the store delete if it was persisted.
 
@@ -647,3 +819,200 @@ class SparseOntoDAG(LazyOntoDAG):
                 if parent is not None:
                     self.add_edge(parent, node)
         return bool(touched)
+
+
+class _Miss(Exception):
+    """Raised out of a replayed query: these records are not read yet."""
+
+    def __init__(self, names):
+        super().__init__(names)
+        self.names = set(names)
+
+
+class _Replay(LazyOntoDAG):
+    """A `LazyOntoDAG` that never does I/O: reading a record not yet in
+    `_records` raises `_Miss` for the whole batch instead. Every change to
+    its state follows a successful read, so a run that stops there leaves
+    nothing half-done, and the next run picks up from the same graph.
+
+    The level-by-level walks go further and pick up where they stopped:
+    `_walk` keeps each one's progress in `_walks`, a dict the caller gives
+    every run of one query, so a run that stops at level 40 of a cone
+    starts the next at level 40, not at the top. Without that a query
+    would walk its cone again once per level, quadratic in its depth.
+
+    The upward walks run once per candidate, one after another, so a
+    probe or a browse over a hundred candidates would otherwise stop a
+    hundred times per level. They answer False / empty instead and leave
+    their misses in `_pending`; a run that left any is a draft, thrown
+    away once they are read, so no provisional answer ever escapes."""
+
+    def __init__(self, cache_cones, max_cached_cones):
+        super().__init__(None, cache_cones=cache_cones,
+                         max_cached_cones=max_cached_cones)
+        self._pending = set()
+        self._walks = {}
+
+    def _walk(self, key, start, found=(), seen=()):
+        walk = self._walks.get(key)
+        if walk is None:
+            walk = self._walks[key] = _Walk(start, found, seen)
+        elif not walk.frontier:
+            # Finished in an earlier run: its answer, fresh, since a caller
+            # may narrow the set it is given.
+            walk = _Walk(None, walk.found, walk.seen)
+        return walk
+
+    def _batches(self):
+        # A stop is a round of reads for every query in flight, whatever
+        # the store: as few of them as there are levels.
+        return True
+
+    def _load(self, name):
+        if name in self._records:
+            return self._records[name]
+        raise _Miss((name,))
+
+    def _load_many(self, names):
+        missing = [name for name in names if name not in self._records]
+        if missing:
+            raise _Miss(missing)
+
+    def _expand(self, node):
+        self._load(node.name)           # read before anything is marked
+        return super()._expand(node)
+
+    def _has_ancestors(self, node, targets, computed=True):
+        try:
+            return super()._has_ancestors(node, targets, computed)
+        except _Miss as miss:
+            self._pending |= miss.names
+            return False
+
+    def get_ancestors(self, node, ignore=(), computed=True):
+        try:
+            return super().get_ancestors(node, ignore, computed)
+        except _Miss as miss:
+            self._pending |= miss.names
+            return set()
+
+
+class AsyncLazyOntoDAG:
+    """`LazyOntoDAG`'s queries as coroutines, for serving many at once.
+
+    `record_store` is duck-typed as in `LazyOntoDAG`, with coroutine
+    methods or plain ones: an ``async def get`` (and ``get_many``) is
+    awaited, a plain one runs on `asyncio.to_thread`, as many at a time as
+    its ``max_concurrent_reads`` (one without it). Pass a snapshot.
+
+    Every query runs the synchronous planner on one shared read-only graph
+    (`_Replay`) that holds only the records read so far. When a query
+    reaches a record that is not there, it stops, the records it asked for
+    are read, and it runs again, each walk resuming where it stopped. The
+    answers are therefore `LazyOntoDAG`'s by construction. Concurrent
+    queries share that graph, its record and cone caches, and any read in
+    flight: a record two queries want at once is fetched once
+    (``self.fetches``). One event loop only — nothing here is guarded
+    against threads.
+    """
+
+    def __init__(self, record_store, cache_cones=True, max_cached_cones=64):
+        self.store = record_store
+        self.fetches = 0            # records read, however many queries
+        self.round_trips = 0        # store requests waited on in turn
+        self._dag = _Replay(cache_cones, max_cached_cones)
+        self._inflight = {}         # name -> future, done when it is read
+        self._threads = None        # bounds the sync store's reads
+
+    async def get(self, super_categories):
+        """`LazyOntoDAG.get`."""
+        return await self._answer(self._dag.get, super_categories)
+
+    async def get_any(self, queries):
+        """`LazyOntoDAG.get_any`."""
+        return await self._answer(self._dag.get_any, queries)
+
+    async def is_below(self, node, super_category):
+        """`LazyOntoDAG.is_below`."""
+        return await self._answer(self._dag.is_below, node, super_category)
+
+    async def browse(self, queries, sample=_browse.SAMPLE):
+        """`ontodag.browse.browse` over this graph."""
+        return await self._answer(_browse.browse, self._dag, queries, sample)
+
+    async def _answer(self, query, *args):
+        """Run `query(*args)` until it runs without reading anything."""
+        dag = self._dag
+        walks = {}
+        while True:
+            dag._pending = set()
+            dag._walks = walks
+            try:
+                answer = query(*args)
+            except _Miss as miss:
+                missing = miss.names | dag._pending
+            else:
+                if not dag._pending:
+                    return answer
+                missing = dag._pending
+            await self._read(missing)
+
+    async def _read(self, names):
+        """Read `names` into the shared graph: the ones no other query is
+        reading as one batch, then wait for the rest."""
+        loop = asyncio.get_running_loop()
+        records = self._dag._records
+        waiting = []
+        wanted = []
+        for name in sorted(names):
+            if name in records:
+                continue
+            if name in self._inflight:
+                waiting.append(self._inflight[name])
+            else:
+                wanted.append(name)
+        mine = {name: loop.create_future() for name in wanted}
+        self._inflight.update(mine)
+        try:
+            if wanted:
+                found = await self._fetch(wanted)
+                self.fetches += len(wanted)
+                for name in wanted:
+                    records[name] = found.get(name)
+        finally:
+            # Done either way: a waiter whose record is still missing after
+            # a failed read asks for it again, and meets the error itself.
+            for name, future in mine.items():
+                del self._inflight[name]
+                future.set_result(None)
+        if waiting:
+            await asyncio.gather(*waiting)
+
+    async def _fetch(self, names):
+        """`{name: record}` for those of `names` the store has."""
+        get_many = getattr(self.store, "get_many", None)
+        if get_many is not None:
+            self.round_trips += 1
+            return await self._call(get_many, names)
+        if inspect.iscoroutinefunction(self.store.get):
+            self.round_trips += 1
+        else:
+            workers = getattr(self.store, "max_concurrent_reads", 1)
+            self.round_trips += -(-len(names) // workers)
+        records = await asyncio.gather(*map(self._get_or_none, names))
+        return dict(zip(names, records))
+
+    async def _get_or_none(self, name):
+        try:
+            return await self._call(self.store.get, name)
+        except KeyError:
+            return None
+
+    async def _call(self, method, *args):
+        if inspect.iscoroutinefunction(method):
+            return await method(*args)
+        if self._threads is None:
+            self._threads = asyncio.Semaphore(
+                getattr(self.store, "max_concurrent_reads", 1))
+        async with self._threads:
+            return await asyncio.to_thread(method, *args)
@@ -100,6 +100,12 @@ class AgentSurface:
             eager.commit()
             dag = eager
         self.dag = dag
+        # A server answers the same questions all session; every write
+        # invalidates the cache by generation, so answers are never stale.
+        dag.enable_query_cache()
+        # Dimension values are bisected rather than scanned per question;
+        # entries are built from stars the scan would fetch anyway.
+        dag.enable_interval_index()
         self.root = dag.store.root
         self._snapshots = {}
         # The write surface (PROVENANCE.md §5): explicit opt-in, a
@@ -307,38 +313,57 @@ class AgentSurface:
             raise ToolError(
                 "pass at most one of `terms` (a conjunction) or `any_of` "
                 "(a list of conjunctions, answered as their union)")
+        limit = self._limit(arguments)
+        # An explained query is answered by its traced run: running it again
+        # to trace it would measure warm caches, not the query asked.
+        explain = answer = None
         if any_of is None:
             # No terms at all — including neither argument — is the empty
             # query: an intersection of no constraints, so every item.
             terms = [] if terms is None else terms
             echo = self._canonical_terms(dag, terms, allow_empty=True)
-            result = dag.get(terms)
+            if arguments.get("explain"):
+                explain, answer = dag._explain(terms)
+            else:
+                # Streamed in name order: only the prefix is held, and the
+                # total still counts the complete answer.
+                stream = dag.iter_get(terms, limit=limit)
+                items = [item.name for item in stream]
+                count = stream.total
             payload = {"terms": echo}
         else:
             if not isinstance(any_of, list) or not any_of:
                 raise ToolError("any_of must be a non-empty list of "
                                 "term lists")
             echo = [self._canonical_terms(dag, q) for q in any_of]
-            result = dag.get_any(any_of)
+            if arguments.get("explain"):
+                explain, answer = dag._explain_any(any_of)
+            else:
+                answer = dag.get_any(any_of)
             payload = {"any_of": echo}
-        items = sorted(item.name for item in result)
+        if answer is not None:
+            items = sorted(item.name for item in answer)
+            count = len(items)
+            items = items if limit is None else items[:limit]
         # `count` is always the size of the complete answer, `items` may be a
         # prefix of it — so a caller can always tell what it is holding.
-        payload.update({"items": items, "count": len(items),
-                        "truncated": False})
-        limit = self._limit(arguments)
-        if limit is not None and len(items) > limit:
-            payload.update({"items": items[:limit], "truncated": True})
+        payload.update({"items": items, "count": count,
+                        "truncated": len(items) < count})
+        if explain is not None:
+            payload["explain"] = explain
         return self._envelope(root, payload)
 
     def tool_is_below(self, arguments):
         dag, root = self._dag_at(arguments.get("as_of"))
         sub = self._need(arguments, "sub")
         sup = self._need(arguments, "sup")
+        explain = dag.explain_below(sub, sup) \
+            if arguments.get("explain") else None
         payload = {
             "sub": dag._canonical_name(sub),
             "sup": dag._canonical_name(sup),
-            "result": bool(dag.is_below(sub, sup)),
+            "result": bool(dag.is_below(sub, sup) if explain is None
+                           else explain["result"]),
         }
         if arguments.get("certify"):
             # The trustless upgrade (CONTRACT.md §7 Tier 2): recordstore
@@ -347,6 +372,8 @@ class AgentSurface:
             # ontodag.certificates.verify_below(certificate, root).
             from ontodag.certificates import prove_below
             payload["certificate"] = prove_below(dag, sub, sup)
+        if explain is not None:
+            payload["explain"] = explain
         return self._envelope(root, payload)
 
     def tool_overlapping(self, arguments):
@@ -650,6 +677,13 @@ _CERTIFY = {"type": "boolean",
                            "re-execution at the cited root, or certify "
                            "individual candidates via is_below)"}
 
+_EXPLAIN = {"type": "boolean",
+            "description": "attach `explain`: how the answer was planned "
+                           "and what it cost (terms dropped, cone order, "
+                           "walk/probe steps, nodes visited) — for "
+                           "diagnosing a slow question, not for reasoning "
+                           "about the answer"}
+
 TOOL_SPECS = [
     {"name": "about",
      "description": "What this store is about, without downloading it: "
@@ -678,7 +712,7 @@ TOOL_SPECS = [
                                   "still reports the full count and sets "
                                   "truncated. Omit for the complete answer "
                                   "— there is no default cap."},
-         "as_of": _AS_OF, "certify": _CERTIFY}}},
+         "as_of": _AS_OF, "certify": _CERTIFY, "explain": _EXPLAIN}}},
     {"name": "is_below",
      "description": "Does SUB fit within SUP? Fail-closed: true only with "
                     "a witness in the graph or exact dimension arithmetic; "
@@ -692,6 +726,7 @@ TOOL_SPECS = [
                          "sub": {"type": "string"},
                          "sup": {"type": "string"},
                          "as_of": _AS_OF,
+                         "explain": _EXPLAIN,
                          "certify": {
                              "type": "boolean",
                              "description":
@@ -0,0 +1,316 @@
+"""`.odb` — a binary snapshot of a store, laid out to be memory-mapped.
+
+The text store (`.od`) is parsed in full by every `odag` run that touches
+it. An `.odb` file holds the same graph as fixed-width arrays, so a reader
+can map it and look things up in place: a read-only `odag get` binary-
+searches the name table, walks the adjacency arrays and decodes only the
+names it prints — no Item is built and nothing is parsed. A full `read()`
+still gives an ordinary OntoDAG, wired directly with the persisted counts.
+
+Layout, version 1 (all integers little-endian):
+
+    header    8s magic b"ONTODAGB", u32 version, u32 flags, u32 nodes,
+              u32 edges, u32 root id, u32 reserved
+    sections  8 x (u64 offset, u64 length), in the order below; each
+              section starts on an 8-byte boundary
+
+    0 name offsets   u64[nodes + 1], into the name blob
+    1 name blob      UTF-8 names, sorted — byte order is code point order,
+                     so the table binary-searches as bytes; id = position
+    2 down index     u32[nodes + 1], CSR offsets into `down`
+    3 down           u32[edges], each node's children, ascending ids
+    4 up index       u32[nodes + 1]
+    5 up             u32[edges], each node's parents, ascending ids
+    6 counts         u32[nodes], descendant counts as the writer had them
+    7 metadata       JSON object, name -> metadata, for nodes that have any
+
+Flag bit 0 says the graph declares a dimension. Such a graph has computed
+order that the arrays do not hold, so `Snapshot.plain` is false and a
+mapped query would be wrong — callers load the graph instead.
+
+Conversion is lossless both ways: `.od -> .odb -> .od` gives the same
+bytes, since both writers sort and both keep every edge, name and
+metadata entry. Writes go to a temporary file renamed into place, so a
+reader that has the old file mapped keeps reading the old file.
+"""
+
+import gc
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from ontodag import _files
+from ontodag.dag import Item, OntoDAG
+
+MAGIC = b"ONTODAGB"
+VERSION = 1
+DIMENSIONS = 1          # flag bit: the graph declares a dimension
+
+_HEADER = struct.Struct("<8sIIIIII")
+_SECTION = struct.Struct("<QQ")
+_SECTIONS = 8
+_NAME_OFFSETS, _NAMES, _DOWN_INDEX, _DOWN, _UP_INDEX, _UP, _COUNTS, \
+    _METADATA = range(_SECTIONS)
+_TYPES = {_NAME_OFFSETS: "Q", _DOWN_INDEX: "I", _DOWN: "I",
+          _UP_INDEX: "I", _UP: "I", _COUNTS: "I"}
+
+# Mapped arrays are read in place when the machine's own integers are the
+# file's; anywhere else they are copied and byte-swapped once.
+_NATIVE = sys.byteorder == "little" and all(
+    array(code).itemsize == struct.calcsize("<" + code) for code in "IQ")
+
+
+def write(dag, path):
+    """Write `dag` to `path` as an `.odb` snapshot."""
+    nodes = dag.nodes
+    names = sorted(nodes)
+    ids = {name: i for i, name in enumerate(names)}
+    down_index, down = array("I", [0]), array("I")
+    up_index, up = array("I", [0]), array("I")
+    counts = array("I")
+    metadata = {}
+    for name in names:
+        node = nodes[name]
+        down.extend(sorted(ids[child.name] for child in node.neighbors
+                           if nodes.get(child.name) is child))
+        down_index.append(len(down))
+        up.extend(sorted(ids[parent.name] for parent in node.parents
+                         if nodes.get(parent.name) is parent))
+        up_index.append(len(up))
+        counts.append(node.descendant_count)
+        if node.metadata:
+            metadata[name] = node.metadata
+    encoded = [name.encode("utf-8") for name in names]
+    offsets = array("Q", [0])
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+    meta = json.dumps(metadata, sort_keys=True, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+    sections = {_NAME_OFFSETS: offsets, _NAMES: b"".join(encoded),
+                _DOWN_INDEX: down_index, _DOWN: down,
+                _UP_INDEX: up_index, _UP: up, _COUNTS: counts,
+                _METADATA: meta}
+    payloads = []
+    for index in range(_SECTIONS):
+        data = sections[index]
+        if isinstance(data, array):
+            if not _NATIVE:
+                data = array(data.typecode, data)
+                data.byteswap()
+            data = data.tobytes()
+        payloads.append(data)
+
+    flags = DIMENSIONS if dag._declares_dimensions() else 0
+    position = _HEADER.size + _SECTION.size * _SECTIONS
+    table, body = [], []
+    for data in payloads:
+        padding = -position % 8
+        body.append(b"\0" * padding)
+        position += padding
+        table.append(_SECTION.pack(position, len(data)))
+        body.append(data)
+        position += len(data)
+    header = _HEADER.pack(MAGIC, VERSION, flags, len(names), len(down),
+                          ids[dag.root.name], 0)
+
+    with _files.replacing(path) as temporary, open(temporary, "wb") as fh:
+        fh.write(header)
+        fh.write(b"".join(table))
+        for chunk in body:
+            fh.write(chunk)
+
+
+def read(path, into=None):
+    """The OntoDAG an `.odb` file holds: wired directly, counts as stored.
+    `into`, an empty OntoDAG (a subclass's, say), is wired instead of a
+    fresh one."""
+    with Snapshot(path) as snapshot:
+        dag = OntoDAG() if into is None else into
+        nodes = dag.nodes
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            items = []
+            for i in range(len(snapshot)):
+                name = snapshot.name(i)
+                item = dag.root if i == snapshot.root else Item(name)
+                nodes[name] = item
+                items.append(item)
+            down, index, counts = \
+                snapshot._down, snapshot._down_index, snapshot._counts
+            up, up_index = snapshot._up, snapshot._up_index
+            item_at = items.__getitem__
+            for item, count in zip(items, counts):
+                item.descendant_count = count
+            for name, values in snapshot.metadata().items():
+                nodes[name].metadata.update(values)
+            dag._wire((item,
+                       map(item_at, down[index[i]:index[i + 1]]),
+                       map(item_at, up[up_index[i]:up_index[i + 1]]))
+                      for i, item in enumerate(items))
+        finally:
+            if collecting:
+                gc.enable()
+    return dag
+
+
+class Snapshot:
+    """A mapped `.odb` file, answering queries from its arrays.
+
+    Read-only, and a context manager: `close()` (or leaving the `with`)
+    unmaps the file. Node ids are positions in the sorted name table."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            self._open()
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self):
+        whole = self._view(memoryview(self._map))
+        if len(whole) < _HEADER.size + _SECTION.size * _SECTIONS:
+            raise ValueError(f"{self.path}: not an .odb file (too short)")
+        magic, version, flags, size, edges, root, _ = \
+            _HEADER.unpack_from(whole)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: not an .odb file")
+        if version != VERSION:
+            raise ValueError(f"{self.path}: .odb version {version}; this "
+                             f"ontodag reads version {VERSION}")
+        self.plain = not flags & DIMENSIONS
+        self.root = root
+        self._size = size
+        sections = []
+        for index in range(_SECTIONS):
+            offset, length = _SECTION.unpack_from(
+                whole, _HEADER.size + _SECTION.size * index)
+            if offset + length > len(whole):
+                raise ValueError(f"{self.path}: truncated .odb file")
+            view = self._view(whole[offset:offset + length])
+            code = _TYPES.get(index)
+            if code is not None:
+                view = self._ints(view, code)
+            sections.append(view)
+        self._name_offsets, self._names, self._down_index, self._down, \
+            self._up_index, self._up, self._counts, self._meta = sections
+        if len(self._name_offsets) != size + 1 \
+                or len(self._down) != edges or len(self._up) != edges:
+            raise ValueError(f"{self.path}: inconsistent .odb file")
+
+    def _view(self, view):
+        self._views.append(view)
+        return view
+
+    def _ints(self, view, code):
+        if _NATIVE:
+            return self._view(view.cast(code))
+        values = array(code, bytes(view))
+        values.byteswap()
+        return values
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._size
+
+    # ------------------------------------------------------------- lookups
+
+    def name(self, i):
+        offsets = self._name_offsets
+        return str(self._names[offsets[i]:offsets[i + 1]], "utf-8")
+
+    def find(self, name):
+        """The id of `name`, or None: a binary search over the name table."""
+        key = name.encode("utf-8")
+        offsets, names = self._name_offsets, self._names
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = names[offsets[mid]:offsets[mid + 1]].tobytes()
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def children(self, i):
+        return self._down[self._down_index[i]:self._down_index[i + 1]]
+
+    def parents(self, i):
+        return self._up[self._up_index[i]:self._up_index[i + 1]]
+
+    def count(self, i):
+        return self._counts[i]
+
+    def metadata(self):
+        return json.loads(str(self._meta, "utf-8"))
+
+    # ------------------------------------------------------------- queries
+
+    def cone(self, i):
+        """The ids strictly below `i`."""
+        down, index = self._down, self._down_index
+        seen = set()
+        stack = [i]
+        while stack:
+            j = stack.pop()
+            for child in down[index[j]:index[j + 1]]:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return seen
+
+    def _terms(self, terms):
+        """The ids of the query's terms, smallest cone first; None when a
+        term is not in the store (fail-closed, like `OntoDAG.get`)."""
+        ids = set()
+        for term in terms:
+            i = self.find(term)
+            if i is None:
+                return None
+            ids.add(i)
+        return sorted(ids or [self.root], key=self._counts.__getitem__)
+
+    def get_ids(self, terms):
+        ids = self._terms(terms)
+        if ids is None:
+            return set()
+        found = self.cone(ids[0])
+        for i in ids[1:]:
+            if not found:
+                break
+            found &= self.cone(i)
+        return found
+
+    def get(self, terms):
+        """The names below every term: `OntoDAG.get` for a `plain` graph."""
+        return {self.name(i) for i in self.get_ids(terms)}
+
+    def count_of(self, terms):
+        """`len(get(terms))`; a single term is its stored count."""
+        ids = self._terms(terms)
+        if ids is None:
+            return 0
+        if len(ids) == 1:
+            return self._counts[ids[0]]
+        return len(self.get_ids(terms))
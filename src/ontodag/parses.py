@@ -0,0 +1,83 @@
+"""Parse cache — each parametric name parsed once, until the schema moves.
+
+`OntoDAG._parse_parametric` sits on nearly every hot path: both ends of
+every `add_edge`, `_is_anchor`, `_canonical_name` for every query term, the
+reduction's anchor checks, and each comparison the computed order makes.
+Each call resolved the head's kind by an ancestor walk, rebuilt the set of
+unit declarations to validate the unit cache, canonicalized the name and —
+in every `contains`/`intersect` after it — parsed both sides again. None of
+that changes unless the *schema* does, and the schema is a handful of
+nodes. This keeps:
+
+- **names**: term-shaped name -> (head, kind, canonical) and the canonical
+  name's denotation (the Fractions `contains` compares), or None for a
+  name whose head is not a declared dimension. Names without a "(" never
+  get here, so a dimension-free graph pays nothing.
+- **kinds**: head -> the kind its ancestor walk found.
+- **units**: the resolved graph-declared unit vocabulary.
+
+Invalidated through the DAG's index hooks, and only by schema changes: an
+edge added or removed below a node some cached kind walk passed through
+(a head, or one of its ancestors short of a kind node), such a node added
+or forgotten, or any change under `unit-declaration`. Filing items under
+values, or values under heads, leaves the cache alone. Everything is
+dropped at once — schema changes are rare, and a precise dependency map
+would cost more to keep than the re-parses it saves. `rebuild()` (direct
+wiring) drops it too.
+
+Always on for an OntoDAG, never persisted, and bounded: past `LIMIT`
+names (query terms are unbounded; present nodes are not) it starts over.
+"""
+
+from ontodag import dimensions as _dims
+
+
+class ParseCache:
+    LIMIT = 1 << 16
+
+    def __init__(self, dag):
+        self._dag = dag
+        self.rebuild()
+
+    def rebuild(self):
+        """Forget everything; the schema changed or was rewired."""
+        self.names = {}
+        self.kinds = {}
+        self.units = None
+        self._schema = set()    # heads, and the nodes their kind walks saw
+
+    # ------------------------------------------------------------ DAG hooks
+
+    def node_added(self, node):
+        if node.name in self._schema or node.name == _dims.UNIT_DECLARATION:
+            self.rebuild()
+
+    node_forgotten = node_added
+
+    def edge_added(self, parent, child):
+        if child.name in self._schema \
+                or parent.name == _dims.UNIT_DECLARATION:
+            self.rebuild()
+
+    edge_removed = edge_added
+
+    # -------------------------------------------------------------- reading
+
+    def kind(self, head):
+        """The head's dimension kind, walking its ancestors once."""
+        try:
+            return self.kinds[head]
+        except KeyError:
+            pass
+        seen = set()
+        kind = self._dag._dimension_kind(head, seen)
+        self._schema.add(head)
+        self._schema.update(node.name for node in seen)
+        self.kinds[head] = kind
+        return kind
+
+    def store(self, name, entry):
+        if len(self.names) >= self.LIMIT:
+            self.names.clear()
+        self.names[name] = entry
+        return entry
@@ -0,0 +1,76 @@
+"""Query result cache — recent `get` answers, never served stale.
+
+The web app, the MCP server and an interactive `odag` session answer the
+same few conjunctions over and over (the web app's `QUERY_LOG` counts
+exactly that), and each call redoes the cone walks. This keeps the most
+recently used answers, keyed by the query's canonical term set — so
+`["Dog", "Pet"]` and `["Pet", "Dog"]`, or two spellings of one typed value,
+share one entry.
+
+Staleness is ruled out by a **generation** counter rather than by working
+out which entries a write affects: every structural change reported
+through the DAG's index hooks (`add_node`, `add_edge`, `remove_edge`,
+`_forget`, and `rebuild()` after direct wiring) bumps it, and an entry
+stamped with an older generation is a miss. A write is one increment; the
+cost is that ANY write empties the cache in effect, which is the right
+trade for the read-mostly sessions this is for.
+
+Opt-in like the other indexes (`OntoDAG.enable_query_cache(size)`), bounded
+(least recently used entries go first) and never persisted. Answers are
+the same Items `get` would return; each hit hands out a fresh set, so a
+caller mutating its answer cannot corrupt the next one. `explain` bypasses
+the cache — it exists to measure the walk.
+"""
+
+from collections import OrderedDict
+
+
+class QueryCache:
+    def __init__(self, dag, size=256):
+        if not isinstance(size, int) or isinstance(size, bool) or size < 1:
+            raise ValueError("query cache size must be a positive integer")
+        self._dag = dag
+        self.size = size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()   # term set -> (generation, answer)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def rebuild(self):
+        """The graph was rewired behind the hooks: everything is stale."""
+        self._bump()
+
+    # ------------------------------------------------------------ DAG hooks
+
+    def _bump(self, *changed):
+        self.generation += 1
+
+    node_added = node_forgotten = edge_added = edge_removed = _bump
+
+    # -------------------------------------------------------------- reading
+
+    def lookup(self, key):
+        """The cached answer for `key` (a copy), or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == self.generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return set(entry[1])
+            del self._entries[key]      # stale: a write came after it
+        self.misses += 1
+        return None
+
+    def store(self, key, answer):
+        self._entries[key] = (self.generation, frozenset(answer))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,194 @@
+"""Reachability labels — decide most "is A above B?" questions without a walk.
+
+`is_below`, the planner's probe and `add_edge`'s redundancy and cycle checks
+all reduce to `_has_ancestors`: an upward walk from the lower node that stops
+once it has met every target. Upward is the cheap direction, but a negative
+answer still walks the whole ancestor cone, and every write asks two of
+these questions. This index (GRAIL-style, Yildirim et al., VLDB 2010) keeps
+per node:
+
+- a **level**: strictly greater than every parent's level. A node can only
+  be above nodes on higher levels.
+- two **interval labels** `[lo, hi]`, one per depth-first numbering (children
+  in name order, then in reverse name order), with the invariant that a
+  child's interval lies inside each parent's. So if A reaches B, B's
+  intervals lie inside A's, in both numberings.
+
+Either test failing proves "not an ancestor" at the cost of a few integer
+comparisons; when both pass the walk still runs, but only through parents
+that could themselves lie below the target, so positive answers touch the
+path and little else.
+
+Incremental, and sound by construction rather than exact:
+
+- a **fresh leaf** filed under its first parent shares that parent's own
+  point, one level below it — the `put(item, supers)` case costs O(1), and
+  the levels still tell the two apart;
+- any other new edge **widens** the parent's intervals (and its ancestors',
+  pruning at the first one that already contains them) and pushes levels
+  down where they would no longer increase;
+- **removal** changes nothing: fewer edges can only make the labels looser.
+
+Looseness costs pruning power, never correctness (shared points and wide
+intervals only make the cuts fire less often); `rebuild()` re-derives tight
+labels in O(nodes + edges), and runs on its own once the nodes added plus
+the labels widened since the last rebuild outnumber the nodes — amortized
+O(1) per write, and at least half the graph is tightly labelled at any time.
+
+The labels describe ASSERTED edges. The computed order between parametric
+values (DIMENSIONS.md §5) is not in them, so a combined-order question is
+answered by the index only while no dimension is declared at all — no kind
+node has a child — which the index tracks from the same hooks.
+"""
+
+from ontodag import dimensions as _dims
+
+
+class ReachabilityLabels:
+    def __init__(self, dag):
+        self._dag = dag
+        self.rebuild()
+
+    def rebuild(self):
+        """Re-derive tight labels from the graph as it stands."""
+        dag = self._dag
+        live_parents = dag._live_parents
+        # label = [level, lo1, hi1, lo2, hi2]
+        labels = {name: [0, 0, 0, 0, 0] for name in dag.nodes}
+        self._labels = labels
+        self._kind_edges = sum(len(dag.nodes[kind].neighbors)
+                               for kind in _dims.KINDS if kind in dag.nodes)
+        for node in dag.topological_sort():
+            label = labels[node.name]
+            for parent in live_parents(node):
+                label[0] = max(label[0], labels[parent.name][0] + 1)
+        roots = sorted(name for name, node in dag.nodes.items()
+                       if not any(True for _ in live_parents(node)))
+        for slot, reverse in ((1, False), (3, True)):
+            self._number(roots, slot, reverse)
+        self._next = len(labels)
+        self._drift = 0
+
+    def _number(self, roots, slot, reverse):
+        """One depth-first post-order numbering into `slot` (lo) and
+        `slot + 1` (hi). Iterative (I6)."""
+        nodes, labels = self._dag.nodes, self._labels
+        rank = 0
+        done = set()
+        for root in (reversed(roots) if reverse else roots):
+            if root in done:
+                continue
+            done.add(root)
+            path = [(nodes[root], iter(sorted(
+                nodes[root].neighbors, key=lambda item: item.name,
+                reverse=reverse)))]
+            while path:
+                node, children = path[-1]
+                for child in children:
+                    if child.name not in done:
+                        done.add(child.name)
+                        path.append((child, iter(sorted(
+                            child.neighbors, key=lambda item: item.name,
+                            reverse=reverse))))
+                        break
+                else:
+                    path.pop()
+                    label = labels[node.name]
+                    low = rank
+                    for child in node.neighbors:
+                        low = min(low, labels[child.name][slot])
+                    label[slot], label[slot + 1] = low, rank
+                    rank += 1
+
+    # ------------------------------------------------------------ DAG hooks
+
+    def node_added(self, node):
+        if node.name not in self._labels:
+            # A point of its own, outside every interval so far: a node with
+            # no edges is above nothing and below nothing.
+            self._labels[node.name] = [0, self._next, self._next,
+                                       self._next, self._next]
+            self._next += 1
+            self._drift += 1
+
+    def node_forgotten(self, node):
+        del self._labels[node.name]
+
+    def edge_added(self, parent, child):
+        labels = self._labels
+        dag = self._dag
+        above, below = labels[parent.name], labels[child.name]
+        if parent.name in _dims.KINDS:
+            self._kind_edges += 1
+        if not child.neighbors and len(child.parents) == 1:
+            # A fresh leaf: nothing below it, nothing else above it, so it
+            # can simply take its parent's own point (hi is the parent's
+            # post-order rank) one level down.
+            below[:] = [above[0] + 1, above[2], above[2], above[4], above[4]]
+            if self._drift > len(labels):
+                self.rebuild()
+            return
+        if below[0] <= above[0]:
+            stack = [(child, above[0] + 1)]
+            while stack:
+                node, level = stack.pop()
+                label = labels[node.name]
+                if label[0] >= level:
+                    continue
+                label[0] = level
+                stack.extend((grandchild, level + 1)
+                             for grandchild in node.neighbors)
+        lo1, hi1, lo2, hi2 = below[1:]
+        live_parents = dag._live_parents
+        stack = [parent]
+        while stack:
+            node = stack.pop()
+            label = labels[node.name]
+            if label[1] <= lo1 and hi1 <= label[2] \
+                    and label[3] <= lo2 and hi2 <= label[4]:
+                continue          # contains it already, and so does all above
+            label[1], label[2] = min(label[1], lo1), max(label[2], hi1)
+            label[3], label[4] = min(label[3], lo2), max(label[4], hi2)
+            self._drift += 1
+            stack.extend(live_parents(node))
+        if self._drift > len(labels):
+            self.rebuild()
+
+    def edge_removed(self, parent, child):
+        if parent.name in _dims.KINDS:
+            self._kind_edges -= 1
+
+    # -------------------------------------------------------------- reading
+
+    def covers(self, computed):
+        """Whether the labels speak for the order being asked about: always
+        for the asserted order, for the combined order only while no
+        dimension is declared."""
+        return not computed or not self._kind_edges
+
+    def may_reach(self, upper, lower):
+        """False only when `upper` is provably NOT a strict ancestor of
+        `lower` (names)."""
+        a = self._labels.get(upper)
+        b = self._labels.get(lower)
+        if a is None or b is None:
+            return True
+        return (a[0] < b[0] and a[1] <= b[1] and b[2] <= a[2]
+                and a[3] <= b[3] and b[4] <= a[4])
+
+    def below_test(self, upper):
+        """`may_reach(upper, name)` as a one-argument predicate, with
+        `upper`'s label read once — for walks that ask it of every node
+        they touch."""
+        a = self._labels.get(upper)
+        if a is None:
+            return lambda name: True
+        level, lo1, hi1, lo2, hi2 = a
+        labels = self._labels
+
+        def may_lie_below(name):
+            b = labels.get(name)
+            return b is None or (level < b[0] and lo1 <= b[1]
+                                 and b[2] <= hi1 and lo2 <= b[3]
+                                 and b[4] <= hi2)
+        return may_lie_below
@@ -0,0 +1,179 @@
+"""Hydrated snapshots — a record store's graph kept on disk, by root.
+
+Every `odag` run on an `rs:` or `swarm:` store hydrated the whole graph
+(`EagerOntoDAG`): every record fetched and decoded from JSON, every node
+and edge wired. `--as-of`, `undo` and `redo` did it again for each root
+they open. A root names its content, so the graph at a root never goes
+stale, and the cache keeps it as an `.odb` snapshot (`ontodag.odb`) under
+the home directory:
+
+    ~/.ontodag/snapshots/<root>.odb     the graph at that root
+    ~/.ontodag/snapshots/<root>.json    its payload refs
+    ~/.ontodag/snapshots/<key>.head     per store: the root it last cached
+
+An open at a cached root maps the snapshot and reads no record. An open
+at another root (the HEAD moved, or `--as-of` names another version)
+starts from the store's last snapshot and applies the `RecordStore.diff`
+between the two roots, so it reads the records that changed rather than
+the store; once that diff is more than 1/64 of the graph, the graph is
+snapshotted again at the new root. The `KEEP` most recently used
+snapshots are kept.
+
+A hydrated dag needs the records as synced to compare its commits
+against. From a snapshot they are `Records`, built from the mapped arrays
+for the names a commit asks about.
+
+Nothing is cached when a store key is configured: the graph would sit on
+disk in the clear.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import MutableMapping
+
+from ontodag import odb
+
+DIRECTORY = "snapshots"
+VERSION = 1
+KEEP = 16
+REFRESH = 64            # re-snapshot when a diff is over 1/REFRESH of it
+
+
+class SnapshotCache:
+    """The snapshots of the store `target` (a store spec)."""
+
+    def __init__(self, home, target):
+        self.directory = os.path.join(home, DIRECTORY)
+        key = hashlib.sha256(target.encode("utf-8")).hexdigest()
+        self.target = target
+        self.head = os.path.join(self.directory, key[:32] + ".head")
+
+    def _path(self, root):
+        return os.path.join(self.directory, root)
+
+    def _payloads(self, root):
+        """The payload refs stored with the snapshot at `root`, or None
+        when there is no usable snapshot there."""
+        try:
+            with open(self._path(root) + ".json", encoding="utf-8") as fh:
+                recorded = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(recorded, dict) \
+                or recorded.get("version") != VERSION \
+                or recorded.get("root") != root \
+                or not os.path.exists(self._path(root) + ".odb"):
+            return None
+        return recorded["payloads"]
+
+    def nearest(self, root):
+        """`(cached_root, odb_path, payloads)`: the snapshot at `root` if
+        there is one, else the last one this store cached (to apply the
+        diff from), else None."""
+        candidates = [root]
+        try:
+            with open(self.head, encoding="utf-8") as fh:
+                candidates.append(json.load(fh)["root"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        for cached in candidates:
+            payloads = self._payloads(cached) if isinstance(cached, str) \
+                else None
+            if payloads is not None:
+                path = self._path(cached) + ".odb"
+                try:
+                    os.utime(path)              # recently used
+                except OSError:
+                    pass
+                return cached, path, payloads
+        return None
+
+    def store(self, dag, root, payloads):
+        """Snapshot `dag`, the graph at `root`, with its payload refs, and
+        make it the one this store's next open starts from."""
+        os.makedirs(self.directory, exist_ok=True)
+        base = self._path(root)
+        odb.write(dag, base + ".odb")
+        for path, content in (
+                (base + ".json", {"version": VERSION, "root": root,
+                                  "payloads": payloads}),
+                (self.head, {"target": self.target, "root": root})):
+            temporary = f"{path}.tmp{os.getpid()}"
+            with open(temporary, "w", encoding="utf-8") as fh:
+                json.dump(content, fh)
+            os.replace(temporary, path)
+        self._evict()
+
+    def _evict(self):
+        """Delete all but the `KEEP` most recently used snapshots."""
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".odb"):
+                path = os.path.join(self.directory, name)
+                try:
+                    snapshots.append((os.stat(path).st_mtime_ns, path))
+                except OSError:
+                    pass
+        for _, path in sorted(snapshots, reverse=True)[KEEP:]:
+            for stale in (path[:-len(".odb")] + ".json", path):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+
+class Records(MutableMapping):
+    """The records of the graph a snapshot holds, keyed by name, as an
+    `EagerOntoDAG` keeps its synced ones: each built from the mapped
+    arrays when it is read. Writes (a commit's records) shadow them."""
+
+    def __init__(self, path, payloads):
+        self._snapshot = odb.Snapshot(path)
+        self._metadata = self._snapshot.metadata()
+        self._payloads = payloads
+        self._shadow = {}               # name -> record, None once deleted
+
+    def __getitem__(self, name):
+        if name in self._shadow:
+            record = self._shadow[name]
+            if record is None:
+                raise KeyError(name)
+            return record
+        snapshot = self._snapshot
+        i = snapshot.find(name)
+        if i is None:
+            raise KeyError(name)
+        return {
+            "up": [snapshot.name(j) for j in snapshot.parents(i)],
+            "down": [snapshot.name(j) for j in snapshot.children(i)],
+            "count": snapshot.count(i),
+            "payload": self._payloads.get(name),
+            "meta": dict(self._metadata.get(name, {})),
+        }
+
+    def __contains__(self, name):
+        if name in self._shadow:
+            return self._shadow[name] is not None
+        return self._snapshot.find(name) is not None
+
+    def __setitem__(self, name, record):
+        self._shadow[name] = record
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._shadow[name] = None
+
+    def __iter__(self):
+        shadow = self._shadow
+        for i in range(len(self._snapshot)):
+            name = self._snapshot.name(i)
+            if name not in shadow:
+                yield name
+        for name, record in list(shadow.items()):
+            if record is not None:
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
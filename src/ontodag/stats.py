@@ -0,0 +1,240 @@
+"""Ancestor statistics — what an upward walk from each node will cost.
+
+`OntoDAG.get` chooses, before each remaining term, between walking that
+term's cone (cost: its `descendant_count`, exact and maintained) and
+probing every surviving candidate upward (cost: the candidates' ancestor
+cones — which nothing measured, so the planner multiplied by a constant,
+`_PROBE_COST_ESTIMATE`). On a deep taxonomy the constant is far too low
+and the planner probes when walking would be cheaper; on a flat one it is
+too high. This index keeps the missing statistic per node:
+
+- **ancestors**: the size of the node's strict (asserted) ancestor cone —
+  the most an upward probe from it can visit;
+- **depth**: the longest path down to it from a parentless node. A strict
+  ancestor is always shallower, which rules out most "is A above B?"
+  questions between query terms before any walk.
+
+Opt-in like the other indexes (`OntoDAG.enable_ancestor_stats()`), kept
+through the DAG's index hooks, and never persisted: the canonical record
+holds `descendant_count` because the store's summaries need it; these are
+planner statistics, derivable from the edges at any time (`rebuild()`).
+
+Maintenance mirrors the count rules in dag.py, with the directions
+swapped:
+
+- **add** `p -> c` gives every node at or below `c` the ancestors `p` has
+  (and `p`) that it lacked: `c`'s share is found by one upward walk, and
+  pushed down the cone, where a node keeps what all its parents gained
+  and walks up only from a parent outside the cone. Nothing moves when
+  `p` was already above `c`. Depth pushes down where it would no longer
+  increase.
+- **remove** marks the child stale; the next read recomputes the stale
+  nodes' cones once (a removal that leaves the parent above the child —
+  transitive-reduction pruning, every cross-link's aftermath — changes
+  nothing and is dropped first). Cone removal drops many edges in a row,
+  so deferring keeps it one recompute.
+
+Like the other indexes these are ASSERTED figures. The computed order
+between parametric values (DIMENSIONS.md §5) adds hops no count records;
+the probe estimate tolerates that (it only picks between exact operators),
+but the depth cut is a proof, so `covers()` offers it only while no
+dimension is declared.
+"""
+
+from ontodag import dimensions as _dims
+
+
+class AncestorStats:
+    def __init__(self, dag):
+        self._dag = dag
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute every node's statistics from the graph as it stands."""
+        dag = self._dag
+        live_parents = dag._live_parents
+        # stats = [ancestor count, depth]
+        self._stats = {}
+        self._stale = set()      # (parent name, child name) of removed edges
+        self._kind_edges = sum(len(dag.nodes[kind].neighbors)
+                               for kind in _dims.KINDS if kind in dag.nodes)
+        # Ancestor cones as bitsets over the nodes that have children (every
+        # ancestor has one), built parents first.
+        position = {}
+        above = {}
+        for node in dag.topological_sort():
+            cone, depth = 0, 0
+            for parent in live_parents(node):
+                cone |= above[parent.name] | (1 << position[parent.name])
+                depth = max(depth, self._stats[parent.name][1] + 1)
+            self._stats[node.name] = [cone.bit_count(), depth]
+            if node.neighbors:
+                position[node.name] = len(position)
+                above[node.name] = cone
+
+    # ------------------------------------------------------------ DAG hooks
+
+    def node_added(self, node):
+        self._stats.setdefault(node.name, [0, 0])
+
+    def node_forgotten(self, node):
+        del self._stats[node.name]
+
+    def edge_added(self, parent, child):
+        self._flush(skip=(child, parent))   # the state the edge was added to
+        if parent.name in _dims.KINDS:
+            self._kind_edges += 1
+        stats = self._stats
+        level = stats[parent.name][1] + 1
+        if stats[child.name][1] < level:
+            stack = [(child, level)]
+            while stack:
+                node, level = stack.pop()
+                entry = stats[node.name]
+                if entry[1] >= level:
+                    continue
+                entry[1] = level
+                stack.extend((grandchild, level + 1)
+                             for grandchild in node.neighbors)
+        gained = self._ancestors(parent)
+        gained.add(parent.name)
+        # What each node at or below child gains: the child, what it did
+        # not have of `gained`; below it, what every parent in the cone
+        # gains (a parent is never in `gained`: that would be a cycle),
+        # less what a parent outside the cone already had — the only
+        # upward walks left. Parents first, by Kahn over the cone.
+        gains = {child.name: gained - self._ancestors(child,
+                                                      skip=(child, parent))}
+        if not gains[child.name]:
+            return                # below parent already, and so is all below
+        cone = {child.name}
+        stack = [child]
+        while stack:
+            for grandchild in stack.pop().neighbors:
+                if grandchild.name not in cone:
+                    cone.add(grandchild.name)
+                    stack.append(grandchild)
+        live_parents = self._dag._live_parents
+        nodes = self._dag.nodes
+        waiting = {name: sum(1 for above in live_parents(nodes[name])
+                             if above.name in cone)
+                   for name in cone}
+        stats[child.name][0] += len(gains[child.name])
+        ready = [child]
+        while ready:
+            for node in ready.pop().neighbors:
+                name = node.name
+                waiting[name] -= 1
+                if waiting[name]:
+                    continue
+                gain, outside = None, []
+                for above in live_parents(node):
+                    if above.name not in cone:
+                        outside.append(above)
+                    elif gain is None:
+                        gain = gains[above.name]    # shared, never mutated
+                    else:
+                        gain = gain & gains[above.name]
+                for above in outside:
+                    if not gain:
+                        break
+                    gain = gain - self._ancestors(above) - {above.name}
+                gains[name] = gain
+                stats[name][0] += len(gain)
+                ready.append(node)
+
+    def edge_removed(self, parent, child):
+        if parent.name in _dims.KINDS:
+            self._kind_edges -= 1
+        self._stale.add((parent.name, child.name))
+
+    # -------------------------------------------------------------- reading
+
+    def _ancestors(self, node, skip=None):
+        """Names of `node`'s strict asserted ancestors; `skip` is one
+        (child, parent) edge to leave out — the edge just added, for the
+        pre-state."""
+        live_parents = self._dag._live_parents
+        seen = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for parent in live_parents(current):
+                if skip is not None and current is skip[0] \
+                        and parent is skip[1]:
+                    continue
+                if parent.name not in seen:
+                    seen.add(parent.name)
+                    stack.append(parent)
+        return seen
+
+    def _flush(self, skip=None):
+        """Recompute the nodes below removed edges; `skip` leaves out an
+        edge just added, as `_ancestors` does, for a caller that applies
+        it after."""
+        if not self._stale:
+            return
+        nodes = self._dag.nodes
+        live_parents = self._dag._live_parents
+        roots = []
+        for parent, child in self._stale:
+            node = nodes.get(child)
+            if node is None:
+                continue
+            if parent in nodes and parent in self._ancestors(node, skip):
+                continue          # still above: nothing changed (pruning)
+            roots.append(node)
+        self._stale.clear()
+        # The cones below, recomputed parents first (Kahn over the affected
+        # subgraph; parents outside it are current).
+        affected = set()
+        stack = list(roots)
+        while stack:
+            node = stack.pop()
+            if node.name not in affected:
+                affected.add(node.name)
+                stack.extend(node.neighbors)
+        pending = {name: sum(1 for parent in live_parents(nodes[name])
+                             if parent.name in affected)
+                   for name in affected}
+        ready = [name for name, waiting in pending.items() if not waiting]
+        stats = self._stats
+        while ready:
+            node = nodes[ready.pop()]
+            stats[node.name] = [
+                len(self._ancestors(node, skip)),
+                max((stats[parent.name][1] + 1
+                     for parent in live_parents(node)), default=0)]
+            for child in node.neighbors:
+                pending[child.name] -= 1
+                if not pending[child.name]:
+                    ready.append(child.name)
+
+    def covers(self, computed):
+        """Whether `depth` orders the relation asked about: always for the
+        asserted order, for the combined order only while no dimension is
+        declared."""
+        return not computed or not self._kind_edges
+
+    def ancestors(self, name):
+        """Size of `name`'s strict asserted ancestor cone."""
+        self._flush()
+        return self._stats[name][0]
+
+    def depth(self, name):
+        """Longest path from a parentless node down to `name`."""
+        self._flush()
+        return self._stats[name][1]
+
+    def probe_cost(self, names, bound):
+        """Nodes an upward probe from each of `names` can visit, summed —
+        counted only until it reaches `bound`, since the planner just
+        needs to know which side of the walk cost it lies on."""
+        self._flush()
+        stats = self._stats
+        total = 0
+        for name in names:
+            total += stats[name][0]
+            if total >= bound:
+                break
+        return total
@@ -0,0 +1,185 @@
+"""The composed-view cache — `Session.view()` kept on disk between runs.
+
+With overlays configured, every answer reads the composed view: a fresh
+OntoDAG with the primary store and each overlay merged in. A one-shot
+`odag get` paid for it on every run — every layer loaded, then the whole
+union replayed and reduced — before it could answer anything. The cache
+keeps the union instead, as an `.odb` snapshot (`ontodag.odb`) under the
+home directory, one per list of layers:
+
+    ~/.ontodag/views/<key>.odb     the composed view
+    ~/.ontodag/views/<key>.json    what it was composed from
+
+The manifest records each layer's stamp — the backend's `stamp()`, as the
+daemon uses it: a file's (and its journal's) identity, size and mtime,
+the `root` pointer of an `rs:` store, a `swarm:` store's HEAD — and, for a
+record store, the root it was at. While every stamp is unchanged the
+snapshot is the view, and no layer is read at all.
+
+When layers moved and every one that moved is a record store, the view is
+folded forward rather than rebuilt: `RecordStore.diff` between the root
+recorded and the root now gives the records that changed, and only those
+are replayed into the cached union — `EagerOntoDAG.merge_delta`'s walk,
+from the cached view instead of a live store. The union is grow-only, as
+merge is, so a fold is only exact when the layer grew: a record that
+disappeared, lost metadata, or dropped a parent it is no longer below
+would leave its old claims in the union, and the view is rebuilt in full
+instead. So is it when a file layer moved, since a file keeps no earlier
+state to diff against.
+
+Nothing is cached for a past version (`--as-of`), a primary with changes
+not yet saved, a backend that gives no stamp, or when a store key is
+configured: the union would sit on disk in the clear.
+"""
+
+import hashlib
+import json
+import os
+
+from ontodag import odb
+from ontodag.dag import Item
+
+DIRECTORY = "views"
+VERSION = 1
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+class ViewCache:
+    """The cached composition of `layers` (store specs, primary first)."""
+
+    def __init__(self, home, layers):
+        key = hashlib.sha256(json.dumps(layers).encode("utf-8")).hexdigest()
+        base = os.path.join(home, DIRECTORY, key[:32])
+        self.layers = list(layers)
+        self.path = base + ".odb"
+        self.manifest = base + ".json"
+
+    def _recorded(self):
+        """The manifest, if it describes the snapshot beside it."""
+        try:
+            with open(self.manifest, encoding="utf-8") as fh:
+                recorded = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(recorded, dict) \
+                or recorded.get("version") != VERSION \
+                or recorded.get("layers") != self.layers \
+                or recorded.get("view") != _stamp(self.path):
+            return None
+        return recorded
+
+    def load(self, stamps):
+        """The cached view, if every layer is at `stamps`; else None."""
+        recorded = self._recorded()
+        if recorded is None or recorded["stamps"] != stamps:
+            return None
+        return odb.read(self.path)
+
+    def refold(self, stamps, backends):
+        """The cached view folded forward to `stamps`, when every layer that
+        moved is a record store that only grew; else None."""
+        recorded = self._recorded()
+        if recorded is None:
+            return None
+        roots = list(recorded["roots"])
+        moved = [i for i, stamp in enumerate(stamps)
+                 if recorded["stamps"][i] != stamp]
+        if not moved or any(roots[i] is None for i in moved):
+            return None
+        view = odb.read(self.path)
+        for i in moved:
+            store = backends[i].open_store()
+            try:
+                root = store.root
+                if root != roots[i] and not fold(view, store.blobs,
+                                                 roots[i], root):
+                    return None
+                roots[i] = root
+            finally:
+                close = getattr(store, "close", None)
+                if close is not None:
+                    close()
+        self.store(view, stamps, roots)
+        return view
+
+    def store(self, view, stamps, roots):
+        """Write `view` as the composition of the layers at `stamps`;
+        `roots` holds each record store's root, None for a file."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        odb.write(view, self.path)
+        temporary = f"{self.manifest}.tmp{os.getpid()}"
+        with open(temporary, "w", encoding="utf-8") as fh:
+            json.dump({"version": VERSION, "layers": self.layers,
+                       "stamps": stamps, "roots": roots,
+                       "view": _stamp(self.path)}, fh)
+        os.replace(temporary, self.manifest)
+
+
+def fold(view, bytes_store, old_root, new_root):
+    """Fold a record store's move from `old_root` to `new_root` into `view`,
+    which holds the store at `old_root` among its layers. Returns False,
+    with `view` untouched, when the move was not growth."""
+    from ontodag._extras import require
+    rs = require("recordstore", "store", "the composed-view cache")
+
+    after = rs.RecordStore.at(new_root, bytes_store)
+    touched = {}
+    for key, before, record in rs.RecordStore.at(
+            old_root, bytes_store).diff(new_root):
+        if key == view.root.name:
+            continue                     # the root always exists; up is []
+        if record is rs.ABSENT:
+            return False
+        meta = record.get("meta") or {}
+        if before is not rs.ABSENT:
+            old_meta = before.get("meta") or {}
+            if any(name not in meta or meta[name] != value
+                   for name, value in old_meta.items()):
+                return False
+            dropped = set(before["up"]) - set(record["up"])
+            if any(not _below(after, key, parent) for parent in dropped):
+                return False
+        # Ours-win metadata is only what a rebuild gives when nothing in
+        # the union disagrees: the layers' order decides a conflict.
+        node = view.nodes.get(key)
+        if node is not None and any(
+                node.metadata.get(name, value) != value
+                for name, value in meta.items()):
+            return False
+        touched[key] = record
+
+    with view.bulk():
+        for key in sorted(touched):
+            node = view.nodes.get(key)
+            if node is None:
+                view.add_node(Item(key, metadata=touched[key].get("meta")
+                                   or {}))
+            else:
+                for name, value in (touched[key].get("meta") or {}).items():
+                    node.metadata.setdefault(name, value)
+        for key in sorted(touched):
+            node = view.nodes[key]
+            for parent in touched[key]["up"]:
+                if parent in view.nodes:
+                    view.add_edge(view.nodes[parent], node)
+    return True
+
+
+def _below(store, key, ancestor):
+    """Whether `key` is still below `ancestor` in `store`, by its records."""
+    seen, frontier = {key}, [key]
+    while frontier:
+        for parent in store.get(frontier.pop())["up"]:
+            if parent == ancestor:
+                return True
+            if parent not in seen:
+                seen.add(parent)
+                frontier.append(parent)
+    return False
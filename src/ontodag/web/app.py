@@ -131,7 +131,7 @@ def init_session_visualizer():
 # This list is also what stops the console silently acquiring every future
 # CLI command without anyone deciding it should.
 CONSOLE_COMMANDS = {
-    "put", "get", "count", "below", "?", "canon", "list", "show",
+    "put", "get", "count", "below", "?", "explain", "canon", "list", "show",
     "move", "remove", "overlapping", "prelude", "pack", "help",
 }
 
@@ -148,6 +148,9 @@ CONSOLE_REFUSALS = {
     "index": "publishes a record store, which this sandbox has nowhere to put",
     "set": "which store this app opens is a launch argument, not a page's decision",
     "swarm": "checks a Bee node this sandbox does not talk to",
+    "compact": "folds a store file's journal, and this sandbox has no file",
+    "serve": "keeps stores loaded for the command line, on a socket on the "
+             "server",
     "web": "is what you are looking at",
     "history": "this sandbox keeps no versions (an `rs:` or `swarm:` store does)",
     "status": "this sandbox keeps no versions (an `rs:` or `swarm:` store does)",
@@ -389,13 +392,14 @@ def _shape(parser):
 COMMAND_GROUPS = (
     ("Filing things", ("put", "move", "remove")),
     ("Asking questions",
-     ("get", "count", "list", "show", "below", "overlapping", "canon")),
+     ("get", "count", "list", "show", "below", "overlapping", "canon",
+      "explain")),
     ("Vocabulary", ("prelude", "pack")),
     ("Files and pictures",
      ("import", "export", "merge", "ingest", "excerpt", "diff",
       "visualize")),
     ("Versions", ("history", "status", "undo", "redo")),
-    ("Store and network", ("set", "index", "swarm")),
+    ("Store and network", ("set", "compact", "serve", "index", "swarm")),
     ("Help", ("help",)),
 )
 
@@ -409,7 +413,7 @@ NOT_IN_THE_BROWSER = {"web"}
 def commands():
     """Every OntoDAG command — what it does, and whether it runs here.
 
-    All 27, not the 13 this surface allows: someone opening this is asking
+    All 31, not the 14 this surface allows: someone opening this is asking
     what the system can do, and answering with only the sandbox's subset
     would misrepresent it. The ones a browser cannot run say why in the same
     breath (they take filesystem paths, or need a store that keeps versions),
@@ -801,14 +805,37 @@ def get_query():
         # closed (empty result / empty disjunct), parametric terms may be
         # virtual (weight(..5kg) needs no node), malformed parameters are
         # a client error.
-        if len(queries) == 1:
-            result_nodes = my_dag.get(queries[0])
+        limit = request.args.get("limit", type=int)
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be a non-negative integer")
+        # ?explain=1 attaches the planner's trace (OntoDAG.explain) for
+        # diagnosing a slow query where it is slow. The traced run is the
+        # one that answers: a second run would only measure warm caches.
+        explain = answer = None
+        if request.args.get("explain", "").lower() in ("1", "true", "yes"):
+            explain, answer = (my_dag._explain(queries[0])
+                               if len(queries) == 1
+                               else my_dag._explain_any(queries))
+        elif len(queries) == 1:
+            # ?limit=N streams the first N by name (OntoDAG.iter_get); the
+            # answer still says how many there are in all.
+            result_nodes = my_dag.iter_get(queries[0], limit=limit)
+            result_nodes, total = list(result_nodes), result_nodes.total
         else:
-            result_nodes = my_dag.get_any(queries)
+            answer = my_dag.get_any(queries)
+        if answer is not None:
+            result_nodes = sorted(answer, key=lambda node: node.name)
+            total = len(result_nodes)
+            if limit is not None:
+                result_nodes = result_nodes[:limit]
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
-    return jsonify({"nodes": list([node.to_dict() for node in result_nodes])})
+    body = {"nodes": list([node.to_dict() for node in result_nodes]),
+            "total": total}
+    if explain is not None:
+        body["explain"] = explain
+    return jsonify(body)
 
 
 QUERY_LOG = Counter()  # category-set -> times queried (see /dag/stats/queries)
@@ -0,0 +1,197 @@
+"""Ancestor statistics and `explain` — exact figures, unchanged answers.
+
+The statistics are compared with freshly walked ancestor cones and longest
+paths after *every* operation (the deferred recompute on removal has the
+same ways to be quietly wrong as the bitmaps' stale-marking), and query
+answers with a statistics-free twin fed the same operations: the planner
+may choose differently, never answer differently."""
+
+import unittest
+from unittest import mock
+
+from ontodag import OntoDAG
+
+from twins import twin_edits
+
+
+def names(items):
+    return {item.name for item in items}
+
+
+class StatsAssertions(unittest.TestCase):
+    def assertStatsExact(self, dag, label=""):
+        stats = dag._stats
+        depth = {}
+        for node in dag.topological_sort():
+            depth[node.name] = max((depth[parent.name] + 1
+                                    for parent in dag._live_parents(node)),
+                                   default=0)
+        for name in dag.nodes:
+            self.assertEqual(
+                stats.ancestors(name),
+                len(dag.get_ancestors(name, computed=False)),
+                f"ancestors of {name} after {label}")
+            self.assertEqual(stats.depth(name), depth[name],
+                             f"depth of {name} after {label}")
+
+
+class TestMaintenance(StatsAssertions):
+    def test_enable_indexes_the_existing_graph(self):
+        dag = OntoDAG()
+        dag.put("Animal", [])
+        dag.put("Dog", ["Animal"])
+        dag.put("Pet", [])
+        dag.put("Spaniel", ["Dog", "Pet"])
+        stats = dag.enable_ancestor_stats()
+        self.assertStatsExact(dag, "enable")
+        self.assertEqual(stats.ancestors("Spaniel"), 4)
+        self.assertEqual(stats.depth("Spaniel"), 3)
+
+    def test_a_category_edge_reaches_the_whole_cone(self):
+        dag = OntoDAG()
+        dag.enable_ancestor_stats()
+        dag.put("Dog", [])
+        dag.put("Spaniel", ["Dog"])
+        dag.put("Cocker", ["Spaniel"])
+        dag.put("Animal", [])
+        dag.put("Dog", ["Animal"])
+        self.assertStatsExact(dag, "reparent")
+        dag.remove("Animal")
+        self.assertStatsExact(dag, "contraction")
+
+    def test_removal_is_deferred_to_the_next_read(self):
+        dag = OntoDAG()
+        stats = dag.enable_ancestor_stats()
+        dag.put("A", [])
+        dag.put("B", ["A"])
+        dag.put("c", ["B"])
+        dag.remove_cone(["B"])
+        self.assertTrue(stats._stale)
+        self.assertStatsExact(dag, "cone removal")
+        self.assertFalse(stats._stale)
+
+    def test_a_new_parent_is_pushed_down_not_walked_up_per_member(self):
+        dag = OntoDAG()
+        stats = dag.enable_ancestor_stats()
+        chain = [f"k{i}" for i in range(20)]
+        dag.bulk_load([("*", "k0"), *zip(chain, chain[1:]), ("k19", "cat"),
+                       *(("cat", f"i{i}") for i in range(500)),
+                       ("*", "other"), ("other", "i0")])
+        with mock.patch.object(stats, "_ancestors",
+                               wraps=stats._ancestors) as walked:
+            dag.put("cat", ["k19", "other"])
+        # the parent, the child, and the member with a parent of its own
+        self.assertLessEqual(walked.call_count, 4)
+        self.assertStatsExact(dag, "a new parent")
+
+    def test_bulk_load_rebuilds(self):
+        dag = OntoDAG()
+        dag.enable_ancestor_stats()
+        dag.bulk_load([("*", "A"), ("A", "B"), ("B", "c"), ("A", "c")])
+        self.assertStatsExact(dag, "bulk load")
+
+
+class TestExplain(unittest.TestCase):
+    def deep(self):
+        dag = OntoDAG()
+        previous = []
+        for depth in range(12):
+            dag.put(f"k{depth}", previous)
+            previous = [f"k{depth}"]
+        for i in range(40):
+            dag.put(f"item{i}", [f"k{i % 12}"])
+        dag.put("tag", [])
+        for i in range(0, 40, 3):
+            dag.put(f"item{i}", ["tag"])
+        return dag
+
+    def test_the_trace_matches_the_answer(self):
+        dag = self.deep()
+        trace = dag.explain(["k0", "k3", "tag"])
+        self.assertEqual(trace["result"], len(dag.get(["k0", "k3", "tag"])))
+        self.assertEqual(trace["operator"], "planner")
+        self.assertEqual(trace["dropped"], [{"term": "k0", "subsumed_by": "k3"}])
+        self.assertEqual([entry["term"] for entry in trace["order"]],
+                         ["tag", "k3"])
+        self.assertEqual(trace["steps"][0]["op"], "walk")
+        self.assertEqual(trace["steps"][0]["result"], 14)
+        self.assertEqual(sum(step["visits"] for step in trace["steps"])
+                         + trace["plan_visits"], trace["visits"])
+
+    def test_real_ancestor_cones_change_the_plan(self):
+        # Two candidates thirty levels deep against a remaining cone of 50:
+        # the flat estimate (2 x 16) probes, the real ancestor cones walk.
+        dag = OntoDAG()
+        previous = []
+        for depth in range(30):
+            dag.put(f"k{depth}", previous)
+            previous = [f"k{depth}"]
+        dag.put("tag", [])
+        dag.put("wide", [])
+        for i in range(48):
+            dag.put(f"item{i}", ["wide"])
+        dag.put("deepA", ["k29", "tag", "wide"])
+        dag.put("deepB", ["k29", "tag", "wide"])
+        flat = dag.explain(["tag", "wide"])
+        self.assertEqual([step["op"] for step in flat["steps"]],
+                         ["walk", "probe"])
+        self.assertEqual(flat["steps"][1]["estimate"], 32)
+        dag.enable_ancestor_stats()
+        costed = dag.explain(["tag", "wide"])
+        self.assertEqual([step["op"] for step in costed["steps"]],
+                         ["walk", "walk"])
+        self.assertEqual(costed["steps"][1]["alternative"], 66)
+        self.assertEqual(costed["result"], flat["result"])
+
+    def test_settled_queries_say_how(self):
+        dag = self.deep()
+        self.assertEqual(dag.explain([])["operator"], "universe")
+        empty = dag.explain(["nonesuch"])
+        self.assertEqual(empty["operator"], "empty")
+        self.assertIn("nonesuch", empty["note"])
+        dag.enable_cone_bitmaps()
+        self.assertEqual(dag.explain(["tag", "k1"])["operator"], "bitmaps")
+
+    def test_a_union_explains_each_branch_it_runs(self):
+        dag = self.deep()
+        queries = [["tag", "k3"], ["k11"], ["k11", "tag"]]
+        trace = dag.explain_any(queries)
+        self.assertEqual(trace["result"], len(dag.get_any(queries)))
+        self.assertEqual(trace["skipped"], [["k11", "tag"]])
+        self.assertEqual([branch["terms"] for branch in trace["branches"]],
+                         [["k3", "tag"], ["k11"]])
+        self.assertEqual(trace["visits"],
+                         sum(branch["visits"] for branch in trace["branches"]))
+
+    def test_below_names_the_rule_that_decided(self):
+        dag = self.deep()
+        upward = dag.explain_below("item11", "k2")
+        self.assertEqual((upward["operator"], upward["result"]),
+                         ("upward", True))
+        self.assertFalse(upward["labels"])
+        self.assertGreater(upward["visits"], 0)
+        self.assertEqual(dag.explain_below("k3", "k3")["operator"], "reflexive")
+        self.assertEqual(dag.explain_below("k3", "nonesuch")["operator"],
+                         "unknown")
+        dag.enable_reachability_index()
+        self.assertTrue(dag.explain_below("item11", "k2")["labels"])
+
+
+class TestFuzz(StatsAssertions):
+    def _run(self, seed):
+        dag, twin = OntoDAG(), OntoDAG()
+        dag.enable_ancestor_stats()
+        for rng, label in twin_edits(dag, twin, seed):
+            self.assertStatsExact(dag, label)
+            live = sorted(set(dag.nodes) - {"*"})
+            for _ in range(3):
+                terms = rng.sample(live, min(len(live), rng.randint(1, 3)))
+                self.assertEqual(names(dag.get(terms)), names(twin.get(terms)))
+
+    def test_fuzz_many_seeds(self):
+        for seed in range(8):
+            self._run(seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -133,6 +133,11 @@ class TestCoreIsSwarmFree(unittest.TestCase):
         self.assertEqual(loaded, [],
                          f"importing ontodag.migrate loaded {loaded}")
 
+    def test_compact_module_imports_stay_core_only(self):
+        loaded = fresh_import("ontodag.compact", CORE_FORBIDDEN)
+        self.assertEqual(loaded, [],
+                         f"importing ontodag.compact loaded {loaded}")
+
     def test_compare_module_imports_stay_core_only(self):
         loaded = fresh_import("ontodag.compare", CORE_FORBIDDEN)
         self.assertEqual(loaded, [],
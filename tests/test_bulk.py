@@ -0,0 +1,235 @@
+"""Bulk loading — one pass must leave exactly the graph a replay leaves.
+
+The oracle is the replay itself: the same edges fed through `add_edge` one
+at a time into a twin, compared on the edge set and on every count. The
+transitive reduction of a DAG is unique (I3), so any difference is a bug in
+the one-pass reduction, not an acceptable alternative answer."""
+
+import gc
+import random
+import unittest
+
+from ontodag import OntoDAG
+from ontodag.dag import Item
+
+
+def edge_set(dag):
+    return {(parent.name, child.name)
+            for parent in dag.nodes.values() for child in parent.neighbors}
+
+
+def counts(dag):
+    return {name: node.descendant_count for name, node in dag.nodes.items()}
+
+
+def replay(dag, edges):
+    for parent, child in edges:
+        for name in (parent, child):
+            if name not in dag.nodes:
+                dag.add_node(Item(name))
+        dag.add_edge(dag.nodes[parent], dag.nodes[child])
+
+
+class TestBulkLoad(unittest.TestCase):
+    def test_unreduced_edges_load_reduced_and_counted(self):
+        dag = OntoDAG()
+        dag.bulk_load([("*", "Animal"), ("Animal", "Dog"), ("Dog", "Spaniel"),
+                       ("Animal", "Spaniel"), ("*", "Dog"), ("*", "Spaniel")])
+        self.assertEqual(edge_set(dag), {("*", "Animal"), ("Animal", "Dog"),
+                                         ("Dog", "Spaniel")})
+        self.assertEqual(counts(dag), {"*": 3, "Animal": 2, "Dog": 1,
+                                       "Spaniel": 0})
+
+    def test_present_edges_are_reduced_against_the_new_ones(self):
+        dag = OntoDAG()
+        dag.put("Animal", [])
+        dag.put("Spaniel", ["Animal"])
+        dag.bulk_load([("Animal", "Dog"), ("Dog", "Spaniel")])
+        self.assertNotIn(("Animal", "Spaniel"), edge_set(dag))
+        self.assertEqual(dag.nodes["Animal"].descendant_count, 2)
+
+    def test_a_cycle_is_refused_before_anything_changes(self):
+        dag = OntoDAG()
+        dag.put("A", [])
+        before = (edge_set(dag), counts(dag))
+        with self.assertRaises(ValueError) as caught:
+            dag.bulk_load([("A", "B"), ("B", "C"), ("C", "B"), ("C", "leaf")])
+        self.assertIn("B, C", str(caught.exception))
+        self.assertNotIn("leaf", str(caught.exception))
+        self.assertEqual((edge_set(dag), counts(dag)), before)
+        self.assertEqual(set(dag.nodes), {"*", "A"})
+
+    def test_a_cycle_in_a_small_batch_is_refused_before_anything_changes(self):
+        # Few edges on a large graph: replayed edge by edge, not one pass.
+        dag = OntoDAG()
+        for i in range(40):
+            dag.put(f"n{i}", [])
+        before = (edge_set(dag), counts(dag))
+        with self.assertRaises(ValueError) as caught:
+            dag.bulk_load([("n0", "n1"), ("n1", "n0")])
+        self.assertIn("n0, n1", str(caught.exception))
+        self.assertEqual((edge_set(dag), counts(dag)), before)
+
+    def test_metadata_is_merged_and_must_name_a_node(self):
+        dag = OntoDAG()
+        dag.put(Item("Dog", metadata={"legs": 4, "sound": "woof"}), [])
+        dag.bulk_load([("Dog", "Spaniel")],
+                      metadata={"Dog": {"sound": "bark"}, "Spaniel": {"x": 1}})
+        self.assertEqual(dag.nodes["Dog"].metadata, {"legs": 4, "sound": "bark"})
+        self.assertEqual(dag.nodes["Spaniel"].metadata, {"x": 1})
+        with self.assertRaises(ValueError):
+            dag.bulk_load([("Dog", "Beagle")], metadata={"Cat": {}})
+        self.assertNotIn("Beagle", dag.nodes)
+
+    def test_indexes_are_rebuilt(self):
+        dag = OntoDAG()
+        dag.enable_cone_bitmaps()
+        dag.enable_reachability_index()
+        dag.bulk_load([("*", "A"), ("A", "B"), ("B", "c"), ("A", "c")])
+        self.assertEqual(dag.count(["A"]), 2)
+        self.assertTrue(dag.is_below("c", "A"))
+        self.assertFalse(dag.is_below("A", "c"))
+        dag.put("d", ["B"])
+        self.assertEqual(dag.count(["A"]), 3)
+
+    def test_the_collector_is_restored(self):
+        dag = OntoDAG()
+        self.assertTrue(gc.isenabled())
+        dag.bulk_load([("*", "A")])
+        self.assertTrue(gc.isenabled())
+        with self.assertRaises(ValueError):
+            dag.bulk_load([("A", "B"), ("B", "A")])
+        self.assertTrue(gc.isenabled())
+
+
+class TestBulkBlock(unittest.TestCase):
+    def test_puts_in_a_block_match_puts_outside_one(self):
+        lines = [("Spaniel", ["Dog", "Pet"]), ("Dog", ["Animal"]),
+                 ("Pet", []), ("Animal", []), ("Beagle", ["Dog"]),
+                 ("Dog", ["Pet"])]
+        plain, batched = OntoDAG(), OntoDAG()
+        for target in (plain, batched):
+            for name in ("Dog", "Pet", "Animal"):
+                target.put(name, [])
+        for name, supers in lines:
+            plain.put(name, supers)
+        with batched.bulk():
+            for name, supers in lines:
+                batched.put(name, supers)
+            # Nodes exist at once; the edges wait for the end of the block.
+            self.assertIn("Beagle", batched.nodes)
+            self.assertFalse(batched.nodes["Beagle"].parents)
+        self.assertEqual(edge_set(batched), edge_set(plain))
+        self.assertEqual(counts(batched), counts(plain))
+
+    def test_an_exception_forgets_what_the_block_created(self):
+        dag = OntoDAG()
+        dag.put("Dog", [])
+        with self.assertRaises(RuntimeError):
+            with dag.bulk():
+                dag.put("Spaniel", ["Dog"])
+                raise RuntimeError("stop")
+        self.assertEqual(set(dag.nodes), {"*", "Dog"})
+        self.assertEqual(dag.nodes["Dog"].descendant_count, 0)
+
+    def test_declaring_a_dimension_switches_to_edge_by_edge(self):
+        lines = [("parcel", ["weight(3kg)"]), ("dimension", []),
+                 ("linear-dimension", ["dimension"]),
+                 ("weight", ["linear-dimension"]),
+                 ("weight(3kg)", []), ("parcel", ["weight(3kg)"]),
+                 ("weight(..5kg)", []), ("box", ["weight(3000g)"])]
+        plain, batched = OntoDAG(), OntoDAG()
+        plain.put("weight(3kg)", [])
+        batched.put("weight(3kg)", [])
+        for name, supers in lines:
+            plain.put(name, supers)
+        with batched.bulk():
+            for name, supers in lines:
+                batched.put(name, supers)
+        self.assertEqual(edge_set(batched), edge_set(plain))
+        self.assertEqual(counts(batched), counts(plain))
+        self.assertTrue(batched.is_below("box", "weight(..5kg)"))
+
+
+class TestPutMany(unittest.TestCase):
+    def scaffolded(self, pairs):
+        """The oracle: what `odag ingest` did line by line before."""
+        dag = OntoDAG()
+        for name, supers in pairs:
+            for sup in supers:
+                if sup not in dag.nodes:
+                    dag.put(sup, [])
+            dag.put(name, supers)
+        return dag
+
+    def test_matches_the_puts_in_order(self):
+        rng = random.Random(3)
+        names = [f"n{i}" for i in range(40)]
+        pairs = [(names[i], rng.sample(names[:i], min(i, rng.randint(0, 3))))
+                 for i in range(40)]
+        pairs += [(rng.choice(names[20:]), rng.sample(names[:20], 2))
+                  for _ in range(30)]
+        rng.shuffle(pairs)
+        dag = OntoDAG()
+        dag.put_many(iter(pairs), scaffold=True)
+        oracle = self.scaffolded(pairs)
+        self.assertEqual(edge_set(dag), edge_set(oracle))
+        self.assertEqual(counts(dag), counts(oracle))
+        dag.put_many(pairs, scaffold=True)                  # idempotent
+        self.assertEqual(edge_set(dag), edge_set(oracle))
+
+    def test_a_dimension_declared_midway_takes_put(self):
+        pairs = [("linear-dimension", ["dimension"]),
+                 ("parcel", ["weight(3000g)"]),
+                 ("weight", ["linear-dimension"]),
+                 ("box", ["weight(3000g)"]), ("crate", ["weight(..5kg)"])]
+        dag = OntoDAG()
+        dag.put_many(pairs, scaffold=True)
+        oracle = self.scaffolded(pairs)
+        self.assertEqual(edge_set(dag), edge_set(oracle))
+        self.assertEqual(counts(dag), counts(oracle))
+        self.assertIn("weight(3kg)", dag.nodes)             # canonicalized
+        self.assertIn("weight(3000g)", dag.nodes)           # an opaque atom
+
+    def test_a_missing_supercategory_is_refused_without_scaffold(self):
+        dag = OntoDAG()
+        dag.put("Dog", [])
+        with self.assertRaises(ValueError):
+            dag.put_many([("Spaniel", ["Dog"]), ("Beagle", ["Hound"])])
+        self.assertEqual(set(dag.nodes), {"*", "Dog"})
+        with self.assertRaises(ValueError):
+            dag.put_many([("*", [])])
+
+
+class TestFuzz(unittest.TestCase):
+    def _run(self, seed):
+        rng = random.Random(seed)
+        base = OntoDAG()
+        for i in range(rng.randint(0, 15)):
+            live = sorted(set(base.nodes) - {"*"})
+            base.put(f"b{i}", rng.sample(live, min(len(live), rng.randint(0, 2))))
+        names = [f"n{i}" for i in range(rng.randint(2, 30))]
+        names += sorted(set(base.nodes) - {"*"})
+        edges = [tuple(rng.sample(names, 2)) for _ in range(rng.randint(0, 60))]
+        edges += [("*", name) for name in names if rng.random() < 0.3]
+        plain, batched = base.deepcopy(), base.deepcopy()
+        try:
+            replay(plain, edges)
+        except ValueError:
+            before = (edge_set(batched), counts(batched))
+            with self.assertRaises(ValueError, msg=f"seed {seed}"):
+                batched.bulk_load(edges)
+            self.assertEqual((edge_set(batched), counts(batched)), before)
+            self.assertEqual(set(batched.nodes), set(base.nodes))
+            return
+        batched.bulk_load(edges)
+        self.assertEqual(edge_set(batched), edge_set(plain), f"seed {seed}")
+        self.assertEqual(counts(batched), counts(plain), f"seed {seed}")
+
+    def test_fuzz_many_seeds(self):
+        for seed in range(200):
+            self._run(seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,7 +18,10 @@ recordstore's own live-node suite. These tests validate the CLI wiring.
 """
 
 import io
+import json
 import os
+import random
+import shlex
 import sys
 import tempfile
 import unittest
@@ -191,6 +194,96 @@ class TestNativeStoreMetadata(unittest.TestCase):
         self.assertEqual(before, commit(back))
 
 
+class TestNativeFastLoad(unittest.TestCase):
+    """A file `_save_native` wrote, checksum intact, is wired as written; any
+    other file is replayed. Both must build the same graph and counts."""
+
+    NAMES = ["plain", "New York", "it's", 'say "hi"', "café", "a\\b",
+             "#hash", "-dash"]
+
+    def _graph(self, seed):
+        rng = random.Random(seed)
+        dag = OntoDAG()
+        names = []
+        for i in range(60):
+            name = f"{rng.choice(self.NAMES)} {i}" if rng.random() < 0.3 \
+                else f"n{i}"
+            supers = rng.sample(names, min(len(names), rng.randint(0, 3)))
+            dag.put(name, supers)
+            names.append(name)
+        dag.nodes[names[0]].metadata["label"] = "first"
+        return dag
+
+    def _shape(self, dag):
+        return {name: (sorted(child.name for child in node.neighbors),
+                       node.descendant_count, node.metadata)
+                for name, node in dag.nodes.items()}
+
+    def test_a_saved_file_is_wired_not_replayed(self):
+        for seed in range(5):
+            dag = self._graph(seed)
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "s.od")
+                cli._save_native(dag, path)
+                with mock.patch.object(cli, "_replay_native") as replay:
+                    back = cli._load_native(path)
+                replay.assert_not_called()
+            self.assertEqual(self._shape(back), self._shape(dag))
+
+    def test_an_edited_file_is_replayed(self):
+        dag = self._graph(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "s.od")
+            cli._save_native(dag, path)
+            with open(path, encoding="utf-8") as fh:
+                text = fh.read()
+            self.assertTrue(text.splitlines()[-1].startswith("#:sha256 "))
+            # A redundant edge added by hand: the stale checksum sends the
+            # file through add_edge, which reduces it away again.
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(text.replace("\nn2 ", "\nn2 '*' ", 1))
+            with mock.patch.object(cli, "_wire_native") as wire:
+                cli._load_native(path)
+            wire.assert_not_called()
+            back = cli._load_native(path)
+        self.assertEqual(self._shape(back), self._shape(dag))
+
+    def test_counts_match_a_replay(self):
+        dag = OntoDAG()
+        dag.bulk_load([("*", "a"), ("a", "b"), ("a", "c"), ("b", "d"),
+                       ("c", "d"), ("d", "x"), ("b", "y"), ("c", "y"),
+                       ("x", "z"), ("a", "w")])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "s.od")
+            cli._save_native(dag, path)
+            back = cli._load_native(path)
+        self.assertEqual(back.nodes["a"].descendant_count, 7)
+        self.assertEqual(self._shape(back), self._shape(dag))
+
+    def test_dimension_values_survive(self):
+        dag = OntoDAG()
+        dag.put("dimension", [])
+        dag.put("linear-dimension", ["dimension"])
+        dag.put("weight", ["linear-dimension"])
+        dag.put("box", ["weight(3kg)"])
+        dag.put("crate", ["weight(500g)"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "s.od")
+            cli._save_native(dag, path)
+            back = cli._load_native(path)
+        self.assertEqual({item.name for item in back.get(["weight(..1kg)"])},
+                         {"crate", "weight(1/2kg)"})
+        self.assertEqual(self._shape(back), self._shape(dag))
+
+    def test_the_cheap_tokenizer_agrees_with_shlex(self):
+        lines = ["a b c", "a\tb", "'New York' '*'", "x 'it'\"'\"'s' y",
+                 "'café' 'weight(3kg)'", "a  b", "'' b"]
+        for line in lines:
+            for canonical in (False, True):
+                self.assertEqual(cli._split_line(line, canonical),
+                                 shlex.split(line), line)
+
+
 def _mem_swarm_session(shared):
     """A Session wired to an in-memory RecordStore that persists in `shared`
     (a dict holding the bytes store and pointer), mimicking a durable store
@@ -744,6 +837,37 @@ class TestBelow(unittest.TestCase):
                 (1, "false\n"))
 
 
+class TestExplain(unittest.TestCase):
+    def _session(self, home):
+        session = cli.Session(os.path.join(home, "zoo.od"))
+        for argv in (["put", "animal"], ["put", "pet"],
+                     ["put", "dog", "animal", "pet"], ["put", "cat", "pet"]):
+            self.assertEqual(_run(argv, session)[0], 0)
+        return session
+
+    def test_the_plan_is_printed_step_by_step(self):
+        with tempfile.TemporaryDirectory() as home:
+            code, out = _run(["explain", "animal", "pet"],
+                             self._session(home))
+            self.assertEqual(code, 0)
+            self.assertIn("order animal (1), pet (2)", out)
+            self.assertIn("1. walk animal", out)
+            self.assertTrue(out.splitlines()[-1].startswith("result 1, "))
+
+    def test_alternatives_below_and_json(self):
+        with tempfile.TemporaryDirectory() as home:
+            session = self._session(home)
+            code, out = _run(["explain", "animal", "or", "cat"], session)
+            self.assertIn("alternative 2:", out)
+            code, out = _run(["explain", "--below", "dog", "pet"], session)
+            self.assertIn("below dog pet: upward", out)
+            self.assertIn("result true", out)
+            code, out = _run(["explain", "--json", "pet"], session)
+            self.assertEqual(json.loads(out)["result"], 2)
+            self.assertEqual(_run(["explain", "--below", "dog"], session)[0],
+                             1)
+
+
 class TestIndexCommand(unittest.TestCase):
     def test_publish_and_consume_cone_summaries(self):
         data_blobs = MemoryBytesStore()
@@ -965,6 +1089,95 @@ class TestLocalRecordStore(unittest.TestCase):
             self.assertEqual(session.describe(), f"rs:{path}")
 
 
+class TestPartialWrites(unittest.TestCase):
+    """A one-shot `put`/`remove`/`move` on a record store runs on a
+    `SparseOntoDAG`: it fetches the records it touches and must commit the
+    root the eager writer commits (canonical roots make that one compare)."""
+
+    SEED = ([["put", "Travel"], ["put", "Food"], ["put", "Japan", "Travel"]]
+            + [["put", f"d{i}", "Japan"] for i in range(30)]
+            + [["put", f"f{i}", "Food"] for i in range(30)])
+
+    def setUp(self):
+        self._home = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ,
+                                  {"ONTODAG_HOME": self._home.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._home.cleanup)
+
+    def store(self, name):
+        spec = f"rs:{os.path.join(self._home.name, name)}"
+        session = cli.Session(spec)
+        for argv in self.SEED:
+            _run(argv, session)
+        return spec
+
+    def main(self, *argv):
+        err = io.StringIO()
+        with redirect_stdout(io.StringIO()), redirect_stderr(err), \
+                self.assertRaises(SystemExit) as exit_:
+            cli.main(list(argv))
+        return exit_.exception.code, err.getvalue()
+
+    def both(self, *argv):
+        """Run `argv` sparse and eager on twin stores; the two roots."""
+        tag = "-".join(argv)
+        sparse, eager = self.store(f"sparse{tag}"), self.store(f"eager{tag}")
+        code, err = self.main("-f", sparse, "--verbose", *argv)
+        self.assertEqual(code, 0, err)
+        self.assertIn("a partial write", err)
+        code, err = self.main("-f", eager, "--eager", "--verbose", *argv)
+        self.assertEqual(code, 0, err)
+        self.assertIn("loaded all", err)
+        return (cli.Session(sparse).dag.store.root,
+                cli.Session(eager).dag.store.root)
+
+    def test_a_put_fetches_what_it_touches(self):
+        spec = self.store("s")
+        code, err = self.main("-f", spec, "--verbose", "put", "sushi",
+                              "Food", "Japan")
+        self.assertEqual(code, 0, err)
+        fetched = int(err.split("fetched ")[1].split()[0])
+        self.assertLess(fetched, 10)
+        self.assertEqual(_run(["get", "Food", "Travel"], cli.Session(spec)),
+                         (0, "sushi\n"))
+
+    def test_the_writes_commit_the_eager_root(self):
+        for argv in (["put", "sushi", "Food", "Japan"],
+                     ["remove", "Japan"], ["remove", "--cone", "Japan"],
+                     ["move", "d3", "--to", "Food"]):
+            sparse, eager = self.both(*argv)
+            self.assertEqual(sparse, eager, argv)
+
+    def test_a_dry_run_move_and_reads_load_the_store(self):
+        spec = self.store("s")
+        code, err = self.main("-f", spec, "--verbose", "move", "d3",
+                              "--to", "Food", "--dry-run")
+        self.assertEqual(code, 0, err)
+        self.assertIn("loaded all", err)
+        self.assertFalse(cli._writes_partially(["get", "Food"]))
+
+    def test_a_swarm_window_is_held_until_the_command_ends(self):
+        shared = {"bytes": MemoryBytesStore(), "pointer": MemoryPointer()}
+        closed = []
+
+        def factory():
+            store = RecordStore(shared["bytes"], pointer=shared["pointer"])
+            store.close = lambda: closed.append(store)
+            return store
+
+        with mock.patch.object(cli, "_make_backend",
+                               lambda spec: cli.SwarmBackend(
+                                   "t", store_factory=factory)):
+            for argv in (["put", "Travel"], ["put", "Japan", "Travel"]):
+                self.assertEqual(self.main("-f", "swarm:t", *argv)[0], 0)
+            self.assertEqual(len(closed), 2)        # one window per command
+            dag = cli.SwarmBackend("t", store_factory=factory).load()
+        self.assertEqual([p.name for p in dag.nodes["Japan"].parents],
+                         ["Travel"])
+
+
 class TestSwarmDoctor(unittest.TestCase):
     """`odag swarm` walks the setup in dependency order and stops at the
     first failure. The failures are the product here, not the successes."""
@@ -2710,6 +2923,10 @@ class TestOverlayView(unittest.TestCase):
         self._old = os.environ.get("ONTODAG_OVERLAYS")
         self._dir = tempfile.TemporaryDirectory()
         home = self._dir.name
+        # The composed-view cache lives under the home directory.
+        patcher = mock.patch.dict(os.environ, {"ONTODAG_HOME": home})
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.primary = os.path.join(home, "human.od")
         self.overlay = os.path.join(home, "proj.od")
         human = cli.Session(self.primary)
@@ -2818,6 +3035,15 @@ class TestIngest(unittest.TestCase):
     """`odag ingest`: the PROJECTIONS.md §4 wire format, with the contract's
     semantics — idempotent, order-free, full rebuild via --drop."""
 
+    def setUp(self):
+        # Ingest fingerprints live in the home directory.
+        self._home = tempfile.TemporaryDirectory()
+        self.addCleanup(self._home.cleanup)
+        patcher = mock.patch.dict(os.environ,
+                                  {"ONTODAG_HOME": self._home.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def _stream(self, home, lines, name="stream.jsonl"):
         path = os.path.join(home, name)
         with open(path, "w", encoding="utf-8") as fh:
@@ -2896,6 +3122,206 @@ class TestIngest(unittest.TestCase):
             self.assertEqual(code, 1)
             self.assertIn("line 2", err.getvalue())
 
+    def test_chunks_and_workers_build_the_same_store(self):
+        lines = [json.dumps({"item": f"h{i}",
+                             "supercategories": [f"sys:on:d{i % 3}"]})
+                 for i in range(9)]
+        lines += ['{"item": "sys:on:d1", "supercategories": ["sys:on"]}']
+        with tempfile.TemporaryDirectory() as home, \
+                mock.patch.object(cli, "_INGEST_CHUNK", 4):
+            stream = self._stream(home, lines)
+            stores = []
+            for jobs in ("1", "2"):
+                path = os.path.join(home, f"p{jobs}.od")
+                code, _, err = _run3(["ingest", "--jobs", jobs, stream],
+                                     cli.Session(path))
+                self.assertEqual(code, 0)
+                self.assertRegex(err, r"ingested 10 lines in .* lines/s")
+                with open(path, encoding="utf-8") as fh:
+                    stores.append(fh.read())
+            self.assertEqual(stores[0], stores[1])
+            self.assertIn("sys:on", stores[0])
+
+    def test_errors_name_the_line_in_any_chunk(self):
+        with tempfile.TemporaryDirectory() as home, \
+                mock.patch.object(cli, "_INGEST_CHUNK", 2):
+            session = cli.Session(os.path.join(home, "p.od"))
+            good = '{"item": "ok", "supercategories": ["sys:"]}'
+            # A malformed line fails in the decoder, a root re-put in put.
+            for jobs, bad, lineno in (("2", '{"item": 5}', 4),
+                                      ("1", '{"item": "*"}', 3)):
+                stream = self._stream(
+                    home, [good] * (lineno - 1) + [bad, good])
+                code, _, err = _run3(["ingest", "--jobs", jobs, stream],
+                                     session)
+                self.assertEqual(code, 1)
+                self.assertIn(f"line {lineno}:", err)
+            self.assertNotIn("ok", session.dag.nodes)   # nothing half-done
+
+
+class TestIngestFingerprints(unittest.TestCase):
+    """Re-ingesting a source: nothing to do when the stream is unchanged,
+    a delta when little changed — and always the graph `--full` builds."""
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.home = self._dir.name
+        patcher = mock.patch.dict(os.environ, {"ONTODAG_HOME": self.home})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.stream = os.path.join(self.home, "stream.jsonl")
+
+    def write(self, entries):
+        with open(self.stream, "w", encoding="utf-8") as fh:
+            for item, supers in entries:
+                fh.write(json.dumps({"item": item,
+                                     "supercategories": supers}) + "\n")
+
+    def ingest(self, path, *flags):
+        code, _, err = _run3(["ingest", *flags, self.stream],
+                             cli.Session(path))
+        self.assertEqual(code, 0, err)
+        return err
+
+    def shape(self, path):
+        """The stored graph (a delta's save may be a journal entry)."""
+        dag = cli.Session(path).dag
+        return {name: (sorted(child.name for child in node.neighbors
+                              if dag.nodes.get(child.name) is child),
+                       node.descendant_count)
+                for name, node in dag.nodes.items()}
+
+    def projection(self, rng):
+        entries = [("sys:on", ["sys:"]), ("sys:type", ["sys:"])]
+        entries += [(f"sys:on:d{i}", ["sys:on"]) for i in range(3)]
+        entries += [(f"sys:type:t{i}", ["sys:type"]) for i in range(3)]
+        for i in range(30):
+            entries.append((f"h{i}", sorted({f"sys:on:d{rng.randrange(3)}",
+                                             f"sys:type:t{rng.randrange(3)}"})))
+        return entries
+
+    def test_an_unchanged_stream_is_not_applied_again(self):
+        self.write(self.projection(random.Random(0)))
+        path = os.path.join(self.home, "p.od")
+        self.ingest(path)
+        self.assertNotIn("unchanged", self.ingest(path, "--drop", "sys:"))
+        first = self.shape(path)
+        with mock.patch.object(OntoDAG, "put_many") as put_many, \
+                mock.patch.object(OntoDAG, "remove_cone") as remove_cone:
+            err = self.ingest(path, "--drop", "sys:")
+        put_many.assert_not_called()
+        remove_cone.assert_not_called()
+        self.assertIn("unchanged", err)
+        self.assertEqual(self.shape(path), first)
+        self.assertNotIn("unchanged",
+                         self.ingest(path, "--full", "--drop", "sys:"))
+
+    def test_a_delta_builds_what_the_full_path_builds(self):
+        for seed in range(12):
+            rng = random.Random(seed)
+            drop = ["--drop", "sys:"] if seed % 2 else []
+            delta = os.path.join(self.home, f"delta{seed}.od")
+            full = os.path.join(self.home, f"full{seed}.od")
+            for path in (delta, full):
+                # A human claim in the same store survives the rebuild.
+                session = cli.Session(path)
+                self.assertEqual(_run(["put", "papers"], session)[0], 0)
+                self.assertEqual(_run(["put", "h1", "papers"], session)[0], 0)
+            entries = self.projection(rng)
+            self.write(entries)
+            self.ingest(delta, *drop)
+            self.ingest(full, *drop)
+            changes = entries[:]
+            for _ in range(rng.randint(1, 6)):
+                i = rng.randrange(8, len(changes))
+                roll = rng.random()
+                if roll < 0.3:
+                    del changes[i]
+                elif roll < 0.8:
+                    changes[i] = (changes[i][0], [f"sys:on:d{rng.randrange(3)}"])
+                else:
+                    changes.append((f"new{rng.randrange(5)}",
+                                    [f"sys:type:t{rng.randrange(3)}"]))
+            self.write(changes)
+            err = self.ingest(delta, *drop)
+            self.assertIn("delta", err, seed)
+            self.ingest(full, "--full", *drop)
+            self.assertEqual(self.shape(delta), self.shape(full), seed)
+
+    def test_a_rebuild_that_would_change_the_graph_leaves_no_fingerprint(self):
+        # it2 is filed under sys:c0 by hand, which the stream then files
+        # under sys: the first ingest keeps it2, a rebuild deletes it.
+        self.write([("sys:c0", ["sys"]), ("it1", ["sys:c0"])])
+        path = os.path.join(self.home, "p.od")
+        session = cli.Session(path)
+        self.assertEqual(_run(["put", "sys:c0"], session)[0], 0)
+        self.assertEqual(_run(["put", "it2", "sys:c0"], session)[0], 0)
+        self.ingest(path, "--drop", "sys")
+        err = self.ingest(path, "--drop", "sys")
+        self.assertNotIn("unchanged", err)
+        self.assertNotIn("it2", cli.Session(path).dag.nodes)
+        # What the rebuild left is its own fixed point.
+        self.assertIn("unchanged", self.ingest(path, "--drop", "sys"))
+
+    def test_a_delta_after_an_unsettled_rebuild_matches_the_full_path(self):
+        for seed in range(8):
+            rng = random.Random(seed)
+            entries = [(f"sys:c{i}", ["sys"]) for i in range(2)]
+            entries += [(f"it{i}", [f"sys:c{rng.randrange(2)}"])
+                        for i in range(6)]
+            delta = os.path.join(self.home, f"delta{seed}.od")
+            full = os.path.join(self.home, f"full{seed}.od")
+            for path in (delta, full):
+                session = cli.Session(path)
+                self.assertEqual(_run(["put", "sys:c0"], session)[0], 0)
+                self.assertEqual(_run(["put", "hand", "sys:c0"], session)[0],
+                                 0)
+            self.write(entries)
+            for path in (delta, full):
+                self.ingest(path, "--drop", "sys", "--drop", "other")
+            entries[rng.randrange(2, len(entries))] = ("it0", ["sys:c1"])
+            self.write(entries)
+            self.ingest(delta, "--drop", "sys", "--drop", "other")
+            self.ingest(full, "--full", "--drop", "sys", "--drop", "other")
+            self.assertEqual(self.shape(delta), self.shape(full), seed)
+
+    def test_a_deep_category_chain_refiles_without_recursion(self):
+        from ontodag import fingerprints
+        dag = OntoDAG()
+        chain = [f"c{i}" for i in range(3000)]
+        dag.bulk_load(list(zip(chain, chain[1:])))
+        dag.put("item", ["c2999"])
+        dag.put("kept", [])
+        categories = set(chain) | {"kept"}
+        self.assertTrue(fingerprints.refile(
+            dag, {"item"}, {"item": ["kept"]}, ["c0"], categories,
+            categories))
+        self.assertEqual({parent.name for parent in
+                          dag.nodes["item"].parents}, {"kept"})
+
+    def test_a_changed_category_structure_rebuilds(self):
+        entries = self.projection(random.Random(1))
+        self.write(entries)
+        path = os.path.join(self.home, "p.od")
+        self.ingest(path, "--drop", "sys:")
+        entries[2] = ("sys:on:d0", ["sys:type"])
+        self.write(entries)
+        err = self.ingest(path, "--drop", "sys:")
+        self.assertNotIn("delta", err)
+        self.assertTrue(cli.Session(path).dag.is_below("sys:on:d0", "sys:type"))
+
+    def test_a_store_written_since_is_ingested_in_full(self):
+        entries = self.projection(random.Random(2))
+        self.write(entries)
+        path = os.path.join(self.home, "p.od")
+        self.ingest(path)
+        session = cli.Session(path)
+        self.assertEqual(_run(["put", "elsewhere"], session)[0], 0)
+        err = self.ingest(path)
+        self.assertNotIn("unchanged", err)
+        self.assertNotIn("delta", err)
+
 
 def _run3(argv, session):
     """Dispatch capturing all three: (exit_code, stdout, stderr)."""
@@ -3138,3 +3564,117 @@ class TestEncryptedStore(unittest.TestCase):
                                     cli.Session(f"rs:{path}"))
         self.assertEqual(code, 1)
         self.assertIn("ontodag[crypto]", err)
+
+
+class TestBatchStream(unittest.TestCase):
+    """`odag --batch` and `begin`/`commit`/`rollback`: a piped stream saves
+    once, not once per line, and a failing line leaves the store as it was
+    at the last save."""
+
+    def setUp(self):
+        self._home = tempfile.TemporaryDirectory()
+        self._saved = os.environ.get("ONTODAG_HOME")
+        os.environ["ONTODAG_HOME"] = self._home.name
+        cli._OVERRIDES.clear()
+        self.spec = "rs:" + os.path.join(self._home.name, "store")
+
+    def tearDown(self):
+        cli._OVERRIDES.clear()
+        if self._saved is None:
+            os.environ.pop("ONTODAG_HOME", None)
+        else:
+            os.environ["ONTODAG_HOME"] = self._saved
+        self._home.cleanup()
+
+    def _stream(self, text, **kwargs):
+        """Run `text` as stdin; returns (code, stderr, backend saves)."""
+        session = cli.Session(self.spec)
+        saves = []
+        real = session.backend.save
+        session.backend.save = lambda dag, message=None: (
+            saves.append(message), real(dag, message=message))
+        err = io.StringIO()
+        with redirect_stdout(io.StringIO()), redirect_stderr(err):
+            code = cli._run_stream(session, io.StringIO(text),
+                                   interactive=False, **kwargs)
+        return code, err.getvalue(), saves
+
+    def _items(self):
+        return sorted(item.name for item in cli.Session(self.spec).dag.get([]))
+
+    def test_a_batch_saves_once_under_one_label(self):
+        cli._OVERRIDES["message"] = "import"
+        code, _err, saves = self._stream(
+            "put Travel\nput Japan Travel\nput Onsen Japan\n", batch=True)
+        self.assertEqual((code, saves), (0, ["import"]))
+        self.assertEqual(self._items(), ["Japan", "Onsen", "Travel"])
+        history = cli.Session(self.spec).backend.open_store().history()
+        self.assertEqual(len(history), 1)
+
+    def test_without_batch_every_line_saves(self):
+        code, _err, saves = self._stream("put Travel\nput Japan Travel\n")
+        self.assertEqual((code, len(saves)), (0, 2))
+
+    def test_a_failing_line_rolls_the_batch_back(self):
+        self._stream("put Travel\n", batch=True)
+        code, err, saves = self._stream(
+            "put Japan Travel\nput Bad Nope\nput Later\n", batch=True)
+        self.assertEqual((code, saves), (1, []))
+        self.assertIn("line 2 failed", err)
+        self.assertEqual(self._items(), ["Travel"])
+
+    def test_a_false_answer_is_not_a_failure(self):
+        code, _err, saves = self._stream(
+            "put Travel\nput Japan\nbelow Japan Travel\nput Onsen Japan\n",
+            batch=True)
+        self.assertEqual((code, len(saves)), (0, 1))
+        self.assertEqual(self._items(), ["Japan", "Onsen", "Travel"])
+
+    def test_checkpoints_every_n_lines(self):
+        lines = "put Travel\n" + "".join(f"put p{i} Travel\n"
+                                         for i in range(5))
+        code, _err, saves = self._stream(lines, batch=True, every=2)
+        self.assertEqual((code, len(saves)), (0, 3))
+        code, err, saves = self._stream(
+            "put q0 Travel\nput q1 Travel\nput q2 Travel\nput Bad Nope\n",
+            batch=True, every=2)
+        self.assertEqual((code, len(saves)), (1, 1))
+        self.assertIn("q1", self._items())
+        self.assertNotIn("q2", self._items())
+
+    def test_begin_commit_rollback(self):
+        code, err, saves = self._stream(
+            "put Travel\n"
+            "begin\nput A Travel\nput B Travel\ncommit\n"
+            "begin\nput C Travel\nrollback\n"
+            "begin\nput D Nope\nput E Travel\ncommit\n")
+        self.assertEqual((code, len(saves)), (0, 2))
+        self.assertIn("skipped (the transaction failed at line 10)", err)
+        self.assertIn("nothing was committed", err)
+        self.assertEqual(self._items(), ["A", "B", "Travel"])
+
+    def test_an_unfinished_transaction_is_rolled_back(self):
+        code, err, saves = self._stream("begin\nput Travel\n")
+        self.assertEqual((code, saves), (1, []))
+        self.assertIn("end it with commit", err)
+        self.assertEqual(self._items(), [])
+
+    def test_undo_refuses_uncommitted_changes(self):
+        code, err, _saves = self._stream(
+            "put Travel\nbegin\nput Japan Travel\nundo\ncommit\n")
+        self.assertEqual(code, 0)
+        self.assertIn("cannot undo with uncommitted changes", err)
+        self.assertIn("nothing was committed", err)
+        self.assertEqual(self._items(), ["Travel"])
+
+    def test_batch_flag_reaches_the_stream(self):
+        err = io.StringIO()
+        with mock.patch.object(sys, "stdin", io.StringIO("put Travel\n")), \
+                redirect_stderr(err), self.assertRaises(SystemExit) as exit_:
+            cli.main(["-f", self.spec, "--batch-every", "0"])
+        self.assertEqual(exit_.exception.code, 2)
+        with mock.patch.object(sys, "stdin", io.StringIO("put Travel\n")), \
+                self.assertRaises(SystemExit) as exit_:
+            cli.main(["-f", self.spec, "--batch"])
+        self.assertEqual(exit_.exception.code, 0)
+        self.assertEqual(self._items(), ["Travel"])
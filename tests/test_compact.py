@@ -0,0 +1,176 @@
+"""CompactOntoDAG — the id/CSR representation, held to OntoDAG as oracle.
+
+Every mutation is replayed on both; edge set, counts and query answers
+must agree exactly, including across forced compactions (the overflow
+delta folded into the base arrays mid-sequence)."""
+
+import random
+import unittest
+
+from ontodag.compact import CompactOntoDAG
+from ontodag.dag import Item, OntoDAG
+
+
+def edges_of(dag):
+    return {(node.name, child.name)
+            for node in dag.nodes.values() for child in node.neighbors}
+
+
+def compact_edges(compact):
+    return {(name, child) for name in compact.names()
+            for child in compact.children_of(name)}
+
+
+def counts_of(dag):
+    return {name: node.descendant_count for name, node in dag.nodes.items()}
+
+
+def compact_counts(compact):
+    return {name: compact.descendant_count(name) for name in compact.names()}
+
+
+class TestCompactBasics(unittest.TestCase):
+
+    def setUp(self):
+        self.dag = CompactOntoDAG()
+        for name, supers in [("animal", []), ("pet", []),
+                             ("dog", ["animal", "pet"]), ("cat", ["animal"]),
+                             ("spaniel", ["dog"])]:
+            self.dag.put(name, supers)
+
+    def test_get_returns_names(self):
+        self.assertEqual(self.dag.get(["animal", "pet"]), {"dog", "spaniel"})
+        self.assertEqual(self.dag.get(["nowhere"]), set())
+        self.assertEqual(self.dag.get([]), self.dag.get(["*"]))
+
+    def test_put_refuses_unknown_super_and_cycles(self):
+        with self.assertRaises(ValueError):
+            self.dag.put("x", ["nowhere"])
+        with self.assertRaises(ValueError):
+            self.dag.put("animal", ["spaniel"])
+        with self.assertRaises(ValueError):
+            self.dag.put("*", [])
+
+    def test_reduction_drops_the_implied_edge(self):
+        self.dag.put("spaniel", ["animal"])          # already implied
+        self.assertEqual(self.dag.parents_of("spaniel"), {"dog"})
+        self.dag.put("puppy", ["animal"])
+        self.dag.put("puppy", ["spaniel"])           # makes animal redundant
+        self.assertEqual(self.dag.parents_of("puppy"), {"spaniel"})
+
+    def test_remove_contracts(self):
+        self.dag.remove("dog")
+        self.assertNotIn("dog", self.dag)
+        self.assertEqual(self.dag.parents_of("spaniel"), {"animal", "pet"})
+        self.assertEqual(self.dag.descendant_count("animal"), 2)
+        with self.assertRaises(ValueError):
+            self.dag.remove("*")
+
+    def test_metadata_travels_through_excerpt(self):
+        self.dag.put(Item("rex", metadata={"label": "Rex"}), ["spaniel"])
+        cut = self.dag.excerpt([["dog"]])
+        self.assertIsInstance(cut, OntoDAG)
+        self.assertEqual(cut.nodes["rex"].metadata, {"label": "Rex"})
+        self.assertEqual(set(cut.nodes), {"*", "spaniel", "rex"})
+
+    def test_round_trip_through_ontodag(self):
+        dag = self.dag.to_dag()
+        again = CompactOntoDAG.from_dag(dag)
+        self.assertEqual(compact_edges(again), compact_edges(self.dag))
+        self.assertEqual(compact_counts(again), compact_counts(self.dag))
+
+
+class TestCompactMatchesOntoDAG(unittest.TestCase):
+
+    def _replay(self, seed, compact_every):
+        rng = random.Random(seed)
+        oracle, compact = OntoDAG(), CompactOntoDAG()
+        names = []
+        for step in range(250):
+            roll = rng.random()
+            if roll < 0.75 or len(names) < 3:
+                name = f"n{step}"
+                supers = rng.sample(names, min(len(names), rng.randint(0, 3)))
+            elif roll < 0.9:
+                name = rng.choice(names)
+                supers = [rng.choice(names)]
+            else:
+                victim = names.pop(rng.randrange(len(names)))
+                oracle.remove(victim)
+                compact.remove(victim)
+                continue
+            try:
+                oracle.put(name, supers)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    compact.put(name, supers)
+                continue
+            compact.put(name, supers)
+            if name not in names:
+                names.append(name)
+            if compact_every and step % compact_every == 0:
+                compact.compact()
+        return rng, oracle, compact
+
+    def test_random_histories_agree(self):
+        for seed, compact_every in [(1, 0), (2, 7), (3, 1), (4, 50)]:
+            rng, oracle, compact = self._replay(seed, compact_every)
+            self.assertEqual(compact_edges(compact), edges_of(oracle))
+            self.assertEqual(compact_counts(compact), counts_of(oracle))
+            live = sorted(oracle.nodes)
+            for _ in range(60):
+                terms = rng.sample(live, rng.randint(1, 3))
+                expected = {item.name for item in oracle.get(terms)}
+                self.assertEqual(compact.get(terms), expected)
+                sub, sup = rng.choice(live), rng.choice(live)
+                self.assertEqual(compact.is_below(sub, sup),
+                                 oracle.is_below(sub, sup))
+            queries = [rng.sample(live, 2), rng.sample(live, 1)]
+            self.assertEqual(compact.get_any(queries),
+                             {item.name for item in oracle.get_any(queries)})
+            self.assertEqual(edges_of(compact.excerpt(queries)),
+                             edges_of(oracle.excerpt(queries)))
+
+    def test_merge_matches_ontodag_merge(self):
+        rng, first, _ = self._replay(5, 0)
+        # A divergent replica: the same history plus edits of its own, so
+        # the merge has shared names, new names and new edges among old ones.
+        second = first.deepcopy()
+        live = sorted(set(first.nodes) - {"*"})
+        for step in range(40):
+            try:
+                if step % 2:
+                    second.put(f"m{step}", rng.sample(live, 2))
+                else:
+                    second.put(rng.choice(live), [rng.choice(live)])
+            except ValueError:
+                pass
+        expected = first.deepcopy()
+        expected.merge(second)
+        merged = CompactOntoDAG.from_dag(first)
+        merged.merge(second)
+        self.assertEqual(compact_edges(merged), edges_of(expected))
+        self.assertEqual(compact_counts(merged), counts_of(expected))
+        other = CompactOntoDAG.from_dag(first)
+        other.merge(CompactOntoDAG.from_dag(second))
+        self.assertEqual(compact_edges(other), compact_edges(merged))
+        self.assertEqual(compact_counts(other), compact_counts(merged))
+
+    def test_automatic_compaction_keeps_answers(self):
+        compact = CompactOntoDAG()
+        compact._COMPACT_MIN = 16       # fold the delta many times over
+        oracle = OntoDAG()
+        rng = random.Random(9)
+        names = []
+        for step in range(200):
+            supers = rng.sample(names, min(len(names), rng.randint(0, 2)))
+            oracle.put(f"n{step}", supers)
+            compact.put(f"n{step}", supers)
+            names.append(f"n{step}")
+        self.assertLess(compact._delta, 64)
+        self.assertEqual(compact_edges(compact), edges_of(oracle))
+        self.assertEqual(compact_counts(compact), counts_of(oracle))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""`odag serve` — forwarded commands answer as local ones do, from a store
+kept loaded, and a resident graph never outlives the stored state."""
+
+import io
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+import ontodag.__main__ as cli
+from ontodag import daemon
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.home = self._dir.name
+        self.store = os.path.join(self.home, "s.od")
+        patcher = mock.patch.dict(os.environ, {"ONTODAG_HOME": self.home,
+                                               "ONTODAG_STORE": self.store})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cli._OVERRIDES.clear()
+        self.daemon = daemon.Daemon()
+
+    def tearDown(self):
+        self.daemon.close()
+        cli._OVERRIDES.clear()
+        self._dir.cleanup()
+
+    def request(self, *argv, overrides=None, tty=False):
+        return self.daemon.handle({
+            "version": cli.__version__, "argv": list(argv),
+            "overrides": overrides or {},
+            "env": {key: os.environ.get(key)
+                    for key in daemon.FORWARDED_ENV},
+            "cwd": os.getcwd(), "tty": [tty, tty]})
+
+    def local(self, *argv):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = cli.dispatch(list(argv), cli.Session(self.store))
+        return code, out.getvalue()
+
+    def test_commands_answer_as_they_do_locally(self):
+        for argv in (["put", "Travel"], ["put", "Japan"],
+                     ["put", "Flight", "Travel"],
+                     ["put", "JAL", "Flight", "Japan"]):
+            self.assertEqual(self.request(*argv)["code"], 0)
+        for argv in (["get", "Travel"], ["count", "Flight", "Japan"],
+                     ["below", "JAL", "Travel"], ["below", "Japan", "Travel"],
+                     ["list"], ["get", "Nowhere"]):
+            answer = self.request(*argv)
+            self.assertEqual((answer["code"], answer["out"]),
+                             self.local(*argv), argv)
+        self.assertEqual(self.daemon.loads, 1)
+        answer = self.request("remove", "Nowhere")
+        self.assertEqual(answer["code"], 1)
+        self.assertIn("odag:", answer["err"])
+
+    def test_the_resident_graph_is_reused_until_the_store_moves(self):
+        self.request("put", "Travel")
+        self.request("get", "Travel")
+        self.assertEqual(self.daemon.loads, 1)
+        # Another writer, not through the daemon.
+        self.local("put", "Hotel", "Travel")
+        self.assertEqual(self.request("get", "Travel")["out"], "Hotel\n")
+        self.assertEqual(self.daemon.loads, 2)
+        self.request("get", "Travel")
+        self.assertEqual(self.daemon.loads, 2)
+
+    def test_a_failed_command_drops_its_session(self):
+        # It may have changed the graph without reaching its save.
+        self.request("put", "Travel")
+        self.assertEqual(self.request("put", "Hotel", "Nowhere")["code"], 1)
+        self.assertEqual(self.daemon.sessions, {})
+        self.assertEqual(self.request("list")["out"], "Travel\n")
+        self.assertEqual(self.daemon.loads, 2)
+
+    def test_an_unexpected_error_is_an_answer_not_the_end(self):
+        self.request("put", "Travel")
+        with mock.patch.object(cli, "dispatch",
+                               side_effect=RuntimeError("commit mismatch")):
+            answer = self.request("put", "Hotel", "Travel")
+        self.assertEqual(answer["code"], 1)
+        self.assertIn("RuntimeError: commit mismatch", answer["err"])
+        self.assertEqual(self.daemon.sessions, {})
+        self.assertEqual(self.request("list")["out"], "Travel\n")
+
+    def test_each_store_and_flag_layer_has_its_own_session(self):
+        other = os.path.join(self.home, "other.od")
+        self.request("put", "Travel")
+        self.request("put", "Cooking", overrides={"store": other})
+        self.assertEqual(self.request("list")["out"], "Travel\n")
+        self.assertEqual(self.request("list", overrides={"store": other})
+                         ["out"], "Cooking\n")
+        self.assertEqual(cli._OVERRIDES, {})
+
+    def test_output_follows_the_callers_terminal(self):
+        for i in range(60):
+            self.request("put", f"item{i}")
+        piped = self.request("list")
+        self.assertEqual(len(piped["out"].splitlines()), 60)
+        at_a_terminal = self.request("list", tty=True)
+        self.assertLess(len(at_a_terminal["out"].splitlines()), 60)
+
+    def test_a_daemon_of_another_version_is_not_used(self):
+        answer = self.daemon.handle({"version": "0.0.0", "argv": ["list"]})
+        self.assertIn("refused", answer)
+
+
+class TestForwarding(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.home = self._dir.name
+        self.store = os.path.join(self.home, "s.od")
+        patcher = mock.patch.dict(os.environ, {"ONTODAG_HOME": self.home,
+                                               "ONTODAG_STORE": self.store})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def main(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            with self.assertRaises(SystemExit) as exit_:
+                cli.main(list(argv))
+        return exit_.exception.code, out.getvalue()
+
+    def test_main_forwards_to_a_running_daemon(self):
+        self.assertEqual(self.main("put", "Travel"), (0, ""))   # no daemon
+        server = daemon.listen(daemon.socket_path())
+        resident = daemon.Daemon()
+        thread = threading.Thread(target=daemon.serve_forever,
+                                  args=(server, resident), daemon=True)
+        thread.start()
+        self.addCleanup(server.close)
+        self.assertEqual(self.main("put", "Flight", "Travel"), (0, ""))
+        self.assertEqual(self.main("get", "Travel"), (0, "Flight\n"))
+        self.assertEqual(self.main("below", "Travel", "Flight"), (1, "false\n"))
+        self.assertEqual(resident.requests, 3)
+        self.assertEqual(resident.loads, 1)
+        with self.assertRaisesRegex(ValueError, "already serving"):
+            daemon.listen(daemon.socket_path())
+
+    def test_a_stale_socket_runs_the_command_locally(self):
+        server = daemon.listen(daemon.socket_path())
+        server.close()                  # the daemon died; its file remains
+        self.assertEqual(self.main("put", "Travel"), (0, ""))
+        self.assertEqual(self.main("list"), (0, "Travel\n"))
+        daemon.listen(daemon.socket_path()).close()
+
+
+if __name__ == "__main__":
+    unittest.main()
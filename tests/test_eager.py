@@ -17,9 +17,13 @@ Properties:
                        (the CRDT precondition from SWARM_DESIGN §5)
   S6  Node extras    - payload/meta survive the roundtrip
   S7  Removal        - removed nodes disappear from the store, not just RAM
+  S8  Dirty commits  - a commit rebuilds only the records the change can
+                       reach, and stages what a full diff would
 """
 
+import random
 import unittest
+from unittest import mock
 
 from ontodag.dag import Item
 from ontodag.eager import EagerOntoDAG
@@ -205,6 +209,21 @@ class TestRehydratedInvariants(unittest.TestCase):
         with self.assertRaises(ValueError):  # invariants still enforced
             again.put(Item("vehicle"), [Item("ev")])  # would create a cycle
 
+    def test_wiring_matches_the_records(self):
+        blobs = MemoryBytesStore()
+        dag = build(RecordStore(blobs), VEHICLES)
+        again = EagerOntoDAG(RecordStore.at(dag.commit(), blobs))
+        self.assertEqual(edge_set(again), edge_set(dag))
+        for name, node in again.nodes.items():
+            self.assertEqual(
+                {parent.name for parent in node.parents},
+                {parent for parent, child in edge_set(dag) if child == name})
+        # names are interned: one string per name, however many records
+        # list it
+        ev = again._synced["car"]["down"][0]
+        self.assertIs(ev, again.nodes["ev"].name)
+        self.assertIs(ev, again._synced["electric"]["down"][1])
+
 
 class TestConvergence(unittest.TestCase):
     def _one(self, store):
@@ -405,5 +424,86 @@ class TestBatchedHydration(unittest.TestCase):
             RecordStore(blobs, root=root)).commit())
 
 
+class TestDirtyCommits(unittest.TestCase):
+    def test_random_history_matches_full_diff(self):
+        rng = random.Random(21)
+        blobs = MemoryBytesStore()
+        dag = EagerOntoDAG(RecordStore(blobs))
+        dag.verify_commits = True      # raises on any record the hooks miss
+        names = [f"n{i}" for i in range(40)]
+        for step in range(400):
+            live = [name for name in names if name in dag.nodes]
+            roll = rng.random()
+            if roll < 0.45 or len(live) < 4:
+                name = rng.choice(names)
+                supers = rng.sample(live, min(len(live), rng.randint(0, 2)))
+                if name not in supers:
+                    try:
+                        dag.put(Item(name), [Item(s) for s in supers])
+                    except ValueError:
+                        pass                        # a cycle, refused
+            elif roll < 0.6:
+                dag.remove(rng.choice(live))
+            elif roll < 0.65:
+                dag.remove_cone([rng.choice(live)])
+            elif roll < 0.75:
+                node = dag.nodes[rng.choice(live)]
+                if node.metadata and rng.random() < 0.5:
+                    node.metadata.clear()
+                else:
+                    node.metadata[f"k{step % 3}"] = step
+            elif roll < 0.8:
+                name = rng.choice(live)
+                dag.put(Item(name), [parent.name for parent in
+                                     dag.nodes[name].parents][:1],
+                        payload=f"ref{step}")
+            elif roll < 0.85:
+                dag.merge(build(EagerOntoDAG(fresh_store()),
+                                [(rng.choice(names), [])]))
+            if rng.random() < 0.2:
+                dag.commit()
+        root = dag.commit()
+        again = EagerOntoDAG(RecordStore(blobs, root=root))
+        self.assertEqual(edge_set(again), edge_set(dag))
+        self.assertEqual(again._synced, dag._synced)
+
+    def test_small_put_rebuilds_few_records(self):
+        dag = build(fresh_store(), [(f"c{i}", []) for i in range(20)])
+        for i in range(2000):
+            dag.put(Item(f"leaf{i}"), [Item(f"c{i % 20}")])
+        dag.commit()
+        dag.put(Item("new"), [Item("c3")])
+        with mock.patch.object(EagerOntoDAG, "_record_for", autospec=True,
+                               side_effect=EagerOntoDAG._record_for) as built:
+            dag.commit()
+        # the new leaf, its category and the root
+        self.assertLessEqual(built.call_count, 4)
+
+    def test_annotated_nodes_are_rebuilt_only_when_their_metadata_moved(self):
+        dag = build(fresh_store(), [(f"c{i}", []) for i in range(20)])
+        for i in range(2000):
+            dag.put(Item(f"leaf{i}", metadata={"i": i}), [Item(f"c{i % 20}")])
+        dag.commit()
+        dag.put(Item("new"), [Item("c3")])
+        dag.nodes["leaf7"].metadata["i"] = -7
+        with mock.patch.object(EagerOntoDAG, "_record_for", autospec=True,
+                               side_effect=EagerOntoDAG._record_for) as built:
+            dag.commit()
+        # the new leaf, its category, the root and the edited leaf
+        self.assertLessEqual(built.call_count, 5)
+
+    def test_in_place_metadata_edits_are_committed(self):
+        blobs = MemoryBytesStore()
+        dag = build(RecordStore(blobs), VEHICLES)
+        dag.nodes["car"].metadata["wheels"] = 4
+        root = dag.commit()
+        self.assertEqual(EagerOntoDAG(RecordStore(blobs, root=root))
+                         .nodes["car"].metadata, {"wheels": 4})
+        dag.nodes["car"].metadata.clear()
+        root = dag.commit()
+        self.assertEqual(EagerOntoDAG(RecordStore(blobs, root=root))
+                         .nodes["car"].metadata, {})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,199 @@
+"""FederatedOntoDAG — answers over several layers, walked in place.
+
+The oracle is the composed view: a fresh OntoDAG with every layer merged
+in, which is what `Session.view()` builds by default. A federated view must
+give the same answers, and a lazy layer must stay lazy under it.
+"""
+
+import io
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import ontodag.__main__ as cli
+from ontodag.dag import OntoDAG
+from ontodag.eager import EagerOntoDAG
+from ontodag.federated import FederatedOntoDAG
+from ontodag.lazy import LazyOntoDAG
+from recordstore import MemoryBytesStore, RecordStore
+
+
+def names(items):
+    return {item.name for item in items}
+
+
+def composed(layers):
+    union = OntoDAG()
+    for layer in layers:
+        union.merge(layer)
+    return union
+
+
+def layers(seed):
+    """Three layers sharing some names: a human store, a machine layer over
+    the human store's items, and a published reference read lazily."""
+    rng = random.Random(seed)
+    human = OntoDAG()
+    for name, parents in (("photos", []), ("travel", []),
+                          ("japan", ["travel"]), ("vienna", ["travel"])):
+        human.put(name, parents)
+    for i in range(30):
+        human.put(f"img{i}", rng.sample(["photos", "japan", "vienna"],
+                                        rng.randint(1, 2)))
+    machine = OntoDAG()
+    machine.put("sys:", [])
+    for drive in ("a", "b"):
+        machine.put(f"sys:{drive}", ["sys:"])
+    for i in range(0, 40, 2):
+        machine.put(f"img{i}", [f"sys:{rng.choice('ab')}"])
+    blobs = MemoryBytesStore()
+    published = EagerOntoDAG(RecordStore(blobs))
+    for name, parents in (("place", []), ("city", ["place"]),
+                          ("vienna", ["city"]), ("kyoto", ["city"]),
+                          ("japan", ["place"]), ("kyoto", ["japan"])):
+        published.put(name, parents)
+    for i in range(100):
+        published.put(f"landmark{i}", ["kyoto" if i % 2 else "place"])
+    root = published.commit()
+    reference = LazyOntoDAG(RecordStore.at(root, blobs))
+    oracle = EagerOntoDAG(RecordStore.at(root, blobs))
+    return [human, machine, reference], [human, machine, oracle]
+
+
+class TestFederatedAnswers(unittest.TestCase):
+    def setUp(self):
+        walked, loaded = layers(0)
+        self.view = FederatedOntoDAG(walked)
+        self.oracle = composed(loaded)
+
+    def test_get_and_count_agree_with_the_composed_view(self):
+        for query in (["photos"], ["photos", "sys:a"], ["travel", "sys:b"],
+                      ["city"], ["place", "travel"], ["japan", "kyoto"],
+                      ["sys:"], [], ["nowhere"], ["travel", "photos"]):
+            self.assertEqual(names(self.view.get(query)),
+                             names(self.oracle.get(query)), query)
+            self.assertEqual(self.view.count(query),
+                             self.oracle.count(query), query)
+
+    def test_get_any_and_is_below_agree(self):
+        queries = [{"photos", "sys:a"}, {"kyoto"}, {"vienna", "sys:b"}]
+        self.assertEqual(names(self.view.get_any(queries)),
+                         names(self.oracle.get_any(queries)))
+        for sub, sup in (("vienna", "place"), ("img4", "sys:"),
+                         ("landmark1", "japan"), ("landmark2", "japan"),
+                         ("japan", "travel"), ("kyoto", "travel"),
+                         ("img1", "nowhere"), ("photos", "photos")):
+            self.assertEqual(self.view.is_below(sub, sup),
+                             self.oracle.is_below(sub, sup), (sub, sup))
+
+    def test_metadata_follows_the_layer_order(self):
+        human = OntoDAG()
+        human.put("vienna", [])
+        human.nodes["vienna"].metadata["label"] = "Wien"
+        other = OntoDAG()
+        other.put("vienna", [])
+        other.nodes["vienna"].metadata.update(label="Vienna", country="AT")
+        view = FederatedOntoDAG([human, other])
+        self.assertEqual(view.nodes["vienna"].metadata,
+                         {"label": "Wien", "country": "AT"})
+
+    def test_a_lazy_layer_stays_lazy(self):
+        walked, _ = layers(1)
+        reference = walked[2]
+        view = FederatedOntoDAG(walked)
+        view.get(["photos", "sys:a"])
+        view.is_below("img6", "travel")
+        view.is_below("kyoto", "place")
+        # The 100 landmarks are never fetched for a question about photos.
+        self.assertFalse([name for name in reference._records
+                          if name.startswith("landmark")])
+
+    def test_overlapping_crosses_layers(self):
+        schema = OntoDAG()
+        for name, parents in (("dimension", []),
+                              ("linear-dimension", ["dimension"]),
+                              ("weight", ["linear-dimension"])):
+            schema.put(name, parents)
+        goods = OntoDAG()
+        for name, parents in (("dimension", []),
+                              ("linear-dimension", ["dimension"]),
+                              ("weight", ["linear-dimension"]),
+                              ("parcel", ["weight(3kg)"]),
+                              ("offer", ["weight(0.8kg..1.5kg)"])):
+            goods.put(name, parents)
+        oracle = composed([schema, goods])
+        view = FederatedOntoDAG([schema, goods])
+        for term in ("weight(1kg..)", "weight(..5kg)"):
+            self.assertEqual(names(view.get_overlapping(term)),
+                             names(oracle.get_overlapping(term)), term)
+            self.assertEqual(names(view.get([term])),
+                             names(oracle.get([term])), term)
+
+    def test_writes_are_refused(self):
+        with self.assertRaises(TypeError):
+            self.view.put("new", ["photos"])
+
+
+class TestFederatedSession(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        home = self._dir.name
+        self.primary = os.path.join(home, "human.od")
+        machine = "rs:" + os.path.join(home, "machine")
+        patcher = mock.patch.dict(os.environ, {
+            "ONTODAG_HOME": home, "ONTODAG_OVERLAYS": machine,
+            "ONTODAG_OVERLAY_MODE": "federate"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cli._OVERRIDES.clear()
+        for spec, commands in (
+                (self.primary, [["put", "photos"],
+                                ["put", "trip.jpg", "photos"]]),
+                (machine, [["put", "sys:"], ["put", "sys:drive", "sys:"],
+                           ["put", "trip.jpg", "sys:drive"],
+                           ["put", "cache.tmp", "sys:drive"]])):
+            session = cli.Session(spec)
+            for argv in commands:
+                self.assertEqual(self.run_(argv, session)[0], 0)
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def run_(self, argv, session):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = cli.dispatch(argv, session)
+        return code, out.getvalue()
+
+    def test_answers_walk_the_layers(self):
+        session = cli.Session(self.primary)
+        self.assertEqual(self.run_(["get", "photos", "sys:drive"], session),
+                         (0, "trip.jpg\n"))
+        self.assertEqual(self.run_(["count"], session), (0, "5\n"))
+        self.assertIsInstance(session.view(), FederatedOntoDAG)
+        self.assertIsInstance(session.view().layers[1], LazyOntoDAG)
+        # Whole-graph commands still read the composed union.
+        self.assertNotIsInstance(session.view(whole=True), FederatedOntoDAG)
+        with mock.patch.dict(os.environ, {"ONTODAG_OVERLAY_MODE": "merge"}):
+            self.assertEqual(self.run_(["count"], session), (0, "5\n"))
+
+    def test_a_save_is_seen_by_the_next_answer(self):
+        session = cli.Session(self.primary)
+        self.run_(["get", "photos"], session)
+        self.run_(["put", "beach.jpg", "photos"], session)
+        self.assertEqual(self.run_(["get", "photos"], session),
+                         (0, "beach.jpg\ntrip.jpg\n"))
+
+    def test_an_unknown_mode_is_an_error(self):
+        with mock.patch.dict(os.environ, {"ONTODAG_OVERLAY_MODE": "zip"}):
+            code = cli.dispatch(["get", "photos"], cli.Session(self.primary))
+        self.assertEqual(code, 1)
+        self.assertEqual(cli.dispatch(["set", "overlay_mode", "zip"],
+                                      cli.Session(self.primary)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
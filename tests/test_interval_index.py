@@ -0,0 +1,153 @@
+"""Interval index — the dimension queries it answers match the star scan.
+
+The oracle is an index-free twin fed the same operations: virtual cones,
+`get_overlapping`, the computed neighbours of every present value and
+virtual-subject `is_below` must agree however the star has changed since
+the index last looked at it."""
+
+import random
+import unittest
+
+from ontodag import OntoDAG
+
+
+def names(items):
+    return {item.name for item in items}
+
+
+def timeline():
+    dag = OntoDAG()
+    dag.put("dimension", [])
+    dag.put("linear-dimension", ["dimension"])
+    dag.put("calendar-dimension", ["dimension"])
+    dag.put("weight", ["linear-dimension"])
+    dag.put("time", ["calendar-dimension"])
+    return dag
+
+
+class TestIntervalIndex(unittest.TestCase):
+    def test_a_range_bisects_the_points(self):
+        dag = timeline()
+        index = dag.enable_interval_index()
+        for day in range(1, 29):
+            dag.put(f"log{day}", [f"time(2026-02-{day:02d}T12:00:00Z)"])
+        got = dag.get(["time(2026-02-10..2026-02-12)"])
+        self.assertEqual(names(got) - {n for n in names(got)
+                                       if n.startswith("time(")},
+                         {"log10", "log11", "log12"})
+        star = index.lookup("time", "calendar-dimension",
+                            dag._declared_units())
+        self.assertEqual(len(star.inside("2026-02-10T00:00:00Z",
+                                         "2026-02-12T23:59:59Z")), 3)
+
+    def test_ranges_and_points_in_one_star(self):
+        dag = timeline()
+        dag.enable_interval_index()
+        dag.put("crate", ["weight(10kg)"])
+        dag.put("band", ["weight(5kg..20kg)"])
+        dag.put("light", ["weight(..1kg)"])
+        self.assertEqual(names(dag.get(["weight(5kg..)"])),
+                         {"weight(10kg)", "crate", "weight(5kg..20kg)",
+                          "band"})
+        self.assertEqual(names(dag.get_overlapping("weight(15kg..)")),
+                         {"weight(5kg..20kg)", "band", "weight(10kg)",
+                          "crate"})
+        # A virtual subject climbs through the values containing it.
+        self.assertTrue(dag.is_below("weight(7kg)", "weight"))
+        self.assertFalse(dag.is_below("weight(2kg)", "weight"))
+        self.assertEqual(names(dag._computed_parents(
+            dag.nodes["weight(10kg)"])), {"weight(5kg..20kg)"})
+
+    def test_removal_and_redeclaration_are_seen(self):
+        dag = timeline()
+        dag.enable_interval_index()
+        dag.put("a", ["weight(3kg)"])
+        self.assertEqual(names(dag.get(["weight(..5kg)"])),
+                         {"weight(3kg)", "a"})
+        dag.remove_cone(["weight(3kg)"])
+        self.assertEqual(dag.get(["weight(..5kg)"]), set())
+        # Re-declared under another kind: the entry parsed under the old
+        # one must not be served.
+        dag.put("count-dimension", ["dimension"])
+        dag.put("crates", ["linear-dimension"])
+        dag.put("shipment", ["crates(3)"])
+        self.assertEqual(names(dag.get(["crates(..5)"])),
+                         {"crates(3)", "shipment"})
+        dag.reclassify(["crates"], from_=["linear-dimension"])
+        dag.reclassify(["crates"], to=["count-dimension"])
+        self.assertEqual(dag._dimension_kind("crates"), "count-dimension")
+        self.assertEqual(names(dag.get(["crates(2..)"])),
+                         {"crates(3)", "shipment"})
+
+    def test_mixed_families_fall_back_to_the_scan(self):
+        dag = timeline()
+        dag.enable_interval_index()
+        dag.put("box", ["weight(2kg)"])
+        with self.assertRaises(ValueError):
+            dag.get(["weight(1m..)"])
+
+
+class TestFuzz(unittest.TestCase):
+    UNITS = ["kg", "g"]
+
+    def _term(self, rng):
+        def end():
+            return f"{rng.randint(0, 40)}{rng.choice(self.UNITS)}"
+        shape = rng.random()
+        if shape < 0.6:
+            return f"weight({end()})"
+        lo, hi = sorted([rng.randint(0, 40), rng.randint(0, 40)])
+        if shape < 0.8:
+            return f"weight({lo}kg..{hi}kg)"
+        return rng.choice([f"weight({lo}kg..)", f"weight(..{hi}kg)"])
+
+    def _run(self, seed, rounds=30):
+        rng = random.Random(seed)
+        dag, twin = timeline(), timeline()
+        dag.enable_interval_index()
+        for i in range(rounds):
+            roll = rng.random()
+            live = sorted(name for name in twin.nodes
+                          if name.startswith("weight("))
+            if roll < 0.7 or not live:
+                supers = [self._term(rng) for _ in range(rng.randint(1, 2))]
+                for target in (twin, dag):
+                    try:
+                        target.put(f"n{i}", supers)
+                    except ValueError:
+                        pass
+            elif roll < 0.85:
+                victim = rng.choice(live)
+                for target in (twin, dag):
+                    target.remove(victim)
+            else:
+                victim = rng.choice(live)
+                for target in (twin, dag):
+                    target.remove_cone([victim])
+            for _ in range(2):
+                term = self._term(rng)
+                self.assertEqual(names(dag.get([term])),
+                                 names(twin.get([term])), f"{term} (seed {seed})")
+                self.assertEqual(names(dag.get_overlapping(term)),
+                                 names(twin.get_overlapping(term)), term)
+                self.assertEqual(dag.is_below(term, "weight(10kg..30kg)"),
+                                 twin.is_below(term, "weight(10kg..30kg)"))
+        for name in twin.nodes:
+            if name.startswith("weight("):
+                self.assertEqual(
+                    names(dag._computed_children(dag.nodes[name])),
+                    names(twin._computed_children(twin.nodes[name])), name)
+                self.assertEqual(
+                    names(dag._computed_parents(dag.nodes[name])),
+                    names(twin._computed_parents(twin.nodes[name])), name)
+        self.assertEqual(
+            {(p.name, c.name) for p in dag.nodes.values() for c in p.neighbors},
+            {(p.name, c.name) for p in twin.nodes.values() for c in p.neighbors})
+
+    def test_fuzz_many_seeds(self):
+        for seed in range(3):
+            self._run(seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""`iter_get` — the answer of `get`, streamed, and cut short only when asked.
+
+The oracle is `get` itself: in name order the stream must be exactly the
+sorted answer (or its first `limit` names) with an exact total; in planner
+order any `limit` members of the answer, a total that never overstates,
+and `count()` equal to the answer's size."""
+
+import random
+import unittest
+
+from ontodag import OntoDAG
+
+
+def names(items):
+    return [item.name for item in items]
+
+
+class TestIterGet(unittest.TestCase):
+    def tagged(self, n=200):
+        dag = OntoDAG()
+        dag.put("all", [])
+        dag.put("odd", [])
+        for i in range(n):
+            dag.put(f"i{i:04}", ["all"] + (["odd"] if i % 2 else []))
+        return dag
+
+    def test_name_order_is_the_sorted_answer(self):
+        dag = self.tagged()
+        stream = dag.iter_get(["all", "odd"], limit=3)
+        self.assertEqual(names(stream), ["i0001", "i0003", "i0005"])
+        self.assertEqual((stream.total, stream.exact), (100, True))
+        everything = dag.iter_get(["odd"])
+        self.assertEqual(names(everything),
+                         sorted(names(dag.get(["odd"]))))
+
+    def test_planner_order_stops_at_the_limit(self):
+        dag = self.tagged()
+        stream = dag.iter_get(["all", "odd"], limit=5, order=None)
+        got = names(stream)
+        self.assertEqual(len(got), 5)
+        self.assertLessEqual(set(got), set(names(dag.get(["all", "odd"]))))
+        self.assertEqual((stream.total, stream.exact), (5, False))
+        self.assertEqual(stream.count(), 100)
+        self.assertTrue(stream.exact)
+
+    def test_settled_queries_stream_too(self):
+        dag = self.tagged(10)
+        self.assertEqual(names(dag.iter_get(["nonesuch"])), [])
+        self.assertEqual(len(names(dag.iter_get([]))), 12)
+        dag.enable_cone_bitmaps()
+        self.assertEqual(names(dag.iter_get(["all", "odd"], limit=1)),
+                         ["i0001"])
+        with self.assertRaises(ValueError):
+            dag.iter_get(["all"], order="count")
+        with self.assertRaises(ValueError):
+            dag.iter_get(["all"], limit=-1)
+
+    def test_random_queries_match_get(self):
+        rng = random.Random(20261017)
+        dag = OntoDAG()
+        for i in range(80):
+            live = sorted(set(dag.nodes) - {"*"})
+            dag.put(f"n{i}", rng.sample(live, min(len(live),
+                                                  rng.randint(0, 3))))
+        pool = sorted(set(dag.nodes) - {"*"})
+        for _ in range(200):
+            terms = rng.sample(pool, rng.randint(0, 3))
+            answer = sorted(names(dag.get(terms)))
+            limit = rng.choice([None, 0, 1, 5])
+            stream = dag.iter_get(terms, limit=limit)
+            self.assertEqual(names(stream), answer[:limit], terms)
+            self.assertEqual(stream.total, len(answer), terms)
+            loose = dag.iter_get(terms, limit=limit, order=None)
+            got = names(loose)
+            self.assertLessEqual(set(got), set(answer), terms)
+            self.assertEqual(len(got), len(answer[:limit]), terms)
+            self.assertEqual(loose.count(), len(answer), terms)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""The native store's journal — saves append their changes beside the file,
+a load replays them, and compaction folds them back in."""
+
+import io
+import os
+import random
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import ontodag.__main__ as cli
+from ontodag import journal
+from ontodag.dag import OntoDAG
+
+
+def shape(dag):
+    return {name: (sorted(child.name for child in node.neighbors
+                          if dag.nodes.get(child.name) is child),
+                   node.descendant_count, node.metadata)
+            for name, node in dag.nodes.items()}
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "s.od")
+        self.log = journal.path_for(self.path)
+        cli._OVERRIDES.clear()
+        dag = OntoDAG()
+        for name, parents in (("Travel", []), ("Japan", []),
+                              ("Flight", ["Travel"]),
+                              ("JAL", ["Flight", "Japan"])):
+            dag.put(name, parents)
+        cli._save(dag, self.path)
+        # Nothing is due by size unless a test says so.
+        patcher = mock.patch.object(journal, "RATIO", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _run(self, argv, session):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = cli.dispatch(argv, session)
+        return code, out.getvalue()
+
+    def _file(self):
+        with open(self.path, "rb") as fh:
+            return fh.read()
+
+    def test_saves_append_and_a_load_replays_them(self):
+        rng = random.Random(0)
+        before = self._file()
+        session = cli.Session(self.path)
+        names = ["Travel", "Japan", "Flight", "JAL"]
+        for i in range(60):
+            roll = rng.random()
+            if roll < 0.6:
+                name = f"n{i}"
+                argv = ["put", name] + rng.sample(names, rng.randint(0, 2))
+                names.append(name)
+            elif roll < 0.8 and len(names) > 4:
+                argv = ["move", rng.choice(names[4:]), rng.choice(names[:4])]
+            elif len(names) > 4:
+                name = rng.choice(names[4:])
+                argv = ["remove", name]
+                names.remove(name)
+            else:
+                continue
+            self._run(argv, session)
+            self.assertEqual(shape(cli.Session(self.path).dag),
+                             shape(session.dag), argv)
+        self.assertEqual(self._file(), before)
+        self.assertTrue(os.path.exists(self.log))
+
+    def test_metadata_updates_are_recorded(self):
+        session = cli.Session(self.path)
+        session.dag.nodes["JAL"].metadata["label"] = "Japan Airlines"
+        session.save()
+        session.dag.nodes["Japan"].metadata["label"] = "Nippon"
+        session.save()
+        self.assertEqual(cli.Session(self.path).dag.nodes["JAL"].metadata,
+                         {"label": "Japan Airlines"})
+        session.dag.nodes["JAL"].metadata.clear()
+        session.save()
+        loaded = cli.Session(self.path).dag
+        self.assertEqual(loaded.nodes["JAL"].metadata, {})
+        self.assertEqual(loaded.nodes["Japan"].metadata, {"label": "Nippon"})
+
+    def test_compact_folds_the_journal_into_the_file(self):
+        session = cli.Session(self.path)
+        self._run(["put", "ANA", "Flight", "Japan"], session)
+        self.assertIn("\njournal = ", self._run(["status"], session)[1])
+        code, out = self._run(["compact"], session)
+        self.assertEqual(code, 0)
+        self.assertIn("compacted", out)
+        self.assertFalse(os.path.exists(self.log))
+        written = os.path.join(self._dir.name, "written.od")
+        cli._save_native(session.dag, written)
+        with open(written, "rb") as fh:
+            self.assertEqual(self._file(), fh.read())
+        self.assertEqual(self._run(["compact"], session),
+                         (0, f"nothing to compact: {self.path} has no journal\n"))
+        # The session keeps appending, now to a journal on the new file.
+        self._run(["put", "Peach", "Flight"], session)
+        self.assertEqual(shape(cli.Session(self.path).dag), shape(session.dag))
+
+    def test_a_whole_write_keeps_the_link_and_the_mode(self):
+        os.chmod(self.path, 0o640)
+        link = os.path.join(self._dir.name, "link.od")
+        os.symlink(self.path, link)
+        session = cli.Session(link)
+        self._run(["put", "ANA", "Flight"], session)
+        self.assertEqual(self._run(["compact"], session)[0], 0)
+        self.assertTrue(os.path.islink(link))
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+        self.assertIn("ANA", cli._load_native(self.path).nodes)
+
+    def test_a_due_journal_is_compacted_by_the_save(self):
+        session = cli.Session(self.path)
+        self._run(["put", "ANA", "Flight"], session)
+        self.assertTrue(os.path.exists(self.log))
+        with mock.patch.object(journal, "RATIO", 1000):
+            self._run(["put", "Peach", "Flight"], session)
+        self.assertFalse(os.path.exists(self.log))
+        self._run(["put", "Jetstar", "Flight"], session)
+        with mock.patch.object(time, "time", return_value=time.time()
+                               + journal.MAX_AGE + 1):
+            self._run(["put", "Zipair", "Flight"], session)
+        self.assertFalse(os.path.exists(self.log))
+        self.assertEqual(shape(cli._load_native(self.path)), shape(session.dag))
+
+    def test_a_bulk_rewiring_writes_the_whole_file(self):
+        session = cli.Session(self.path)
+        self._run(["put", "ANA", "Flight"], session)
+        self.assertTrue(os.path.exists(self.log))
+        session.dag.bulk_load([("Japan", f"Ryokan {i}") for i in range(20)])
+        session.save()
+        self.assertFalse(os.path.exists(self.log))
+        self.assertEqual(shape(cli._load_native(self.path)), shape(session.dag))
+
+    def test_a_torn_last_line_is_skipped(self):
+        session = cli.Session(self.path)
+        self._run(["put", "ANA", "Flight"], session)
+        expected = shape(session.dag)
+        with open(self.log, "ab") as fh:
+            fh.write(b'[["node","Pea')
+        self.assertEqual(shape(cli._load_native(self.path)), expected)
+        # A later save by a new session starts over with the whole file.
+        again = cli.Session(self.path)
+        self._run(["put", "Peach", "Flight"], again)
+        self.assertFalse(os.path.exists(self.log))
+        self.assertEqual(shape(cli._load_native(self.path)), shape(again.dag))
+
+    def test_an_interrupted_compaction(self):
+        session = cli.Session(self.path)
+        self._run(["put", "ANA", "Flight"], session)
+        expected = shape(session.dag)
+        with open(self.log, "rb") as fh:
+            pending = fh.read()
+        # Marked, but the file not yet replaced: the journal still applies.
+        journal.mark_compacted(self.log, "0" * 64)
+        self.assertEqual(shape(cli._load_native(self.path)), expected)
+        # Replaced, but the journal not yet removed: it is ignored.
+        with open(self.log, "wb") as fh:
+            fh.write(pending)
+        with mock.patch.object(os, "remove"):
+            cli._save_native(session.dag, self.path)
+        self.assertTrue(os.path.exists(self.log))
+        self.assertEqual(shape(cli._load_native(self.path)), expected)
+
+    def test_a_file_rewritten_under_its_journal_is_refused(self):
+        session = cli.Session(self.path)
+        self._run(["put", "ANA", "Flight"], session)
+        with open(self.path, "ab") as fh:
+            fh.write(b"Hotel Travel\n")
+        with self.assertRaisesRegex(ValueError, "move the journal aside"):
+            cli._load_native(self.path)
+
+    def test_only_a_native_file_has_a_journal(self):
+        for spec in (os.path.join(self._dir.name, "s.odb"),
+                     "rs:" + os.path.join(self._dir.name, "rs")):
+            code = cli.dispatch(["compact"], cli.Session(spec))
+            self.assertEqual(code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,11 +7,14 @@ quietly loads everything is correct and useless, so correctness alone would not
 catch the regression that matters.
 """
 
+import asyncio
 import random
 import unittest
+from unittest import mock
 
 from ontodag.dag import Item
-from ontodag.lazy import LazyOntoDAG
+from ontodag.browse import browse
+from ontodag.lazy import AsyncLazyOntoDAG, LazyOntoDAG
 from ontodag.eager import EagerOntoDAG
 from recordstore import MemoryBytesStore, RecordStore
 
@@ -165,6 +168,199 @@ class TestFetchBudget(unittest.TestCase):
             bounded.get_descendants(name)
         self.assertLessEqual(len(bounded._cone_cache), 2)
 
+    def test_a_limited_stream_stops_fetching(self):
+        puts = [("big", [])] + [(f"m{i}", ["big"]) for i in range(200)]
+        root, blobs = publish(puts)
+        everything = lazy(root, blobs)
+        everything.get(["big"])
+        first = lazy(root, blobs)
+        stream = first.iter_get(["big"], limit=3, order=None)
+        self.assertEqual(len(list(stream)), 3)
+        self.assertLess(first.fetches, everything.fetches // 10)
+        self.assertEqual(stream.count(), 200)
+
+    def test_explain_reports_fetches_and_cone_hits_per_step(self):
+        puts = list(VEHICLES) + [(f"car{i}", ["car"]) for i in range(50)]
+        root, blobs = publish(puts)
+        reader = lazy(root, blobs)
+        cold = reader.explain(["vehicle", "electric"])
+        self.assertEqual(cold["fetches"], reader.fetches)
+        self.assertGreater(cold["steps"][0]["fetches"], 0)
+        self.assertLessEqual(sum(step["fetches"] for step in cold["steps"]),
+                             cold["fetches"])
+        self.assertEqual(cold["cone_hits"], 0)
+        warm = reader.explain(["vehicle", "electric"])
+        self.assertEqual(warm["fetches"], 0)
+        self.assertEqual(warm["steps"][0]["cone_hits"], 1)
+        self.assertEqual(warm["result"], cold["result"])
+
+
+class SingleGetStore:
+    """A snapshot that answers only `get` — and, with `workers`, advertises
+    that many concurrent reads."""
+
+    def __init__(self, store, workers=None):
+        self._store = store
+        if workers is not None:
+            self.max_concurrent_reads = workers
+
+    def get(self, name):
+        return self._store.get(name)
+
+
+class TestBatchedFetching(unittest.TestCase):
+    def setUp(self):
+        # four levels under 'top': 3 mid, 9 low, 27 leaves
+        puts = [("top", [])]
+        for i in range(3):
+            puts.append((f"mid{i}", ["top"]))
+            for j in range(3):
+                puts.append((f"low{i}{j}", [f"mid{i}"]))
+                for k in range(3):
+                    puts.append((f"leaf{i}{j}{k}", [f"low{i}{j}"]))
+        self.root, self.blobs = publish(puts)
+        self.oracle = eager(self.root, self.blobs)
+
+    def test_a_cone_costs_a_round_trip_per_level(self):
+        reader = lazy(self.root, self.blobs)
+        self.assertEqual(names(reader.get_descendants("top")),
+                         names(self.oracle.get_descendants("top")))
+        self.assertEqual(reader.fetches, 40)
+        self.assertEqual(reader.round_trips, 4)     # top, then three levels
+
+    def test_ancestors_are_read_a_level_at_a_time(self):
+        reader = lazy(self.root, self.blobs)
+        self.assertEqual(names(reader.get_ancestors("leaf210")),
+                         names(self.oracle.get_ancestors("leaf210")))
+        self.assertEqual(reader.round_trips, reader.fetches)   # one per level
+        self.assertTrue(reader.is_below("leaf210", "top"))
+
+    def test_a_store_without_get_many(self):
+        store = RecordStore.at(self.root, self.blobs)
+        serial = LazyOntoDAG(SingleGetStore(store))
+        pooled = LazyOntoDAG(SingleGetStore(store, workers=8))
+        for reader in (serial, pooled):
+            self.assertEqual(names(reader.get(["top"])),
+                             names(self.oracle.get(["top"])))
+        self.assertEqual(serial.round_trips, serial.fetches)
+        self.assertEqual(pooled.fetches, serial.fetches)
+        self.assertLess(pooled.round_trips, pooled.fetches // 4)
+
+    def test_a_serial_store_stops_at_the_record_that_answers(self):
+        # Five parents, each under 'top': the first one expanded answers.
+        root, blobs = publish([("top", [])]
+                              + [(f"p{i}", ["top"]) for i in range(5)]
+                              + [("item", [f"p{i}" for i in range(5)])])
+        store = RecordStore.at(root, blobs)
+        serial = LazyOntoDAG(SingleGetStore(store))
+        batched = LazyOntoDAG(store)
+        for reader in (serial, batched):
+            self.assertTrue(reader.is_below("item", "top"))
+        self.assertEqual(serial.round_trips, serial.fetches)
+        self.assertEqual(batched.fetches - serial.fetches, 4)
+
+    def test_explain_reports_round_trips(self):
+        trace = lazy(self.root, self.blobs).explain(["top"])
+        self.assertGreater(trace["round_trips"], 0)
+        self.assertLess(trace["round_trips"], trace["fetches"])
+
+
+class AsyncGetStore:
+    """A snapshot whose `get` is a coroutine, counting the reads."""
+
+    def __init__(self, store):
+        self._store = store
+        self.reads = []
+
+    async def get(self, name):
+        self.reads.append(name)
+        await asyncio.sleep(0)
+        return self._store.get(name)
+
+
+class TestAsyncReader(unittest.TestCase):
+    def setUp(self):
+        self.root, self.blobs = publish(VEHICLES + [
+            ("tesla", ["ev"]), ("vanmoof", ["ebike"]), ("moped", ["bike"])])
+        self.oracle = lazy(self.root, self.blobs)
+
+    def test_answers_match_the_lazy_reader(self):
+        terms = sorted(n for n in eager(self.root, self.blobs).nodes
+                       if n != "*") + ["unknown"]
+        queries = [[a, b] for a in terms for b in terms]
+
+        async def ask(reader):
+            return await asyncio.gather(
+                asyncio.gather(*map(reader.get, queries)),
+                reader.get_any([["ev"], ["bike", "electric"]]),
+                asyncio.gather(*(reader.is_below(a, b) for a, b in queries)),
+                reader.browse([["vehicle"]]))
+
+        reader = AsyncLazyOntoDAG(RecordStore.at(self.root, self.blobs))
+        gets, union, below, position = asyncio.run(ask(reader))
+        for query, answer in zip(queries, gets):
+            self.assertEqual(names(answer), names(self.oracle.get(query)),
+                             query)
+        self.assertEqual(names(union), names(self.oracle.get_any(
+            [["ev"], ["bike", "electric"]])))
+        self.assertEqual(below, [self.oracle.is_below(a, b)
+                                 for a, b in queries])
+        expected = browse(self.oracle, [["vehicle"]])
+        self.assertEqual((position.here, position.refine),
+                         (expected.here, expected.refine))
+
+    def test_concurrent_queries_share_their_reads(self):
+        store = AsyncGetStore(RecordStore.at(self.root, self.blobs))
+        reader = AsyncLazyOntoDAG(store)
+
+        async def ask():
+            return await asyncio.gather(*(reader.get(["vehicle", "electric"])
+                                          for _ in range(8)))
+
+        answers = asyncio.run(ask())
+        once = lazy(self.root, self.blobs)
+        expected = names(once.get(["vehicle", "electric"]))
+        self.assertEqual([names(answer) for answer in answers],
+                         [expected] * 8)
+        self.assertEqual(len(store.reads), len(set(store.reads)))
+        self.assertEqual(reader.fetches, once.fetches)
+        self.assertEqual(asyncio.run(reader.get(["vehicle", "electric"])),
+                         answers[0])
+        self.assertEqual(reader.fetches, once.fetches)   # cached since
+
+    def test_a_deep_cone_is_walked_once_not_once_per_level(self):
+        root, blobs = publish(deep_chain(300, width=1))
+        reader = AsyncLazyOntoDAG(RecordStore.at(root, blobs))
+        expanded = []
+        expand = LazyOntoDAG._expand
+
+        def counted(dag, node):
+            expanded.append(node.name)
+            return expand(dag, node)
+
+        with mock.patch.object(LazyOntoDAG, "_expand", counted):
+            answer = asyncio.run(reader.get(["c0"]))
+            self.assertTrue(asyncio.run(reader.is_below("c299", "c0")))
+        self.assertEqual(names(answer), names(lazy(root, blobs).get(["c0"])))
+        # Each record expanded a few times (the query, then is_below's
+        # walk up), never once per level of the 300 it took.
+        self.assertLess(len(expanded), 4 * reader.fetches)
+
+    def test_a_failed_read_is_retried_by_the_next_query(self):
+        store = AsyncGetStore(RecordStore.at(self.root, self.blobs))
+        reader = AsyncLazyOntoDAG(store)
+        failing = store.get
+
+        async def unreachable(name):
+            raise OSError("node unreachable")
+
+        store.get = unreachable
+        with self.assertRaises(OSError):
+            asyncio.run(reader.get(["ev"]))
+        store.get = failing
+        self.assertEqual(names(asyncio.run(reader.get(["ev"]))),
+                         {"tesla"})
+
 
 class TestRandomizedAgainstEager(unittest.TestCase):
     def test_random_dag_all_queries_match(self):
@@ -17,6 +17,7 @@ import sys
 import tempfile
 import unittest
 from contextlib import redirect_stdout
+from unittest import mock
 
 from ontodag import CONTRACT_VERSION
 from ontodag.__main__ import Session, dispatch
@@ -133,6 +134,32 @@ class TestTools(SurfaceHarness):
         empty = self.call("query", {"terms": ["no-such-thing"]})
         self.assertEqual(empty["items"], [])
 
+    def test_explain_annotates_query_and_is_below(self):
+        answer = self.call("query", {"terms": ["pet"], "explain": True})
+        self.assertEqual(answer["explain"]["result"], answer["count"])
+        self.assertNotIn("explain", self.call("query", {"terms": ["pet"]}))
+        union = self.call("query", {"any_of": [["cat"], ["pet"]],
+                                    "explain": True})
+        self.assertIn("branches", union["explain"])
+        below = self.call("is_below", {"sub": "cat", "sup": "pet",
+                                       "explain": True})
+        self.assertEqual(below["explain"]["result"], below["result"])
+
+    def test_an_explained_query_is_answered_by_the_traced_run(self):
+        from ontodag.dag import OntoDAG
+        with mock.patch.object(OntoDAG, "_get", autospec=True,
+                               side_effect=OntoDAG._get) as planned:
+            answer = self.call("query", {"terms": ["pet"], "explain": True,
+                                         "limit": 1})
+        self.assertEqual(planned.call_count, 1)
+        self.assertEqual(answer["items"], ["cat"])
+        self.assertEqual(answer["explain"]["result"], answer["count"])
+        with mock.patch.object(OntoDAG, "is_below",
+                               side_effect=AssertionError("ran twice")):
+            below = self.call("is_below", {"sub": "cat", "sup": "pet",
+                                           "explain": True})
+        self.assertTrue(below["result"])
+
     def test_query_refuses_both_shapes_at_once(self):
         text = self.call("query", {"terms": ["a"], "any_of": [["b"]]},
                          expect_error=True)
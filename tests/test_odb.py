@@ -0,0 +1,162 @@
+"""`.odb` snapshots — the binary format round-trips losslessly, and the
+mapped view answers plain queries exactly as the loaded graph does."""
+
+import io
+import os
+import random
+import struct
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import ontodag.__main__ as cli
+from ontodag import odb
+from ontodag.dag import OntoDAG
+
+NAMES = ["plain", "New York", "it's", 'say "hi"', "café", "東京", "-dash"]
+
+
+def graph(seed, size=80):
+    rng = random.Random(seed)
+    dag = OntoDAG()
+    names = []
+    for i in range(size):
+        name = f"{rng.choice(NAMES)} {i}" if rng.random() < 0.3 else f"n{i}"
+        dag.put(name, rng.sample(names, min(len(names), rng.randint(0, 3))))
+        names.append(name)
+        if rng.random() < 0.1:
+            dag.nodes[name].metadata["label"] = f"label {i}"
+    return dag, names
+
+
+def shape(dag):
+    return {name: (sorted(child.name for child in node.neighbors),
+                   node.descendant_count, node.metadata)
+            for name, node in dag.nodes.items()}
+
+
+class TestOdb(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "s.odb")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_round_trip(self):
+        for seed in range(4):
+            dag, _names = graph(seed)
+            odb.write(dag, self.path)
+            self.assertEqual(shape(odb.read(self.path)), shape(dag))
+
+    def test_text_and_binary_convert_losslessly(self):
+        dag, _names = graph(7)
+        text = os.path.join(self._dir.name, "s.od")
+        again = os.path.join(self._dir.name, "again.od")
+        cli._save(dag, text)
+        cli._save(cli._load(text), self.path)
+        cli._save(cli._load(self.path), again)
+        with open(text, "rb") as one, open(again, "rb") as two:
+            self.assertEqual(one.read(), two.read())
+
+    def test_mapped_queries_match_the_graph(self):
+        dag, names = graph(3, size=120)
+        odb.write(dag, self.path)
+        rng = random.Random(0)
+        with odb.Snapshot(self.path) as snapshot:
+            self.assertTrue(snapshot.plain)
+            self.assertEqual(len(snapshot), len(dag.nodes))
+            for _ in range(200):
+                terms = rng.sample(names, rng.randint(0, 3))
+                if rng.random() < 0.1:
+                    terms.append("absent")
+                expected = {item.name for item in dag.get(terms)}
+                self.assertEqual(snapshot.get(terms), expected, terms)
+                self.assertEqual(snapshot.count_of(terms), len(expected))
+            self.assertEqual(snapshot.get(["*"]),
+                             {item.name for item in dag.get([])})
+
+    def test_a_dimension_graph_is_not_plain(self):
+        dag = OntoDAG()
+        dag.put("dimension", [])
+        dag.put("linear-dimension", ["dimension"])
+        dag.put("weight", ["linear-dimension"])
+        dag.put("box", ["weight(3kg)"])
+        odb.write(dag, self.path)
+        with odb.Snapshot(self.path) as snapshot:
+            self.assertFalse(snapshot.plain)
+        self.assertEqual({item.name for item in
+                          odb.read(self.path).get(["weight(2kg..)"])},
+                         {"box", "weight(3kg)"})
+
+    def test_not_an_odb_file(self):
+        with open(self.path, "wb") as fh:
+            fh.write(b"# ontodag store v1\n" + b"\0" * 200)
+        with self.assertRaises(ValueError):
+            odb.Snapshot(self.path)
+        odb.write(OntoDAG(), self.path)
+        with open(self.path, "r+b") as fh:
+            fh.seek(8)
+            fh.write(struct.pack("<I", odb.VERSION + 1))
+        with self.assertRaisesRegex(ValueError, "version"):
+            odb.read(self.path)
+
+
+class TestOdbCommandLine(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "s.odb")
+        cli._OVERRIDES.clear()
+        session = cli.Session(self.path)
+        for argv in (["put", "Travel"], ["put", "Japan"],
+                     ["put", "Flight", "Travel"],
+                     ["put", "JAL", "Flight", "Japan"]):
+            self.assertEqual(cli.dispatch(argv, session), 0)
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _run(self, argv, session):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = cli.dispatch(argv, session)
+        return code, out.getvalue()
+
+    def test_get_answers_without_loading(self):
+        session = cli.Session(self.path)
+        with mock.patch.object(odb, "read", side_effect=AssertionError):
+            self.assertEqual(self._run(["get", "Travel"], session),
+                             (0, "Flight\nJAL\n"))
+            self.assertEqual(self._run(["count", "Travel", "Japan"], session),
+                             (0, "1\n"))
+            self.assertEqual(self._run(["get", "Flight", "or", "Japan"],
+                                       session), (0, "JAL\n"))
+            self.assertEqual(self._run(["list"], session),
+                             (0, "Flight\nJAL\nJapan\nTravel\n"))
+        self.assertIsNone(session._dag)
+
+    def test_a_loaded_session_reads_its_own_graph(self):
+        session = cli.Session(self.path)
+        session.begin()
+        self._run(["put", "ANA", "Flight"], session)
+        self.assertIsNone(session.snapshot())
+        self.assertEqual(self._run(["get", "Flight"], session),
+                         (0, "ANA\nJAL\n"))
+        session.commit()
+        self.assertEqual(self._run(["get", "Flight"], cli.Session(self.path)),
+                         (0, "ANA\nJAL\n"))
+
+    def test_a_write_keeps_the_link_and_the_mode(self):
+        os.chmod(self.path, 0o600)
+        link = os.path.join(self._dir.name, "link.odb")
+        os.symlink(self.path, link)
+        self.assertEqual(self._run(["put", "ANA", "Flight"],
+                                   cli.Session(link))[0], 0)
+        self.assertTrue(os.path.islink(link))
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        self.assertIn("ANA", odb.read(self.path).nodes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""Parse cache — a parametric name is parsed once, and again after every
+schema change that could alter what it means.
+
+The oracle is a twin whose cache is emptied before every parse, i.e. the
+behavior before the cache existed: answers must agree through random
+declarations, re-declarations, unit declarations and ordinary puts."""
+
+import random
+import unittest
+
+from ontodag import OntoDAG
+
+
+def names(items):
+    return {item.name for item in items}
+
+
+class Uncached(OntoDAG):
+    def _parsed(self, name):
+        self._parses.rebuild()
+        return super()._parsed(name)
+
+
+def schema(dag):
+    dag.put("dimension", [])
+    dag.put("linear-dimension", ["dimension"])
+    dag.put("count-dimension", ["dimension"])
+    dag.put("weight", ["linear-dimension"])
+    dag.put("group", [])
+    return dag
+
+
+class TestParseCache(unittest.TestCase):
+    def test_filing_items_keeps_the_cache(self):
+        dag = schema(OntoDAG())
+        dag.put("box", ["weight(3kg)"])
+        cached = dict(dag._parses.names)
+        self.assertIn("weight(3kg)", cached)
+        dag.put("crate", ["weight(5kg)"])
+        dag.get(["weight(..4kg)"])
+        self.assertLessEqual(cached.items(), dag._parses.names.items())
+
+    def test_a_declaration_is_seen(self):
+        dag = schema(OntoDAG())
+        dag.put("crates(3)", [])                 # undeclared: an atom
+        self.assertIsNone(dag._parse_parametric("crates(3)"))
+        dag.put("crates", ["count-dimension"])
+        self.assertEqual(dag._parse_parametric("crates(3)"),
+                         ("crates", "count-dimension", "crates(3)"))
+        dag.reclassify(["crates"], from_=["count-dimension"])
+        self.assertIsNone(dag._parse_parametric("crates(3)"))
+
+    def test_an_intermediate_declaration_is_seen(self):
+        dag = schema(OntoDAG())
+        dag.put("measure", [])
+        dag.put("length", ["measure"])
+        self.assertIsNone(dag._parse_parametric("length(2m)"))
+        dag.put("measure", ["linear-dimension"])
+        self.assertEqual(dag._parse_parametric("length(2m)")[1],
+                         "linear-dimension")
+
+    def test_unit_declarations_are_seen(self):
+        dag = schema(OntoDAG())
+        with self.assertRaises(ValueError):
+            dag._parse_parametric("weight(2zz)")
+        dag.put("unit-declaration", [])
+        dag.put("unit(zz=1kg)", ["unit-declaration"])
+        self.assertEqual(dag._parse_parametric("weight(2zz)")[2],
+                         "weight(2kg)")
+        dag.remove("unit(zz=1kg)")
+        with self.assertRaises(ValueError):
+            dag._parse_parametric("weight(2zz)")
+
+    def test_the_cache_is_bounded(self):
+        dag = schema(OntoDAG())
+        dag._parses.LIMIT = 10
+        for i in range(25):
+            dag._parse_parametric(f"weight({i}kg)")
+        self.assertLessEqual(len(dag._parses.names), 10)
+
+
+class TestFuzz(unittest.TestCase):
+    HEADS = ["weight", "crates", "length", "group"]
+
+    def _op(self, rng, i):
+        roll = rng.random()
+        head = rng.choice(self.HEADS)
+        if roll < 0.15:
+            kind = rng.choice(["linear-dimension", "count-dimension",
+                               "group"])
+            return lambda dag: dag.put(head, [kind])
+        if roll < 0.25:
+            old = rng.choice(["linear-dimension", "count-dimension", "group"])
+            return lambda dag: dag.reclassify([head], from_=[old])
+        if roll < 0.3:
+            return lambda dag: dag.put("group", ["linear-dimension"])
+        value = f"{head}({rng.randint(1, 9)})"
+        return lambda dag: dag.put(f"n{i}", [value])
+
+    def _run(self, seed, rounds=60):
+        rng = random.Random(seed)
+        dag, twin = schema(OntoDAG()), schema(Uncached())
+        for i in range(rounds):
+            op = self._op(rng, i)
+            outcomes = []
+            for target in (twin, dag):
+                try:
+                    op(target)
+                    outcomes.append(None)
+                except ValueError as error:
+                    outcomes.append(str(error))
+            self.assertEqual(outcomes[0], outcomes[1], f"round {i}")
+            for head in self.HEADS:
+                term = f"{head}(..{rng.randint(1, 9)})"
+                try:
+                    expected = names(twin.get([term]))
+                except ValueError:
+                    with self.assertRaises(ValueError):
+                        dag.get([term])
+                    continue
+                self.assertEqual(names(dag.get([term])), expected,
+                                 f"{term} at round {i} (seed {seed})")
+
+    def test_fuzz_many_seeds(self):
+        for seed in range(6):
+            self._run(seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
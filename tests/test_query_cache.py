@@ -0,0 +1,107 @@
+"""Query result cache — hits when nothing changed, never a stale answer.
+
+The oracle is a cache-free twin fed the same operations: after every write
+the cached DAG must answer every query exactly as the twin does, however
+many of those queries it had answered (and cached) before the write."""
+
+import unittest
+
+from ontodag import OntoDAG
+
+from twins import twin_edits
+
+
+def names(items):
+    return {item.name for item in items}
+
+
+class TestCache(unittest.TestCase):
+    def zoo(self):
+        dag = OntoDAG()
+        dag.put("Animal", [])
+        dag.put("Pet", [])
+        dag.put("Dog", ["Animal", "Pet"])
+        dag.put("Cat", ["Animal", "Pet"])
+        return dag
+
+    def test_a_repeated_query_is_a_hit_in_any_term_order(self):
+        dag = self.zoo()
+        cache = dag.enable_query_cache()
+        first = dag.get(["Animal", "Pet"])
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(dag.get(["Pet", "Animal"]), first)
+        self.assertEqual(dag.count(["Animal", "Pet"]), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_every_write_bumps_the_generation(self):
+        dag = self.zoo()
+        cache = dag.enable_query_cache()
+        dag.get(["Pet"])
+        before = cache.generation
+        dag.put("Parrot", ["Pet"])
+        self.assertGreater(cache.generation, before)
+        self.assertIn("Parrot", names(dag.get(["Pet"])))
+        dag.remove("Parrot")
+        self.assertNotIn("Parrot", names(dag.get(["Pet"])))
+        dag.bulk_load([("Pet", "Hamster")])
+        self.assertIn("Hamster", names(dag.get(["Pet"])))
+        self.assertEqual(cache.hits, 0)
+
+    def test_answers_are_copies(self):
+        dag = self.zoo()
+        dag.enable_query_cache()
+        dag.get(["Pet"]).clear()
+        self.assertEqual(names(dag.get(["Pet"])), {"Dog", "Cat"})
+
+    def test_least_recently_used_entries_are_evicted(self):
+        dag = self.zoo()
+        cache = dag.enable_query_cache(size=2)
+        dag.get(["Animal"])
+        dag.get(["Pet"])
+        dag.get(["Animal"])              # now the most recent
+        dag.get(["Dog"])                 # evicts Pet
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+        dag.get(["Animal"])
+        dag.get(["Pet"])
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+        with self.assertRaises(ValueError):
+            OntoDAG().enable_query_cache(size=0)
+
+    def test_get_any_reuses_each_disjunct(self):
+        dag = self.zoo()
+        cache = dag.enable_query_cache()
+        dag.get(["Dog"])
+        dag.get_any([["Dog"], ["Cat", "Pet"]])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        dag.get_any([["Cat", "Pet"]])
+        self.assertEqual(cache.hits, 2)
+
+    def test_explain_measures_the_walk(self):
+        dag = self.zoo()
+        cache = dag.enable_query_cache()
+        dag.get(["Animal", "Pet"])
+        trace = dag.explain(["Animal", "Pet"])
+        self.assertGreater(trace["visits"], 0)
+        self.assertEqual(cache.hits, 0)
+
+
+class TestFuzz(unittest.TestCase):
+    def _run(self, seed):
+        dag, twin = OntoDAG(), OntoDAG()
+        dag.enable_query_cache(size=16)
+        for rng, label in twin_edits(dag, twin, seed, rounds=120):
+            live = sorted(set(dag.nodes) - {"*"})
+            for _ in range(6):
+                # Few distinct queries, asked repeatedly: most are hits.
+                terms = rng.sample(live[:6], min(len(live), rng.randint(0, 2)))
+                self.assertEqual(names(dag.get(terms)), names(twin.get(terms)),
+                                 f"{terms} after {label}")
+        self.assertGreater(dag._results.hits, 0)
+
+    def test_fuzz_many_seeds(self):
+        for seed in range(8):
+            self._run(seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Reachability labels — sound after every write, identical answers always.
+
+Two oracles: the label invariant itself (every edge goes down a level and
+into its parent's intervals — what makes every negative cut a proof), and
+an index-free twin fed the same operations, compared on `is_below` for
+every pair of nodes and on the resulting edge sets (the redundancy and
+cycle checks of `add_edge` run through the index too)."""
+
+import unittest
+
+from ontodag import OntoDAG
+
+from twins import twin_edits
+
+
+def edge_set(dag):
+    return {(parent.name, child.name)
+            for parent in dag.nodes.values() for child in parent.neighbors}
+
+
+class LabelAssertions(unittest.TestCase):
+    def assertLabelsSound(self, dag, label=""):
+        labels = dag._reach._labels
+        self.assertEqual(set(labels), set(dag.nodes), label)
+        for parent, child in edge_set(dag):
+            a, b = labels[parent], labels[child]
+            self.assertLess(a[0], b[0], f"level {parent}->{child} {label}")
+            self.assertTrue(a[1] <= b[1] and b[2] <= a[2]
+                            and a[3] <= b[3] and b[4] <= a[4],
+                            f"interval {parent}->{child} {label}")
+
+
+class TestLabels(LabelAssertions):
+    def test_unrelated_pairs_are_cut_without_a_walk(self):
+        dag = OntoDAG()
+        dag.put("Animal", [])
+        dag.put("Dog", ["Animal"])
+        dag.put("Machine", [])
+        dag.put("Car", ["Machine"])
+        reach = dag.enable_reachability_index()
+        self.assertFalse(reach.may_reach("Animal", "Car"))
+        self.assertFalse(reach.may_reach("Dog", "Animal"))
+        self.assertTrue(reach.may_reach("Animal", "Dog"))
+        self.assertFalse(dag.is_below("Car", "Animal"))
+        self.assertTrue(dag.is_below("Dog", "*"))
+
+    def test_cycles_are_still_refused(self):
+        dag = OntoDAG()
+        dag.enable_reachability_index()
+        dag.put("A", [])
+        dag.put("B", ["A"])
+        dag.put("C", ["B"])
+        with self.assertRaises(ValueError):
+            dag.put("A", ["C"])
+        self.assertLabelsSound(dag, "after refusal")
+
+    def test_declared_dimensions_bypass_the_labels(self):
+        dag = OntoDAG()
+        reach = dag.enable_reachability_index()
+        dag.put("dimension", [])
+        dag.put("linear-dimension", ["dimension"])
+        self.assertTrue(reach.covers(computed=True))
+        dag.put("weight", ["linear-dimension"])
+        self.assertFalse(reach.covers(computed=True))
+        dag.put("parcel", ["weight(3kg)"])
+        # Below only through the computed order, which no label records.
+        self.assertTrue(dag.is_below("parcel", "weight(..5kg)"))
+        dag.put("weight(..5kg)", [])
+        self.assertTrue(dag.is_below("parcel", "weight(..5kg)"))
+        self.assertLabelsSound(dag, "dimensions")
+
+    def test_widening_triggers_a_rebuild(self):
+        dag = OntoDAG()
+        reach = dag.enable_reachability_index()
+        for i in range(20):
+            dag.put(f"c{i}", [])
+        for i in range(1, 20):
+            dag.put(f"c{i}", [f"c{i - 1}"])     # each one a widening chain
+        self.assertLessEqual(reach._drift, len(dag.nodes))
+        self.assertLabelsSound(dag, "chain")
+        self.assertTrue(dag.is_below("c19", "c0"))
+        self.assertFalse(dag.is_below("c0", "c19"))
+
+
+class TestFuzz(LabelAssertions):
+    def _run(self, seed):
+        dag, twin = OntoDAG(), OntoDAG()
+        dag.enable_reachability_index()
+        for _rng, label in twin_edits(dag, twin, seed):
+            self.assertLabelsSound(dag, label)
+            self.assertEqual(edge_set(dag), edge_set(twin), label)
+        names = sorted(dag.nodes)
+        for sub in names:
+            for sup in names:
+                self.assertEqual(dag.is_below(sub, sup),
+                                 twin.is_below(sub, sup), (sub, sup, seed))
+
+    def test_fuzz_many_seeds(self):
+        for seed in range(8):
+            self._run(seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""The hydrated-snapshot cache — a record store opens from the snapshot at
+its root, or from the last one plus the records that moved since, and
+always to the graph a full hydration gives."""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import ontodag.__main__ as cli
+from ontodag import snapshots
+from ontodag.eager import EagerOntoDAG
+
+
+def shape(dag):
+    return {name: (sorted(child.name for child in node.neighbors),
+                   sorted(parent.name for parent in node.parents
+                          if dag.nodes.get(parent.name) is parent),
+                   node.descendant_count, node.metadata)
+            for name, node in dag.nodes.items()}
+
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.home = self._dir.name
+        self.spec = "rs:" + os.path.join(self.home, "store")
+        patcher = mock.patch.dict(os.environ, {"ONTODAG_HOME": self.home})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in ("ONTODAG_OVERLAYS", "ONTODAG_STORE_KEY"):
+            os.environ.pop(name, None)
+        cli._OVERRIDES.clear()
+        self.run_in(["put", "photos"], ["put", "trip.jpg", "photos"],
+                    ["put", "beach.jpg", "photos"])
+        session = cli.Session(self.spec)
+        session.dag.nodes["trip.jpg"].metadata["label"] = "Trip"
+        session.dag.put("report", ["photos"], payload="swarm-ref-1")
+        session.save()
+
+    def tearDown(self):
+        cli._OVERRIDES.clear()
+        self._dir.cleanup()
+
+    def run_in(self, *commands):
+        session = cli.Session(self.spec)
+        with redirect_stdout(io.StringIO()):
+            for argv in commands:
+                self.assertEqual(cli.dispatch(argv, session), 0, argv)
+
+    def hydrated(self, root=None):
+        """The graph at `root` (HEAD), read record by record."""
+        store = cli._make_backend(self.spec)._record_store()
+        if root is not None:
+            from recordstore import RecordStore
+            store = RecordStore.at(root, store.blobs)
+        return EagerOntoDAG(store)
+
+    def history(self):
+        """`odag history`'s exit code and output."""
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = cli.dispatch(["history"], cli.Session(self.spec))
+        return code, out.getvalue()
+
+    def opened(self):
+        """A session's dag, failing if it read every record."""
+        with mock.patch.object(EagerOntoDAG, "_all_records") as read:
+            dag = cli.Session(self.spec).dag
+        read.assert_not_called()
+        return dag
+
+    def test_a_later_session_maps_the_snapshot(self):
+        cli.Session(self.spec).dag
+        dag = self.opened()
+        full = self.hydrated()
+        self.assertEqual(shape(dag), shape(full))
+        self.assertEqual(dag._payloads, {"report": "swarm-ref-1"})
+        self.assertEqual(dict(dag._synced), full._synced)
+
+    def test_a_moved_head_applies_the_diff(self):
+        cli.Session(self.spec).dag
+        self.run_in(["put", "dune.jpg", "photos"], ["remove", "beach.jpg"])
+        dag = self.opened()
+        self.assertIn("dune.jpg", dag.nodes)
+        self.assertNotIn("beach.jpg", dag.nodes)
+        self.assertEqual(shape(dag), shape(self.hydrated()))
+        self.assertEqual(dict(dag._synced), self.hydrated()._synced)
+
+    def test_commits_from_a_snapshot_match_a_full_hydration(self):
+        cli.Session(self.spec).dag
+        self.run_in(["put", "dune.jpg", "photos"])
+        cached, full = self.opened(), self.hydrated()
+        for dag in (cached, full):
+            dag.verify_commits = True
+            dag.put("sunset.jpg", ["dune.jpg"])
+            del dag.nodes["trip.jpg"].metadata["label"]
+            dag.remove("report")
+        self.assertEqual(cached.commit(), full.commit())
+
+    def test_a_past_version_opens_from_the_snapshot(self):
+        self.run_in(["put", "dune.jpg", "photos"])
+        cli.Session(self.spec).dag
+        _, history = self.history()
+        root = history.splitlines()[1].split()[0]
+        cli._OVERRIDES["as_of"] = root
+        self.addCleanup(cli._OVERRIDES.clear)
+        dag = self.opened()
+        self.assertNotIn("dune.jpg", dag.nodes)
+        self.assertEqual(shape(dag), shape(self.hydrated(dag.base_root)))
+
+    def test_only_the_most_recent_are_kept(self):
+        with mock.patch.object(snapshots, "KEEP", 2):
+            for name in ("a", "b", "c"):
+                self.run_in(["put", name])
+                cli.Session(self.spec).dag
+        kept = [name for name in os.listdir(
+            os.path.join(self.home, snapshots.DIRECTORY))
+            if name.endswith(".odb")]
+        self.assertEqual(len(kept), 2)
+
+    def test_nothing_is_cached_with_a_store_key(self):
+        directory = os.path.join(self.home, snapshots.DIRECTORY)
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+        with mock.patch.dict(os.environ, {"ONTODAG_STORE_KEY": "secret"}):
+            cli.Session(self.spec).dag
+        self.assertEqual(os.listdir(directory)
+                         if os.path.isdir(directory) else [], [])
+
+    def test_an_unreadable_snapshot_is_hydrated_again(self):
+        cli.Session(self.spec).dag
+        directory = os.path.join(self.home, snapshots.DIRECTORY)
+        for name in os.listdir(directory):
+            if name.endswith(".json"):
+                with open(os.path.join(directory, name), "w") as fh:
+                    fh.write("{not json")
+        dag = cli.Session(self.spec).dag
+        self.assertEqual(shape(dag), shape(self.hydrated()))
+
+
+if __name__ == "__main__":
+    unittest.main()
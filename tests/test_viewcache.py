@@ -0,0 +1,151 @@
+"""The composed-view cache — a later session reads the union from disk, and
+a layer that moved is folded in when it grew, recomposed when it did not."""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import ontodag.__main__ as cli
+from ontodag import viewcache
+from ontodag.dag import OntoDAG
+
+
+def shape(dag):
+    return {name: (sorted(child.name for child in node.neighbors
+                          if dag.nodes.get(child.name) is child),
+                   node.descendant_count, node.metadata)
+            for name, node in dag.nodes.items()}
+
+
+class TestViewCache(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.home = self._dir.name
+        self.primary = os.path.join(self.home, "human.od")
+        self.machine = "rs:" + os.path.join(self.home, "machine")
+        self.files = os.path.join(self.home, "reference.od")
+        patcher = mock.patch.dict(os.environ, {
+            "ONTODAG_HOME": self.home,
+            "ONTODAG_OVERLAYS": f"{self.machine},{self.files}"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cli._OVERRIDES.clear()
+        self.run_in(self.primary, ["put", "photos"],
+                    ["put", "trip.jpg", "photos"])
+        self.run_in(self.machine, ["put", "sys:"], ["put", "sys:on", "sys:"],
+                    ["put", "sys:on:drive", "sys:on"],
+                    ["put", "trip.jpg", "sys:on:drive"])
+        self.run_in(self.files, ["put", "Travel"])
+
+    def tearDown(self):
+        cli._OVERRIDES.clear()
+        self._dir.cleanup()
+
+    def run_in(self, spec, *commands):
+        session = cli.Session(spec)
+        with redirect_stdout(io.StringIO()):
+            for argv in commands:
+                self.assertEqual(cli.dispatch(argv, session), 0, argv)
+
+    def composed(self):
+        """The view as composed without any cache."""
+        union = OntoDAG()
+        for spec in [self.primary] + cli._overlay_specs():
+            union.merge(cli._make_backend(spec).load())
+        return union
+
+    def test_a_later_session_reads_the_view_from_disk(self):
+        first = cli.Session(self.primary).view()
+        session = cli.Session(self.primary)
+        with mock.patch.object(OntoDAG, "merge") as merge:
+            view = session.view()
+        merge.assert_not_called()
+        self.assertIsNone(session._dag)     # no layer was read
+        self.assertEqual(shape(view), shape(first))
+        self.assertEqual(shape(view), shape(self.composed()))
+
+    def test_a_record_layer_that_grew_is_folded_in(self):
+        cli.Session(self.primary).view()
+        self.run_in(self.machine, ["put", "cache.tmp", "sys:on:drive"],
+                    ["put", "sys:on:drive:photos", "sys:on:drive"],
+                    ["move", "trip.jpg", "--to", "sys:on:drive:photos"])
+        session = cli.Session(self.primary)
+        with mock.patch.object(cli.LocalRecordBackend, "load") as load:
+            view = session.view()
+        load.assert_not_called()
+        self.assertEqual(shape(view), shape(self.composed()))
+        # And the fold was written back: the next session is a plain hit.
+        with mock.patch.object(viewcache, "fold") as fold:
+            cli.Session(self.primary).view()
+        fold.assert_not_called()
+
+    def test_a_record_layer_that_lost_claims_is_recomposed(self):
+        cli.Session(self.primary).view()
+        self.run_in(self.machine, ["remove", "sys:on:drive"])
+        view = cli.Session(self.primary).view()
+        self.assertNotIn("sys:on:drive", view.nodes)
+        self.assertEqual(shape(view), shape(self.composed()))
+
+    def test_a_metadata_conflict_is_recomposed(self):
+        # An earlier layer's metadata wins; a fold cannot tell which layer
+        # a value in the union came from.
+        reference = cli.Session(self.files)
+        reference.dag.nodes["Travel"].metadata["label"] = "Trips"
+        reference.save()
+        cli.Session(self.primary).view()
+        machine = cli.Session(self.machine)
+        with redirect_stdout(io.StringIO()):
+            cli.dispatch(["put", "Travel"], machine)
+        machine.dag.nodes["Travel"].metadata["label"] = "Voyages"
+        machine.save()
+        view = cli.Session(self.primary).view()
+        self.assertEqual(view.nodes["Travel"].metadata, {"label": "Voyages"})
+        self.assertEqual(shape(view), shape(self.composed()))
+
+    def test_a_file_layer_that_moved_is_recomposed(self):
+        cli.Session(self.primary).view()
+        self.run_in(self.files, ["put", "Flight", "Travel"])
+        self.run_in(self.primary, ["put", "beach.jpg", "photos"])
+        view = cli.Session(self.primary).view()
+        self.assertIn("Flight", view.nodes)
+        self.assertIn("beach.jpg", view.nodes)
+        self.assertEqual(shape(view), shape(self.composed()))
+
+    def test_a_session_sees_its_own_saves(self):
+        session = cli.Session(self.primary)
+        session.view()
+        self.run_in(self.primary, ["put", "elsewhere.jpg", "photos"])
+        # Loaded before that write: the session's view is its own graph.
+        with redirect_stdout(io.StringIO()):
+            cli.dispatch(["put", "beach.jpg", "photos"], session)
+        self.assertIn("beach.jpg", session.view().nodes)
+        self.assertNotIn("elsewhere.jpg", session.view().nodes)
+
+    def test_what_is_never_cached(self):
+        views = os.path.join(self.home, viewcache.DIRECTORY)
+        session = cli.Session(self.primary)
+        session.begin()
+        session.dag.put("draft.jpg", ["photos"])
+        session.save()
+        self.assertIn("draft.jpg", session.view().nodes)
+        self.assertFalse(os.path.exists(views))
+        with mock.patch.dict(os.environ, {"ONTODAG_STORE_KEY": "secret"}):
+            cli.Session(self.primary).view()
+        self.assertFalse(os.path.exists(views))
+
+    def test_an_unreadable_cache_is_recomposed(self):
+        cli.Session(self.primary).view()
+        views = os.path.join(self.home, viewcache.DIRECTORY)
+        for name in os.listdir(views):
+            if name.endswith(".json"):
+                with open(os.path.join(views, name), "w") as fh:
+                    fh.write("{")
+        view = cli.Session(self.primary).view()
+        self.assertEqual(shape(view), shape(self.composed()))
+
+
+if __name__ == "__main__":
+    unittest.main()
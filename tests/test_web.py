@@ -3,11 +3,14 @@ parametric-dimensions flow exercised over HTTP. Skips cleanly when the web
 extras are not installed (the app imports flask and dot2tex at module
 level)."""
 
+from unittest import mock
+
 import pytest
 
 pytest.importorskip("flask")
 pytest.importorskip("dot2tex")
 
+from ontodag.dag import OntoDAG  # noqa: E402
 from ontodag.web.app import app  # noqa: E402
 
 
@@ -54,6 +57,43 @@ class TestPlainRest:
         counts = {row["cat"]: row["count"] for row in stats}
         assert counts == {"animal,pet": 2, "animal": 1, "pet": 1}
 
+    def test_query_limit_streams_a_prefix_with_the_total(self, client):
+        put(client, "animal")
+        for name in ("cat", "dog", "eel"):
+            put(client, name, ["animal"])
+        body = client.get("/dag/query", query_string={
+            "cat": "animal", "limit": "2"}).get_json()
+        assert [node["name"] for node in body["nodes"]] == ["cat", "dog"]
+        assert body["total"] == 3
+
+    def test_query_explain_attaches_the_trace(self, client):
+        put(client, "animal")
+        put(client, "pet")
+        put(client, "dog", ["animal", "pet"])
+        plain = client.get("/dag/query", query_string={"cat": "animal,pet"})
+        assert "explain" not in plain.get_json()
+        response = client.get("/dag/query", query_string={
+            "cat": "animal,pet", "explain": "1"})
+        body = response.get_json()
+        assert {node["name"] for node in body["nodes"]} == {"dog"}
+        assert body["explain"]["result"] == 1
+        assert body["explain"]["steps"][0]["op"] == "walk"
+        union = client.get("/dag/query", query_string={
+            "cat": "animal|pet", "explain": "1"}).get_json()
+        assert len(union["explain"]["branches"]) == 2
+
+    def test_an_explained_query_runs_once(self, client):
+        put(client, "animal")
+        for name in ("cat", "dog", "eel"):
+            put(client, name, ["animal"])
+        with mock.patch.object(OntoDAG, "_get", autospec=True,
+                               side_effect=OntoDAG._get) as planned:
+            body = client.get("/dag/query", query_string={
+                "cat": "animal", "explain": "1", "limit": "2"}).get_json()
+        assert planned.call_count == 1
+        assert [node["name"] for node in body["nodes"]] == ["cat", "dog"]
+        assert body["total"] == body["explain"]["result"] == 3
+
     def test_below_endpoint(self, client):
         put(client, "animal")
         put(client, "dog", ["animal"])
@@ -0,0 +1,54 @@
+"""The random edits the index tests replay on twins: one DAG with the
+index under test, one plain `OntoDAG`. An index is exact when, after
+every edit, the indexed DAG answers as its twin does — each test file
+checks its own index, the edits are the same for all of them."""
+
+import random
+
+
+def twin_edits(dag, twin, seed, rounds=150):
+    """Apply `rounds` random puts, cross-links, removals, cone removals
+    and reclassifications to `twin` and then `dag`; yield `(rng, label)`
+    after each one, `rng` for the caller's own queries. An edit the twin
+    refuses (`ValueError`) is skipped, and `dag` never sees it."""
+    rng = random.Random(seed)
+    for i in range(rounds):
+        live = sorted(set(dag.nodes) - {"*"})
+        roll = rng.random()
+        if roll < 0.55 or len(live) < 4:
+            name = f"n{i}"
+            supers = rng.sample(live, min(len(live), rng.randint(0, 3)))
+            label = f"put {name} under {supers}"
+
+            def edit(target):
+                target.put(name, supers)
+        elif roll < 0.75:
+            child, sup = rng.choice(live), rng.choice(live)
+            label = f"cross-link {child} under {sup}"
+
+            def edit(target):
+                target.put(child, [sup])
+        elif roll < 0.85:
+            victim = rng.choice(live)
+            label = f"remove {victim}"
+
+            def edit(target):
+                target.remove(victim)
+        elif roll < 0.93:
+            victim = rng.choice(live)
+            label = f"remove_cone {victim}"
+
+            def edit(target):
+                target.remove_cone([victim])
+        else:
+            item, to = rng.choice(live), rng.choice(live)
+            label = f"reclassify {item} to {to}"
+
+            def edit(target):
+                target.reclassify([item], to=[to])
+        try:
+            for target in (twin, dag):
+                edit(target)
+        except ValueError:
+            continue                        # refused on the twin first
+        yield rng, f"{label} (seed {seed})"